@@ -0,0 +1,149 @@
+"""Micro-benchmark for ``lvlab images clean`` planning on a large cache.
+
+Builds a synthetic cloud-image directory of empty files — images, each with a
+checksum manifest, its ``.verified`` companion and a keyring — protects a
+share of them the way a manifest would, mentions some others in manifest
+comments, and times:
+
+- **before** — the previous planning code: the protected set rebuilt for
+    every file, a quadratic prefix scan to group sidecars, and a substring
+    search of the comments for every file name followed by another
+    quadratic sidecar pass;
+- **after** — :func:`find_cleanup_candidates` and
+    :func:`comment_referenced_files`.
+
+Both sides must produce the same plan; the script exits non-zero if they
+do not. The synthetic comments name images, not sidecars: a comment naming
+only a sidecar protects its whole family after, but only that sidecar (and
+the files extending its name) before.
+
+Usage::
+
+    uv run python scripts/bench_cleanup.py [--files 10000] [--rounds 3]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+
+from tkc_lvlab.utils.images import (
+    CleanupCandidate,
+    comment_referenced_files,
+    find_cleanup_candidates,
+)
+
+_SIDECARS = (".SHA256SUMS", ".SHA256SUMS.verified", ".keyring.gpg")
+
+
+def _before_candidates(image_dir: str, protected: set[str]) -> list[CleanupCandidate]:
+    unprotected: list[str] = []
+    for fname in os.listdir(image_dir):
+        fpath = os.path.join(image_dir, fname)
+        if not os.path.isfile(fpath):
+            continue
+        if os.path.abspath(fpath) in {os.path.abspath(p) for p in protected}:
+            continue
+        unprotected.append(fpath)
+    remaining = sorted(unprotected, key=lambda p: (len(os.path.basename(p)), p))
+    consumed: set[str] = set()
+    candidates: list[CleanupCandidate] = []
+    for primary in remaining:
+        if primary in consumed:
+            continue
+        primary_base = os.path.basename(primary)
+        sidecars: list[str] = []
+        for other in remaining:
+            if other is primary or other in consumed:
+                continue
+            if os.path.basename(other).startswith(primary_base + "."):
+                sidecars.append(other)
+                consumed.add(other)
+        consumed.add(primary)
+        candidates.append(
+            CleanupCandidate(image_fpath=primary, sidecar_fpaths=sorted(sidecars))
+        )
+    return sorted(candidates, key=lambda c: c.image_fpath)
+
+
+def _before_commented(image_dir: str, manifest_text: str) -> set[str]:
+    comment_blob = "\n".join(
+        line.split("#", 1)[1] for line in manifest_text.splitlines() if "#" in line
+    )
+    files = [
+        fname
+        for fname in os.listdir(image_dir)
+        if os.path.isfile(os.path.join(image_dir, fname))
+    ]
+    referenced = {fname for fname in files if fname and fname in comment_blob}
+    protected: set[str] = set()
+    for fname in files:
+        if fname in referenced or any(
+            fname.startswith(ref + ".") for ref in referenced
+        ):
+            protected.add(os.path.abspath(os.path.join(image_dir, fname)))
+    return protected
+
+
+def _build_cache(image_dir: str, files: int) -> tuple[set[str], str]:
+    """Create ~``files`` files; return a protected set and manifest text."""
+    images = files // (1 + len(_SIDECARS))
+    protected: set[str] = set()
+    comments: list[str] = []
+    for index in range(images):
+        image = f"distro-{index // 100}-cloud-{index:05d}.qcow2"
+        for suffix in ("", *_SIDECARS):
+            fpath = os.path.join(image_dir, image + suffix)
+            with open(fpath, "wb"):
+                pass
+            if index % 2 == 0:
+                protected.add(fpath)
+        if index % 10 == 1:
+            comments.append(f"  #   image_url: https://example.invalid/{image}")
+    return protected, "images:\n" + "\n".join(comments) + "\n"
+
+
+def _best(fn, rounds: int) -> tuple[float, object]:
+    best, result = float("inf"), None
+    for _ in range(rounds):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main() -> None:
+    """Run the benchmark and print a before/after table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=10_000)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as image_dir:
+        protected, manifest = _build_cache(image_dir, args.files)
+        count = len(os.listdir(image_dir))
+        print(f"{count} files, {len(protected)} protected, best of {args.rounds}")
+        print(f"{'step':<12}{'before s':>12}{'after s':>12}")
+        for name, before, after in (
+            (
+                "candidates",
+                lambda: _before_candidates(image_dir, protected),
+                lambda: find_cleanup_candidates(image_dir, protected),
+            ),
+            (
+                "comments",
+                lambda: _before_commented(image_dir, manifest),
+                lambda: comment_referenced_files(image_dir, manifest),
+            ),
+        ):
+            before_s, expected = _best(before, args.rounds)
+            after_s, actual = _best(after, args.rounds)
+            if actual != expected:
+                raise SystemExit(f"{name}: plans differ")
+            print(f"{name:<12}{before_s:>12.3f}{after_s:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""Micro-benchmark for the single-stream image download loop.
+
+Serves a throwaway file from ``python -m http.server`` on ``127.0.0.1`` (in a
+child process, so its CPU is not charged to the client) and downloads it
+with:
+
+- **before** — the pre-tuning loop: ``iter_content(1024)`` with a
+    progress callback per chunk, each one taking a lock the way ``lvlab
+    init``'s display does;
+- **after** — :meth:`CloudImage._download_file` (adaptive 1–8 MiB reads,
+    throttled progress, digest computed while streaming).
+
+Both sides hash with SHA-256 and report the same progress callback, so the
+difference is the read/write/callback loop. Prints throughput and client CPU
+seconds per GB.
+
+Usage::
+
+    uv run python scripts/bench_download.py [--size-mib 512] [--rounds 3]
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from pathlib import Path
+
+import requests
+
+from tkc_lvlab.utils.images import CloudImage
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _serve(directory: Path) -> tuple[subprocess.Popen, str]:
+    port = _free_port()
+    server = subprocess.Popen(  # pylint: disable=consider-using-with
+        [sys.executable, "-m", "http.server", str(port), "--bind", "127.0.0.1"],
+        cwd=directory,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    base = f"http://127.0.0.1:{port}"
+    for _ in range(100):
+        try:
+            urllib.request.urlopen(base, timeout=1).close()  # noqa: S310
+            return server, base
+        except OSError:
+            time.sleep(0.05)
+    server.kill()
+    raise SystemExit("local http.server did not start")
+
+
+def _progress() -> object:
+    lock = threading.Lock()
+    state = {"done": 0}
+
+    def callback(done: int, _total: int) -> None:
+        with lock:
+            state["done"] = done
+
+    return callback
+
+
+def _before(url: str, destination: str) -> None:
+    callback = _progress()
+    hasher = hashlib.sha256()
+    response = requests.get(url, stream=True, timeout=(10, 60))
+    response.raise_for_status()
+    total = int(response.headers.get("content-length", 0))
+    done = 0
+    with open(destination, "wb") as file:
+        for data in response.iter_content(1024):
+            file.write(data)
+            hasher.update(data)
+            done += len(data)
+            callback(done, total)
+
+
+def _after(url: str, destination: str) -> None:
+    if not CloudImage._download_file(  # pylint: disable=protected-access
+        url, destination, progress_callback=_progress(), hash_name="sha256"
+    ):
+        raise SystemExit("download incomplete")
+
+
+def _measure(fn, url: str, destination: str, size: int) -> tuple[float, float]:
+    wall, cpu = time.perf_counter(), time.process_time()
+    fn(url, destination)
+    wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+    os.remove(destination)
+    return size / wall / 1e6, cpu / (size / 1e9)
+
+
+def main() -> None:
+    """Run the benchmark and print a before/after table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size-mib", type=int, default=512)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    size = args.size_mib * 1024 * 1024
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        served = root / "www"
+        served.mkdir()
+        with open(served / "image.qcow2", "wb") as image:
+            for _ in range(args.size_mib):
+                image.write(os.urandom(1024 * 1024))
+        server, base = _serve(served)
+        try:
+            url = f"{base}/image.qcow2"
+            destination = str(root / "image.qcow2")
+            print(f"{args.size_mib} MiB x {args.rounds} rounds, best of each")
+            print(f"{'loop':<8}{'MB/s':>10}{'CPU s/GB':>12}")
+            for name, fn in (("before", _before), ("after", _after)):
+                results = [
+                    _measure(fn, url, destination, size) for _ in range(args.rounds)
+                ]
+                rate = max(r[0] for r in results)
+                cpu = min(r[1] for r in results)
+                print(f"{name:<8}{rate:>10.0f}{cpu:>12.2f}")
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
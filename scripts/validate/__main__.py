@@ -20,6 +20,8 @@ import sys
 import time
 from pathlib import Path
 
+from tkc_lvlab.utils.virsh_watch import virsh_watchers
+
 # Allow ``python scripts/validate/__main__.py`` (no package context) to import siblings.
 if __package__ in (None, ""):
     sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -170,7 +172,9 @@ def main(argv: list[str] | None = None) -> int:
     args = _parse_args(argv if argv is not None else sys.argv[1:])
     # Final backstop: reap any prefixed leftovers even if the run crashes.
     try:
-        return asyncio.run(_run(args))
+        # Share one libvirt event stream + lease poller across all scenarios.
+        with virsh_watchers():
+            return asyncio.run(_run(args))
     finally:
         if not args.dry_run:
             safety.reap_prefixed_domains(args.uri)
@@ -11,7 +11,9 @@ import asyncio
 import time
 
 from tkc_lvlab.smoke import _parse_domifaddr_lease
-from tkc_lvlab.utils.virsh import VirshError, run_virsh, virsh_domstate
+from tkc_lvlab.utils.virsh import VirshError
+from tkc_lvlab.utils.virsh_async import virsh_domstate_async
+from tkc_lvlab.utils.virsh_watch import virsh_watchers
 
 from validate.context import RunContext
 from validate.model import RunResult
@@ -65,7 +67,7 @@ async def run_binary(
         )
 
 
-def domain_state(ctx: RunContext, domain: str) -> str:
+async def domain_state(ctx: RunContext, domain: str) -> str:
     """Return the libvirt run-state of ``domain`` (``"running"``, ``"shut off"``, …).
 
     Args:
@@ -77,7 +79,7 @@ def domain_state(ctx: RunContext, domain: str) -> str:
         or libvirt can't be reached.
     """
     try:
-        return virsh_domstate(ctx.uri, domain)
+        return await virsh_domstate_async(ctx.uri, domain)
     except VirshError:
         return "absent"
 
@@ -85,11 +87,13 @@ def domain_state(ctx: RunContext, domain: str) -> str:
 async def resolve_ip(
     ctx: RunContext, domain: str, *, source: str, retries: int | None = None
 ) -> str | None:
-    """Poll ``virsh domifaddr --source <source>`` until an IPv4 address appears.
+    """Wait for ``virsh domifaddr --source <source>`` to report an IPv4 address.
 
     Reuses :func:`tkc_lvlab.smoke._parse_domifaddr_lease` so the harness reads
     addresses exactly as ``lvlab smoke`` does (by the running domain, not by a
-    self-generated MAC — see issue #125).
+    self-generated MAC — see issue #125). The query is answered by the URI's
+    shared lease poller, so concurrent scenarios await one future each instead
+    of sleep-polling ``virsh`` side by side.
 
     Args:
         ctx: The run context (URI + poll cadence).
@@ -97,24 +101,24 @@ async def resolve_ip(
         source: ``"lease"`` (dnsmasq DHCP) or ``"arp"`` (host neighbour table —
             populated once the guest emits traffic, so it surfaces a *static*
             address without DHCP).
-        retries: Poll count override (defaults to ``ctx.dhcp_poll_retries``).
+        retries: Poll count override (defaults to ``ctx.dhcp_poll_retries``);
+            the wait is bounded at ``retries * ctx.dhcp_poll_interval_s``.
 
     Returns:
         The first dotted-quad IPv4 address seen, or ``None`` if none appeared.
     """
-    for _ in range(retries if retries is not None else ctx.dhcp_poll_retries):
+    budget_s = (
+        retries if retries is not None else ctx.dhcp_poll_retries
+    ) * ctx.dhcp_poll_interval_s
+    with virsh_watchers(lease_interval=ctx.dhcp_poll_interval_s) as watchers:
+        watchers.domain_watcher(ctx.uri)  # a Started event kicks the poller
+        future = watchers.lease_poller(ctx.uri).watch(
+            ["domifaddr", domain, "--source", source], _parse_domifaddr_lease
+        )
         try:
-            result = run_virsh(
-                ctx.uri, ["domifaddr", domain, "--source", source], check=False
-            )
-        except VirshError:
-            result = None
-        if result is not None and result.returncode == 0:
-            ip = _parse_domifaddr_lease(result.stdout)
-            if ip:
-                return ip
-        await asyncio.sleep(ctx.dhcp_poll_interval_s)
-    return None
+            return await asyncio.wait_for(asyncio.wrap_future(future), budget_s)
+        except asyncio.TimeoutError:
+            return None
 
 
 async def resolve_dhcp_ip(ctx: RunContext, domain: str) -> str | None:
@@ -173,7 +173,7 @@ class CreateVmScenario:
 
     async def _verify(self, ctx: RunContext, result: ScenarioResult) -> None:
         """Assert the guest reached ``running`` and acquired its address."""
-        state = domain_state(ctx, self.domain)
+        state = await domain_state(ctx, self.domain)
         result.record(
             AssertionOutcome(
                 description="domain state == running",
@@ -265,7 +265,7 @@ class CreateVmScenario:
         )
         result.runs.append(run)
         # Backstop: if deletevm left the domain (or never ran), reap by prefix.
-        if domain_state(ctx, self.domain) != "absent":
+        if await domain_state(ctx, self.domain) != "absent":
             safety.reap_domain(ctx.uri, self.domain)
 
     async def execute(self, ctx: RunContext) -> ScenarioResult:
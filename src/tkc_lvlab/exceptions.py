@@ -20,6 +20,7 @@ Hierarchy::
     ├── ConfigError        — manifest cannot be read / structurally invalid
     │   └── ManifestError  — semantic manifest-validation failure
     ├── VirshError         — a ``virsh`` invocation failed
+    │   └── VirshUnavailableError — refused up front: libvirtd circuit open
     ├── LibvirtNetworkError — libvirt network info unresolvable / invalid
     ├── ImageError         — a cloud image / sidecar could not be obtained
     ├── DependencyError    — a required host binary is missing
@@ -113,6 +114,16 @@ class VirshError(LvlabError, RuntimeError):
         )
 
 
+class VirshUnavailableError(VirshError):
+    """Raised without running ``virsh`` while a URI's circuit breaker is open.
+
+    A subclass of :class:`VirshError` so every existing ``except VirshError``
+    site treats a fail-fast refusal exactly like the connection failure it
+    stands in for. ``returncode`` is ``-2``; ``stderr`` names the URI and
+    when the next probe is allowed.
+    """
+
+
 class LibvirtNetworkError(LvlabError, RuntimeError):
     """Raised when libvirt network information cannot be resolved or validated.
 
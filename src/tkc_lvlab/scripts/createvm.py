@@ -30,16 +30,16 @@ and for test imports.
 
 from __future__ import annotations
 
+import concurrent.futures
 import ipaddress
 import json
 import os
 import re
 import shutil
 import subprocess
-import time
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
 import click
 import typer
@@ -48,6 +48,7 @@ from rich.progress import BarColumn, Progress, TextColumn, TimeRemainingColumn
 from .. import __version__
 from ..config import HostConfig, NetworkDefaults, load_host_config
 from ..exceptions import CloudInitError, ImageError
+from ..utils.cache_quota import record_image_use
 from ..utils.catalog import (
     BUILTIN_IMAGES,
     ImageEntry as CatalogEntry,
@@ -56,7 +57,13 @@ from ..utils.catalog import (
     resolve_image_entry,
 )
 from ..utils.cloud_init import CloudInitIso, NetworkConfig
-from ..utils.images import CloudImage
+from ..utils.http_client import DownloadClient
+from ..utils.images import (
+    DEFAULT_DOWNLOAD_SEGMENTS,
+    CloudImage,
+    cache_lock,
+    verify_images,
+)
 from ..utils.network import (
     LibvirtNetworkError,
     LibvirtNetworkInfo,
@@ -91,7 +98,10 @@ from ..utils.standalone_cloud_init import (
     user_data_supplies_keys,
 )
 from ..utils.subprocess_env import system_first_env
-from ..utils.virsh import VirshError, run_virsh, vm_exists
+from ..utils.trace import trace_to
+from ..utils.vdisk import read_disk_header
+from ..utils.virsh import vm_exists
+from ..utils.virsh_watch import virsh_watchers
 
 # ---------------------------------------------------------------------------
 # Defaults (mirror the lvscripts reference)
@@ -115,6 +125,8 @@ NAT_DHCP_LEASE_WAIT_SECONDS = 20
 
 # Shared with ``lvlab up`` — CloudImage appends ``/cloud-images``.
 _CLOUD_IMAGE_BASEDIR = Path("/var/lib/libvirt/images/lvlab")
+# Images hash-verified concurrently by --init-cloud-images.
+_VERIFY_JOBS = 4
 # Per-VM state, namespaced beside the shared cache. Distinct from
 # ``lvlab up``'s ``lvlab/<env>/<vm>/`` layout so one-off VMs never collide
 # with manifest VM disks.
@@ -377,6 +389,7 @@ def _build_cloud_image(name: str, entry: CatalogEntry, image_dir: Path) -> Cloud
     """
     config = {
         "image_url": entry.image_url,
+        "mirrors": list(entry.mirrors),
         "checksum_url": entry.checksum_url,
         "checksum_type": entry.checksum_type,
         "checksum_url_gpg": entry.checksum_url_gpg,
@@ -392,51 +405,133 @@ def _build_cloud_image(name: str, entry: CatalogEntry, image_dir: Path) -> Cloud
     )
 
 
-def _ensure_image_available(cloud_image: CloudImage) -> None:
+def _ensure_image_available(
+    cloud_image: CloudImage,
+    *,
+    verify: bool = True,
+    reverify: bool = False,
+    client: DownloadClient | None = None,
+) -> None:
     """Download and verify the cloud image if not already present locally.
 
+    An image whose recorded verification still holds
+    (:meth:`CloudImage.is_verified`) is not GPG- or hash-checked again.
+
     Args:
         cloud_image: A populated :class:`CloudImage` instance.
+        verify: Hash-check the image against its checksum file. Callers
+            that verify several images together pass ``False`` and use
+            :func:`verify_images`.
+        reverify: Ignore any recorded verification and check again.
+        client: Pooled :class:`DownloadClient` for the image, checksum and
+            keyring downloads (``None`` = a fresh connection per file).
 
     Raises:
         typer.Exit: Download or verification failed.
     """
+    # Held across download + verify: a concurrent lvlab/createvm fetching
+    # the same image finishes first and this run reuses its files.
+    with cloud_image.locked(on_wait=_lock_wait_notice(cloud_image)):
+        _fetch_and_verify(cloud_image, verify=verify, reverify=reverify, client=client)
+
+
+def _lock_wait_notice(cloud_image: CloudImage) -> Callable[[float], None]:
+    """An ``on_wait`` callback that says once that another process has the image."""
+    announced: list[bool] = []
+
+    def on_wait(_waited: float) -> None:
+        if not announced:
+            announced.append(True)
+            secho(
+                f"Waiting for another process downloading {cloud_image.filename}...",
+                fg=typer.colors.YELLOW,
+            )
+
+    return on_wait
+
+
+def _fetch_and_verify(
+    cloud_image: CloudImage,
+    *,
+    verify: bool,
+    reverify: bool,
+    client: DownloadClient | None,
+) -> None:
+    """The body of :func:`_ensure_image_available`, run under the image lock."""
     try:
         if not cloud_image.exists_locally("image"):
-            if not cloud_image.download_image():
+            if not cloud_image.download_image(client=client):
                 _fail(f"Failed to download cloud image from {cloud_image.image_url}")
         if cloud_image.checksum_url and not cloud_image.exists_locally("checksum"):
-            cloud_image.download_checksum()
+            cloud_image.download_checksum(client=client)
         if cloud_image.checksum_url_gpg and not cloud_image.exists_locally(
             "checksum_gpg"
         ):
-            cloud_image.download_checksum_gpg()
+            cloud_image.download_checksum_gpg(client=client)
     except ImageError as exc:
         # Clean boundary (issue #98): a transport/HTTP download failure (e.g.
         # the gzip-served Fedora GPG key returning 416) surfaces the
         # ImageError's actionable message + manual-placement workaround
         # instead of a raw requests traceback.
         _fail(str(exc))
+    if not reverify and cloud_image.is_verified():
+        # Verified before and nothing it was checked against has changed.
+        return
     if cloud_image.checksum_url_gpg:
         cloud_image.gpg_verify_checksum_file()
-    if cloud_image.checksum_url and not cloud_image.checksum_verify_image():
+    if verify and cloud_image.checksum_url and not cloud_image.checksum_verify_image():
         _fail(f"Cloud image {cloud_image.image_fpath} failed checksum verification.")
 
 
-def _initialize_cloud_images(catalog: dict[str, dict[str, Any]]) -> None:
+def _initialize_cloud_images(
+    catalog: dict[str, dict[str, Any]],
+    *,
+    reverify: bool = False,
+    client: DownloadClient | None = None,
+) -> None:
     """Download every catalog image that isn't already cached.
 
+    Images are fetched one at a time over one pooled :class:`DownloadClient`
+    (so an image, its checksum and its keyring share the mirror
+    connection), then the ones without a still-valid verification record
+    are hash-verified together on a small thread pool
+    (:func:`verify_images`).
+
     Args:
         catalog: A merged catalog from :func:`resolve_catalog`.
+        reverify: Re-verify images even when a verification is recorded.
+        client: Client to download through; one is created (and closed)
+            for the call when omitted.
 
     Raises:
         typer.Exit: Any image fails to download or verify.
     """
     secho("Initializing cloud images...", fg=typer.colors.GREEN)
-    for name in sorted(catalog):
-        entry = resolve_image_entry(name, catalog)
-        cloud_image = _build_cloud_image(name, entry, _CLOUD_IMAGE_BASEDIR)
-        _ensure_image_available(cloud_image)
+    cloud_images = [
+        _build_cloud_image(name, resolve_image_entry(name, catalog), _CLOUD_IMAGE_BASEDIR)
+        for name in sorted(catalog)
+    ]
+    own_client = client is None
+    if client is None:
+        # One image at a time; room for all of its segmented ranges.
+        client = DownloadClient(connections_per_job=DEFAULT_DOWNLOAD_SEGMENTS)
+    try:
+        for cloud_image in cloud_images:
+            _ensure_image_available(
+                cloud_image, verify=False, reverify=reverify, client=client
+            )
+    finally:
+        if own_client:
+            client.close()
+
+    to_verify = [
+        image
+        for image in cloud_images
+        if image.checksum_url and (reverify or not image.is_verified())
+    ]
+    for cloud_image, ok in zip(to_verify, verify_images(to_verify, jobs=_VERIFY_JOBS)):
+        if not ok:
+            _fail(f"Cloud image {cloud_image.image_fpath} failed checksum verification.")
 
 
 # ---------------------------------------------------------------------------
@@ -1021,7 +1116,10 @@ def parse_disk_size_to_bytes(value: str) -> int:
 
 
 def _image_virtual_size_bytes(image_fpath: str) -> int:
-    """Return the virtual size (in bytes) of a qcow2/raw image via qemu-img.
+    """Return the virtual size (in bytes) of a qcow2/raw image.
+
+    Read from the image header in-process (:func:`read_disk_header`); only
+    an image it cannot parse costs a ``qemu-img info`` run.
 
     Args:
         image_fpath: Path to the base cloud image.
@@ -1034,6 +1132,13 @@ def _image_virtual_size_bytes(image_fpath: str) -> int:
         OSError: The ``qemu-img`` binary was not found.
         ValueError: The JSON output lacked an integer ``virtual-size``.
     """
+    try:
+        header = read_disk_header(image_fpath)
+    except (OSError, ValueError):
+        header = None  # let qemu-img have a go and report its own error
+    if header is not None:
+        return header.virtual_size
+
     proc = subprocess.run(
         ["qemu-img", "info", "--output=json", image_fpath],
         check=True,
@@ -1139,7 +1244,10 @@ def _provision_vm(
     disk_path = vm_dir / "disk0.qcow2"
 
     secho("Copying base image...", fg=typer.colors.GREEN)
-    shutil.copyfile(ctx.cloud_image.image_fpath, disk_path)
+    # Under the image's lock so a cache-quota eviction can't remove it mid-copy.
+    with cache_lock(ctx.cloud_image.image_fpath):
+        shutil.copyfile(ctx.cloud_image.image_fpath, disk_path)
+    record_image_use(ctx.cloud_image.image_fpath)
 
     # Deliberate divergence from lvscripts-py's unconditional `qemu-img resize`
     # (ref #88): qemu-img cannot shrink a qcow2 (`resize` to a smaller size
@@ -1283,29 +1391,35 @@ def _extract_lease_ip(
 def _wait_for_dhcp_lease(
     vm_hostname: str, network_name: str, *, vm_mac: str | None, timeout_seconds: int
 ) -> str | None:
-    """Poll ``virsh net-dhcp-leases`` and return the VM IPv4 CIDR when it appears."""
-    with Progress(
-        TextColumn("Waiting for DHCP lease"),
-        BarColumn(),
-        TextColumn("{task.percentage:>3.0f}%"),
-        TimeRemainingColumn(),
-        transient=True,
-    ) as progress:
+    """Wait for ``virsh net-dhcp-leases`` to show the VM and return its IPv4 CIDR.
+
+    The query runs on the URI's shared lease poller; this thread only blocks
+    on the waiter's future, waking once a second to advance the progress bar.
+    """
+    with (
+        virsh_watchers(lease_interval=1.0) as watchers,
+        Progress(
+            TextColumn("Waiting for DHCP lease"),
+            BarColumn(),
+            TextColumn("{task.percentage:>3.0f}%"),
+            TimeRemainingColumn(),
+            transient=True,
+        ) as progress,
+    ):
         task_id = progress.add_task("dhcp-wait", total=timeout_seconds)
+        future = watchers.lease_poller(_SYSTEM_URI).watch(
+            ["net-dhcp-leases", network_name],
+            lambda output: _extract_lease_ip(output, vm_hostname, vm_mac),
+        )
         for _ in range(timeout_seconds):
             try:
-                result = run_virsh(
-                    _SYSTEM_URI, ["net-dhcp-leases", network_name], check=False
-                )
-            except VirshError:
-                result = None
-            if result is not None and result.returncode == 0:
-                lease_ip = _extract_lease_ip(result.stdout, vm_hostname, vm_mac)
-                if lease_ip is not None:
-                    progress.update(task_id, completed=timeout_seconds)
-                    return lease_ip
-            time.sleep(1)
-            progress.advance(task_id)
+                lease_ip = future.result(timeout=1)
+            except concurrent.futures.TimeoutError:
+                progress.advance(task_id)
+                continue
+            progress.update(task_id, completed=timeout_seconds)
+            return lease_ip
+        future.cancel()
     return None
 
 
@@ -1392,6 +1506,7 @@ def _manifest_path_used(config_path: Path | None) -> Path | None:
 
 @app.command()
 def createvm(  # pylint: disable=too-many-arguments,too-many-locals
+    cli_ctx: typer.Context,
     vm_name: str | None = typer.Argument(None, help="FQDN for the VM."),
     vm_distro: str | None = typer.Argument(None, help="Configured distro key."),
     ip4: str | None = typer.Option(
@@ -1472,6 +1587,14 @@ def createvm(  # pylint: disable=too-many-arguments,too-many-locals
             "DEPRECATED: prefer 'lvlab init' (the single image-init path)."
         ),
     ),
+    reverify: bool = typer.Option(
+        False,
+        "--reverify",
+        help=(
+            "Re-run GPG and checksum verification of the cached image even "
+            "when it was already verified and is unchanged."
+        ),
+    ),
     config_path: Path | None = typer.Option(
         None,
         "--config",
@@ -1489,6 +1612,16 @@ def createvm(  # pylint: disable=too-many-arguments,too-many-locals
         "--no-color",
         help="Disable colored output (also honors the NO_COLOR env var).",
     ),
+    trace: Path | None = typer.Option(
+        None,
+        "--trace",
+        dir_okay=False,
+        writable=True,
+        help=(
+            "Record every external process (argv, duration, exit code, retries) "
+            "to FILE as JSON lines and print a per-program summary at exit."
+        ),
+    ),
     version: bool = typer.Option(  # pylint: disable=unused-argument
         False,
         "--version",
@@ -1501,6 +1634,9 @@ def createvm(  # pylint: disable=too-many-arguments,too-many-locals
     """Create a libvirt VM using configured cloud images and cloud-init."""
     if no_color:
         set_no_color(True)
+    if trace is not None:
+        # Closed (and summarized) when the command returns or exits.
+        cli_ctx.with_resource(trace_to(trace))
     has_vm_args = vm_name is not None or vm_distro is not None
     has_all_vm_args = vm_name is not None and vm_distro is not None
 
@@ -1530,7 +1666,7 @@ def createvm(  # pylint: disable=too-many-arguments,too-many-locals
             "This flag still works for now.",
             fg=typer.colors.YELLOW,
         )
-        _initialize_cloud_images(catalog)
+        _initialize_cloud_images(catalog, reverify=reverify)
         if not has_all_vm_args:
             secho("Cloud images initialized.", fg=typer.colors.GREEN)
             return
@@ -1582,7 +1718,7 @@ def createvm(  # pylint: disable=too-many-arguments,too-many-locals
 
     vm_dir = storage_dir_for(vm_name, root=storage_root)
     _check_vm_preconditions(vm_name, vm_dir)
-    _ensure_image_available(ctx.cloud_image)
+    _ensure_image_available(ctx.cloud_image, reverify=reverify)
 
     try:
         vm_dir.mkdir(parents=True, exist_ok=False)
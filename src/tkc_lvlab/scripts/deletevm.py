@@ -46,6 +46,7 @@ import typer
 from .. import __version__
 from ..utils.output import secho, set_no_color
 from ..utils.snapshot_cleanup import undefine_with_snapshot_cleanup
+from ..utils.trace import trace_to
 from ..utils.virsh import VirshError, run_virsh, virsh_snapshot_names, vm_exists
 from .createvm import storage_dir_for
 
@@ -113,6 +114,7 @@ def _undefine_or_fail(vm_name: str) -> None:
 
 @app.command()
 def deletevm(
+    ctx: typer.Context,
     vm_name: str = typer.Argument(..., help="VM name to destroy and remove."),
     force: bool = typer.Option(False, "--force", help="Skip confirmation prompt."),
     # --snapshots-too is a deliberate divergence from the lvscripts-py
@@ -139,6 +141,16 @@ def deletevm(
         "--no-color",
         help="Disable colored output (also honors the NO_COLOR env var).",
     ),
+    trace: Path | None = typer.Option(
+        None,
+        "--trace",
+        dir_okay=False,
+        writable=True,
+        help=(
+            "Record every external process (argv, duration, exit code, retries) "
+            "to FILE as JSON lines and print a per-program summary at exit."
+        ),
+    ),
     version: bool = typer.Option(  # pylint: disable=unused-argument
         False,
         "--version",
@@ -162,6 +174,9 @@ def deletevm(
     """
     if no_color:
         set_no_color(True)
+    if trace is not None:
+        # Closed (and summarized) when the command returns or exits.
+        ctx.with_resource(trace_to(trace))
     domain_name = vm_name
     vm_dir = storage_dir_for(vm_name, root=storage_root)
 
@@ -69,6 +69,7 @@ from .utils.libvirt import Machine
 from .utils.network import LibvirtNetworkInfo, get_network_info
 from .utils.output import get_console, is_tty, styled_table
 from .utils.virsh import VirshError, run_virsh, virsh_list_all_names
+from .utils.virsh_watch import virsh_watchers, wait_for_domain_state, wait_for_lease
 
 logger = get_logger(__name__)
 
@@ -101,7 +102,10 @@ SSH_CONNECT_TIMEOUT = 8
 SSH_PROBE_RETRIES = 30
 SSH_PROBE_INTERVAL = 5
 
-# DHCP lease poll: how long to wait for a lease to appear after boot.
+# DHCP lease wait: how long to wait for a lease to appear after boot
+# (``RETRIES * INTERVAL`` = 150s). The shared lease poller ticks every
+# ``DHCP_POLL_INTERVAL`` seconds for all cases at once, and a domain ``Started``
+# event triggers an immediate tick.
 DHCP_POLL_RETRIES = 30
 DHCP_POLL_INTERVAL = 5
 
@@ -109,10 +113,13 @@ DHCP_POLL_INTERVAL = 5
 # are ephemeral and force-destroyed regardless, so this only needs to last long
 # enough for a well-behaved guest to ACPI-poweroff cleanly — not the ~60s a
 # guest that ignores the signal (Ubuntu cloud images without a guest agent)
-# would otherwise stall the run. Bounded at ``(RETRIES - 1) * INTERVAL`` = 14s;
-# a prompt shutdown is still caught within one INTERVAL (2s).
+# would otherwise stall the run. Bounded at ``(RETRIES - 1) * INTERVAL`` = 14s.
+# The wait is woken by the domain's ``Stopped`` event, so a prompt shutdown is
+# caught immediately; INTERVAL is only the cadence if ``virsh event`` is
+# unavailable and the wait degrades to polling.
 SHUTDOWN_POLL_RETRIES = 8
 SHUTDOWN_POLL_INTERVAL = 2
+SHUTDOWN_GRACE_SECONDS = (SHUTDOWN_POLL_RETRIES - 1) * SHUTDOWN_POLL_INTERVAL
 
 
 class OutputFormat(str, Enum):
@@ -1275,7 +1282,7 @@ def static_failure_detail(
 def _resolve_dhcp_ip(
     case: SmokeCase, uri: str
 ) -> str | None:  # pragma: no cover - VM lifecycle
-    """Poll libvirt for the running domain's DHCP-leased IPv4 address.
+    """Wait for libvirt to report the running domain's DHCP-leased IPv4 address.
 
     Uses ``virsh domifaddr <domain> --source lease``, which resolves the
     address by the *running domain's* own interface. That is correct
@@ -1283,22 +1290,17 @@ def _resolve_dhcp_ip(
     ``generate_mac`` is random per ``Machine`` construction, so matching
     ``net-dhcp-leases`` against a MAC this process pinned independently never
     matched the VM's actual MAC and failed every DHCP case (issue #125).
+
+    The query is answered by the URI's shared lease poller
+    (:func:`~tkc_lvlab.utils.virsh_watch.wait_for_lease`), so concurrent cases
+    share one polling thread instead of each sleeping in its own loop.
     """
-    for _ in range(DHCP_POLL_RETRIES):
-        try:
-            result = run_virsh(
-                uri,
-                ["domifaddr", case.libvirt_domain, "--source", "lease"],
-                check=False,
-            )
-        except VirshError:
-            result = None
-        if result is not None and result.returncode == 0:
-            ip = _parse_domifaddr_lease(result.stdout)
-            if ip:
-                return ip
-        time.sleep(DHCP_POLL_INTERVAL)
-    return None
+    return wait_for_lease(
+        uri,
+        ["domifaddr", case.libvirt_domain, "--source", "lease"],
+        _parse_domifaddr_lease,
+        timeout=DHCP_POLL_RETRIES * DHCP_POLL_INTERVAL,
+    )
 
 
 def _ssh_probe(
@@ -1468,46 +1470,48 @@ def cases_to_reap(
 
 
 def _await_shutoff(
-    domstate: Callable[[], str],
+    uri: str,
+    domain: str,
     *,
-    retries: int = SHUTDOWN_POLL_RETRIES,
-    interval: float = SHUTDOWN_POLL_INTERVAL,
-    sleep: Callable[[float], None] = time.sleep,
+    timeout: float = SHUTDOWN_GRACE_SECONDS,
+    poll_interval: float = SHUTDOWN_POLL_INTERVAL,
 ) -> bool:
-    """Poll a domain's state until it powers off or the grace budget is spent.
+    """Wait for a domain to power off, or until the grace budget is spent.
 
     Smoke VMs are ephemeral and force-destroyed regardless, so the graceful
     ``lvlab down`` wait only needs to outlast a well-behaved guest's ACPI
-    poweroff. This bounds the wait to ``(retries - 1) * interval`` seconds
-    (issue #132): a distro that ignores the ACPI signal — Ubuntu cloud images
-    without a guest agent — no longer stalls the run for ~60s, while a prompt
-    shutdown is still caught within one ``interval``.
+    poweroff. This bounds the wait to ``timeout`` seconds (issue #132): a
+    distro that ignores the ACPI signal — Ubuntu cloud images without a guest
+    agent — no longer stalls the run for ~60s. The wait blocks on the
+    domain's lifecycle events (:func:`~tkc_lvlab.utils.virsh_watch.wait_for_domain_state`),
+    so a prompt shutdown is seen the moment libvirt reports it.
 
     Args:
-        domstate: Zero-argument callable returning the domain's lowercase state
-            (e.g. ``"running"``, ``"shut off"``).
-        retries: Maximum number of state polls before giving up.
-        interval: Seconds to sleep between polls.
-        sleep: Sleep function; injectable so tests run without real delay.
+        uri: libvirt connection URI.
+        domain: The libvirt domain name.
+        timeout: Grace budget in seconds.
+        poll_interval: Polling cadence if the event stream is unavailable.
 
     Returns:
-        ``True`` if the domain reached ``"shut off"`` (or its state became
-        unreadable) within the grace budget; ``False`` if it was still running
-        when the budget was exhausted. The caller force-destroys for cleanup
-        either way, so this is informational — a clean shutdown was observed
-        when ``True``.
+        ``True`` if the domain reached ``"shut off"`` (or was undefined, or its
+        state became unreadable) within the grace budget; ``False`` if it was
+        still running when the budget was exhausted. The caller force-destroys
+        for cleanup either way, so this is informational — a clean shutdown
+        was observed when ``True``.
     """
-    for attempt in range(retries):
-        try:
-            if domstate() == "shut off":
-                return True
-        except VirshError:
-            # State unreadable (transient daemon hiccup, domain already gone);
-            # stop waiting and let the unconditional force-destroy finish up.
-            return True
-        if attempt < retries - 1:
-            sleep(interval)
-    return False
+    try:
+        reached = wait_for_domain_state(
+            uri,
+            domain,
+            ("shut off", "absent"),
+            timeout=timeout,
+            poll_interval=poll_interval,
+        )
+    except VirshError:
+        # State unreadable (transient daemon hiccup, domain already gone);
+        # stop waiting and let the unconditional force-destroy finish up.
+        return True
+    return reached is not None
 
 
 def _teardown(
@@ -1520,15 +1524,13 @@ def _teardown(
     --force`` then powers off any guest still running and removes its storage,
     so a slow-to-ACPI distro can't stall the run.
     """
-    from .utils.virsh import virsh_domstate
-
     subprocess.run(
         [lvlab, "down", case.vm_name],
         stdout=subprocess.DEVNULL,
         stderr=subprocess.DEVNULL,
         check=False,
     )
-    _await_shutoff(lambda: virsh_domstate(uri, case.libvirt_domain))
+    _await_shutoff(uri, case.libvirt_domain)
     subprocess.run(
         [lvlab, "destroy", case.vm_name, "--force"],
         stdout=subprocess.DEVNULL,
@@ -1958,14 +1960,16 @@ def run_smoke(
             file=sys.stderr,
         )
     try:
-        results = _run_batches(
-            plan,
-            progress,
-            lvlab=lvlab,
-            uri=uri,
-            key_path=key_path,
-            live=live,
-        )
+        # One event stream + lease poller shared by every case's waits.
+        with virsh_watchers(lease_interval=DHCP_POLL_INTERVAL):
+            results = _run_batches(
+                plan,
+                progress,
+                lvlab=lvlab,
+                uri=uri,
+                key_path=key_path,
+                live=live,
+            )
     finally:
         # Crash-safe teardown (issue #139): reap any in-flight VM an interrupted
         # run never tore down. A normal completion leaves nothing to do here.
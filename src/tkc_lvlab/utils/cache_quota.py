@@ -0,0 +1,229 @@
+"""Cloud-image cache quota (``config_defaults.cache_max_bytes``).
+
+``lvlab images clean`` removes everything the current manifest does not
+claim, on demand. A lab host that runs many manifests (CI, shared image
+servers) needs something gentler and automatic: keep the cache under a size
+budget by dropping the images that were used longest ago.
+
+- :func:`record_image_use` stamps an image as used. ``lvlab init``,
+    ``lvlab up`` and ``createvm`` call it whenever they fetch or build a
+    disk from an image; the stamps live in one JSON file under the hidden
+    ``cloud-images/.usage/`` directory.
+- :func:`evict_to_quota` removes unprotected cache entries, least recently
+    used first, until :func:`cache_usage_bytes` is within the budget. Its
+    candidates come from
+    :func:`~tkc_lvlab.utils.images.find_cleanup_candidates`, so the
+    protected set the caller passes (manifest images, in-use backing files,
+    comment references) is honoured exactly as ``images clean`` honours it.
+    Blobs of the content-addressed layout that lose their last alias go
+    with it.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import time
+from stat import S_ISREG
+from typing import Any, Callable
+
+from .._logging import get_logger
+from .images import (
+    CleanupCandidate,
+    cache_lock,
+    find_cleanup_candidates,
+    find_orphan_blobs,
+)
+
+logger = get_logger(__name__)
+
+#: ``config_defaults`` key holding the cache budget in bytes (unset: no limit).
+CACHE_QUOTA_KEY = "cache_max_bytes"
+
+# Hidden directory under the cache (``images clean`` only lists files).
+_USAGE_DIR = ".usage"
+_USAGE_FILE = "last_used.json"
+# Hidden directories of lvlab's own small bookkeeping files (locks, logs,
+# mirror and usage stats, backing-file scans), left out of the cache's size.
+_BOOKKEEPING_DIRS = frozenset({".locks", ".logs", ".mirrors", ".scan", _USAGE_DIR})
+
+
+class UsageLog:
+    """When each cached file was last used, persisted as JSON across runs.
+
+    Entries are keyed by file name; updates are serialized across processes
+    with :func:`~tkc_lvlab.utils.images.cache_lock`.
+
+    Args:
+        fpath: The JSON file (created on the first :meth:`record`).
+        clock: Wall clock; injectable for tests.
+    """
+
+    def __init__(self, fpath: str, *, clock: Callable[[], float] = time.time) -> None:
+        self.fpath = fpath
+        self._clock = clock
+
+    @classmethod
+    def for_image_dir(cls, image_dir: str) -> "UsageLog":
+        """The usage log of the cloud-image cache at ``image_dir``."""
+        return cls(os.path.join(os.path.expanduser(image_dir), _USAGE_DIR, _USAGE_FILE))
+
+    def last_used(self) -> dict[str, float]:
+        """``{file name: timestamp}`` of every recorded use."""
+        try:
+            with open(self.fpath, "r", encoding="utf-8") as usage_file:
+                entries = json.load(usage_file)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(entries, dict):
+            return {}
+        return {
+            name: float(stamp)
+            for name, stamp in entries.items()
+            if isinstance(stamp, (int, float))
+        }
+
+    def _update(self, change: Callable[[dict[str, float]], None]) -> None:
+        os.makedirs(os.path.dirname(self.fpath), exist_ok=True)
+        with cache_lock(self.fpath):
+            entries = self.last_used()
+            change(entries)
+            tmp_fpath = self.fpath + ".tmp"
+            with open(tmp_fpath, "w", encoding="utf-8") as usage_file:
+                json.dump(entries, usage_file)
+            os.replace(tmp_fpath, self.fpath)
+
+    def record(self, fpath: str) -> None:
+        """Stamp ``fpath`` as used now."""
+        now = self._clock()
+        self._update(lambda entries: entries.__setitem__(os.path.basename(fpath), now))
+
+    def forget(self, fpath: str) -> None:
+        """Drop ``fpath``'s entry (it was evicted)."""
+        self._update(lambda entries: entries.pop(os.path.basename(fpath), None))
+
+
+def record_image_use(image_fpath: str) -> None:
+    """Stamp the cached image at ``image_fpath`` as used now.
+
+    Best effort: a cache the caller may read but not write (another user's
+    shared cache) only loses the stamp, logged at debug level.
+    """
+    image_fpath = os.path.expanduser(image_fpath)
+    try:
+        UsageLog.for_image_dir(os.path.dirname(image_fpath)).record(image_fpath)
+    except OSError as exc:
+        logger.debug("could not record use of %s: %s", image_fpath, exc)
+
+
+def parse_cache_quota(config_defaults: dict[str, Any]) -> int | None:
+    """Read ``cache_max_bytes`` from ``config_defaults``.
+
+    Returns:
+        The budget in bytes, or ``None`` when unset.
+
+    Raises:
+        ValueError: The value is not a non-negative whole number of bytes.
+    """
+    value = config_defaults.get(CACHE_QUOTA_KEY)
+    if value is None:
+        return None
+    if isinstance(value, bool) or not isinstance(value, int) or value < 0:
+        raise ValueError(
+            f"config_defaults.{CACHE_QUOTA_KEY} must be a whole number of "
+            f"bytes, got {value!r}"
+        )
+    return value
+
+
+def cache_usage_bytes(image_dir: str) -> int:
+    """Bytes the cache occupies, counting each hard-linked file once.
+
+    Walks ``image_dir`` including the blob store, staged refreshes and
+    partial downloads, but not lvlab's bookkeeping directories; symlinks
+    are not followed.
+    """
+    seen: set[tuple[int, int]] = set()
+    total = 0
+    for root, dirs, files in os.walk(image_dir):
+        dirs[:] = [name for name in dirs if name not in _BOOKKEEPING_DIRS]
+        for fname in files:
+            try:
+                info = os.lstat(os.path.join(root, fname))
+            except OSError:
+                continue
+            key = (info.st_dev, info.st_ino)
+            if S_ISREG(info.st_mode) and key not in seen:
+                seen.add(key)
+                total += info.st_size
+    return total
+
+
+def _last_used(candidate: CleanupCandidate, stamps: dict[str, float]) -> float:
+    """When ``candidate`` was last used; its mtime when never recorded."""
+    stamp = stamps.get(os.path.basename(candidate.image_fpath))
+    if stamp is not None:
+        return stamp
+    try:
+        return os.stat(candidate.image_fpath).st_mtime
+    except OSError:
+        return 0.0
+
+
+def evict_to_quota(
+    image_dir: str,
+    max_bytes: int,
+    protected: set[str],
+    *,
+    usage: UsageLog | None = None,
+) -> list[CleanupCandidate]:
+    """Remove least-recently-used unprotected entries until under ``max_bytes``.
+
+    Each entry is removed under its cache lock, so an image another process
+    is downloading or building from is waited for rather than pulled out
+    from under it.
+
+    Args:
+        image_dir: The cloud-image cache directory (already ``~``-expanded).
+        max_bytes: The budget.
+        protected: Paths that must never be removed (see
+            :func:`~tkc_lvlab.utils.images.find_cleanup_candidates`).
+        usage: The cache's usage log; defaults to the one in ``image_dir``.
+
+    Returns:
+        The evicted candidates, oldest first. The cache may still be over
+        budget when everything left is protected.
+    """
+    used = cache_usage_bytes(image_dir)
+    if used <= max_bytes:
+        return []
+    usage = usage or UsageLog.for_image_dir(image_dir)
+    stamps = usage.last_used()
+    candidates = sorted(
+        find_cleanup_candidates(image_dir, protected),
+        key=lambda candidate: _last_used(candidate, stamps),
+    )
+    evicted: list[CleanupCandidate] = []
+    for candidate in candidates:
+        if used <= max_bytes:
+            break
+        with cache_lock(candidate.image_fpath):
+            for fpath in candidate.all_fpaths:
+                with contextlib.suppress(FileNotFoundError):
+                    os.remove(fpath)
+        for blob in find_orphan_blobs(image_dir):
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(blob)
+        usage.forget(candidate.image_fpath)
+        logger.info("evicted %s from the cloud-image cache", candidate.image_fpath)
+        evicted.append(candidate)
+        used = cache_usage_bytes(image_dir)
+    if used > max_bytes:
+        logger.warning(
+            "cloud-image cache uses %d bytes, over its %d byte quota; "
+            "everything left is protected",
+            used,
+            max_bytes,
+        )
+    return evicted
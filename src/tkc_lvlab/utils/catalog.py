@@ -53,6 +53,9 @@ class ImageEntry:  # pylint: disable=too-many-instance-attributes
 
     Attributes:
         image_url: Direct URL to the qcow2 cloud image.
+        mirrors: Base URLs of other directories publishing the same image
+            file. Downloads race them and fail over between them; the
+            checksum still comes from ``checksum_url`` alone.
         checksum_url: URL to the checksum manifest, or ``None`` for an
             unverified custom image.
         checksum_type: Hash algorithm — ``sha256`` or ``sha512`` — or
@@ -80,6 +83,7 @@ class ImageEntry:  # pylint: disable=too-many-instance-attributes
     os_variant: str
     default_username: str
     username_explicit: bool = False
+    mirrors: tuple[str, ...] = ()
 
 
 def _family_token(key: str) -> str:
@@ -238,6 +242,7 @@ def build_image_entry(key: str, cfg: dict[str, Any]) -> ImageEntry:
         os_variant=derive_os_variant(key, cfg.get("os_variant")),
         default_username=derive_username(key, cfg.get("username")),
         username_explicit=bool(cfg.get("username")),
+        mirrors=tuple(cfg.get("mirrors") or ()),
     )
 
 
@@ -15,6 +15,11 @@ keyring used to verify that manifest. Verification is two-layered:
     manifest. Both Fedora's ``SHA256 (file) = hash`` and Debian's
     ``hash  file`` formats are recognized.
 
+The image hash is computed while the bytes stream in (a resumed download
+re-hashes only the ``.partial`` prefix already on disk) and persisted to
+``<image>.digest``, so verifying a freshly downloaded image is a string
+compare rather than a second full read of a multi-GB file.
+
 Debian's ``SHA512SUMS`` file uses the same filename across releases, so
 when the image's filename matches the Debian pattern (``debian-N-...``)
 the on-disk checksum filename is prefixed with the image's own basename
@@ -23,23 +28,35 @@ to prevent a Debian 11 ``SHA512SUMS`` from clobbering Debian 12's.
 
 from __future__ import annotations
 
+import contextlib
+import copy
+import fcntl
 import hashlib
 import json
 import os
 import re
+import shutil
 import subprocess
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
-from typing import Any, Callable
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Iterable, Iterator
 from urllib.parse import urlparse
 
 import gnupg
 import requests
+import urllib3.exceptions
 from tqdm import tqdm
 
 from .._logging import get_logger
 from ..exceptions import ImageError
 from .catalog import derive_os_variant, derive_username
+from .http_client import DownloadClient
+from .mirrors import MirrorStats, mirror_urls, rank_mirrors
+from .rate_limit import ByteBudget
+from .vdisk import disk_header
 
 logger = get_logger(__name__)
 
@@ -51,6 +68,57 @@ ProgressCallback = Callable[[int, int], None]
 
 VERIFIED_SUFFIX = ".verified"
 
+#: Sidecar recording the image digest computed during download. Its
+#: ``<image>.`` prefix groups it with the image for ``lvlab images clean``.
+DIGEST_SUFFIX = ".digest"
+
+#: Sidecar recording the upstream validators (``ETag`` / ``Last-Modified`` /
+#: ``Content-Length``) an image was downloaded with, so ``lvlab images
+#: refresh`` can ask the mirror whether it changed without re-downloading.
+REMOTE_SUFFIX = ".remote"
+
+#: Hidden cache subdirectory a refresh downloads and verifies into before the
+#: new files are swapped in. ``lvlab images clean`` only considers files.
+_REFRESH_STAGING_DIR = ".refresh"
+
+#: Hidden cache subdirectory holding the per-file advisory lock files (see
+#: :func:`cache_lock`). Lock files are never deleted: removing one while a
+#: process holds it would let the next process lock a fresh inode.
+_LOCK_DIR = ".locks"
+# How often a process waiting on another one's lock re-tries it.
+_LOCK_POLL_SECONDS = 0.25
+
+#: ``config_defaults`` key selecting the content-addressed cache layout (see
+#: :meth:`CloudImage.intern`).
+CONTENT_ADDRESSED_FLAG = "content_addressed_cache"
+
+#: Hidden cache subdirectory of the content-addressed layout: each image's
+#: bytes live once, as ``.blobs/<algorithm>/<hex digest>``, and the usual
+#: ``image_fpath`` names are hard links (or symlinks) to them.
+_BLOB_DIR = ".blobs"
+_HEX_DIGEST = re.compile(r"[0-9a-f]+")
+
+#: Default number of concurrent upstream checks for ``lvlab images refresh``.
+DEFAULT_REFRESH_CHECK_JOBS = 8
+
+#: Default number of concurrent header probes when scanning the VM disks for
+#: backing files (see :func:`backing_users`).
+DEFAULT_BACKING_SCAN_JOBS = 8
+# Hidden cache subdirectory holding the backing-file scan results.
+_BACKING_SCAN_DIR = ".scan"
+_BACKING_SCAN_FILE = "backing.json"
+
+#: Algorithms accepted for ``checksum_type``.
+HASH_ALGORITHMS: dict[str, Callable[[], Any]] = {
+    "sha256": hashlib.sha256,
+    "sha512": hashlib.sha512,
+}
+
+#: Default read buffer for hashing a file from disk. Hashing reads into one
+#: reusable buffer of this size, so peak memory is independent of image size.
+#: Override per manifest with ``config_defaults.checksum_buffer_bytes``.
+DEFAULT_HASH_BUFFER_BYTES = 1024 * 1024
+
 #: Default lvlab base directory used when the manifest's ``config_defaults``
 #: omits ``cloud_image_basedir`` / ``disk_image_basedir``. The cloud-image
 #: cache lands at ``<basedir>/cloud-images`` and per-VM disks under
@@ -76,6 +144,30 @@ _MAX_ATTEMPTS = 3
 _RETRY_BACKOFF_SECONDS = (0, 5, 10, 20)
 _PARTIAL_SUFFIX = ".partial"
 
+# Segmented downloads (see ``_SegmentedDownload``). An image is split into
+# ``download_segments`` byte ranges fetched concurrently straight into a
+# preallocated ``.partial``; ``<partial>.segments`` records each range's
+# progress so a retry (or the next run) resumes every range where it
+# stopped.
+_SEGMENT_STATE_SUFFIX = ".segments"
+#: Default number of concurrent byte ranges for an image download
+#: (``config_defaults.download_segments``; ``1`` disables splitting).
+DEFAULT_DOWNLOAD_SEGMENTS = 4
+# Files smaller than this many bytes per segment are fetched in one stream.
+_MIN_SEGMENT_BYTES = 16 * 1024 * 1024
+# Persist segment progress after roughly this many new bytes per range.
+_SEGMENT_CHECKPOINT_BYTES = 4 * 1024 * 1024
+
+# Body read sizing (see ``_iter_body``). Reads start at the floor and double
+# while a full read returns well inside the target time, halving again when
+# a read runs long, so a fast mirror is drained in few large syscalls and a
+# slow one still reports progress (and checkpoints) regularly.
+_MIN_CHUNK_BYTES = 1024 * 1024
+_MAX_CHUNK_BYTES = 8 * 1024 * 1024
+_CHUNK_TARGET_SECONDS = 0.25
+# Minimum spacing between progress-callback invocations.
+_PROGRESS_INTERVAL_SECONDS = 0.1
+
 # Transient transport-layer failures worth retrying. A genuine HTTP error
 # (404/403) surfaces via ``raise_for_status`` as ``requests.HTTPError``, which
 # is deliberately NOT in this tuple — those fail fast with no retry. A
@@ -104,6 +196,13 @@ class CloudImage:  # pylint: disable=too-many-instance-attributes
         network_version: cloud-init network-config schema version
             (``1`` ENI-style or ``2`` netplan-style). Selects the
             Jinja template at render time.
+        mirrors: Base URLs of other directories publishing the same image
+            file (``mirrors:``); the download picks the fastest and fails
+            over between them (see :mod:`tkc_lvlab.utils.mirrors`).
+        content_addressed: Whether the cache uses the content-addressed
+            layout (``config_defaults.content_addressed_cache``).
+        blob_dir: Root of the content-addressed blob store
+            (``<image_dir>/.blobs``).
         filename: Basename of the image, derived from ``image_url``.
         image_dir: Directory where images are cached on disk
             (``<cloud_image_basedir>/cloud-images``).
@@ -127,13 +226,19 @@ class CloudImage:  # pylint: disable=too-many-instance-attributes
             name: Manifest-side key for the image (used by callers when
                 logging or composing per-image cache subdirectories).
             config: One entry from the manifest's ``images`` dict. Honors
-                ``image_url``, ``checksum_url``, ``checksum_type``,
-                ``checksum_url_gpg``, and ``network_version``.
+                ``image_url``, ``mirrors``, ``checksum_url``,
+                ``checksum_type``, ``checksum_url_gpg``, and
+                ``network_version``.
             environment: The manifest's ``environment[0]`` dict. Unused
                 in the current implementation but kept in the signature
                 so callers in cli.py can pass it without a special case.
             config_defaults: The manifest's ``config_defaults`` dict.
-                Honors ``cloud_image_basedir`` (defaults to
+                Honors ``checksum_buffer_bytes`` (read buffer when hashing
+                an image, default :data:`DEFAULT_HASH_BUFFER_BYTES`),
+                ``download_segments`` (concurrent byte ranges per image
+                download, default :data:`DEFAULT_DOWNLOAD_SEGMENTS`),
+                ``content_addressed_cache`` (default ``False``) and
+                ``cloud_image_basedir`` (defaults to
                 ``/var/lib/libvirt/images/lvlab``). The actual cache
                 directory is conventionally
                 ``<cloud_image_basedir>/cloud-images/`` — but if the
@@ -146,10 +251,18 @@ class CloudImage:  # pylint: disable=too-many-instance-attributes
         """
         self.name = name
         self.image_url = config.get("image_url", None)
+        self.mirrors = list(config.get("mirrors") or [])
         self.checksum_url = config.get("checksum_url", None)
         self.checksum_type = config.get("checksum_type", None)
         self.checksum_url_gpg = config.get("checksum_url_gpg", None)
         self.network_version = config.get("network_version", 1)
+        self.checksum_buffer_bytes = int(
+            config_defaults.get("checksum_buffer_bytes", DEFAULT_HASH_BUFFER_BYTES)
+        )
+        self.download_segments = parse_download_segments(config_defaults)
+        self.content_addressed = bool(
+            config_defaults.get(CONTENT_ADDRESSED_FLAG, False)
+        )
         # Shared image-entry resolution (see utils/catalog): derived from
         # the image key, override via the entry's os_variant/username.
         # Both deploy paths read these so a manifest image resolves its
@@ -175,6 +288,9 @@ class CloudImage:  # pylint: disable=too-many-instance-attributes
         self.image_fpath = os.path.join(
             os.path.expanduser(self.image_dir), self.filename
         )
+        # Not derived from image_dir later: a refresh's staged copy (see
+        # _staged) must intern into the real cache's store.
+        self.blob_dir = os.path.join(os.path.expanduser(self.image_dir), _BLOB_DIR)
 
         if self.checksum_url:
             # Always prefix the local checksum filename with the image
@@ -231,6 +347,9 @@ class CloudImage:  # pylint: disable=too-many-instance-attributes
         partial_path: str,
         *,
         progress_callback: "ProgressCallback | None" = None,
+        hasher: Any = None,
+        client: DownloadClient | None = None,
+        remote: dict[str, Any] | None = None,
     ) -> bool:
         """Stream ``url`` into ``<destination>.partial``, resuming when possible.
 
@@ -250,6 +369,14 @@ class CloudImage:  # pylint: disable=too-many-instance-attributes
                 it replaces the built-in ``tqdm`` bar so callers (``lvlab
                 init``) can drive their own display; when ``None`` the ``tqdm``
                 bar is used (issue #104).
+            hasher: Optional fresh :mod:`hashlib` object. Every byte that ends
+                up in the partial is fed to it — on a resume, the existing
+                prefix is hashed from disk first — so on a ``True`` return
+                it holds the digest of the whole file.
+            client: Pooled :class:`DownloadClient` to fetch through; ``None``
+                uses module-level ``requests``.
+            remote: Optional dict updated with the response's validators
+                (see :func:`_remote_meta`).
 
         Returns:
             ``True`` when the partial is complete (advertised length matched the
@@ -269,9 +396,10 @@ class CloudImage:  # pylint: disable=too-many-instance-attributes
         if already:
             headers["Range"] = f"bytes={already}-"
 
-        response = requests.get(
+        response = (client or requests).get(
             url, stream=True, timeout=_DOWNLOAD_TIMEOUT, headers=headers
         )
+        budget = client.budget() if client is not None else None
 
         # HTTP 416 (Range Not Satisfiable) on a resume means our ``.partial``
         # is stale or longer than the resource — its byte count starts past
@@ -286,6 +414,8 @@ class CloudImage:  # pylint: disable=too-many-instance-attributes
             return False
 
         response.raise_for_status()
+        if remote is not None:
+            remote.update(_remote_meta(response))
 
         # ``Content-Encoding`` (gzip/deflate/br) transforms the body in
         # transit: requests writes DECODED bytes, while Content-Length and
@@ -313,6 +443,9 @@ class CloudImage:  # pylint: disable=too-many-instance-attributes
         resuming = bool(already) and response.status_code == 206 and not content_encoded
         if not resuming:
             already = 0
+        elif hasher is not None:
+            with open(partial_path, "rb") as prefix_file:
+                _hash_stream(hasher, prefix_file, limit=already)
 
         if content_encoded:
             # Can't trust Content-Length for an encoded body; rely on the
@@ -324,17 +457,20 @@ class CloudImage:  # pylint: disable=too-many-instance-attributes
             # the full expected size is the resume offset plus what's left.
             total_size = content_length + already if content_length else 0
 
-        block_size = 1024
         mode = "ab" if resuming else "wb"
         if progress_callback is not None:
             # Caller drives its own display (issue #104) — report monotonic
             # byte progress instead of owning a tqdm bar.
             done = already
+            progress = _ThrottledProgress(progress_callback)
             with open(partial_path, mode) as file:
-                for data in response.iter_content(block_size):
+                for data in _iter_body(response, budget=budget):
                     file.write(data)
+                    if hasher is not None:
+                        hasher.update(data)
                     done += len(data)
-                    progress_callback(done, total_size)
+                    progress(done, total_size)
+            progress.flush()
         else:
             with tqdm(
                 total=total_size,
@@ -343,9 +479,11 @@ class CloudImage:  # pylint: disable=too-many-instance-attributes
                 unit_scale=True,
             ) as progress_bar:
                 with open(partial_path, mode) as file:
-                    for data in response.iter_content(block_size):
+                    for data in _iter_body(response, budget=budget):
                         progress_bar.update(len(data))
                         file.write(data)
+                        if hasher is not None:
+                            hasher.update(data)
 
         if total_size and os.path.getsize(partial_path) != total_size:
             return False
@@ -359,6 +497,12 @@ class CloudImage:  # pylint: disable=too-many-instance-attributes
         destination: str,
         *,
         progress_callback: "ProgressCallback | None" = None,
+        hash_name: str | None = None,
+        segments: int = 1,
+        client: DownloadClient | None = None,
+        record_remote: bool = False,
+        sources: list[str] | None = None,
+        mirror_stats: MirrorStats | None = None,
     ) -> bool:
         """Download a URL to a local file, tolerant of transient mirror failures.
 
@@ -371,6 +515,12 @@ class CloudImage:  # pylint: disable=too-many-instance-attributes
         never left at the final path. Genuine HTTP errors (404/403, connection
         refused) fail fast with no retry.
 
+        With several ``sources`` (mirrors of ``url``), each attempt walks
+        them in order: a failed transfer resumes the same partial from the
+        next source straight away, the backoff only applies once every
+        source has failed, and a source with a fatal error is dropped
+        (fatal overall only when it was the last one).
+
         This is an intentional, documented divergence from lvscripts-py's
         simpler urllib download (ref #87) — see the module-level constants;
         because lvscripts already uses a ``.partial`` strategy, this narrows
@@ -381,6 +531,24 @@ class CloudImage:  # pylint: disable=too-many-instance-attributes
             destination: Local filesystem path to write to on success.
             progress_callback: Optional ``callback(bytes_done, total)`` passed
                 through to :meth:`_stream_to_partial` (issue #104).
+            hash_name: A :data:`HASH_ALGORITHMS` key. When set, the file is
+                hashed as it streams in and the digest is written to
+                ``<destination>.digest`` (see :func:`write_digest`).
+            segments: Fetch up to this many byte ranges concurrently when the
+                server supports ranges and the file is large enough (see
+                :class:`_SegmentedDownload`); otherwise, and always for
+                ``1``, a single stream is used.
+            client: Pooled :class:`DownloadClient` shared with the caller's
+                other downloads (keep-alive across files and workers).
+            record_remote: Write the server's validators for the completed
+                file to ``<destination>.remote`` (see
+                :func:`write_remote_record`). Skipped when a mirror other
+                than ``url`` served it, as its validators are not ``url``'s.
+            sources: URLs to fetch from, preferred first (see
+                :func:`~tkc_lvlab.utils.mirrors.rank_mirrors`); defaults to
+                ``[url]``.
+            mirror_stats: Records the throughput of a complete fresh
+                transfer against the source that served it.
 
         Returns:
             ``True`` on a complete, verified-length write. ``False`` if every
@@ -394,6 +562,10 @@ class CloudImage:  # pylint: disable=too-many-instance-attributes
         """
         logger.info("downloading to: %s", destination)
         partial_path = destination + _PARTIAL_SUFFIX
+        sources = list(sources or [url])
+        # Mirrors serve the same bytes under their own ETags, so resuming
+        # segments fetched from another mirror can only check the length.
+        match_validator = len(sources) == 1
 
         last_exc: Exception | None = None
         for attempt in range(1, _MAX_ATTEMPTS + 1):
@@ -409,26 +581,83 @@ class CloudImage:  # pylint: disable=too-many-instance-attributes
                 )
                 time.sleep(backoff)
 
-            try:
-                if cls._stream_to_partial(
-                    url, partial_path, progress_callback=progress_callback
-                ):
-                    os.replace(partial_path, destination)
-                    return True
-                # Incomplete transfer (content-length mismatch). Treat like a
-                # transient failure: keep the partial and retry with Range.
-                last_exc = RuntimeError("incomplete transfer (content-length mismatch)")
-            except requests.HTTPError:
-                # Genuine HTTP status error (404/403/...). Fail fast — no point
-                # retrying, and don't leave a half-written/error-body partial.
-                if os.path.exists(partial_path):
-                    os.remove(partial_path)
-                raise
-            except requests.exceptions.RequestException as exc:
-                if not cls._is_transient(exc):
-                    # e.g. connection refused — nothing to retry against.
+            for source in list(sources):
+                if last_exc is not None and len(sources) > 1:
+                    logger.warning("continuing %s from %s", destination, source)
+                # A fresh hasher per attempt: a resume re-hashes the prefix on
+                # disk, a restart starts over, so the digest always matches the
+                # bytes in the partial.
+                hasher = HASH_ALGORITHMS[hash_name]() if hash_name else None
+                remote: dict[str, Any] = {}
+                fresh = not os.path.exists(partial_path)
+                started = time.monotonic()
+                try:
+                    complete = None
+                    if segments > 1:
+                        complete = _SegmentedDownload(
+                            source,
+                            partial_path,
+                            segments,
+                            client=client,
+                            match_validator=match_validator,
+                        ).run(
+                            progress_callback=progress_callback,
+                            hasher=hasher,
+                            remote=remote,
+                        )
+                    else:
+                        _discard_segment_state(partial_path)
+                    if complete is None:
+                        complete = cls._stream_to_partial(
+                            source,
+                            partial_path,
+                            progress_callback=progress_callback,
+                            hasher=hasher,
+                            client=client,
+                            remote=remote,
+                        )
+                    if complete:
+                        os.replace(partial_path, destination)
+                        if hasher is not None:
+                            write_digest(destination, hash_name, hasher.hexdigest())
+                        if record_remote and source == url:
+                            write_remote_record(destination, url, remote)
+                        if mirror_stats is not None and fresh:
+                            elapsed = max(time.monotonic() - started, 1e-6)
+                            mirror_stats.record(
+                                source, os.path.getsize(destination) / elapsed
+                            )
+                        return True
+                    # Incomplete transfer (content-length mismatch). Treat like
+                    # a transient failure: keep the partial and retry with Range.
+                    last_exc = RuntimeError(
+                        "incomplete transfer (content-length mismatch)"
+                    )
+                except requests.HTTPError as exc:
+                    if len(sources) > 1:
+                        # This mirror lacks the file; the partial from the
+                        # others is still good.
+                        logger.warning("dropping source %s: %s", source, exc)
+                        sources.remove(source)
+                        last_exc = exc
+                        continue
+                    # Genuine HTTP status error (404/403/...). Fail fast — no
+                    # point retrying, and don't leave a half-written/error-body
+                    # partial.
+                    _discard_segment_state(partial_path)
+                    if os.path.exists(partial_path):
+                        os.remove(partial_path)
                     raise
-                last_exc = exc
+                except requests.exceptions.RequestException as exc:
+                    if not cls._is_transient(exc):
+                        # e.g. connection refused — nothing to retry against.
+                        if len(sources) > 1:
+                            logger.warning("dropping source %s: %s", source, exc)
+                            sources.remove(source)
+                            last_exc = exc
+                            continue
+                        raise
+                    last_exc = exc
 
         logger.error(
             "download of %s failed after %d attempts: %s",
@@ -450,6 +679,12 @@ class CloudImage:  # pylint: disable=too-many-instance-attributes
         destination: str,
         *,
         progress_callback: "ProgressCallback | None" = None,
+        hash_name: str | None = None,
+        segments: int = 1,
+        client: DownloadClient | None = None,
+        record_remote: bool = False,
+        sources: list[str] | None = None,
+        mirror_stats: MirrorStats | None = None,
     ) -> bool:
         """Download ``url`` to ``destination``, raising a clean ImageError on failure.
 
@@ -464,6 +699,12 @@ class CloudImage:  # pylint: disable=too-many-instance-attributes
         Args:
             url: HTTP(S) URL to download.
             destination: Local filesystem path to write to on success.
+            hash_name: Passed through to :meth:`_download_file`.
+            segments: Passed through to :meth:`_download_file`.
+            client: Passed through to :meth:`_download_file`.
+            record_remote: Passed through to :meth:`_download_file`.
+            sources: Passed through to :meth:`_download_file`.
+            mirror_stats: Passed through to :meth:`_download_file`.
 
         Returns:
             ``True`` on a complete write; ``False`` on a content-length
@@ -474,14 +715,25 @@ class CloudImage:  # pylint: disable=too-many-instance-attributes
         """
         try:
             return cls._download_file(
-                url, destination, progress_callback=progress_callback
+                url,
+                destination,
+                progress_callback=progress_callback,
+                hash_name=hash_name,
+                segments=segments,
+                client=client,
+                record_remote=record_remote,
+                sources=sources,
+                mirror_stats=mirror_stats,
             )
         except requests.RequestException as exc:
             response = getattr(exc, "response", None)
             status = getattr(response, "status_code", None)
             reason = f"HTTP {status}" if status else exc.__class__.__name__
+            where = url
+            if sources and len(sources) > 1:
+                where = f"{url} or its {len(sources) - 1} mirror(s)"
             raise ImageError(
-                f"Could not download {url} ({reason}). You can place the file "
+                f"Could not download {where} ({reason}). You can place the file "
                 f"manually at {destination} and re-run."
             ) from exc
 
@@ -497,28 +749,84 @@ class CloudImage:  # pylint: disable=too-many-instance-attributes
             os.makedirs(image_dir, exist_ok=True)
 
     def download_image(
-        self, *, progress_callback: "ProgressCallback | None" = None
+        self,
+        *,
+        progress_callback: "ProgressCallback | None" = None,
+        client: DownloadClient | None = None,
     ) -> bool:
         """Download the cloud image to :attr:`image_fpath`.
 
         Creates the cache directory if needed. Returns ``True`` on
-        successful download, ``False`` on content-length mismatch.
+        successful download, ``False`` on content-length mismatch. When a
+        checksum is configured, the image is hashed as it downloads and the
+        digest is persisted for :meth:`checksum_verify_image`. Large images
+        from range-capable servers are fetched as
+        :attr:`download_segments` concurrent byte ranges. With
+        :attr:`mirrors`, the fastest source is used and a failed transfer
+        resumes from the next one. The server's validators are recorded for
+        :meth:`check_upstream` when ``image_url`` itself served the file.
+
+        In the :attr:`content_addressed` layout the checksum manifest is
+        fetched first (when not cached) so an image whose bytes are already
+        in the blob store is linked instead of downloaded (see
+        :meth:`link_from_store`); a fresh download is then interned
+        (:meth:`intern`).
 
         Args:
             progress_callback: Optional ``callback(bytes_done, total)`` for
                 progress reporting (issue #104).
+            client: Pooled :class:`DownloadClient` shared across downloads.
 
         Raises:
             ImageError: The download failed with a transport or HTTP error.
         """
         self._manage_image_dir()
-        return self._download_or_raise(
-            self.image_url, self.image_fpath, progress_callback=progress_callback
+        if self.content_addressed:
+            if self.checksum_url and not self.exists_locally("checksum"):
+                try:
+                    self.download_checksum(client=client)
+                except ImageError as exc:
+                    # Only an optimisation here; the caller fetches it again.
+                    logger.debug("early checksum fetch failed: %s", exc)
+            if self.link_from_store():
+                return True
+            hash_name: str | None = self._blob_algorithm()
+        else:
+            hash_name = (
+                self.checksum_type
+                if self.checksum_url and self.checksum_type in HASH_ALGORITHMS
+                else None
+            )
+        sources: list[str] = []
+        mirror_stats = None
+        if self.mirrors:
+            mirror_stats = MirrorStats.for_image_dir(self.image_dir)
+            sources = rank_mirrors(
+                mirror_urls(self.image_url, self.mirrors),
+                stats=mirror_stats,
+                client=client,
+            )
+        complete = self._download_or_raise(
+            self.image_url,
+            self.image_fpath,
+            progress_callback=progress_callback,
+            hash_name=hash_name,
+            segments=self.download_segments,
+            client=client,
+            record_remote=True,
+            sources=sources,
+            mirror_stats=mirror_stats,
         )
+        if complete and self.content_addressed:
+            self.intern()
+        return complete
 
-    def download_checksum(self) -> bool:
+    def download_checksum(self, *, client: DownloadClient | None = None) -> bool:
         """Download the checksum manifest to :attr:`checksum_fpath`.
 
+        Args:
+            client: Pooled :class:`DownloadClient` shared across downloads.
+
         Returns:
             ``True`` on successful download, ``False`` on content-length
             mismatch.
@@ -526,11 +834,16 @@ class CloudImage:  # pylint: disable=too-many-instance-attributes
         Raises:
             ImageError: The download failed with a transport or HTTP error.
         """
-        return self._download_or_raise(self.checksum_url, self.checksum_fpath)
+        return self._download_or_raise(
+            self.checksum_url, self.checksum_fpath, client=client
+        )
 
-    def download_checksum_gpg(self) -> bool:
+    def download_checksum_gpg(self, *, client: DownloadClient | None = None) -> bool:
         """Download the GPG keyring to :attr:`checksum_gpg_fpath`.
 
+        Args:
+            client: Pooled :class:`DownloadClient` shared across downloads.
+
         Returns:
             ``True`` on successful download, ``False`` on content-length
             mismatch.
@@ -538,7 +851,11 @@ class CloudImage:  # pylint: disable=too-many-instance-attributes
         Raises:
             ImageError: The download failed with a transport or HTTP error.
         """
-        return self._download_or_raise(self.checksum_url_gpg, self.checksum_gpg_fpath)
+        # Several images can share one keyring, so it has its own lock.
+        with cache_lock(os.path.expanduser(self.checksum_gpg_fpath)):
+            return self._download_or_raise(
+                self.checksum_url_gpg, self.checksum_gpg_fpath, client=client
+            )
 
     def exists_locally(self, file_type: str = "image") -> bool:
         """Check whether one of the on-disk artifacts is already cached.
@@ -657,11 +974,14 @@ class CloudImage:  # pylint: disable=too-many-instance-attributes
         return checksums
 
     def checksum_verify_image(self) -> bool:
-        """Hash the on-disk image and compare to the manifest entry.
+        """Compare the on-disk image's hash to the manifest entry.
 
         Uses the configured :attr:`checksum_type` (``sha256`` /
         ``sha512``) and prefers the ``.verified`` sidecar when one
-        exists.
+        exists. When the download recorded a digest for the image as it
+        is on disk now (see :func:`read_digest`), that digest is compared
+        directly; otherwise the image is read back and hashed in
+        :attr:`checksum_buffer_bytes` blocks (see :func:`hash_file`).
 
         Returns:
             ``True`` when the computed hash matches the manifest entry
@@ -673,16 +993,12 @@ class CloudImage:  # pylint: disable=too-many-instance-attributes
                 unsupported algorithm. Kept as a hard-fail to avoid
                 silently skipping verification.
         """
-        hash_algorithms = {"sha256": hashlib.sha256, "sha512": hashlib.sha512}
-
         if self.checksum_type is None:
             raise SystemExit(
                 "Please configure a checksum_type if you configure a checksume_url for an image."
             )
 
-        if self.checksum_type in hash_algorithms:
-            sha = hash_algorithms[self.checksum_type]()
-        else:
+        if self.checksum_type not in HASH_ALGORITHMS:
             raise SystemExit(f"Unsupported checksum algorithm {self.checksum_type}")
 
         checksum_fpath = self.checksum_fpath
@@ -693,15 +1009,1221 @@ class CloudImage:  # pylint: disable=too-many-instance-attributes
             checksums = self._parse_checksum_file(checksum_fpath)
             expected_checksum = checksums.get(os.path.basename(self.image_fpath))
 
-            with open(self.image_fpath, "rb") as verify_file:
-                sha.update(verify_file.read())
-                caclulated_checksum = sha.hexdigest()
+            calculated_checksum = read_digest(self.image_fpath, self.checksum_type)
+            if calculated_checksum is None:
+                calculated_checksum = hash_file(
+                    self.image_fpath,
+                    self.checksum_type,
+                    buffer_size=self.checksum_buffer_bytes,
+                )
 
-            if caclulated_checksum == expected_checksum:
+            if calculated_checksum == expected_checksum:
+                write_digest(
+                    self.image_fpath,
+                    self.checksum_type,
+                    calculated_checksum,
+                    verified_against=self._verification_sources(),
+                )
                 return True
 
         return False
 
+    def _verification_sources(self) -> dict[str, str | None]:
+        """SHA-256 of every file a verification of this image trusts.
+
+        The raw checksum manifest, its GPG ``.verified`` plaintext and the
+        keyring. Any of them changing (a re-downloaded manifest, a new
+        key) invalidates a recorded verification.
+        """
+        checksum_fpath = self.checksum_fpath
+        return {
+            "checksum": _small_file_sha256(checksum_fpath),
+            "verified": _small_file_sha256(
+                checksum_fpath + VERIFIED_SUFFIX if checksum_fpath else None
+            ),
+            "keyring": _small_file_sha256(self.checksum_gpg_fpath),
+        }
+
+    def is_verified(self) -> bool:
+        """Whether a previous verification of the cached image still holds.
+
+        True when the ``.digest`` record says the image — same size,
+        ``st_mtime_ns`` and inode — already matched the checksum manifest,
+        and the manifest, ``.verified`` plaintext and keyring it was
+        checked against are byte-for-byte unchanged. Callers use it to skip
+        both GPG and hash verification of an image they have verified
+        before; it never reads the image itself.
+
+        Returns:
+            ``False`` when no checksum is configured, nothing was recorded,
+            or anything involved changed since.
+        """
+        if not self.checksum_url or self.checksum_type not in HASH_ALGORITHMS:
+            return False
+        record = _read_digest_record(self.image_fpath, self.checksum_type)
+        if record is None or "verified_against" not in record:
+            return False
+        return record["verified_against"] == self._verification_sources()
+
+    def pending_download_bytes(
+        self, *, client: DownloadClient | None = None
+    ) -> int | None:
+        """Bytes of the image file a download would still have to fetch.
+
+        ``0`` for a cached image. Otherwise one ``HEAD`` for the upstream
+        length, less whatever an interrupted download left in ``.partial``.
+
+        Args:
+            client: Pooled :class:`DownloadClient` shared across probes.
+
+        Returns:
+            The byte count, or ``None`` when the server would not say.
+        """
+        if self.exists_locally("image"):
+            return 0
+        try:
+            response = (client or requests).head(
+                self.image_url,
+                allow_redirects=True,
+                timeout=_DOWNLOAD_TIMEOUT,
+                headers={"Accept-Encoding": "identity"},
+            )
+            length = int(response.headers["content-length"])
+        except (requests.exceptions.RequestException, KeyError, ValueError) as exc:
+            logger.debug("size probe of %s failed: %s", self.image_url, exc)
+            return None
+        if response.status_code != 200:
+            return None
+        partial_path = os.path.expanduser(self.image_fpath) + _PARTIAL_SUFFIX
+        if os.path.exists(partial_path):
+            length -= min(length, os.path.getsize(partial_path))
+        return length
+
+    def _blob_algorithm(self) -> str:
+        """Algorithm naming this image's blob: its checksum's, else SHA-256."""
+        if self.checksum_url and self.checksum_type in HASH_ALGORITHMS:
+            return self.checksum_type
+        return "sha256"
+
+    def blob_fpath(self, digest: str) -> str:
+        """Path of the content-addressed blob holding the bytes with ``digest``."""
+        return os.path.join(self.blob_dir, self._blob_algorithm(), digest)
+
+    def link_from_store(self) -> bool:
+        """Link :attr:`image_fpath` to a stored blob instead of downloading it.
+
+        Looks the image up in the cached checksum manifest and, when the blob
+        with that digest already exists (another manifest entry, or an older
+        alias, fetched the same bytes), points :attr:`image_fpath` at it and
+        records the digest. Blobs are only ever named by :meth:`intern` from
+        their hashed contents, so the later verification against the manifest
+        holds without reading the image.
+
+        Returns:
+            ``True`` when the image is now in place; ``False`` when there is
+            no cached manifest entry or no matching blob.
+        """
+        if not self.checksum_url or self.checksum_type not in HASH_ALGORITHMS:
+            return False
+        if not os.path.isfile(self.checksum_fpath):
+            return False
+        digest = self._parse_checksum_file(self.checksum_fpath).get(self.filename)
+        if digest is None or not _HEX_DIGEST.fullmatch(digest):
+            return False
+        blob = self.blob_fpath(digest)
+        if not os.path.isfile(blob):
+            return False
+        _link_alias(blob, self.image_fpath)
+        write_digest(self.image_fpath, self.checksum_type, digest)
+        logger.info("CloudImage %s linked from stored blob %s", self.name, blob)
+        return True
+
+    def intern(self) -> str:
+        """Move the cached image into the blob store, leaving its name as an alias.
+
+        The blob is a hard link of :attr:`image_fpath`, so the image keeps
+        its path (``VirtualDisk`` backing chains and ``qemu-img`` see no
+        difference) and its ``.digest`` / ``.remote`` records stay valid.
+        When a blob with the same digest is already stored, the alias is
+        repointed at it and the duplicate bytes are released. Where hard
+        links are unsupported the bytes move into the store and the alias
+        becomes a symlink.
+
+        Returns:
+            The blob's path.
+        """
+        algorithm = self._blob_algorithm()
+        digest = read_digest(self.image_fpath, algorithm)
+        if digest is None:
+            digest = hash_file(
+                self.image_fpath, algorithm, buffer_size=self.checksum_buffer_bytes
+            )
+            write_digest(self.image_fpath, algorithm, digest)
+        blob = self.blob_fpath(digest)
+        os.makedirs(os.path.dirname(blob), exist_ok=True)
+        try:
+            os.link(self.image_fpath, blob)
+            return blob
+        except FileExistsError:
+            pass
+        except OSError as exc:
+            logger.debug("hard link into %s failed (%s); using a symlink", blob, exc)
+            os.replace(self.image_fpath, blob)
+            os.symlink(blob, self.image_fpath)
+            return blob
+        if not os.path.samefile(blob, self.image_fpath):
+            # Same bytes stored under another alias already: share them. The
+            # records name the inode, so they are re-written for the new one.
+            digest_record = _read_digest_record(self.image_fpath, algorithm) or {}
+            remote_record = read_remote_record(self.image_fpath, self.image_url)
+            _link_alias(blob, self.image_fpath)
+            write_digest(
+                self.image_fpath,
+                algorithm,
+                digest,
+                verified_against=digest_record.get("verified_against"),
+            )
+            if remote_record is not None:
+                write_remote_record(self.image_fpath, self.image_url, remote_record)
+        return blob
+
+    def locked(
+        self, *, on_wait: Callable[[float], None] | None = None
+    ) -> contextlib.AbstractContextManager[float]:
+        """Hold this image's cross-process cache lock (see :func:`cache_lock`).
+
+        Callers wrap their whole download + verify sequence in it and check
+        :meth:`exists_locally` / :meth:`is_verified` inside, so a process
+        that had to wait reuses what the lock holder just fetched.
+
+        Args:
+            on_wait: Called with the seconds waited so far while another
+                process holds the lock.
+        """
+        return cache_lock(os.path.expanduser(self.image_fpath), on_wait=on_wait)
+
+    def check_upstream(self, *, client: DownloadClient | None = None) -> UpstreamCheck:
+        """Ask the mirror whether the cached image has changed, without fetching it.
+
+        Sends a ``HEAD`` (a streamed ``GET`` that is closed unread when the
+        server rejects ``HEAD``) carrying the recorded validators as
+        ``If-None-Match`` / ``If-Modified-Since``; a ``304`` means current.
+        Otherwise the answer's ``ETag``, then ``Last-Modified``, then length
+        is compared with the record written at download time. An image
+        cached before records existed is judged by size and by whether
+        ``Last-Modified`` is newer than the file, and — when that finds it
+        current — the answer is recorded as its baseline.
+
+        Args:
+            client: Pooled :class:`DownloadClient` shared across checks.
+
+        Returns:
+            The :class:`UpstreamCheck` for this image.
+        """
+        if not os.path.isfile(self.image_fpath):
+            return UpstreamCheck(self, "missing", "not cached; run lvlab init")
+        record = read_remote_record(self.image_fpath, self.image_url)
+        headers = {"Accept-Encoding": "identity"}
+        if record is not None:
+            if record.get("etag"):
+                headers["If-None-Match"] = record["etag"]
+            if record.get("last_modified"):
+                headers["If-Modified-Since"] = record["last_modified"]
+
+        http = client or requests
+        try:
+            response = http.head(
+                self.image_url,
+                allow_redirects=True,
+                timeout=_DOWNLOAD_TIMEOUT,
+                headers=headers,
+            )
+            if response.status_code in (405, 501):
+                response = http.get(
+                    self.image_url,
+                    stream=True,
+                    timeout=_DOWNLOAD_TIMEOUT,
+                    headers=headers,
+                )
+                response.close()
+            if response.status_code == 304:
+                return UpstreamCheck(self, "current", "not modified")
+            response.raise_for_status()
+        except requests.RequestException as exc:
+            status = getattr(getattr(exc, "response", None), "status_code", None)
+            reason = f"HTTP {status}" if status else exc.__class__.__name__
+            return UpstreamCheck(self, "error", reason)
+        return self._compare_upstream(record, _remote_meta(response))
+
+    def _compare_upstream(
+        self, record: dict[str, Any] | None, fresh: dict[str, Any]
+    ) -> UpstreamCheck:
+        """Judge ``fresh`` validators against the recorded ones (or the file)."""
+        if record is not None:
+            for key, label in (("etag", "ETag"), ("last_modified", "Last-Modified")):
+                if record.get(key) and fresh.get(key):
+                    if record[key] != fresh[key]:
+                        return UpstreamCheck(
+                            self, "changed", f"{label} {record[key]} -> {fresh[key]}"
+                        )
+                    return UpstreamCheck(self, "current", f"{label} unchanged")
+            if (
+                record.get("content_length") is not None
+                and fresh.get("content_length") is not None
+                and record["content_length"] != fresh["content_length"]
+            ):
+                return UpstreamCheck(
+                    self,
+                    "changed",
+                    f"size {record['content_length']} -> {fresh['content_length']}",
+                )
+            return UpstreamCheck(self, "unknown", "server sent no usable validators")
+
+        stat = os.stat(self.image_fpath)
+        length = fresh.get("content_length")
+        if length is not None and length != stat.st_size:
+            return UpstreamCheck(self, "changed", f"size {stat.st_size} -> {length}")
+        modified = _http_date_timestamp(fresh.get("last_modified"))
+        if modified is None:
+            return UpstreamCheck(self, "unknown", "server sent no usable validators")
+        if modified > stat.st_mtime:
+            return UpstreamCheck(
+                self, "changed", "upstream is newer than the cached copy"
+            )
+        write_remote_record(self.image_fpath, self.image_url, fresh)
+        return UpstreamCheck(self, "current", "cached copy is not older than upstream")
+
+    def refresh(
+        self,
+        *,
+        overlays: list[str] | None = None,
+        client: DownloadClient | None = None,
+        progress_callback: "ProgressCallback | None" = None,
+    ) -> None:
+        """Re-download the image and atomically swap it into the cache.
+
+        The image, checksum manifest and keyring are fetched into a hidden
+        ``.refresh/`` staging directory inside the cache and verified there
+        exactly as ``lvlab init`` would; only then is each file moved over
+        its cached counterpart with ``os.replace`` (image last but for its
+        ``.remote`` record), so a failed refresh leaves the cache untouched.
+
+        qcow2 overlays reference their backing file by path, so before
+        anything is downloaded each disk in ``overlays`` is repointed
+        (``qemu-img rebase -u``, a metadata-only change) at a hard link of
+        the current image named ``<image>.<mtime stamp>``. Those disks keep
+        reading the exact bytes they were created from; ``lvlab images
+        clean`` reaps the link once no disk uses it.
+
+        Call it while holding :meth:`locked`, having found ``overlays``
+        under the same lock, so no disk is created against the old image
+        between the scan and the swap.
+
+        Args:
+            overlays: Disks whose backing file is this image.
+            client: Pooled :class:`DownloadClient` for the downloads.
+            progress_callback: Passed to :meth:`download_image`.
+
+        Raises:
+            ImageError: An overlay could not be repointed (typically its VM
+                is running and holds the disk's write lock), a download
+                failed, or the new image did not verify.
+        """
+        self._manage_image_dir()
+        if overlays:
+            self._retain_for_overlays(overlays)
+
+        staging = os.path.join(
+            os.path.expanduser(self.image_dir), _REFRESH_STAGING_DIR, self.filename
+        )
+        shutil.rmtree(staging, ignore_errors=True)
+        staged = self._staged(staging)
+        try:
+            if not staged.download_image(
+                progress_callback=progress_callback, client=client
+            ):
+                raise ImageError(
+                    f"Refreshed download of {self.image_url} was incomplete; "
+                    f"the cached {self.filename} is unchanged."
+                )
+            # A content-addressed download already fetched the manifest.
+            fetched = (
+                not self.checksum_url_gpg
+                or staged.download_checksum_gpg(client=client)
+            ) and (
+                not self.checksum_url
+                or staged.exists_locally("checksum")
+                or staged.download_checksum(client=client)
+            )
+            if not fetched:
+                raise ImageError(
+                    f"Could not fetch the checksum files for {self.name}; "
+                    f"the cached {self.filename} is unchanged."
+                )
+            if self.checksum_url_gpg and not staged.gpg_verify_checksum_file():
+                raise ImageError(
+                    f"GPG verification of the refreshed {self.name} checksum "
+                    f"file failed; the cached {self.filename} is unchanged."
+                )
+            if self.checksum_url and not staged.checksum_verify_image():
+                raise ImageError(
+                    f"The refreshed {self.filename} does not match its checksum; "
+                    "the cached copy is unchanged."
+                )
+            self._swap_in(staged)
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+    def _staged(self, directory: str) -> "CloudImage":
+        """A copy of this image whose on-disk paths all live in ``directory``."""
+        staged = copy.copy(self)
+        staged.image_dir = directory
+        staged.image_fpath = os.path.join(directory, self.filename)
+        if self.checksum_fpath:
+            staged.checksum_fpath = os.path.join(
+                directory, os.path.basename(self.checksum_fpath)
+            )
+        if self.checksum_gpg_fpath:
+            staged.checksum_gpg_fpath = os.path.join(
+                directory, os.path.basename(self.checksum_gpg_fpath)
+            )
+        return staged
+
+    def _retain_for_overlays(self, overlays: list[str]) -> str:
+        """Hard-link the current image aside and repoint ``overlays`` at it."""
+        stat = os.stat(self.image_fpath)
+        stamp = time.strftime("%Y%m%dT%H%M%S", time.gmtime(stat.st_mtime))
+        retained = f"{self.image_fpath}.{stamp}"
+        try:
+            if not os.path.exists(retained) or not os.path.samefile(
+                retained, self.image_fpath
+            ):
+                os.link(self.image_fpath, retained)
+        except OSError as exc:
+            raise ImageError(
+                f"Could not keep the current {self.filename} for the disks "
+                f"backed by it ({exc}); it was not refreshed."
+            ) from exc
+        for overlay in overlays:
+            if not _qemu_img_rebase(overlay, retained):
+                raise ImageError(
+                    f"Could not repoint {overlay} at {retained} (is its VM "
+                    f"running?); {self.name} was not refreshed."
+                )
+            logger.info("%s now backed by %s", overlay, retained)
+        return retained
+
+    def _swap_in(self, staged: "CloudImage") -> None:
+        """Move ``staged``'s files over this image's; drop ones it lacks."""
+        moves = [
+            (staged.checksum_gpg_fpath, self.checksum_gpg_fpath),
+            (staged.checksum_fpath, self.checksum_fpath),
+        ]
+        if self.checksum_fpath:
+            moves.append(
+                (
+                    staged.checksum_fpath + VERIFIED_SUFFIX,
+                    self.checksum_fpath + VERIFIED_SUFFIX,
+                )
+            )
+        moves += [
+            (staged.image_fpath + DIGEST_SUFFIX, self.image_fpath + DIGEST_SUFFIX),
+            (staged.image_fpath, self.image_fpath),
+            (staged.image_fpath + REMOTE_SUFFIX, self.image_fpath + REMOTE_SUFFIX),
+        ]
+        for source, target in moves:
+            if not source:
+                continue
+            if os.path.exists(source):
+                os.replace(source, target)
+            elif os.path.exists(target):
+                os.remove(target)
+
+
+class _ThrottledProgress:
+    """Forward at most one :data:`ProgressCallback` call per interval.
+
+    A callback per chunk redraws the caller's display far more often than
+    anyone can read it; the latest update withheld by the throttle is
+    delivered by :meth:`flush`, so the final byte count is never lost.
+    """
+
+    def __init__(
+        self,
+        callback: ProgressCallback,
+        *,
+        interval: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._callback = callback
+        self._interval = _PROGRESS_INTERVAL_SECONDS if interval is None else interval
+        self._clock = clock
+        self._next_at = float("-inf")
+        self._pending: tuple[int, int] | None = None
+
+    def __call__(self, done: int, total: int) -> None:
+        now = self._clock()
+        if now < self._next_at:
+            self._pending = (done, total)
+            return
+        self._next_at = now + self._interval
+        self._pending = None
+        self._callback(done, total)
+
+    def flush(self) -> None:
+        """Deliver the most recent withheld update, if any."""
+        if self._pending is not None:
+            pending, self._pending = self._pending, None
+            self._callback(*pending)
+
+
+def _iter_body(
+    response: requests.Response, *, budget: ByteBudget | None = None
+) -> Iterator[bytes]:
+    """Yield the decoded body of a streamed ``response`` in adaptive chunks.
+
+    Reads straight from the urllib3 response in sizes between
+    ``_MIN_CHUNK_BYTES`` and ``_MAX_CHUNK_BYTES``: the size doubles while a
+    full read completes in under half of ``_CHUNK_TARGET_SECONDS`` and halves
+    when a read takes longer than it. urllib3 errors are translated the way
+    ``Response.iter_content`` does, so callers (and the retry loop) see the
+    same ``requests`` exceptions.
+
+    With a ``budget`` (``--limit-rate``), each read first spends its size
+    from the shared bucket and reads are capped at one bucketful; the time
+    spent waiting for bandwidth does not count against the read.
+    """
+    ceiling = _MAX_CHUNK_BYTES
+    if budget is not None:
+        ceiling = max(1, min(ceiling, budget.max_read))
+    floor = min(_MIN_CHUNK_BYTES, ceiling)
+    size = floor
+    while True:
+        if budget is not None:
+            budget.spend(size)
+        started = time.monotonic()
+        try:
+            data = response.raw.read(size, decode_content=True)
+        except urllib3.exceptions.ProtocolError as exc:
+            raise requests.exceptions.ChunkedEncodingError(exc) from exc
+        except urllib3.exceptions.DecodeError as exc:
+            raise requests.exceptions.ContentDecodingError(exc) from exc
+        except urllib3.exceptions.ReadTimeoutError as exc:
+            raise requests.exceptions.ConnectionError(exc) from exc
+        except urllib3.exceptions.SSLError as exc:
+            raise requests.exceptions.SSLError(exc) from exc
+        if not data:
+            return
+        elapsed = time.monotonic() - started
+        yield data
+        if len(data) >= size and elapsed < _CHUNK_TARGET_SECONDS / 2:
+            size = min(size * 2, ceiling)
+        elif elapsed > _CHUNK_TARGET_SECONDS:
+            size = max(size // 2, floor)
+
+
+class _StaleSegments(Exception):
+    """A range request got HTTP 416: the recorded segments no longer fit."""
+
+
+class _RangesUnsupported(Exception):
+    """The server did not honour a byte range as an identity-encoded 206."""
+
+
+def _discard_segment_state(partial_path: str) -> None:
+    """Forget a segmented download: its state file and preallocated partial."""
+    state_path = partial_path + _SEGMENT_STATE_SUFFIX
+    if os.path.exists(state_path):
+        os.remove(state_path)
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+
+
+class _SegmentedDownload:
+    """Fetch one URL as concurrent byte ranges into a preallocated ``.partial``.
+
+    :meth:`run` performs one attempt, inside :meth:`CloudImage._download_file`'s
+    retry loop:
+
+    1. ``HEAD`` the URL with ``Accept-Encoding: identity``. Splitting only
+        happens when the (redirect-resolved) server advertises
+        ``Accept-Ranges: bytes``, a length of at least ``_MIN_SEGMENT_BYTES``
+        per segment, and no ``Content-Encoding``; otherwise :meth:`run`
+        returns ``None`` and the caller streams the file normally.
+    2. Each range is fetched on its own thread and written at its offset
+        with ``os.pwrite``. ``<partial>.segments`` (JSON: length, ETag /
+        Last-Modified validator, per-range progress) is checkpointed as
+        bytes land, so a dropped range resumes from its own offset on the
+        next attempt — and a changed validator or length starts over.
+    3. The content-encoding and 416 rules of
+        :meth:`CloudImage._stream_to_partial` still apply per range: an
+        encoded or non-206 answer abandons splitting (the partial is
+        discarded and the single-stream path takes over), and a 416 discards
+        the partial so the next attempt starts fresh.
+
+    A requested digest is computed while the ranges download: the calling
+    thread hashes the contiguous completed prefix with ``os.pread`` as it
+    grows, so only bytes behind a slower range wait for it, and the
+    assembled file is never read a second time.
+
+    Args:
+        url: HTTP(S) URL to download.
+        partial_path: The ``.partial`` scratch file.
+        segments: Number of ranges for a fresh download.
+        client: Pooled :class:`DownloadClient`; ``None`` uses ``requests``.
+        match_validator: Resume recorded ranges only when the ETag /
+            Last-Modified validator matches too; off when the ranges may
+            come from several mirrors, which share only the length.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        partial_path: str,
+        segments: int,
+        *,
+        client: DownloadClient | None = None,
+        match_validator: bool = True,
+    ) -> None:
+        self.url = url
+        self.match_validator = match_validator
+        self._http = client or requests
+        # Captured on the worker thread, so every range shares its priority.
+        self._budget = client.budget() if client is not None else None
+        self.partial_path = partial_path
+        self.state_path = partial_path + _SEGMENT_STATE_SUFFIX
+        self.segments = segments
+        self.remote: dict[str, Any] = {}
+        self._lock = threading.Lock()
+        # Signalled (under self._lock) whenever bytes land or a range stops.
+        self._progressed = threading.Condition(self._lock)
+        self._state: dict[str, Any] = {}
+
+    def _probe(self) -> tuple[str, int, str] | None:
+        """Return ``(final_url, length, validator)`` when splitting is possible."""
+        try:
+            response = self._http.head(
+                self.url,
+                allow_redirects=True,
+                timeout=_DOWNLOAD_TIMEOUT,
+                headers={"Accept-Encoding": "identity"},
+            )
+        except requests.exceptions.RequestException as exc:
+            logger.debug("range probe of %s failed: %s", self.url, exc)
+            return None
+        headers = response.headers
+        encoding = headers.get("content-encoding", "").strip().lower()
+        try:
+            length = int(headers.get("content-length", 0))
+        except ValueError:
+            return None
+        if (
+            response.status_code != 200
+            or headers.get("accept-ranges", "").strip().lower() != "bytes"
+            or encoding not in ("", "identity")
+            or length < self.segments * _MIN_SEGMENT_BYTES
+        ):
+            return None
+        validator = headers.get("etag") or headers.get("last-modified") or ""
+        self.remote = _remote_meta(response)
+        return response.url or self.url, length, validator
+
+    def _load_or_plan(self, length: int, validator: str) -> None:
+        """Resume the recorded ranges if they describe this resource, else plan anew."""
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as state_file:
+                state = json.load(state_file)
+            if (
+                state["length"] == length
+                and (not self.match_validator or state["validator"] == validator)
+                and os.path.getsize(self.partial_path) == length
+            ):
+                self._state = state
+                return
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+        # A single-stream partial left by an earlier attempt is a valid
+        # prefix (the same trust _stream_to_partial's resume extends it):
+        # the ranges it covers start out done.
+        prefix = 0
+        if not os.path.exists(self.state_path) and os.path.exists(self.partial_path):
+            prefix = min(os.path.getsize(self.partial_path), length)
+        step = -(-length // self.segments)  # ceiling division
+        ranges = []
+        for start in range(0, length, step):
+            end = min(start + step, length) - 1
+            ranges.append([start, end, max(0, min(prefix - start, end + 1 - start))])
+        self._state = {"length": length, "validator": validator, "ranges": ranges}
+        with open(self.partial_path, "r+b" if prefix else "wb") as partial:
+            partial.truncate(length)
+        self._save()
+
+    def _save(self) -> None:
+        tmp_path = self.state_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as state_file:
+            json.dump(self._state, state_file)
+        os.replace(tmp_path, self.state_path)
+
+    def _done_bytes(self) -> int:
+        return sum(done for _start, _end, done in self._state["ranges"])
+
+    def _contiguous_bytes(self) -> int:
+        """Length of the completed prefix of the file (caller holds the lock)."""
+        for start, end, done in self._state["ranges"]:
+            if start + done <= end:
+                return start + done
+        return self._state["length"]
+
+    def _wake(self, _future: Any = None) -> None:
+        with self._progressed:
+            self._progressed.notify_all()
+
+    def _hash_while_fetching(self, fd: int, hasher: Any, futures: list) -> None:
+        """Feed ``hasher`` the completed prefix as it grows, until every range stops.
+
+        Bytes past the first unfinished range are hashed once it catches up;
+        what is left unhashed when a range fails no longer matters, because
+        the attempt is then incomplete and the caller discards the hasher.
+        """
+        hashed = 0
+        while True:
+            with self._progressed:
+                while True:
+                    finished = all(future.done() for future in futures)
+                    frontier = self._contiguous_bytes()
+                    if finished or frontier > hashed:
+                        break
+                    self._progressed.wait()
+            while hashed < frontier:
+                data = os.pread(
+                    fd, min(DEFAULT_HASH_BUFFER_BYTES, frontier - hashed), hashed
+                )
+                if not data:
+                    break
+                hasher.update(data)
+                hashed += len(data)
+            if finished:
+                return
+
+    def _fetch_range(self, url: str, fd: int, index: int, on_bytes) -> None:
+        """Fetch the unfinished tail of range ``index`` into ``fd``."""
+        start, end, done = self._state["ranges"][index]
+        position = start + done
+        if position > end:
+            return
+        response = self._http.get(
+            url,
+            stream=True,
+            timeout=_DOWNLOAD_TIMEOUT,
+            headers={"Range": f"bytes={position}-{end}", "Accept-Encoding": "identity"},
+        )
+        try:
+            if response.status_code == 416:
+                raise _StaleSegments()
+            response.raise_for_status()
+            encoding = response.headers.get("content-encoding", "").strip().lower()
+            content_range = response.headers.get("content-range", "")
+            if (
+                response.status_code != 206
+                or encoding not in ("", "identity")
+                or not content_range.startswith(f"bytes {position}-")
+            ):
+                raise _RangesUnsupported()
+            unsaved = 0
+            for data in _iter_body(response, budget=self._budget):
+                if len(data) > end + 1 - position:
+                    data = data[: end + 1 - position]
+                if not data:
+                    break
+                os.pwrite(fd, data, position)
+                position += len(data)
+                unsaved += len(data)
+                with self._lock:
+                    self._state["ranges"][index][2] = position - start
+                    on_bytes()
+                    self._progressed.notify_all()
+                    if unsaved >= _SEGMENT_CHECKPOINT_BYTES:
+                        self._save()
+                        unsaved = 0
+        finally:
+            response.close()
+
+    def run(
+        self,
+        *,
+        progress_callback: "ProgressCallback | None" = None,
+        hasher: Any = None,
+        remote: dict[str, Any] | None = None,
+    ) -> bool | None:
+        """Make one segmented attempt.
+
+        ``remote``, when given, is updated with the probed validators.
+
+        Returns:
+            ``None`` when the file should be fetched as a single stream
+            instead, ``True`` when every range is complete, ``False`` when
+            the attempt ended incomplete (the caller's retry resumes it).
+
+        Raises:
+            requests.exceptions.RequestException: As
+                :meth:`CloudImage._stream_to_partial`; a transport failure of
+                any range propagates to the retry loop after the other ranges
+                finish and progress is saved.
+        """
+        probe = self._probe()
+        if probe is None:
+            _discard_segment_state(self.partial_path)
+            return None
+        url, length, validator = probe
+        if remote is not None:
+            remote.update(self.remote)
+        self._load_or_plan(length, validator)
+
+        progress_bar = progress = None
+        if progress_callback is None:
+            progress_bar = tqdm(
+                total=length, initial=self._done_bytes(), unit="B", unit_scale=True
+            )
+        else:
+            progress = _ThrottledProgress(progress_callback)
+
+        def on_bytes() -> None:  # called with self._lock held
+            done = self._done_bytes()
+            if progress_bar is not None:
+                progress_bar.update(done - progress_bar.n)
+            else:
+                progress(done, length)
+
+        ranges = self._state["ranges"]
+        errors: list[BaseException] = []
+        fd = os.open(self.partial_path, os.O_RDWR)
+        try:
+            with ThreadPoolExecutor(max_workers=len(ranges)) as pool:
+                futures = [
+                    pool.submit(self._fetch_range, url, fd, index, on_bytes)
+                    for index in range(len(ranges))
+                ]
+                for future in futures:
+                    future.add_done_callback(self._wake)
+                if hasher is not None:
+                    self._hash_while_fetching(fd, hasher, futures)
+                for future in futures:
+                    if future.exception() is not None:
+                        errors.append(future.exception())
+        finally:
+            os.close(fd)
+            if progress_bar is not None:
+                progress_bar.close()
+            with self._lock:
+                self._save()
+                if progress is not None:
+                    progress.flush()
+
+        if any(isinstance(exc, _RangesUnsupported) for exc in errors):
+            logger.info("%s did not honour byte ranges; using one stream", url)
+            _discard_segment_state(self.partial_path)
+            return None
+        if any(isinstance(exc, _StaleSegments) for exc in errors):
+            _discard_segment_state(self.partial_path)
+            return False
+        for exc in errors:
+            if isinstance(exc, requests.HTTPError):
+                raise exc
+        if errors:
+            raise errors[0]
+
+        if self._done_bytes() != length:
+            return False
+        os.remove(self.state_path)
+        return True
+
+
+def _hash_stream(
+    hasher: Any,
+    stream: Any,
+    *,
+    limit: int | None = None,
+    buffer_size: int = DEFAULT_HASH_BUFFER_BYTES,
+) -> None:
+    """Feed ``stream`` (up to ``limit`` bytes) to ``hasher`` in fixed-size blocks.
+
+    Reads with ``readinto`` into one preallocated buffer, so memory use is
+    ``buffer_size`` no matter how large the stream is. :mod:`hashlib`
+    releases the GIL while hashing large blocks, so several threads can
+    hash different files in parallel.
+    """
+    buffer = bytearray(max(1, buffer_size))
+    view = memoryview(buffer)
+    remaining = limit
+    while remaining is None or remaining > 0:
+        want = len(buffer) if remaining is None else min(len(buffer), remaining)
+        count = stream.readinto(view[:want])
+        if not count:
+            break
+        hasher.update(view[:count])
+        if remaining is not None:
+            remaining -= count
+
+
+def hash_file(
+    fpath: str, algorithm: str, *, buffer_size: int = DEFAULT_HASH_BUFFER_BYTES
+) -> str:
+    """Return the hex ``algorithm`` digest of ``fpath`` using bounded memory.
+
+    Args:
+        fpath: File to hash.
+        algorithm: A :data:`HASH_ALGORITHMS` key.
+        buffer_size: Read buffer in bytes.
+
+    Returns:
+        The hex digest.
+    """
+    hasher = HASH_ALGORITHMS[algorithm]()
+    with open(fpath, "rb", buffering=0) as stream:
+        _hash_stream(hasher, stream, buffer_size=buffer_size)
+    return hasher.hexdigest()
+
+
+def verify_images(images: list[CloudImage], *, jobs: int = 4) -> list[bool]:
+    """Run :meth:`CloudImage.checksum_verify_image` for several images at once.
+
+    Hashing is I/O- and C-bound with the GIL released, so a small thread
+    pool overlaps the reads of several multi-GB images. Each worker holds
+    only its own read buffer.
+
+    Args:
+        images: Images to verify (each must have a checksum configured).
+        jobs: Maximum images hashed concurrently.
+
+    Returns:
+        One result per image, in the order given.
+    """
+    if not images:
+        return []
+    with ThreadPoolExecutor(max_workers=max(1, min(jobs, len(images)))) as pool:
+        return list(pool.map(lambda image: image.checksum_verify_image(), images))
+
+
+def write_digest(
+    image_fpath: str,
+    algorithm: str,
+    digest: str,
+    *,
+    verified_against: dict[str, str | None] | None = None,
+) -> None:
+    """Record ``digest`` (and optionally a verification) for ``image_fpath``.
+
+    The sidecar (``<image>.digest``, JSON) also stores the image's size,
+    ``st_mtime_ns`` and inode so :func:`read_digest` can tell when the file
+    was modified or replaced behind its back (e.g. placed manually). Written
+    via a temporary file and ``os.replace`` so a reader never sees half of it.
+
+    Args:
+        image_fpath: Path of the downloaded file.
+        algorithm: A :data:`HASH_ALGORITHMS` key.
+        digest: Hex digest of the file's contents.
+        verified_against: When the digest has just matched a checksum
+            manifest, the SHA-256 of each file that verification trusted
+            (see :meth:`CloudImage.is_verified`). ``None`` records a digest
+            only.
+    """
+    stat = os.stat(image_fpath)
+    record: dict[str, Any] = {
+        "algorithm": algorithm,
+        "digest": digest,
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "inode": stat.st_ino,
+    }
+    if verified_against is not None:
+        record["verified_against"] = verified_against
+    digest_fpath = image_fpath + DIGEST_SUFFIX
+    tmp_fpath = digest_fpath + ".tmp"
+    with open(tmp_fpath, "w", encoding="utf-8") as digest_file:
+        json.dump(record, digest_file)
+    os.replace(tmp_fpath, digest_fpath)
+
+
+def _read_digest_record(image_fpath: str, algorithm: str) -> dict[str, Any] | None:
+    """Return the sidecar record if it describes ``image_fpath`` as it is now."""
+    try:
+        with open(image_fpath + DIGEST_SUFFIX, "r", encoding="utf-8") as digest_file:
+            record = json.load(digest_file)
+        stat = os.stat(image_fpath)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(record, dict) or not isinstance(record.get("digest"), str):
+        return None
+    if (
+        record.get("algorithm") != algorithm
+        or record.get("size") != stat.st_size
+        or record.get("mtime_ns") != stat.st_mtime_ns
+        or record.get("inode", stat.st_ino) != stat.st_ino
+    ):
+        return None
+    return record
+
+
+def read_digest(image_fpath: str, algorithm: str) -> str | None:
+    """Return the recorded ``algorithm`` digest of ``image_fpath``, if still valid.
+
+    Args:
+        image_fpath: Path of the image.
+        algorithm: The algorithm the caller needs.
+
+    Returns:
+        The hex digest written by :func:`write_digest`, or ``None`` when
+        there is no sidecar, it is unreadable, it records a different
+        algorithm, or the image's size / mtime / inode no longer match.
+    """
+    record = _read_digest_record(image_fpath, algorithm)
+    return record["digest"] if record is not None else None
+
+
+def _small_file_sha256(fpath: str | None) -> str | None:
+    """SHA-256 of a small file (checksum manifest, keyring), ``None`` if absent."""
+    if not fpath or not os.path.isfile(fpath):
+        return None
+    return hash_file(fpath, "sha256")
+
+
+@contextlib.contextmanager
+def cache_lock(
+    fpath: str, *, on_wait: Callable[[float], None] | None = None
+) -> Iterator[float]:
+    """Hold an exclusive advisory lock on cache file ``fpath``.
+
+    ``lvlab init``, ``lvlab up``, ``createvm`` and the validate harness share
+    one cloud-image directory; without a lock two of them fetching the same
+    image both write its ``.partial`` and corrupt it. The lock is a
+    ``flock`` on ``<dir>/.locks/<name>.lock`` — it is released when the
+    holder exits or dies, and separate opens conflict even within one
+    process, so concurrent workers are serialized too. Never nest two locks
+    on the same file in one thread: the inner one would wait forever.
+
+    Args:
+        fpath: The cache file to guard (it need not exist yet).
+        on_wait: Called with the seconds waited so far, every
+            ``_LOCK_POLL_SECONDS`` while another holder has the lock.
+
+    Yields:
+        Seconds spent waiting for the lock (``0.0`` when it was free).
+    """
+    lock_dir = os.path.join(os.path.dirname(fpath), _LOCK_DIR)
+    os.makedirs(lock_dir, exist_ok=True)
+    lock_fd = os.open(
+        os.path.join(lock_dir, os.path.basename(fpath) + ".lock"),
+        os.O_RDWR | os.O_CREAT,
+        0o664,
+    )
+    try:
+        started = time.monotonic()
+        waited = 0.0
+        while True:
+            try:
+                fcntl.flock(lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                break
+            except BlockingIOError:
+                waited = time.monotonic() - started
+                if on_wait is not None:
+                    on_wait(waited)
+                time.sleep(_LOCK_POLL_SECONDS)
+        if waited:
+            waited = time.monotonic() - started
+            logger.info("waited %.1fs for another process using %s", waited, fpath)
+        yield waited
+    finally:
+        os.close(lock_fd)  # releases the flock
+
+
+def _link_alias(blob: str, alias: str) -> None:
+    """Atomically make ``alias`` a hard link (else a symlink) of ``blob``."""
+    tmp_fpath = alias + ".tmp"
+    with contextlib.suppress(FileNotFoundError):
+        os.remove(tmp_fpath)
+    try:
+        os.link(blob, tmp_fpath)
+    except OSError:
+        os.symlink(blob, tmp_fpath)
+    os.replace(tmp_fpath, alias)
+
+
+@dataclass
+class UpstreamCheck:
+    """Outcome of :meth:`CloudImage.check_upstream` for one image.
+
+    Attributes:
+        image: The image that was checked.
+        status: ``current`` (unchanged upstream), ``changed`` (a refresh
+            downloads the new build), ``missing`` (not cached yet),
+            ``unknown`` (the server gave nothing to compare) or ``error``
+            (the request failed).
+        detail: Short human-readable reason for ``status``.
+    """
+
+    image: CloudImage
+    status: str
+    detail: str = ""
+
+
+def check_upstream_images(
+    images: list[CloudImage],
+    *,
+    client: DownloadClient | None = None,
+    jobs: int = DEFAULT_REFRESH_CHECK_JOBS,
+) -> list[UpstreamCheck]:
+    """Run :meth:`CloudImage.check_upstream` for several images at once.
+
+    Each check is one small request, so they overlap on a thread pool and
+    a whole catalog costs about one round-trip.
+
+    Args:
+        images: Images to check.
+        client: Pooled :class:`DownloadClient` shared by the checks.
+        jobs: Maximum checks in flight.
+
+    Returns:
+        One result per image, in the order given.
+    """
+    if not images:
+        return []
+    with ThreadPoolExecutor(max_workers=max(1, min(jobs, len(images)))) as pool:
+        return list(pool.map(lambda image: image.check_upstream(client=client), images))
+
+
+def schedule_downloads(
+    images: list[CloudImage],
+    *,
+    wanted: set[str] | frozenset[str] = frozenset(),
+    client: DownloadClient | None = None,
+    jobs: int = DEFAULT_REFRESH_CHECK_JOBS,
+) -> list[CloudImage]:
+    """Order ``images`` for fetching: the ones machines need first, then smallest.
+
+    Images named in ``wanted`` (the manifest machines' ``os``) come first, so
+    the next ``lvlab up`` is unblocked as early as possible. Within each
+    group, images are ordered by :meth:`CloudImage.pending_download_bytes`
+    (cached images cost nothing and finish at once; an unknown size goes
+    last) and then by their given order. The size probes overlap on a
+    thread pool.
+
+    Args:
+        images: Images to fetch.
+        wanted: Names of images a manifest machine boots from.
+        client: Pooled :class:`DownloadClient` shared by the probes.
+        jobs: Maximum probes in flight.
+
+    Returns:
+        The same images, highest priority first.
+    """
+    if len(images) < 2:
+        return list(images)
+    with ThreadPoolExecutor(max_workers=max(1, min(jobs, len(images)))) as pool:
+        sizes = list(
+            pool.map(lambda image: image.pending_download_bytes(client=client), images)
+        )
+    ranked = sorted(
+        range(len(images)),
+        key=lambda index: (
+            images[index].name not in wanted,
+            sizes[index] is None,
+            sizes[index] or 0,
+            index,
+        ),
+    )
+    return [images[index] for index in ranked]
+
+
+def _remote_meta(response: requests.Response) -> dict[str, Any]:
+    """The validators of ``response``: ETag, Last-Modified and full length.
+
+    The length is the whole resource's (from ``Content-Range`` on a 206)
+    and is left out for an encoded body, whose length describes the
+    encoded bytes.
+    """
+    headers = response.headers
+    length: int | None = None
+    encoding = headers.get("content-encoding", "").strip().lower()
+    if encoding in ("", "identity"):
+        if response.status_code == 206:
+            total = headers.get("content-range", "").rpartition("/")[2]
+        else:
+            total = headers.get("content-length", "")
+        length = int(total) if total.isdigit() else None
+    return {
+        "etag": headers.get("etag"),
+        "last_modified": headers.get("last-modified"),
+        "content_length": length,
+    }
+
+
+def _http_date_timestamp(value: str | None) -> float | None:
+    """POSIX timestamp of an HTTP date header, ``None`` when absent/invalid."""
+    if not value:
+        return None
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+def write_remote_record(fpath: str, url: str, meta: dict[str, Any]) -> None:
+    """Record the validators ``fpath`` was downloaded from ``url`` with.
+
+    The sidecar (``<fpath>.remote``, JSON) also stores the file's size,
+    ``st_mtime_ns`` and inode, like :func:`write_digest`, so a record
+    outlives neither a manual replacement of the file nor a URL change.
+
+    Args:
+        fpath: The downloaded file.
+        url: The URL it was requested from.
+        meta: ``etag`` / ``last_modified`` / ``content_length`` (see
+            :func:`_remote_meta`).
+    """
+    stat = os.stat(fpath)
+    record = {
+        "url": url,
+        "etag": meta.get("etag"),
+        "last_modified": meta.get("last_modified"),
+        "content_length": meta.get("content_length"),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "inode": stat.st_ino,
+    }
+    remote_fpath = fpath + REMOTE_SUFFIX
+    tmp_fpath = remote_fpath + ".tmp"
+    with open(tmp_fpath, "w", encoding="utf-8") as remote_file:
+        json.dump(record, remote_file)
+    os.replace(tmp_fpath, remote_fpath)
+
+
+def read_remote_record(fpath: str, url: str) -> dict[str, Any] | None:
+    """Return the :func:`write_remote_record` record if it still describes ``fpath``.
+
+    Args:
+        fpath: The cached file.
+        url: The URL the caller would fetch it from now.
+
+    Returns:
+        The record, or ``None`` when there is none, it is unreadable, it was
+        made for another URL, or the file's size / mtime / inode changed.
+    """
+    try:
+        with open(fpath + REMOTE_SUFFIX, "r", encoding="utf-8") as remote_file:
+            record = json.load(remote_file)
+        stat = os.stat(fpath)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(record, dict) or record.get("url") != url:
+        return None
+    if (
+        record.get("size") != stat.st_size
+        or record.get("mtime_ns") != stat.st_mtime_ns
+        or record.get("inode") != stat.st_ino
+    ):
+        return None
+    return record
+
 
 @dataclass
 class CleanupCandidate:
@@ -733,6 +2255,32 @@ class CleanupCandidate:
         return [self.image_fpath, *self.sidecar_fpaths]
 
 
+def parse_download_segments(config_defaults: dict[str, Any]) -> int:
+    """Read ``download_segments`` from ``config_defaults``.
+
+    Whole numbers below 1 mean 1 (no splitting). Anything that is not a
+    whole number falls back to :data:`DEFAULT_DOWNLOAD_SEGMENTS` with a
+    warning rather than failing every command that builds a
+    :class:`CloudImage`.
+
+    Returns:
+        The number of concurrent byte ranges per image download.
+    """
+    raw = config_defaults.get("download_segments", DEFAULT_DOWNLOAD_SEGMENTS)
+    try:
+        if isinstance(raw, (bool, float)):
+            raise ValueError(raw)
+        return max(1, int(raw))
+    except (TypeError, ValueError):
+        logger.warning(
+            "config_defaults.download_segments must be a whole number, got %r; "
+            "using %d.",
+            raw,
+            DEFAULT_DOWNLOAD_SEGMENTS,
+        )
+        return DEFAULT_DOWNLOAD_SEGMENTS
+
+
 def resolve_cloud_image_dir(config_defaults: dict[str, Any]) -> str:
     """Resolve the cloud-image cache directory the same way ``CloudImage`` does.
 
@@ -775,7 +2323,8 @@ def enumerate_protected_files(
     - the image qcow2 (:attr:`CloudImage.image_fpath`),
     - the checksum manifest (:attr:`CloudImage.checksum_fpath`),
     - the GPG-verified ``.verified`` companion of that manifest,
-    - the GPG keyring (:attr:`CloudImage.checksum_gpg_fpath`).
+    - the GPG keyring (:attr:`CloudImage.checksum_gpg_fpath`),
+    - the download-time ``.digest`` and ``.remote`` records of the image.
 
     Missing/``None`` artefacts (an image with no checksum, etc.) are simply
     not added — protection is per existing-derivation, not speculative.
@@ -795,6 +2344,8 @@ def enumerate_protected_files(
         image = CloudImage(image_name, image_config, environment, config_defaults)
         if image.image_fpath:
             protected.add(os.path.expanduser(image.image_fpath))
+            protected.add(os.path.expanduser(image.image_fpath) + DIGEST_SUFFIX)
+            protected.add(os.path.expanduser(image.image_fpath) + REMOTE_SUFFIX)
         if image.checksum_fpath:
             checksum = os.path.expanduser(image.checksum_fpath)
             protected.add(checksum)
@@ -811,14 +2362,16 @@ def backing_files_in_use(
     """Best-effort: cache images currently used as a qcow2 backing file.
 
     Defense-in-depth on top of the manifest protected set. Walks the
-    per-VM disk tree under ``disk_image_basedir`` and asks ``qemu-img
-    info`` for each ``*.qcow2`` disk's ``full-backing-filename``. Any
-    backing path that resolves into the cloud-image cache dir is returned
-    so the cleanup command will never pull a backing file out from under a
-    live disk.
-
-    This is intentionally tolerant: a missing ``qemu-img`` binary, an
-    unreadable disk, or a malformed JSON response is logged and skipped
+    per-VM disk tree under ``disk_image_basedir`` and reads each
+    ``*.qcow2`` disk's backing file from its header
+    (:func:`~tkc_lvlab.utils.vdisk.disk_header`). Any backing path that
+    resolves into the cloud-image cache dir is returned so the cleanup
+    command will never pull a backing file out from under a live disk. The
+    probes run concurrently and are cached per disk (see
+    :func:`backing_users`).
+
+    This is intentionally tolerant: an unreadable or corrupt disk, or a
+    failed ``qemu-img`` fallback for an exotic format, is logged and skipped
     rather than aborting the cleanup. The manifest-images set remains the
     primary guarantee.
 
@@ -834,27 +2387,138 @@ def backing_files_in_use(
         A set of absolute backing-file paths that live inside the cache
         directory. Empty when nothing on-disk references the cache.
     """
+    return set(backing_users(environment, config_defaults))
+
+
+def backing_users(
+    environment: dict[str, Any],
+    config_defaults: dict[str, Any],
+    *,
+    jobs: int = DEFAULT_BACKING_SCAN_JOBS,
+) -> dict[str, list[str]]:
+    """Map each cache image used as a qcow2 backing file to the disks using it.
+
+    The walk behind :func:`backing_files_in_use` (same tolerance for an
+    unreadable disk), keeping which disks reference
+    each backing file so ``lvlab images refresh`` can repoint them.
+
+    Headers are read for up to ``jobs`` disks at once, and only for disks
+    :class:`_BackingScanCache` has no answer for at their current
+    size, ``st_mtime_ns`` and inode, so a repeat scan of idle disks opens
+    none of them. The cloud-image cache itself is not walked: it holds the
+    backing files, not disks built on them.
+
+    Args:
+        environment: The manifest's ``environment[0]`` dict.
+        config_defaults: The manifest's ``config_defaults`` dict. Honors
+            ``disk_image_basedir``.
+        jobs: Concurrent header probes.
+
+    Returns:
+        ``{absolute backing path: [disk paths]}`` for backing files inside
+        the cache directory.
+    """
     disk_basedir = os.path.expanduser(
         config_defaults.get("disk_image_basedir", DEFAULT_LVLAB_BASEDIR)
     )
-    cache_dir = resolve_cloud_image_dir(config_defaults)
+    cache_dir = os.path.abspath(resolve_cloud_image_dir(config_defaults))
 
-    in_use: set[str] = set()
+    users: dict[str, list[str]] = {}
     if not os.path.isdir(disk_basedir):
-        return in_use
+        return users
 
-    for root, _dirs, files in os.walk(disk_basedir):
+    disks: list[tuple[str, os.stat_result]] = []
+    for root, dirs, files in os.walk(disk_basedir):
+        if os.path.abspath(root) == cache_dir:
+            dirs[:] = []
+            continue
         for fname in files:
             if not fname.endswith(".qcow2"):
                 continue
             disk_path = os.path.join(root, fname)
-            backing = _qemu_img_backing_file(disk_path)
-            if not backing:
-                continue
-            backing = os.path.abspath(os.path.expanduser(backing))
-            if os.path.dirname(backing) == os.path.abspath(cache_dir):
-                in_use.add(backing)
-    return in_use
+            try:
+                disks.append((disk_path, os.stat(disk_path)))
+            except OSError as exc:
+                logger.debug("cannot stat %s: %s", disk_path, exc)
+
+    scan_cache = _BackingScanCache.for_image_dir(cache_dir)
+    backings = scan_cache.lookup(disks)
+    misses = [disk for disk in disks if disk[0] not in backings]
+    if misses:
+        with ThreadPoolExecutor(max_workers=max(1, min(jobs, len(misses)))) as pool:
+            headers = list(pool.map(lambda disk: disk_header(disk[0]), misses))
+        for (disk_path, stat), header in zip(misses, headers):
+            if header is None:
+                continue  # not cached: the next scan asks again
+            backing = header.full_backing_file
+            backings[disk_path] = backing
+            scan_cache.store(disk_path, stat, backing)
+    scan_cache.save()
+
+    for disk_path, _stat in disks:
+        backing = backings.get(disk_path)
+        if not backing:
+            continue
+        backing = os.path.abspath(os.path.expanduser(backing))
+        if os.path.dirname(backing) == cache_dir:
+            users.setdefault(backing, []).append(disk_path)
+    return users
+
+
+class _BackingScanCache:
+    """Backing file of each disk, keyed by its size, ``st_mtime_ns`` and inode.
+
+    Persisted as JSON under the cloud-image cache's hidden ``.scan/``
+    directory. Only disks seen by the latest scan are kept, and a write that
+    fails (a read-only shared cache) just leaves the next scan uncached.
+    """
+
+    def __init__(self, fpath: str) -> None:
+        self.fpath = fpath
+        self._entries: dict[str, Any] = {}
+        self._fresh: dict[str, Any] = {}
+        try:
+            with open(fpath, "r", encoding="utf-8") as scan_file:
+                entries = json.load(scan_file)
+        except (OSError, ValueError):
+            entries = {}
+        if isinstance(entries, dict):
+            self._entries = entries
+
+    @classmethod
+    def for_image_dir(cls, image_dir: str) -> "_BackingScanCache":
+        return cls(os.path.join(image_dir, _BACKING_SCAN_DIR, _BACKING_SCAN_FILE))
+
+    @staticmethod
+    def _key(stat: os.stat_result) -> list[int]:
+        return [stat.st_size, stat.st_mtime_ns, stat.st_ino]
+
+    def lookup(self, disks: list[tuple[str, os.stat_result]]) -> dict[str, str | None]:
+        """Cached backing files (``None``: none) of the unchanged ``disks``."""
+        found: dict[str, str | None] = {}
+        for disk_path, stat in disks:
+            entry = self._entries.get(disk_path)
+            if isinstance(entry, dict) and entry.get("key") == self._key(stat):
+                found[disk_path] = entry.get("backing")
+                self._fresh[disk_path] = entry
+        return found
+
+    def store(self, disk_path: str, stat: os.stat_result, backing: str | None) -> None:
+        """Remember ``disk_path``'s backing file as probed at ``stat``."""
+        self._fresh[disk_path] = {"key": self._key(stat), "backing": backing}
+
+    def save(self) -> None:
+        """Write the entries of this scan, if they differ from the file's."""
+        if self._fresh == self._entries:
+            return
+        tmp_fpath = f"{self.fpath}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.fpath), exist_ok=True)
+            with open(tmp_fpath, "w", encoding="utf-8") as scan_file:
+                json.dump(self._fresh, scan_file)
+            os.replace(tmp_fpath, self.fpath)
+        except OSError as exc:
+            logger.debug("could not save the backing-file scan cache: %s", exc)
 
 
 def comment_referenced_files(image_dir: str, manifest_text: str) -> set[str]:
@@ -868,13 +2532,18 @@ def comment_referenced_files(image_dir: str, manifest_text: str) -> set[str]:
     RAW manifest text instead.
 
     For every line, the text following the first ``#`` is treated as a
-    comment. Any cache file in ``image_dir`` whose basename appears as a
-    substring of that comment text is protected — together with its sidecar
-    files (those whose basename begins with ``<image>.``, the checksum /
-    ``.verified`` / GPG naming this module produces), so an image and its
-    verification artefacts are protected as a unit. This mirrors the sidecar
-    grouping in :func:`find_cleanup_candidates`, where a commented-out
-    checksum sidecar would otherwise be reaped on its own.
+    comment. Files are grouped into families as in
+    :func:`find_cleanup_candidates` — an image plus its sidecars, whose
+    basenames begin with ``<image>.`` (the checksum / ``.verified`` / GPG
+    naming this module produces) — and a whole family is protected when
+    its root's basename appears as a substring of the comment text, so an
+    image and its verification artefacts are protected as a unit.
+
+    A sidecar's name contains its root's, so a comment naming only a
+    sidecar (e.g. ``foo.qcow2.SHA256SUMS``) protects the entire
+    ``foo.qcow2`` family, not just that sidecar and the files extending its
+    name. The result is thus a superset of matching every file name on its
+    own; erring towards keeping files is the safe direction for a cleanup.
 
     Args:
         image_dir: The cloud-image cache directory (already ``~``-expanded).
@@ -895,52 +2564,50 @@ def comment_referenced_files(image_dir: str, manifest_text: str) -> set[str]:
     if not comment_blob.strip():
         return set()
 
-    files = [
-        fname
-        for fname in os.listdir(image_dir)
-        if os.path.isfile(os.path.join(image_dir, fname))
-    ]
-    # Direct hits: a cache filename mentioned verbatim anywhere in a comment.
-    referenced = {fname for fname in files if fname and fname in comment_blob}
+    # A sidecar's name contains its root's, so any mentioned file has its
+    # root mentioned too: searching for the roots alone finds every family
+    # with a mentioned member, in one substring search per family.
+    roots = _family_roots(_cache_file_names(image_dir))
+    referenced = {root for root in set(roots.values()) if root in comment_blob}
+    return {
+        os.path.abspath(os.path.join(image_dir, fname))
+        for fname, root in roots.items()
+        if root in referenced
+    }
 
-    protected: set[str] = set()
-    for fname in files:
-        if fname in referenced or any(
-            fname.startswith(ref + ".") for ref in referenced
-        ):
-            protected.add(os.path.abspath(os.path.join(image_dir, fname)))
-    return protected
 
+def _qemu_img_rebase(disk_path: str, backing_fpath: str) -> bool:
+    """Point a qcow2 disk at ``backing_fpath`` without touching its data.
 
-def _qemu_img_backing_file(disk_path: str) -> str | None:
-    """Return a qcow2 disk's backing-file path via ``qemu-img info``.
-
-    Args:
-        disk_path: Absolute path to a qcow2 disk image.
+    ``qemu-img rebase -u`` only rewrites the header, which is safe because
+    the new backing file holds the same bytes as the old one.
 
     Returns:
-        The disk's ``full-backing-filename`` (preferred) or
-        ``backing-filename``, or ``None`` when the disk has no backing
-        file or ``qemu-img`` could not be consulted.
+        ``True`` on success; ``False`` when ``qemu-img`` is missing or failed
+        (e.g. a running VM holds the disk's write lock).
     """
     try:
-        result = subprocess.run(
-            ["qemu-img", "info", "--output=json", disk_path],
+        subprocess.run(
+            [
+                "qemu-img",
+                "rebase",
+                "-u",
+                "-f",
+                "qcow2",
+                "-F",
+                "qcow2",
+                "-b",
+                backing_fpath,
+                disk_path,
+            ],
             capture_output=True,
             text=True,
             check=True,
         )
     except (FileNotFoundError, subprocess.CalledProcessError) as exc:
-        logger.debug("qemu-img info failed for %s: %s", disk_path, exc)
-        return None
-
-    try:
-        info = json.loads(result.stdout)
-    except json.JSONDecodeError as exc:
-        logger.debug("qemu-img info gave non-JSON for %s: %s", disk_path, exc)
-        return None
-
-    return info.get("full-backing-filename") or info.get("backing-filename")
+        logger.debug("qemu-img rebase failed for %s: %s", disk_path, exc)
+        return False
+    return True
 
 
 def find_cleanup_candidates(
@@ -951,11 +2618,11 @@ def find_cleanup_candidates(
     Scans ``image_dir`` (non-recursively) and partitions its files into
     protected (skipped) and unprotected. Unprotected files are grouped so
     a candidate's checksum / ``.verified`` / GPG sidecars travel with it:
-    the primary file is the unprotected entry whose name is the longest
-    prefix of the others (the bare image filename), and every other
-    unprotected file beginning with ``<primary>.`` is attached as a
-    sidecar. An unprotected file that is nobody's sidecar becomes its own
-    standalone candidate.
+    the primary file is the shortest unprotected name the others extend
+    (the bare image filename), and every other unprotected file beginning
+    with ``<primary>.`` is attached as a sidecar. An unprotected file that
+    is nobody's sidecar becomes its own standalone candidate. Planning is
+    linear in the number of files (see :func:`_family_roots`).
 
     Args:
         image_dir: The cloud-image cache directory (already
@@ -971,37 +2638,105 @@ def find_cleanup_candidates(
     if not os.path.isdir(image_dir):
         return []
 
-    unprotected: list[str] = []
-    for fname in os.listdir(image_dir):
+    protected_index = {os.path.abspath(p) for p in protected}
+    unprotected: dict[str, str] = {}
+    for fname in _cache_file_names(image_dir):
         fpath = os.path.join(image_dir, fname)
-        if not os.path.isfile(fpath):
-            continue
-        if os.path.abspath(fpath) in {os.path.abspath(p) for p in protected}:
-            continue
-        unprotected.append(fpath)
-
-    # Group sidecars under their primary. A sidecar shares the primary's
-    # full filename as a prefix followed by a dot (matching the
-    # ``<image>.<checksum>`` / ``<image>.<checksum>.verified`` naming this
-    # module produces). Pick the shortest-named file in each prefix family
-    # as the primary; the rest are its sidecars.
-    remaining = sorted(unprotected, key=lambda p: (len(os.path.basename(p)), p))
-    consumed: set[str] = set()
-    candidates: list[CleanupCandidate] = []
-    for primary in remaining:
-        if primary in consumed:
+        if os.path.abspath(fpath) not in protected_index:
+            unprotected[fname] = fpath
+
+    # Group sidecars under their primary: the shortest unprotected name that
+    # a file extends with ``.<suffix>`` (the ``<image>.<checksum>`` /
+    # ``<image>.<checksum>.verified`` naming this module produces).
+    families: dict[str, list[str]] = {}
+    for fname, root in _family_roots(unprotected).items():
+        sidecars = families.setdefault(root, [])
+        if fname != root:
+            sidecars.append(unprotected[fname])
+
+    candidates = [
+        CleanupCandidate(image_fpath=unprotected[root], sidecar_fpaths=sorted(sidecars))
+        for root, sidecars in families.items()
+    ]
+    return sorted(candidates, key=lambda c: c.image_fpath)
+
+
+def _cache_file_names(image_dir: str) -> list[str]:
+    """Names of the regular files (or symlinks to them) directly in ``image_dir``."""
+    with os.scandir(image_dir) as entries:
+        return [entry.name for entry in entries if entry.is_file()]
+
+
+def _family_roots(names: Iterable[str]) -> dict[str, str]:
+    """Map each of ``names`` to the shortest of ``names`` it extends.
+
+    ``b`` extends ``a`` when it is ``a`` or starts with ``a + "."``, so an
+    image and its sidecars share one root: the image. Only the prefixes
+    ending just before one of a name's dots can be its root, so each name
+    costs one set lookup per dot instead of a comparison with every other
+    name.
+    """
+    present = set(names)
+    roots: dict[str, str] = {}
+    for name in present:
+        root = name
+        dot = name.find(".", 1)
+        while dot != -1:
+            if name[:dot] in present:
+                root = name[:dot]
+                break
+            dot = name.find(".", dot + 1)
+        roots[name] = root
+    return roots
+
+
+def find_orphan_blobs(image_dir: str, removing: list[str] | None = None) -> list[str]:
+    """Blobs of the content-addressed store that nothing will reference.
+
+    A blob's references are its other hard links (``st_nlink - 1``, which
+    counts aliases in the cache, the dated links a refresh keeps for old
+    disks, and any link made outside the cache) plus the symlink aliases in
+    ``image_dir`` that resolve to it. Files in ``removing`` — the paths
+    ``lvlab images clean`` is about to delete — are not counted, so the
+    result is what becomes unreferenced once they are gone.
+
+    Args:
+        image_dir: The cloud-image cache directory (already ``~``-expanded).
+        removing: Paths about to be removed; ``None`` for none.
+
+    Returns:
+        Sorted blob paths with no remaining reference. Empty when the cache
+        has no blob store.
+    """
+    blob_root = os.path.join(image_dir, _BLOB_DIR)
+    if not os.path.isdir(blob_root):
+        return []
+
+    removed = {os.path.abspath(fpath) for fpath in removing or []}
+    removed_links: dict[tuple[int, int], int] = {}
+    for fpath in removed:
+        try:
+            stat = os.lstat(fpath)
+        except OSError:
             continue
-        primary_base = os.path.basename(primary)
-        sidecars: list[str] = []
-        for other in remaining:
-            if other is primary or other in consumed:
-                continue
-            if os.path.basename(other).startswith(primary_base + "."):
-                sidecars.append(other)
-                consumed.add(other)
-        consumed.add(primary)
-        candidates.append(
-            CleanupCandidate(image_fpath=primary, sidecar_fpaths=sorted(sidecars))
-        )
+        key = (stat.st_dev, stat.st_ino)
+        removed_links[key] = removed_links.get(key, 0) + 1
 
-    return sorted(candidates, key=lambda c: c.image_fpath)
+    symlinked: set[str] = set()
+    for fname in os.listdir(image_dir):
+        fpath = os.path.abspath(os.path.join(image_dir, fname))
+        if fpath not in removed and os.path.islink(fpath):
+            symlinked.add(os.path.realpath(fpath))
+
+    orphans: list[str] = []
+    for algorithm in sorted(os.listdir(blob_root)):
+        algorithm_dir = os.path.join(blob_root, algorithm)
+        if not os.path.isdir(algorithm_dir):
+            continue
+        for digest in os.listdir(algorithm_dir):
+            blob = os.path.join(algorithm_dir, digest)
+            stat = os.lstat(blob)
+            links = stat.st_nlink - 1 - removed_links.get((stat.st_dev, stat.st_ino), 0)
+            if links <= 0 and os.path.realpath(blob) not in symlinked:
+                orphans.append(blob)
+    return sorted(orphans)
@@ -37,17 +37,18 @@ from .virsh import (
     DEAD_STATES,
     RUNNING_STATES,
     SHUTDOWNABLE_STATES,
+    VirshBatch,
     VirshError,
+    _parse_name_lines,
     _xml_tempfile,
     run_virsh,
-    virsh_domstate,
-    virsh_domstate_reason,
+    virsh_domstates,
     virsh_list_all_names,
-    virsh_snapshot_names,
 )
 
 if TYPE_CHECKING:
     from .images import CloudImage
+    from .virsh_cache import VirshReadCache
 
 
 logger = get_logger(__name__)
@@ -57,10 +58,9 @@ logger = get_logger(__name__)
 # Extracted to a module constant to satisfy SonarQube python:S1192 — keep the
 # wording in lockstep with the four call sites in this module.
 VM_DOES_NOT_EXIST_MSG = "The virtual machine %s does not exist in this Libvirt URI"
-#: ``logger.error`` format for a failed ``virsh list`` (args: uri, error).
+#: ``logger.error`` format for a failed ``virsh domstats`` / ``virsh list``
+#: (args: uri, error).
 FAILED_LIST_DOMAINS_MSG = "Failed to list domains at %s: %s"
-#: ``logger.error`` format for a failed ``virsh domstate`` (args: vm_name, error).
-FAILED_QUERY_STATE_MSG = "Failed to query state of %s: %s"
 
 # Maps a ``hosts.{family}.tmpl`` filename to the lowercased ``machine.os``
 # prefixes that should select it. Used by
@@ -166,7 +166,7 @@ class _SnapshotManager:
     :class:`Machine` facade methods ``list_snapshots`` / ``create_snapshot``
     / ``delete_snapshot`` can delegate without changing their public
     contracts. All ``virsh`` work goes through the module-level helpers
-    (``virsh_list_all_names``, ``virsh_snapshot_names``, ``run_virsh``,
+    (``VirshBatch``, ``virsh_list_all_names``, ``run_virsh``,
     ``_xml_tempfile``). (Bulk teardown before ``undefine`` now lives in
     :class:`_DomainDestroyer`, which uses the one-shot
     ``undefine --snapshots-metadata`` — issue #96 — rather than a
@@ -178,11 +178,19 @@ class _SnapshotManager:
             this, never the short ``vm_name``.
         vm_name: The short manifest name, used only for human-facing log
             lines (matching the pre-refactor wording).
+        cache: Optional request-scoped read cache shared with the owning
+            :class:`Machine`.
     """
 
-    def __init__(self, libvirt_vm_name: str, vm_name: str) -> None:
+    def __init__(
+        self,
+        libvirt_vm_name: str,
+        vm_name: str,
+        cache: VirshReadCache | None = None,
+    ) -> None:
         self.libvirt_vm_name = libvirt_vm_name
         self.vm_name = vm_name
+        self.cache = cache
 
     def list(self, uri: str) -> list[str]:
         """Return the snapshot names defined for the domain in creation order.
@@ -198,16 +206,21 @@ class _SnapshotManager:
             VirshError: If ``virsh`` itself fails for a reason other than
                 "domain not defined" (e.g. cannot reach the URI).
         """
-        if self.libvirt_vm_name not in virsh_list_all_names(uri):
+        # Both reads ride one virsh process; snapshot-list on an absent
+        # domain merely fails, so it is safe to queue unconditionally.
+        batch = VirshBatch(uri, cache=self.cache)
+        batch.add(["list", "--all", "--name"])
+        batch.add(["snapshot-list", self.libvirt_vm_name, "--name"], check=False)
+        listing, snapshots = batch.run()
+
+        if self.libvirt_vm_name not in _parse_name_lines(listing.stdout):
             return []
-
-        try:
-            return virsh_snapshot_names(uri, self.libvirt_vm_name)
-        except VirshError:
+        if snapshots.returncode != 0:
             # The domain disappeared between the list and the snapshot-list
             # call. Treat as absent — caller wanted snapshot names, there
             # are none to report.
             return []
+        return _parse_name_lines(snapshots.stdout)
 
     def create(
         self,
@@ -230,7 +243,7 @@ class _SnapshotManager:
             VirshError: When the domain isn't defined at ``uri`` or when
                 ``virsh snapshot-create`` itself fails.
         """
-        if self.libvirt_vm_name not in virsh_list_all_names(uri):
+        if self.libvirt_vm_name not in virsh_list_all_names(uri, cache=self.cache):
             logger.warning(
                 VM_DOES_NOT_EXIST_MSG,
                 self.vm_name,
@@ -256,6 +269,7 @@ class _SnapshotManager:
                 uri,
                 ["snapshot-create", self.libvirt_vm_name, "--xmlfile", xml_path],
                 timeout=120.0,
+                cache=self.cache,
             )
         return True
 
@@ -271,7 +285,7 @@ class _SnapshotManager:
                 named snapshot doesn't exist, or when ``virsh
                 snapshot-delete`` itself fails.
         """
-        if self.libvirt_vm_name not in virsh_list_all_names(uri):
+        if self.libvirt_vm_name not in virsh_list_all_names(uri, cache=self.cache):
             logger.warning(
                 VM_DOES_NOT_EXIST_MSG,
                 self.vm_name,
@@ -286,6 +300,7 @@ class _SnapshotManager:
             uri,
             ["snapshot-delete", self.libvirt_vm_name, snapshot_name],
             timeout=120.0,
+            cache=self.cache,
         )
 
 
@@ -305,6 +320,8 @@ class _DomainDestroyer:
         config_fpath: On-disk directory holding the domain's artifacts
             (qcow2 disks, ``cidata.iso``, rendered cloud-init files); the
             target of the file-cleanup step.
+        cache: Optional request-scoped read cache shared with the owning
+            :class:`Machine`.
     """
 
     def __init__(
@@ -312,10 +329,12 @@ class _DomainDestroyer:
         libvirt_vm_name: str,
         vm_name: str,
         config_fpath: str,
+        cache: VirshReadCache | None = None,
     ) -> None:
         self.libvirt_vm_name = libvirt_vm_name
         self.vm_name = vm_name
         self.config_fpath = config_fpath
+        self.cache = cache
 
     def destroy(self, uri: str) -> bool:
         """Forcefully power off, undefine, and clean up files for the domain.
@@ -329,21 +348,16 @@ class _DomainDestroyer:
             or file cleanup raised.
         """
         try:
-            current_vms = virsh_list_all_names(uri)
+            states = virsh_domstates(uri, cache=self.cache)
         except VirshError as e:
             logger.error(FAILED_LIST_DOMAINS_MSG, uri, e)
             return False
 
-        if self.libvirt_vm_name not in current_vms:
+        if self.libvirt_vm_name not in states:
             logger.warning(VM_DOES_NOT_EXIST_MSG, self.vm_name)
             return False
 
-        try:
-            vm_state = virsh_domstate(uri, self.libvirt_vm_name)
-        except VirshError as e:
-            logger.error(FAILED_QUERY_STATE_MSG, self.vm_name, e)
-            return False
-
+        vm_state, _reason = states[self.libvirt_vm_name]
         vm_state = self._force_off_if_alive(uri, vm_state)
         if vm_state is None:
             return False
@@ -382,18 +396,21 @@ class _DomainDestroyer:
         if vm_state not in RUNNING_STATES:
             return vm_state
         logger.warning("Forcefully shutting down %s", self.vm_name)
+        # destroy + domstate in one virsh process (one connect handshake).
+        batch = VirshBatch(uri, cache=self.cache)
+        batch.add(["destroy", self.libvirt_vm_name])
+        batch.add(["domstate", self.libvirt_vm_name])
         try:
-            run_virsh(uri, ["destroy", self.libvirt_vm_name])
+            _destroyed, state = batch.run()
         except VirshError as e:
-            logger.error("Failed to forcefully shutdown %s: %s", self.vm_name, e)
-            return None
-        try:
-            return virsh_domstate(uri, self.libvirt_vm_name)
-        except VirshError as e:
-            logger.error(
-                "Failed to query state of %s after destroy: %s", self.vm_name, e
-            )
+            if e.args and e.args[0] == "domstate":
+                logger.error(
+                    "Failed to query state of %s after destroy: %s", self.vm_name, e
+                )
+            else:
+                logger.error("Failed to forcefully shutdown %s: %s", self.vm_name, e)
             return None
+        return state.stdout.strip().lower()
 
     def _undefine(self, uri: str) -> bool:
         """Undefine the libvirt domain, dropping any snapshots in one shot.
@@ -405,7 +422,9 @@ class _DomainDestroyer:
         """
         logger.info("Undefining %s", self.vm_name)
         try:
-            undefine_with_snapshot_cleanup(uri, self.libvirt_vm_name)
+            undefine_with_snapshot_cleanup(
+                uri, self.libvirt_vm_name, cache=self.cache
+            )
         except VirshError as e:
             logger.error(
                 "Failed to undefine (remove from Libvirt) %s: %s", self.vm_name, e
@@ -944,6 +963,12 @@ class Machine:
             are declared). Explicit manifest/defaults values always win.
             Defaults to ``None`` (no filling) for callers that don't render
             cloud-init (``destroy``/``down``/snapshot paths).
+        virsh_cache: Optional request-scoped
+            :class:`~tkc_lvlab.utils.virsh_cache.VirshReadCache` the CLI
+            creates per command. Every ``virsh`` read and mutation this
+            machine (and its snapshot/destroy collaborators) issues goes
+            through it, so back-to-back lookups within one command are
+            answered once. ``None`` disables caching.
 
     Attributes:
         environment: Reference to the environment dict.
@@ -981,6 +1006,7 @@ class Machine:
         environment: dict[str, Any],
         config_defaults: dict[str, Any],
         networks: dict[str, NetworkDefaults] | None = None,
+        virsh_cache: VirshReadCache | None = None,
     ) -> None:
 
         networks = networks or {}
@@ -1055,13 +1081,16 @@ class Machine:
         self.shared_directories = machine.get("shared_directories", [])
         self.cloud_init_config = machine.get("cloud_init", {})
         self.config_fpath = config_fpath
+        self.virsh_cache = virsh_cache
 
         # Focused collaborators the public facade methods delegate to
         # (issue #48). They read this Machine's resolved identity/state
         # rather than copying it, so they never drift from the facade.
-        self._snapshots = _SnapshotManager(self.libvirt_vm_name, self.vm_name)
+        self._snapshots = _SnapshotManager(
+            self.libvirt_vm_name, self.vm_name, virsh_cache
+        )
         self._destroyer = _DomainDestroyer(
-            self.libvirt_vm_name, self.vm_name, self.config_fpath
+            self.libvirt_vm_name, self.vm_name, self.config_fpath, virsh_cache
         )
         self._cloud_init_composer = _CloudInitComposer(self)
 
@@ -1306,6 +1335,12 @@ class Machine:
             logger.error("Error in virt-install call: %s", e)
             logger.error("%s", " ".join(command))
             return False
+        finally:
+            # virt-install defines (and boots) the domain behind run_virsh's
+            # back, so nothing cached about this URI can be trusted anymore.
+            cache = self._get_virsh_cache()
+            if cache is not None:
+                cache.invalidate(uri)
 
     def destroy(self, uri: str) -> bool:
         """Forcefully power off, undefine, and clean up files for this machine.
@@ -1340,14 +1375,24 @@ class Machine:
                 self.libvirt_vm_name,
                 self.vm_name,
                 self.config_fpath,
+                self._get_virsh_cache(),
             )
         return destroyer
 
+    def _get_virsh_cache(self) -> VirshReadCache | None:
+        """Return the request-scoped read cache, or ``None`` when absent.
+
+        Test stubs created via ``object.__new__`` skip ``__init__`` and so
+        never set :attr:`virsh_cache`; they run uncached.
+        """
+        return getattr(self, "virsh_cache", None)
+
     def exists_in_libvirt(self, uri: str) -> tuple[bool, str, str]:
         """Check whether this machine is defined in libvirt and report its state.
 
-        Looks the domain up by ``self.libvirt_vm_name`` against the list of
-        domains known to ``uri`` and, if found, queries its state and reason.
+        Looks the domain up by ``self.libvirt_vm_name`` in the bulk
+        :func:`virsh_domstates` snapshot of ``uri``, which carries the state
+        and reason of every defined domain in a single ``virsh`` call.
 
         Args:
             uri: A libvirt connection URI (e.g. ``qemu:///session``).
@@ -1361,16 +1406,11 @@ class Machine:
         Raises:
             VirshError: If ``virsh`` itself fails (e.g. cannot reach the URI).
         """
-        if self.libvirt_vm_name not in virsh_list_all_names(uri):
-            return False, "", ""
-
-        try:
-            state, reason = virsh_domstate_reason(uri, self.libvirt_vm_name)
-        except VirshError:
-            # The domain disappeared between the list and the lookup. Treat as
-            # absent rather than propagating a transient race.
+        states = virsh_domstates(uri, cache=self._get_virsh_cache())
+        if self.libvirt_vm_name not in states:
             return False, "", ""
 
+        state, reason = states[self.libvirt_vm_name]
         return True, state, reason
 
     def _get_snapshots(self) -> _SnapshotManager:
@@ -1382,7 +1422,9 @@ class Machine:
         """
         snapshots = getattr(self, "_snapshots", None)
         if snapshots is None:
-            snapshots = _SnapshotManager(self.libvirt_vm_name, self.vm_name)
+            snapshots = _SnapshotManager(
+                self.libvirt_vm_name, self.vm_name, self._get_virsh_cache()
+            )
         return snapshots
 
     def list_snapshots(self, uri: str) -> list[str]:
@@ -1470,27 +1512,24 @@ class Machine:
             return type matches the ``> 0`` truthy check in ``cli.py``.
         """
         try:
-            current_vms = virsh_list_all_names(uri)
+            states = virsh_domstates(uri, cache=self._get_virsh_cache())
         except VirshError as e:
             logger.error(FAILED_LIST_DOMAINS_MSG, uri, e)
             return 1
 
-        if self.libvirt_vm_name not in current_vms:
+        if self.libvirt_vm_name not in states:
             logger.warning(
                 VM_DOES_NOT_EXIST_MSG,
                 self.vm_name,
             )
             return 0
 
-        try:
-            vm_state = virsh_domstate(uri, self.libvirt_vm_name)
-        except VirshError as e:
-            logger.error(FAILED_QUERY_STATE_MSG, self.vm_name, e)
-            return 1
-
+        vm_state, _reason = states[self.libvirt_vm_name]
         if vm_state in DEAD_STATES:
             try:
-                run_virsh(uri, ["start", self.libvirt_vm_name])
+                run_virsh(
+                    uri, ["start", self.libvirt_vm_name], cache=self._get_virsh_cache()
+                )
             except VirshError as e:
                 logger.error("Failed to power on %s: %s", self.vm_name, e)
                 return 1
@@ -1511,26 +1550,25 @@ class Machine:
             return type matches the ``> 0`` truthy check in ``cli.py``.
         """
         try:
-            current_vms = virsh_list_all_names(uri)
+            states = virsh_domstates(uri, cache=self._get_virsh_cache())
         except VirshError as e:
             logger.error(FAILED_LIST_DOMAINS_MSG, uri, e)
             return 1
 
-        if self.libvirt_vm_name not in current_vms:
+        if self.libvirt_vm_name not in states:
             logger.warning(
                 "The virtual machine %s does not exist in Libvirt", self.vm_name
             )
             return 0
 
-        try:
-            vm_state = virsh_domstate(uri, self.libvirt_vm_name)
-        except VirshError as e:
-            logger.error(FAILED_QUERY_STATE_MSG, self.vm_name, e)
-            return 1
-
+        vm_state, _reason = states[self.libvirt_vm_name]
         if vm_state in SHUTDOWNABLE_STATES:
             try:
-                run_virsh(uri, ["shutdown", self.libvirt_vm_name])
+                run_virsh(
+                    uri,
+                    ["shutdown", self.libvirt_vm_name],
+                    cache=self._get_virsh_cache(),
+                )
             except VirshError as e:
                 logger.error("Error with machine.shutdown: %s", e)
                 return 1
@@ -0,0 +1,263 @@
+"""Mirror selection for cloud-image downloads.
+
+An ``images:`` entry (or built-in catalog entry) may list ``mirrors:`` —
+base URLs of directories that publish the same file as ``image_url``. The
+download then picks and falls back between them:
+
+- :func:`mirror_urls` expands the bases into full URLs, ``image_url``
+    first.
+- :func:`rank_mirrors` orders those URLs fastest first. Hosts with a fresh
+    entry in :class:`MirrorStats` (measured throughput, remembered per host
+    across runs under ``cloud-images/.mirrors/``) are ranked from it;
+    the rest are probed concurrently with a small ranged ``GET``
+    (:func:`probe_mirror`). A mirror advertising a different length from
+    the others is serving another build and is dropped; one whose probe
+    failed is kept, last, as a final fallback.
+- :meth:`~tkc_lvlab.utils.images.CloudImage._download_file` starts on the
+    fastest URL and, when it fails mid-transfer, resumes the same
+    ``.partial`` from the next one with a ``Range`` request.
+
+Only the image comes from mirrors: the checksum manifest and GPG keyring
+are always fetched from their single configured URL, so a bad mirror is
+caught by the usual checksum verification.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable
+from urllib.parse import urlparse
+
+import requests
+import urllib3.exceptions
+
+from .._logging import get_logger
+from .http_client import DownloadClient
+
+logger = get_logger(__name__)
+
+#: Bytes fetched from each mirror to measure its throughput.
+PROBE_BYTES = 512 * 1024
+#: Seconds a host's measured throughput is trusted before it is re-probed.
+MIRROR_STATS_TTL_SECONDS = 24 * 60 * 60
+
+# Hidden directory under the cache (``images clean`` only lists files).
+_STATS_DIR = ".mirrors"
+_STATS_FILE = "throughput.json"
+# Probes answer quickly or not at all: a mirror this slow is ranked last.
+_PROBE_TIMEOUT = (5, 15)
+
+
+def mirror_urls(image_url: str, mirrors: list[str] | tuple[str, ...]) -> list[str]:
+    """Return ``image_url`` followed by the same file on each mirror base.
+
+    Args:
+        image_url: The entry's canonical image URL.
+        mirrors: Base URLs of directories holding the same filename.
+
+    Returns:
+        Distinct URLs, ``image_url`` first, then in the order given.
+    """
+    filename = os.path.basename(urlparse(image_url).path)
+    urls = [image_url]
+    for base in mirrors:
+        url = f"{base.rstrip('/')}/{filename}"
+        if url not in urls:
+            urls.append(url)
+    return urls
+
+
+def _host(url: str) -> str:
+    return urlparse(url).netloc.lower()
+
+
+class MirrorStats:
+    """Per-host download throughput, persisted as JSON across runs.
+
+    Args:
+        fpath: The JSON file (created on the first :meth:`record`).
+        ttl: Seconds a measurement stays fresh.
+        clock: Wall clock; injectable for tests.
+    """
+
+    def __init__(
+        self,
+        fpath: str,
+        *,
+        ttl: float = MIRROR_STATS_TTL_SECONDS,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.fpath = fpath
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_image_dir(cls, image_dir: str) -> "MirrorStats":
+        """The stats file of the cloud-image cache at ``image_dir``."""
+        return cls(os.path.join(os.path.expanduser(image_dir), _STATS_DIR, _STATS_FILE))
+
+    def _load(self) -> dict[str, Any]:
+        try:
+            with open(self.fpath, "r", encoding="utf-8") as stats_file:
+                hosts = json.load(stats_file)
+        except (OSError, ValueError):
+            return {}
+        return hosts if isinstance(hosts, dict) else {}
+
+    def throughput(self, url: str) -> float | None:
+        """Fresh bytes/second measured for ``url``'s host, else ``None``."""
+        entry = self._load().get(_host(url))
+        if not isinstance(entry, dict):
+            return None
+        try:
+            if self._clock() - float(entry["measured_at"]) > self.ttl:
+                return None
+            return float(entry["bytes_per_second"])
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    def record(self, url: str, bytes_per_second: float) -> None:
+        """Remember ``bytes_per_second`` for ``url``'s host."""
+        with self._lock:
+            hosts = self._load()
+            hosts[_host(url)] = {
+                "bytes_per_second": bytes_per_second,
+                "measured_at": self._clock(),
+            }
+            os.makedirs(os.path.dirname(self.fpath), exist_ok=True)
+            # Workers each hold their own instance: keep temp files apart.
+            tmp_fpath = f"{self.fpath}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_fpath, "w", encoding="utf-8") as stats_file:
+                json.dump(hosts, stats_file)
+            os.replace(tmp_fpath, self.fpath)
+
+
+@dataclass(frozen=True)
+class MirrorProbe:
+    """Outcome of :func:`probe_mirror`.
+
+    Attributes:
+        url: The probed URL.
+        bytes_per_second: Measured throughput; ``None`` when the probe
+            failed.
+        length: Full length of the file the mirror advertised, if any.
+        detail: Why the probe failed.
+    """
+
+    url: str
+    bytes_per_second: float | None
+    length: int | None = None
+    detail: str = ""
+
+
+def probe_mirror(
+    url: str,
+    *,
+    client: DownloadClient | None = None,
+    probe_bytes: int = PROBE_BYTES,
+) -> MirrorProbe:
+    """Time a ranged ``GET`` of the first ``probe_bytes`` of ``url``.
+
+    The time includes connecting, so a distant mirror is not mistaken for a
+    fast one on a small sample.
+
+    Args:
+        url: The image URL on one mirror.
+        client: Pooled :class:`DownloadClient`; ``None`` uses ``requests``.
+        probe_bytes: Size of the sample.
+
+    Returns:
+        The :class:`MirrorProbe`.
+    """
+    started = time.monotonic()
+    try:
+        response = (client or requests).get(
+            url,
+            stream=True,
+            timeout=_PROBE_TIMEOUT,
+            headers={
+                "Range": f"bytes=0-{probe_bytes - 1}",
+                "Accept-Encoding": "identity",
+            },
+        )
+        try:
+            response.raise_for_status()
+            received = len(response.raw.read(probe_bytes, decode_content=True))
+        finally:
+            response.close()
+    except (requests.RequestException, urllib3.exceptions.HTTPError, OSError) as exc:
+        status = getattr(getattr(exc, "response", None), "status_code", None)
+        return MirrorProbe(url, None, detail=f"HTTP {status}" if status else str(exc))
+    elapsed = max(time.monotonic() - started, 1e-6)
+    if response.status_code == 206:
+        total = response.headers.get("content-range", "").rpartition("/")[2]
+    else:
+        total = response.headers.get("content-length", "")
+    length = int(total) if total.isdigit() else None
+    return MirrorProbe(url, received / elapsed, length)
+
+
+def rank_mirrors(
+    urls: list[str],
+    *,
+    stats: MirrorStats | None = None,
+    client: DownloadClient | None = None,
+) -> list[str]:
+    """Order ``urls`` fastest first, probing hosts without fresh stats.
+
+    Args:
+        urls: Candidate URLs from :func:`mirror_urls`.
+        stats: Remembered throughput; probe results are recorded into it.
+        client: Pooled :class:`DownloadClient` for the probes.
+
+    Returns:
+        The usable URLs, fastest first; failed probes last (in the given
+        order); mirrors disagreeing on the file's length removed.
+    """
+    if len(urls) < 2:
+        return list(urls)
+    speeds: dict[str, float | None] = {
+        url: stats.throughput(url) if stats is not None else None for url in urls
+    }
+    unknown = [url for url in urls if speeds[url] is None]
+    probes: list[MirrorProbe] = []
+    if unknown:
+        with ThreadPoolExecutor(max_workers=len(unknown)) as pool:
+            probes = list(
+                pool.map(lambda url: probe_mirror(url, client=client), unknown)
+            )
+    lengths = {probe.url: probe.length for probe in probes if probe.length}
+    if lengths:
+        # The primary's length when it answered, else the majority's.
+        expected = lengths.get(urls[0])
+        if expected is None:
+            expected = Counter(lengths.values()).most_common(1)[0][0]
+        for url, length in lengths.items():
+            if length != expected:
+                logger.warning(
+                    "mirror %s serves %d bytes, not %d; skipping it",
+                    url,
+                    length,
+                    expected,
+                )
+                speeds.pop(url)
+    for probe in probes:
+        if probe.url not in speeds:
+            continue
+        if probe.bytes_per_second is None:
+            logger.info("mirror probe of %s failed: %s", probe.url, probe.detail)
+            continue
+        speeds[probe.url] = probe.bytes_per_second
+        if stats is not None:
+            stats.record(probe.url, probe.bytes_per_second)
+    return sorted(
+        speeds,
+        key=lambda url: (speeds[url] is None, -(speeds[url] or 0.0)),
+    )
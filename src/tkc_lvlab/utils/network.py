@@ -23,6 +23,11 @@ Differences from the lvscripts source:
     boundary translation in :func:`get_network_info` re-raises every
     libvirt-level failure as :class:`LibvirtNetworkError`.
 
+Parsed networks are memoized process-wide per ``(uri, network)`` by
+:class:`NetworkInfoCache`, so static-IP validation, smoke preflight and
+``createvm``'s v4/v6 resolution share one ``net-dumpxml`` per network
+instead of one per call.
+
 Nothing here reads ``Lvlab.yml`` or imports a CLI module — the standalone
 ``createvm`` and the future manifest workflow can both depend on it.
 """
@@ -30,14 +35,21 @@ Nothing here reads ``Lvlab.yml`` or imports a CLI module — the standalone
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import cached_property
+import hashlib
 import ipaddress
 import secrets
-from typing import Any
+import threading
+import time
+from typing import TYPE_CHECKING, Any
 import xml.etree.ElementTree as ET
 
 from ..exceptions import LibvirtNetworkError, VirshError
 from .virsh import run_virsh
 
+if TYPE_CHECKING:
+    from .virsh_cache import VirshReadCache
+
 # QEMU/KVM's registered OUI. libvirt assigns guest NICs MACs from this
 # prefix by default, so generating our own from the same range keeps the
 # address indistinguishable from an auto-assigned one.
@@ -115,9 +127,9 @@ class LibvirtNetworkInfo:
     dhcp6_start: str | None = None
     dhcp6_end: str | None = None
 
-    @property
+    @cached_property
     def subnet(self) -> ipaddress.IPv4Network | None:
-        """Return the IPv4 subnet inferred from gateway + netmask.
+        """Return the IPv4 subnet inferred from gateway + netmask (computed once).
 
         Returns:
             The :class:`ipaddress.IPv4Network` covering the gateway address
@@ -129,9 +141,9 @@ class LibvirtNetworkInfo:
             return None
         return ipaddress.IPv4Network(f"{self.gateway_ip}/{self.netmask}", strict=False)
 
-    @property
+    @cached_property
     def subnet6(self) -> ipaddress.IPv6Network | None:
-        """Return the IPv6 subnet inferred from ``gateway_ip6`` + ``prefix6``.
+        """Return the IPv6 subnet inferred from ``gateway_ip6`` + ``prefix6`` (computed once).
 
         Returns:
             The :class:`ipaddress.IPv6Network` covering the v6 gateway
@@ -142,16 +154,150 @@ class LibvirtNetworkInfo:
             return None
         return ipaddress.IPv6Network(f"{self.gateway_ip6}/{self.prefix6}", strict=False)
 
+    @cached_property
+    def dhcp_range(self) -> tuple[ipaddress.IPv4Address, ipaddress.IPv4Address] | None:
+        """Return the parsed ``(dhcp_start, dhcp_end)`` v4 pair, or ``None``."""
+        if not (self.dhcp_start and self.dhcp_end):
+            return None
+        return ipaddress.IPv4Address(self.dhcp_start), ipaddress.IPv4Address(self.dhcp_end)
+
+    @cached_property
+    def dhcp6_range(
+        self,
+    ) -> tuple[ipaddress.IPv6Address, ipaddress.IPv6Address] | None:
+        """Return the parsed ``(dhcp6_start, dhcp6_end)`` v6 pair, or ``None``."""
+        if not (self.dhcp6_start and self.dhcp6_end):
+            return None
+        return ipaddress.IPv6Address(self.dhcp6_start), ipaddress.IPv6Address(
+            self.dhcp6_end
+        )
+
+    def _precompute(self) -> None:
+        """Materialize every derived value so cache hits never recompute them."""
+        for attr in ("subnet", "subnet6", "dhcp_range", "dhcp6_range"):
+            getattr(self, attr)
+
+
+#: Seconds a cached network definition is trusted without re-reading it.
+NETWORK_INFO_TTL = 30.0
+
 
-def get_network_info(uri: str, network_name: str) -> LibvirtNetworkInfo:
+@dataclass
+class _NetworkEntry:
+    """One memoized network: the parsed view plus what validates it."""
+
+    info: LibvirtNetworkInfo
+    xml_hash: str
+    checked_at: float
+
+
+class NetworkInfoCache:
+    """Process-wide memo of parsed libvirt networks keyed by ``(uri, network)``.
+
+    Within :attr:`ttl` seconds of the last read an entry is returned without
+    running ``virsh`` at all. Past that, ``net-dumpxml`` runs again but the
+    XML is only re-parsed when its SHA-256 differs from the cached one, so a
+    long-running command pays one cheap read per TTL window and a re-parse
+    only when the network was actually redefined.
+
+    Args:
+        ttl: Seconds an entry is trusted without re-reading the XML.
+        clock: Monotonic clock; injectable for tests.
+
+    Attributes:
+        hits: Lookups answered without running ``virsh``.
+        revalidations: Expired entries whose XML hash still matched.
+        parses: XML documents actually parsed.
+    """
+
+    def __init__(self, ttl: float = NETWORK_INFO_TTL, clock=time.monotonic) -> None:
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: dict[tuple[str, str], _NetworkEntry] = {}
+        self.hits = 0
+        self.revalidations = 0
+        self.parses = 0
+
+    def get(
+        self,
+        uri: str,
+        network_name: str,
+        *,
+        cache: VirshReadCache | None = None,
+    ) -> LibvirtNetworkInfo:
+        """Return the parsed network, reading ``virsh`` only when needed.
+
+        Raises:
+            LibvirtNetworkError: As :func:`get_network_info`. A failed read
+                drops any cached entry for the network.
+        """
+        key = (uri, network_name)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._clock() - entry.checked_at < self.ttl:
+                self.hits += 1
+                return entry.info
+
+        try:
+            xml = _dump_network_xml(uri, network_name, cache=cache)
+        except LibvirtNetworkError:
+            self.invalidate(uri, network_name)
+            raise
+        xml_hash = hashlib.sha256(xml.encode("utf-8")).hexdigest()
+        if entry is not None and entry.xml_hash == xml_hash:
+            info = entry.info
+            with self._lock:
+                self.revalidations += 1
+        else:
+            info = _parse_network_xml(xml, network_name)
+            info._precompute()
+            with self._lock:
+                self.parses += 1
+        with self._lock:
+            self._entries[key] = _NetworkEntry(info, xml_hash, self._clock())
+        return info
+
+    def invalidate(self, uri: str | None = None, network_name: str | None = None) -> None:
+        """Drop entries for one network, one URI, or (no arguments) everything."""
+        with self._lock:
+            for key in list(self._entries):
+                if (uri is None or key[0] == uri) and (
+                    network_name is None or key[1] == network_name
+                ):
+                    del self._entries[key]
+
+
+_NETWORK_INFO_CACHE = NetworkInfoCache()
+
+
+def network_info_cache() -> NetworkInfoCache:
+    """Return the process-wide :class:`NetworkInfoCache`."""
+    return _NETWORK_INFO_CACHE
+
+
+def get_network_info(
+    uri: str,
+    network_name: str,
+    *,
+    cache: VirshReadCache | None = None,
+) -> LibvirtNetworkInfo:
     """Resolve libvirt network metadata via ``virsh net-dumpxml``.
 
+    Results are memoized in the process-wide :class:`NetworkInfoCache`
+    (see :func:`network_info_cache`), so repeated calls for the same
+    network — one per machine on a large manifest — cost one
+    ``net-dumpxml``. The returned object carries its subnets and DHCP
+    ranges already parsed.
+
     Args:
         uri: libvirt connection URI (e.g. ``qemu:///system``,
             ``qemu:///session``). Passed through to
             :func:`tkc_lvlab.utils.virsh.run_virsh`.
         network_name: The libvirt network name (the value normally passed
             to ``virsh net-dumpxml <name>``).
+        cache: Optional request-scoped read cache for the ``net-dumpxml``
+            read.
 
     Returns:
         A populated :class:`LibvirtNetworkInfo`. Optional fields are
@@ -165,16 +311,27 @@ def get_network_info(uri: str, network_name: str) -> LibvirtNetworkInfo:
             original :class:`VirshError` or :class:`xml.etree.ElementTree.ParseError`
             is chained via ``__cause__``.
     """
+    return _NETWORK_INFO_CACHE.get(uri, network_name, cache=cache)
+
+
+def _dump_network_xml(
+    uri: str, network_name: str, *, cache: VirshReadCache | None = None
+) -> str:
+    """Return ``virsh net-dumpxml`` output, translating failures."""
     try:
-        result = run_virsh(uri, ["net-dumpxml", network_name])
+        result = run_virsh(uri, ["net-dumpxml", network_name], cache=cache)
     except VirshError as exc:
         raise LibvirtNetworkError(
             f"Unable to inspect libvirt network '{network_name}': "
             f"{exc.stderr or '<no stderr>'}"
         ) from exc
+    return result.stdout
+
 
+def _parse_network_xml(xml: str, network_name: str) -> LibvirtNetworkInfo:
+    """Parse one ``net-dumpxml`` document into a :class:`LibvirtNetworkInfo`."""
     try:
-        root = ET.fromstring(result.stdout)
+        root = ET.fromstring(xml)
     except ET.ParseError as exc:
         raise LibvirtNetworkError(
             f"Invalid net-dumpxml response for network '{network_name}'."
@@ -315,10 +472,12 @@ def validate_static_ip(vm_ip: str, network_info: LibvirtNetworkInfo) -> None:
 
     if ip_value.version == 6:
         subnet = network_info.subnet6
+        dhcp_range = network_info.dhcp6_range
         dhcp_start_str = network_info.dhcp6_start
         dhcp_end_str = network_info.dhcp6_end
     else:
         subnet = network_info.subnet
+        dhcp_range = network_info.dhcp_range
         dhcp_start_str = network_info.dhcp_start
         dhcp_end_str = network_info.dhcp_end
 
@@ -328,9 +487,8 @@ def validate_static_ip(vm_ip: str, network_info: LibvirtNetworkInfo) -> None:
             f"for network '{network_info.name}'."
         )
 
-    if dhcp_start_str and dhcp_end_str:
-        dhcp_start = ipaddress.ip_address(dhcp_start_str)
-        dhcp_end = ipaddress.ip_address(dhcp_end_str)
+    if dhcp_range is not None:
+        dhcp_start, dhcp_end = dhcp_range
         if dhcp_start <= ip_value <= dhcp_end:
             raise ValueError(
                 f"IP address '{ip_value}' falls within DHCP range "
@@ -0,0 +1,150 @@
+"""Shared download bandwidth budget (``lvlab init --limit-rate``).
+
+``lvlab init`` runs ``--jobs`` image workers, each of which may fetch
+several byte ranges at once; unthrottled, they saturate a shared uplink. A
+single :class:`TokenBucket` caps their combined rate instead:
+
+- The bucket refills at :attr:`TokenBucket.rate` bytes per second and holds
+    at most :attr:`TokenBucket.burst` bytes, so an idle pause does not buy
+    an unbounded burst afterwards. Every body read spends its size before
+    it is issued (see :class:`ByteBudget`), and reads never ask for more
+    than the burst, so the display keeps moving at low rates too.
+- Readers that find the bucket empty queue up and are served strictly by
+    priority (lower first, then arrival order), so the image the next
+    ``lvlab up`` needs gets the bytes ahead of the rest of the catalog.
+
+The :class:`~tkc_lvlab.utils.http_client.DownloadClient` owns the bucket and
+hands each download a :class:`ByteBudget` at its worker's priority.
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import re
+import threading
+import time
+from dataclasses import dataclass
+
+#: A full bucket holds this many seconds of the configured rate ...
+BURST_SECONDS = 0.25
+#: ... but never fewer bytes than this.
+MIN_BURST_BYTES = 16 * 1024
+
+_RATE_PATTERN = re.compile(
+    r"\s*(?P<value>\d+(?:\.\d+)?)\s*(?P<unit>[kmg]?)(?:i?b)?(?:/s)?\s*", re.IGNORECASE
+)
+_RATE_UNITS = {"": 1, "k": 1024, "m": 1024**2, "g": 1024**3}
+
+
+def parse_rate(text: str) -> int:
+    """Parse a ``curl``-style rate such as ``500K``, ``10M`` or ``1.5GiB/s``.
+
+    Units are binary (``K`` = 1024 bytes); a bare number is bytes per second.
+
+    Args:
+        text: The rate as typed on the command line.
+
+    Returns:
+        The rate in bytes per second.
+
+    Raises:
+        ValueError: ``text`` is not a positive rate.
+    """
+    match = _RATE_PATTERN.fullmatch(text)
+    rate = 0
+    if match:
+        rate = int(float(match["value"]) * _RATE_UNITS[match["unit"].lower()])
+    if rate <= 0:
+        raise ValueError(
+            f"invalid rate {text!r}; expected bytes per second such as "
+            "500K, 10M or 1.5G"
+        )
+    return rate
+
+
+class TokenBucket:
+    """Thread-safe token bucket whose waiters are served by priority.
+
+    Args:
+        rate: Sustained budget in bytes per second.
+        burst: Bucket capacity in bytes; defaults to :data:`BURST_SECONDS`
+            of ``rate`` (at least :data:`MIN_BURST_BYTES`).
+
+    Raises:
+        ValueError: ``rate`` is not positive.
+    """
+
+    def __init__(self, rate: float, *, burst: int | None = None) -> None:
+        if rate <= 0:
+            raise ValueError(f"rate must be positive, got {rate!r}")
+        self.rate = float(rate)
+        self.burst = burst or max(MIN_BURST_BYTES, int(rate * BURST_SECONDS))
+        self._tokens = float(self.burst)
+        self._stamp = time.monotonic()
+        self._cond = threading.Condition()
+        self._waiters: list[tuple[int, int]] = []
+        self._arrivals = itertools.count()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(
+            float(self.burst), self._tokens + (now - self._stamp) * self.rate
+        )
+        self._stamp = now
+
+    def consume(self, nbytes: int, *, priority: int = 0) -> float:
+        """Block until ``nbytes`` may be transferred, then spend them.
+
+        A request larger than the burst waits for a full bucket and leaves
+        it in debt, which the following requests wait out.
+
+        Args:
+            nbytes: Bytes about to be read.
+            priority: Queue position among waiters; lower is served first.
+
+        Returns:
+            Seconds spent waiting.
+        """
+        started = time.monotonic()
+        need = min(float(nbytes), float(self.burst))
+        ticket = (priority, next(self._arrivals))
+        with self._cond:
+            heapq.heappush(self._waiters, ticket)
+            try:
+                while True:
+                    self._refill()
+                    if self._waiters[0] != ticket:
+                        self._cond.wait()
+                    elif self._tokens < need:
+                        self._cond.wait((need - self._tokens) / self.rate)
+                    else:
+                        break
+            finally:
+                self._waiters.remove(ticket)
+                heapq.heapify(self._waiters)
+                self._cond.notify_all()
+            self._tokens -= nbytes
+        return time.monotonic() - started
+
+
+@dataclass(frozen=True)
+class ByteBudget:
+    """One download's handle on a shared :class:`TokenBucket`.
+
+    Attributes:
+        bucket: The bucket shared by every concurrent download.
+        priority: This download's place in the bucket's queue.
+    """
+
+    bucket: TokenBucket
+    priority: int = 0
+
+    @property
+    def max_read(self) -> int:
+        """Largest read worth issuing: one bucketful."""
+        return self.bucket.burst
+
+    def spend(self, nbytes: int) -> float:
+        """Wait for and spend ``nbytes``; return the seconds waited."""
+        return self.bucket.consume(nbytes, priority=self.priority)
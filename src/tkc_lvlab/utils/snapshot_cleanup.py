@@ -29,8 +29,13 @@ locale lock and timeout handling are uniform; failures raise
 
 from __future__ import annotations
 
+from typing import TYPE_CHECKING
+
 from .virsh import VirshError, run_virsh
 
+if TYPE_CHECKING:
+    from .virsh_cache import VirshReadCache
+
 _SNAPSHOT_UNDEFINE_MARKER = "cannot delete inactive domain"
 _SNAPSHOT_KEYWORD = "snapshot"
 
@@ -51,7 +56,9 @@ def _is_snapshot_undefine_error(stderr: str) -> bool:
     return _SNAPSHOT_UNDEFINE_MARKER in s and _SNAPSHOT_KEYWORD in s
 
 
-def undefine_with_snapshot_cleanup(uri: str, domain_name: str) -> None:
+def undefine_with_snapshot_cleanup(
+    uri: str, domain_name: str, *, cache: VirshReadCache | None = None
+) -> None:
     """Undefine ``domain_name``, dropping any blocking snapshots in one shot.
 
     Tries ``virsh undefine`` directly. On the specific snapshot-related
@@ -67,6 +74,8 @@ def undefine_with_snapshot_cleanup(uri: str, domain_name: str) -> None:
     Args:
         uri: libvirt connection URI.
         domain_name: The libvirt domain to undefine.
+        cache: Optional request-scoped read cache; both undefine attempts
+            invalidate the domain's entries in it.
 
     Raises:
         VirshError: The ``--snapshots-metadata`` retry also failed, OR the
@@ -74,11 +83,13 @@ def undefine_with_snapshot_cleanup(uri: str, domain_name: str) -> None:
             exception carries the failing ``virsh`` stderr.
     """
     try:
-        run_virsh(uri, ["undefine", domain_name])
+        run_virsh(uri, ["undefine", domain_name], cache=cache)
         return
     except VirshError as exc:
         if not _is_snapshot_undefine_error(exc.stderr):
             raise
         # Snapshots are blocking the undefine. Drop the domain and every
         # snapshot's metadata in a single call (virt-manager's approach).
-        run_virsh(uri, ["undefine", domain_name, "--snapshots-metadata"])
+        run_virsh(
+            uri, ["undefine", domain_name, "--snapshots-metadata"], cache=cache
+        )
@@ -0,0 +1,292 @@
+"""``--trace FILE``: record every external process a command spawns.
+
+lvlab shells out to ``virsh``, ``virt-install``, ``qemu-img``, ``openssl``,
+``ssh`` and friends, and on a slow host the question is always *which* of
+those calls ate the time. :func:`trace_to` answers it:
+
+- While a trace is active, :class:`subprocess.Popen` is swapped for a
+    subclass that times every child from spawn to reap. Every
+    ``subprocess.run`` anywhere in the package (or in a library it calls)
+    is captured without touching the call site.
+- ``virsh`` calls are recorded one level up, by
+    :func:`~tkc_lvlab.utils.virsh.run_virsh` and its async twin, through
+    :func:`trace_span`. That record is the *logical* call: it covers every
+    connection-drop retry and ``_CONNECTION_ERROR_BACKOFF`` sleep, counts
+    them, and says whether the call forked, rode a pooled session or was
+    answered from the read cache. The per-attempt ``Popen`` records inside
+    a span are suppressed so a call is never counted twice.
+- Each finished record is appended to ``FILE`` as one JSON object per line
+    (flushed immediately, so a crashed run still leaves a usable trace), and
+    a per-program summary table is printed to stderr when the trace closes.
+
+Outside a :func:`trace_to` block nothing is patched and :func:`trace_span`
+yields a throwaway span, so the instrumentation costs a context-variable
+read.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import json
+import os
+import subprocess
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Iterator
+
+from .output import get_console, styled_table
+
+#: Record kinds: a raw child process, or a logical ``virsh`` call.
+KIND_PROCESS = "process"
+KIND_VIRSH = "virsh"
+
+# Set inside a trace_span: Popen records are folded into the span instead.
+_IN_SPAN: contextvars.ContextVar[bool] = contextvars.ContextVar(
+    "lvlab_trace_in_span", default=False
+)
+
+_ORIGINAL_POPEN = subprocess.Popen
+
+
+@dataclass
+class TraceRecord:
+    """One traced call, serialized as one JSON line.
+
+    Attributes:
+        kind: :data:`KIND_PROCESS` or :data:`KIND_VIRSH`.
+        argv: The command line.
+        started_at: Wall-clock start (seconds since the epoch).
+        duration_s: Spawn-to-reap (or call-to-return) seconds.
+        returncode: Exit code, or ``None`` if the call raised first.
+        retries: Connection-drop retries (``virsh`` only).
+        backoff_s: Seconds slept between those retries.
+        transport: ``exec`` / ``session`` / ``cache`` / ``batch`` for
+            ``virsh`` calls.
+        error: Exception text when the call raised instead of returning.
+    """
+
+    kind: str
+    argv: list[str]
+    started_at: float
+    duration_s: float = 0.0
+    returncode: int | None = None
+    retries: int = 0
+    backoff_s: float = 0.0
+    transport: str | None = None
+    error: str | None = None
+
+    @property
+    def program(self) -> str:
+        """Summary grouping key: ``virsh <verb>`` or the binary's basename."""
+        if not self.argv:
+            return "?"
+        name = os.path.basename(self.argv[0])
+        if self.kind == KIND_VIRSH:
+            # A batch passes all its verbs as one string; group on the first.
+            verb = self.argv[3].split(" ", 1)[0] if len(self.argv) > 3 else ""
+            return f"virsh {verb}".strip()
+        return name
+
+    @property
+    def failed(self) -> bool:
+        """Whether the call raised or exited nonzero."""
+        return self.error is not None or bool(self.returncode)
+
+
+@dataclass
+class _Span:
+    """Mutable view of a record while its call is still running."""
+
+    record: TraceRecord
+    _t0: float = field(default_factory=time.monotonic)
+
+    def retry(self, backoff_s: float) -> None:
+        """Count one retry and the backoff slept before it."""
+        self.record.retries += 1
+        self.record.backoff_s += backoff_s
+
+    def finish(self, returncode: int | None) -> None:
+        """Record the call's exit code."""
+        self.record.returncode = returncode
+
+
+class Tracer:
+    """Collects :class:`TraceRecord` objects and streams them to a file.
+
+    Args:
+        path: JSON-lines output file (truncated).
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.records: list[TraceRecord] = []
+        self._lock = threading.Lock()
+        self._fh = path.open("w", encoding="utf-8")
+
+    def add(self, record: TraceRecord) -> None:
+        """Append ``record`` and write it out as one JSON line."""
+        with self._lock:
+            self.records.append(record)
+            if not self._fh.closed:
+                self._fh.write(json.dumps(asdict(record), sort_keys=True) + "\n")
+                self._fh.flush()
+
+    def close(self) -> None:
+        """Close the output file."""
+        with self._lock:
+            self._fh.close()
+
+    def summary(self) -> list[dict[str, Any]]:
+        """Aggregate records per program, slowest total first.
+
+        Returns:
+            One dict per program with ``program``, ``calls``, ``failed``,
+            ``retries``, ``total_s``, ``mean_s`` and ``max_s``.
+        """
+        groups: dict[str, list[TraceRecord]] = {}
+        with self._lock:
+            for record in self.records:
+                groups.setdefault(record.program, []).append(record)
+        rows = [
+            {
+                "program": program,
+                "calls": len(records),
+                "failed": sum(1 for r in records if r.failed),
+                "retries": sum(r.retries for r in records),
+                "total_s": sum(r.duration_s for r in records),
+                "mean_s": sum(r.duration_s for r in records) / len(records),
+                "max_s": max(r.duration_s for r in records),
+            }
+            for program, records in groups.items()
+        ]
+        rows.sort(key=lambda row: row["total_s"], reverse=True)
+        return rows
+
+    def render_summary(self) -> None:
+        """Print the per-program summary table to stderr."""
+        table = styled_table(f"Trace: {self.path}")
+        for column in ("Program", "Calls", "Failed", "Retries", "Total s", "Mean s", "Max s"):
+            table.add_column(column, justify="left" if column == "Program" else "right")
+        for row in self.summary():
+            table.add_row(
+                row["program"],
+                str(row["calls"]),
+                str(row["failed"]),
+                str(row["retries"]),
+                f"{row['total_s']:.3f}",
+                f"{row['mean_s']:.3f}",
+                f"{row['max_s']:.3f}",
+            )
+        get_console(stderr=True).print(table)
+
+
+_ACTIVE_TRACER: Tracer | None = None
+
+
+def active_tracer() -> Tracer | None:
+    """Return the tracer opened by :func:`trace_to`, if any."""
+    return _ACTIVE_TRACER
+
+
+def _popen_argv(args: Any) -> list[str]:
+    if isinstance(args, (str, bytes, os.PathLike)):
+        return [os.fsdecode(args)]
+    return [os.fsdecode(arg) for arg in args]
+
+
+class _TracedPopen(_ORIGINAL_POPEN):  # type: ignore[misc,valid-type]
+    """:class:`subprocess.Popen` that records spawn-to-reap time on the tracer."""
+
+    def __init__(self, args: Any, *posargs: Any, **kwargs: Any) -> None:
+        tracer = _ACTIVE_TRACER
+        self._lvlab_tracer = None if _IN_SPAN.get() else tracer
+        self._lvlab_record = TraceRecord(
+            kind=KIND_PROCESS, argv=_popen_argv(args), started_at=time.time()
+        )
+        self._lvlab_t0 = time.monotonic()
+        try:
+            super().__init__(args, *posargs, **kwargs)
+        except OSError as exc:
+            self._lvlab_record.error = str(exc)
+            self._lvlab_done()
+            raise
+
+    def wait(self, timeout: float | None = None) -> int:
+        returncode = super().wait(timeout)
+        self._lvlab_done()
+        return returncode
+
+    def poll(self) -> int | None:
+        returncode = super().poll()
+        if returncode is not None:
+            self._lvlab_done()
+        return returncode
+
+    def _lvlab_done(self) -> None:
+        tracer, self._lvlab_tracer = self._lvlab_tracer, None
+        if tracer is None:
+            return
+        self._lvlab_record.duration_s = time.monotonic() - self._lvlab_t0
+        if self._lvlab_record.error is None:
+            self._lvlab_record.returncode = self.returncode
+        tracer.add(self._lvlab_record)
+
+
+@contextlib.contextmanager
+def trace_span(kind: str, argv: list[str]) -> Iterator[_Span]:
+    """Record one logical call (and fold the processes it spawns into it).
+
+    Args:
+        kind: Record kind, e.g. :data:`KIND_VIRSH`.
+        argv: The logical command line.
+
+    Yields:
+        A span the caller annotates via :meth:`_Span.retry`,
+        :meth:`_Span.finish` and ``span.record.transport``. The record is
+        emitted when the block exits, with ``error`` set if it raised.
+    """
+    span = _Span(TraceRecord(kind=kind, argv=list(argv), started_at=time.time()))
+    tracer = _ACTIVE_TRACER
+    if tracer is None:
+        yield span
+        return
+    token = _IN_SPAN.set(True)
+    try:
+        yield span
+    except BaseException as exc:
+        span.record.error = str(exc) or type(exc).__name__
+        raise
+    finally:
+        _IN_SPAN.reset(token)
+        span.record.duration_s = time.monotonic() - span._t0
+        tracer.add(span.record)
+
+
+@contextlib.contextmanager
+def trace_to(path: Path, *, summary: bool = True) -> Iterator[Tracer]:
+    """Trace every subprocess spawned inside the block to ``path``.
+
+    Args:
+        path: JSON-lines output file.
+        summary: Print the per-program summary table on exit.
+
+    Yields:
+        The active :class:`Tracer`.
+    """
+    global _ACTIVE_TRACER  # pylint: disable=global-statement
+    tracer = Tracer(path)
+    previous = _ACTIVE_TRACER
+    _ACTIVE_TRACER = tracer
+    subprocess.Popen = _TracedPopen  # type: ignore[misc]
+    try:
+        yield tracer
+    finally:
+        _ACTIVE_TRACER = previous
+        if previous is None:
+            subprocess.Popen = _ORIGINAL_POPEN  # type: ignore[misc]
+        tracer.close()
+        if summary and tracer.records:
+            tracer.render_summary()
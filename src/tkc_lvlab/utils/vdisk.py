@@ -20,16 +20,26 @@ Two disk strategies (issue #99):
 
 Select per environment with ``config_defaults.disk_strategy: copy|backing``,
 overridable per disk with ``disks[*].strategy``.
+
+:func:`read_disk_header` reads a qcow2 or raw image's virtual size, cluster
+size and backing file straight from its header, so cleanup scans and
+``createvm`` do not spawn ``qemu-img info`` per disk. :func:`disk_header`
+adds the ``qemu-img`` fallback for the formats it does not parse.
 """
 
 from __future__ import annotations
 
+import functools
+import json
 import os
 import shutil
+import struct
 import subprocess
+from dataclasses import dataclass
 from typing import Any
 
 from .._logging import get_logger
+from .subprocess_env import system_first_env
 
 logger = get_logger(__name__)
 
@@ -241,3 +251,219 @@ class VirtualDisk:
                 os.remove(self.fpath)
             except Exception as e:  # pylint: disable=broad-except
                 logger.error("Exception removing vdisk: %s", e)
+
+
+# --- image headers -----------------------------------------------------------
+
+_QCOW2_MAGIC = b"QFI\xfb"
+# magic, version, backing_file_offset, backing_file_size, cluster_bits, size
+_QCOW2_HEADER = struct.Struct(">4sIQIIQ")
+_QCOW2_V2_HEADER_LENGTH = 72
+_QCOW2_V3_HEADER_LENGTH = 104
+_QCOW2_EXT = struct.Struct(">II")
+_QCOW2_EXT_END = 0
+_QCOW2_EXT_BACKING_FORMAT = 0xE2792ACA
+# qemu never writes more than a cluster of header, extensions and backing name.
+_QCOW2_MAX_HEADER_BYTES = 2 * 1024 * 1024
+# (offset, magic) of formats qemu-img can probe that this module does not
+# parse; they go to the qemu-img fallback rather than being mistaken for raw.
+_OTHER_FORMAT_MAGICS = (
+    (0, b"QFI\xfb"),  # qcow (version 1)
+    (0, b"QED\x00"),
+    (0, b"KDMV"),  # vmdk sparse extent
+    (0, b"# Disk DescriptorFile"),  # vmdk descriptor
+    (0, b"COWD"),  # vmdk3
+    (0, b"conectix"),  # vpc
+    (0, b"vhdxfile"),
+    (0, b"LUKS\xba\xbe"),
+    (0, b"WithoutFreeSpace"),  # parallels
+    (0, b"WithouFreSpacExt"),  # parallels
+    (0, b"Bochs Virtual HD Image"),
+    (0, b"#!/bin/sh\n#V2.0 Format"),  # cloop
+    (0x40, b"\x7f\x10\xda\xbe"),  # vdi
+)
+# Enough of the file for a qcow2 v3 header and every magic above (vdi's
+# ends at 0x44).
+_PROBE_BYTES = max(
+    _QCOW2_V3_HEADER_LENGTH,
+    *(offset + len(magic) for offset, magic in _OTHER_FORMAT_MAGICS),
+)
+
+
+@dataclass(frozen=True)
+class DiskHeader:
+    """Header fields of a disk image, in ``qemu-img info`` terms.
+
+    Attributes:
+        fpath: The image the header was read from.
+        format: ``qcow2``, ``raw``, or whatever ``qemu-img`` reported.
+        virtual_size: Guest-visible size in bytes.
+        cluster_size: Allocation unit in bytes; ``None`` for raw images.
+        backing_file: The backing file as recorded in the image (possibly
+            relative); ``None`` when the image has none.
+        backing_format: The recorded backing format, when there is one.
+    """
+
+    fpath: str
+    format: str
+    virtual_size: int
+    cluster_size: int | None = None
+    backing_file: str | None = None
+    backing_format: str | None = None
+
+    @property
+    def full_backing_file(self) -> str | None:
+        """:attr:`backing_file` resolved against the image's directory.
+
+        Mirrors ``qemu-img``'s ``full-backing-filename``.
+        """
+        if not self.backing_file:
+            return None
+        if "://" in self.backing_file or self.backing_file.startswith("json:"):
+            return self.backing_file  # a protocol URL, not a path
+        return os.path.join(os.path.dirname(self.fpath), self.backing_file)
+
+
+def read_disk_header(fpath: str) -> DiskHeader | None:
+    """Read a qcow2 or raw image's header without running ``qemu-img``.
+
+    Results are memoized per path, size and modification time, so repeat
+    calls on an unchanged image do not touch the file.
+
+    Args:
+        fpath: Path to the image.
+
+    Returns:
+        The header, or ``None`` for a format this module does not parse
+        (qcow v1, vmdk, vdi, ...); :func:`disk_header` asks ``qemu-img``
+        about those.
+
+    Raises:
+        OSError: The image could not be stat'ed or read.
+        ValueError: The image claims to be qcow2 but its header is corrupt.
+    """
+    info = os.stat(fpath)
+    return _read_disk_header(fpath, info.st_size, info.st_mtime_ns)
+
+
+@functools.lru_cache(maxsize=1024)
+def _read_disk_header(fpath: str, file_size: int, mtime_ns: int) -> DiskHeader | None:
+    """:func:`read_disk_header` keyed by the stat fields that invalidate it."""
+    del mtime_ns  # part of the cache key only
+    with open(fpath, "rb") as image:
+        head = image.read(_PROBE_BYTES)
+        if head[:4] == _QCOW2_MAGIC and len(head) >= _QCOW2_V2_HEADER_LENGTH:
+            version = struct.unpack_from(">I", head, 4)[0]
+            if version in (2, 3):
+                return _read_qcow2_header(fpath, image, head, version)
+        for offset, magic in _OTHER_FORMAT_MAGICS:
+            if head[offset : offset + len(magic)] == magic:
+                return None
+    return DiskHeader(fpath=fpath, format="raw", virtual_size=file_size)
+
+
+def _read_qcow2_header(fpath: str, image: Any, head: bytes, version: int) -> DiskHeader:
+    """Decode a qcow2 v2/v3 header whose first bytes are ``head``."""
+    _magic, _version, backing_offset, backing_size, cluster_bits, size = (
+        _QCOW2_HEADER.unpack_from(head)
+    )
+    if not 9 <= cluster_bits <= 21:
+        raise ValueError(f"{fpath}: qcow2 cluster_bits {cluster_bits} out of range")
+    header_length = _QCOW2_V2_HEADER_LENGTH
+    if version == 3:
+        if len(head) < _QCOW2_V3_HEADER_LENGTH:
+            raise ValueError(f"{fpath}: qcow2 v3 header truncated")
+        header_length = struct.unpack_from(">I", head, 100)[0]
+        if header_length < _QCOW2_V3_HEADER_LENGTH:
+            raise ValueError(f"{fpath}: qcow2 header_length {header_length} too short")
+
+    backing_file = None
+    if backing_offset:
+        if backing_offset + backing_size > _QCOW2_MAX_HEADER_BYTES:
+            raise ValueError(f"{fpath}: qcow2 backing file name out of range")
+        image.seek(backing_offset)
+        raw_name = image.read(backing_size)
+        if len(raw_name) != backing_size:
+            raise ValueError(f"{fpath}: qcow2 backing file name truncated")
+        backing_file = raw_name.decode("utf-8", errors="surrogateescape")
+
+    backing_format = None
+    if backing_file:
+        backing_format = _qcow2_backing_format(image, header_length, 1 << cluster_bits)
+    return DiskHeader(
+        fpath=fpath,
+        format="qcow2",
+        virtual_size=size,
+        cluster_size=1 << cluster_bits,
+        backing_file=backing_file,
+        backing_format=backing_format,
+    )
+
+
+def _qcow2_backing_format(image: Any, offset: int, cluster_size: int) -> str | None:
+    """Walk the header extensions after ``offset`` for the backing format."""
+    image.seek(offset)
+    extensions = image.read(max(0, cluster_size - offset))
+    pos = 0
+    while pos + _QCOW2_EXT.size <= len(extensions):
+        ext_type, ext_len = _QCOW2_EXT.unpack_from(extensions, pos)
+        pos += _QCOW2_EXT.size
+        if ext_type == _QCOW2_EXT_END or pos + ext_len > len(extensions):
+            return None
+        if ext_type == _QCOW2_EXT_BACKING_FORMAT:
+            return extensions[pos : pos + ext_len].decode("ascii", errors="replace")
+        pos += (ext_len + 7) & ~7
+    return None
+
+
+def disk_header(fpath: str) -> DiskHeader | None:
+    """Header of any image ``qemu-img`` understands, natively where possible.
+
+    qcow2 and raw are read in-process (:func:`read_disk_header`); other
+    formats cost one ``qemu-img info``, memoized like the native reads.
+
+    Returns:
+        The header, or ``None`` when the image could not be read or
+        ``qemu-img`` could not be consulted (logged at debug level).
+    """
+    try:
+        header = read_disk_header(fpath)
+        if header is not None:
+            return header
+        info = os.stat(fpath)
+    except (OSError, ValueError) as exc:
+        logger.debug("cannot read the header of %s: %s", fpath, exc)
+        return None
+    try:
+        return _qemu_img_header(fpath, info.st_size, info.st_mtime_ns)
+    except (OSError, subprocess.CalledProcessError, ValueError) as exc:
+        logger.debug("qemu-img info failed for %s: %s", fpath, exc)
+        return None
+
+
+@functools.lru_cache(maxsize=256)
+def _qemu_img_header(fpath: str, file_size: int, mtime_ns: int) -> DiskHeader:
+    """``qemu-img info`` as a :class:`DiskHeader`, memoized like the native path.
+
+    Failures raise, so ``lru_cache`` does not remember them and the next
+    call asks again.
+    """
+    del file_size, mtime_ns  # part of the cache key only
+    result = subprocess.run(
+        ["qemu-img", "info", "--output=json", fpath],
+        capture_output=True,
+        text=True,
+        check=True,
+        env=system_first_env(),
+    )
+    info = json.loads(result.stdout)
+    if not isinstance(info, dict) or not isinstance(info.get("virtual-size"), int):
+        raise ValueError("qemu-img info gave no integer virtual-size")
+    return DiskHeader(
+        fpath=fpath,
+        format=str(info.get("format", "")),
+        virtual_size=info["virtual-size"],
+        cluster_size=info.get("cluster-size"),
+        backing_file=info.get("backing-filename"),
+        backing_format=info.get("backing-filename-format"),
+    )
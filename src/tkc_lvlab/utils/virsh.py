@@ -13,16 +13,24 @@ from __future__ import annotations
 
 import contextlib
 import os
+import shlex
 import subprocess
 import tempfile
 import time
+import uuid
 from dataclasses import dataclass
-from typing import Iterator
+from typing import TYPE_CHECKING, Iterator
 
 # Re-export so existing imports (``from tkc_lvlab.utils.virsh import
 # VirshError``) and isinstance checks keep working after the class definition
 # moved to the centralized hierarchy in :mod:`tkc_lvlab.exceptions`.
 from ..exceptions import VirshError
+from .trace import KIND_VIRSH, trace_span
+from .virsh_limit import OUTCOME_DROPPED, OUTCOME_OK, unlimited, virsh_limiter
+from .virsh_session import active_session_pool
+
+if TYPE_CHECKING:
+    from .virsh_cache import VirshReadCache
 
 # Transient libvirtd connection-drop retry (issue #129). Under high concurrency
 # the DBus-activated modular daemons (``virtqemud``) occasionally refuse a
@@ -63,6 +71,18 @@ def _is_transient_connection_error(stderr: str) -> bool:
     return any(marker in haystack for marker in _TRANSIENT_CONNECTION_MARKERS)
 
 
+def _c_locale_env() -> dict[str, str]:
+    """Return a copy of the environment with ``LC_ALL`` and ``LANG`` forced to ``C``.
+
+    Some distros' ``virsh`` honors ``LANG`` even when ``LC_ALL`` is set, so
+    both overrides are required to guarantee stable output parsing.
+    """
+    env = os.environ.copy()
+    env["LC_ALL"] = "C"
+    env["LANG"] = "C"
+    return env
+
+
 def run_virsh(
     uri: str,
     args: list[str],
@@ -71,6 +91,7 @@ def run_virsh(
     capture: bool = True,
     timeout: float | None = 30.0,
     input_text: str | None = None,
+    cache: VirshReadCache | None = None,
 ) -> subprocess.CompletedProcess[str]:
     """Run ``virsh -c <uri> <args...>`` and return the completed process.
 
@@ -87,6 +108,23 @@ def run_virsh(
     is safe to retry. Genuine command failures (bad args, missing domain) are
     not retried; a missing binary and a timeout still raise immediately.
 
+    Inside a :func:`~tkc_lvlab.utils.virsh_session.virsh_sessions` block, a
+    captured call without ``input_text`` is multiplexed over a pooled
+    interactive ``virsh`` shell for ``uri`` instead of forking a new process
+    (and re-doing the connect handshake). Retry and error semantics are the
+    same on both paths; a connection drop on the pooled path also discards
+    the pool's idle sessions for ``uri`` so the retry reconnects.
+
+    Every attempt holds a slot from the URI's
+    :class:`~tkc_lvlab.utils.virsh_limit.VirshLimiter`: concurrency adapts to
+    connection drops, and while the daemon is unreachable calls fail fast
+    with :class:`~tkc_lvlab.exceptions.VirshUnavailableError` (a
+    :class:`VirshError`) instead of retrying.
+
+    Under ``--trace`` each call is recorded once as a logical ``virsh`` span
+    (see :mod:`tkc_lvlab.utils.trace`) carrying its retry count, backoff
+    sleeps and transport (forked, pooled session, or cache hit).
+
     Args:
         uri: libvirt connection URI (e.g. ``qemu:///session``).
         args: ``virsh`` subcommand and flags (no leading ``virsh -c <uri>``).
@@ -99,6 +137,11 @@ def run_virsh(
             value explicitly.
         input_text: Optional stdin text. Reserved for future interactive use;
             no current Phase 2 caller passes this.
+        cache: Optional request-scoped
+            :class:`~tkc_lvlab.utils.virsh_cache.VirshReadCache`. A fresh
+            memoized read is returned without running ``virsh``; a
+            successful read is stored; any other verb invalidates the
+            entries it can have changed.
 
     Returns:
         The :class:`subprocess.CompletedProcess` from the invocation.
@@ -109,60 +152,326 @@ def run_virsh(
             raises after the retry budget is exhausted.
     """
     argv = ["virsh", "-c", uri, *args]
-    env = os.environ.copy()
-    env["LC_ALL"] = "C"
-    env["LANG"] = "C"
+    with trace_span(KIND_VIRSH, argv) as span:
+        if cache is not None and capture:
+            cached = cache.lookup(uri, args)
+            if cached is not None:
+                span.record.transport = "cache"
+                span.finish(cached.returncode)
+                return cached
+
+        run_kwargs: dict = {
+            "env": _c_locale_env(),
+            "timeout": timeout,
+            "input": input_text,
+        }
+        if capture:
+            run_kwargs.update(
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                encoding="utf-8",
+                errors="replace",
+            )
+
+        pool = active_session_pool() if capture and input_text is None else None
+        limiter = virsh_limiter(uri)
+
+        for attempt in range(len(_CONNECTION_ERROR_BACKOFF) + 1):
+            with (
+                limiter.admit(args) if limiter is not None else unlimited()
+            ) as admission:
+                try:
+                    result = None
+                    if pool is not None:
+                        result = pool.run(uri, args, timeout=timeout)
+                    span.record.transport = "exec" if result is None else "session"
+                    if result is None:
+                        result = subprocess.run(
+                            argv, **run_kwargs
+                        )  # noqa: S603 (args are constructed in-process)
+                except FileNotFoundError as exc:
+                    raise VirshError(
+                        127,
+                        "virsh binary not found in PATH; install libvirt-clients",
+                        args,
+                    ) from exc
+                except subprocess.TimeoutExpired as exc:
+                    admission.outcome = OUTCOME_DROPPED
+                    if cache is not None:
+                        # A timed-out mutation may still have landed.
+                        cache.record_mutation(uri, args)
+                    raise VirshError(
+                        -1,
+                        f"virsh timed out after {timeout}s: {' '.join(args)}",
+                        args,
+                    ) from exc
+                dropped = (
+                    capture
+                    and result.returncode != 0
+                    and _is_transient_connection_error(result.stderr or "")
+                )
+                admission.outcome = OUTCOME_DROPPED if dropped else OUTCOME_OK
+
+            # Retry only a transient connection drop, and only while attempts
+            # remain; everything else (success, or a genuine failure) falls
+            # through to the check below on this attempt's result. The
+            # admission slot is released before the backoff sleep.
+            if dropped and attempt < len(_CONNECTION_ERROR_BACKOFF):
+                if pool is not None:
+                    pool.reset(uri)
+                span.retry(_CONNECTION_ERROR_BACKOFF[attempt])
+                time.sleep(_CONNECTION_ERROR_BACKOFF[attempt])
+                continue
+            break
+
+        span.finish(result.returncode)
+        if cache is not None:
+            if capture:
+                cache.store(uri, args, result)
+            cache.record_mutation(uri, args)
+
+        if check and result.returncode != 0:
+            stderr = result.stderr if capture else ""
+            raise VirshError(result.returncode, stderr or "", args)
+
+        return result
 
-    run_kwargs: dict = {
-        "env": env,
-        "timeout": timeout,
-        "input": input_text,
-    }
-    if capture:
-        run_kwargs.update(
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            encoding="utf-8",
-            errors="replace",
-        )
 
-    for attempt in range(len(_CONNECTION_ERROR_BACKOFF) + 1):
-        try:
-            result = subprocess.run(
-                argv, **run_kwargs
-            )  # noqa: S603 (args are constructed in-process)
-        except FileNotFoundError as exc:
-            raise VirshError(
-                127,
-                "virsh binary not found in PATH; install libvirt-clients",
-                args,
-            ) from exc
-        except subprocess.TimeoutExpired as exc:
-            raise VirshError(
-                -1,
-                f"virsh timed out after {timeout}s: {' '.join(args)}",
-                args,
-            ) from exc
-
-        # Retry only a transient connection drop, and only while attempts
-        # remain; everything else (success, or a genuine failure) falls
-        # through to the check below on this attempt's result.
-        if (
-            capture
-            and result.returncode != 0
-            and attempt < len(_CONNECTION_ERROR_BACKOFF)
-            and _is_transient_connection_error(result.stderr or "")
-        ):
-            time.sleep(_CONNECTION_ERROR_BACKOFF[attempt])
-            continue
-        break
-
-    if check and result.returncode != 0:
-        stderr = result.stderr if capture else ""
-        raise VirshError(result.returncode, stderr or "", args)
-
-    return result
+# ---------------------------------------------------------------------------
+# Batched invocations — several verbs, one ``virsh`` process.
+# ---------------------------------------------------------------------------
+
+# stderr reported for a queued command the batch process never reached.
+_BATCH_NOT_RUN_STDERR = "error: not run: virsh exited before reaching this command"
+
+
+class VirshBatch:
+    """Queue several ``virsh`` verbs and run them in one ``virsh`` process.
+
+    ``virsh "cmd1 ; cmd2 ; ..."`` runs every command in one invocation
+    (the single-argument form goes through the same quoting-aware parser as
+    the interactive shell, see :mod:`~tkc_lvlab.utils.virsh_session`), so a
+    multi-step lifecycle sequence (``destroy`` then ``domstate``, ``list``
+    then ``snapshot-list``) pays the fork and the libvirt connect handshake
+    once instead of once per verb. An ``echo`` marker is queued between the
+    commands and stderr is merged into stdout (``virsh`` flushes stdout
+    before every ``error:`` line, so the two streams interleave in order),
+    which lets :meth:`run` split the combined output back into one
+    :class:`subprocess.CompletedProcess` per command:
+
+    - ``stdout`` is the command's own output; ``stderr`` its ``error:``
+      lines. ``returncode`` is ``1`` when it reported an error — the same
+      rule the interactive session transport uses.
+    - ``virsh`` keeps going after a failed command, so only queue verbs that
+      are safe to run after an earlier one failed. A command the process
+      never reached (it died mid-batch) is reported as failed.
+    - A connection drop before the first command has run is retried with
+      :func:`run_virsh`'s backoff schedule; once any command has run the
+      batch is never replayed, so a mutating verb cannot run twice.
+
+    Inside a :func:`~tkc_lvlab.utils.virsh_session.virsh_sessions` block the
+    commands are instead sent one by one over the pooled session for the
+    URI — already a single connection — through :func:`run_virsh`. With a
+    ``cache``, a queued read answered from the cache (before any queued
+    mutation) is not sent to ``virsh`` at all, and every command's result is
+    stored / invalidates exactly as a standalone :func:`run_virsh` would.
+
+    Args:
+        uri: libvirt connection URI.
+        cache: Optional request-scoped read cache (see :func:`run_virsh`).
+        timeout: Wall-clock seconds for the whole batch.
+
+    Example:
+        >>> batch = VirshBatch("qemu:///session")
+        >>> batch.add(["destroy", "web01_lab"])
+        0
+        >>> batch.add(["domstate", "web01_lab"])
+        1
+        >>> destroyed, state = batch.run()  # doctest: +SKIP
+    """
+
+    def __init__(
+        self,
+        uri: str,
+        *,
+        cache: VirshReadCache | None = None,
+        timeout: float | None = 30.0,
+    ) -> None:
+        self.uri = uri
+        self.cache = cache
+        self.timeout = timeout
+        self._commands: list[tuple[list[str], bool]] = []
+
+    def __len__(self) -> int:
+        return len(self._commands)
+
+    def add(self, args: list[str], *, check: bool = True) -> int:
+        """Queue one command and return its index in :meth:`run`'s result.
+
+        Args:
+            args: ``virsh`` subcommand and flags (no leading ``virsh -c``).
+            check: If ``True``, a failure of this command makes :meth:`run`
+                raise :class:`VirshError` (after the whole batch has run).
+        """
+        if not args or any("\n" in arg or "\r" in arg for arg in args):
+            raise ValueError(f"cannot batch virsh command {args!r}")
+        self._commands.append((list(args), check))
+        return len(self._commands) - 1
+
+    def run(self) -> list[subprocess.CompletedProcess[str]]:
+        """Run every queued command and return their results in queue order.
+
+        Raises:
+            VirshError: For the first failed command queued with
+                ``check=True``, carrying that command's own ``args`` and
+                ``error:`` text; on a missing ``virsh`` binary or a timeout.
+        """
+        if active_session_pool() is not None:
+            results = [
+                run_virsh(
+                    self.uri, args, check=False, timeout=self.timeout, cache=self.cache
+                )
+                for args, _check in self._commands
+            ]
+        else:
+            results = self._run_one_process()
+
+        for (args, check), result in zip(self._commands, results):
+            if check and result.returncode != 0:
+                raise VirshError(result.returncode, result.stderr or "", args)
+        return results
+
+    def _run_one_process(self) -> list[subprocess.CompletedProcess[str]]:
+        results: list[subprocess.CompletedProcess[str] | None] = [None] * len(
+            self._commands
+        )
+        pending: list[int] = []
+        mutated = False
+        for index, (args, _check) in enumerate(self._commands):
+            if self.cache is not None and not mutated:
+                cached = self.cache.lookup(self.uri, args)
+                if cached is not None:
+                    results[index] = cached
+                    continue
+            if self.cache is None or not self.cache.is_cacheable(args):
+                mutated = True
+            pending.append(index)
+
+        if pending:
+            token = uuid.uuid4().hex[:12]
+            markers = [f"lvlab-batch-{token}-{n}" for n in range(len(pending) + 1)]
+            parts: list[str] = []
+            for n, index in enumerate(pending):
+                if n:
+                    parts.append(f"echo {markers[n]}")
+                parts.append(shlex.join(self._commands[index][0]))
+            parts.append(f"echo {markers[-1]}")
+            combined = [" ; ".join(parts)]
+
+            output = self._exec(combined, markers[1])
+            commands = [self._commands[index][0] for index in pending]
+            for index, result in zip(pending, self._split(output, markers, commands)):
+                args = self._commands[index][0]
+                results[index] = result
+                if self.cache is not None:
+                    self.cache.store(self.uri, args, result)
+                    self.cache.record_mutation(self.uri, args)
+        return results  # type: ignore[return-value]
+
+    def _exec(self, combined: list[str], first_marker: str) -> str:
+        """Run the combined command line with connection-drop retry.
+
+        Args:
+            combined: The single ``;``-joined command-line argument.
+            first_marker: The marker printed once the first command finished.
+
+        Returns:
+            The merged stdout/stderr text.
+        """
+        argv = ["virsh", "-c", self.uri, *combined]
+        limiter = virsh_limiter(self.uri)
+        with trace_span(KIND_VIRSH, argv) as span:
+            span.record.transport = "batch"
+            for attempt in range(len(_CONNECTION_ERROR_BACKOFF) + 1):
+                with (
+                    limiter.admit(combined) if limiter is not None else unlimited()
+                ) as admission:
+                    try:
+                        result = subprocess.run(  # noqa: S603
+                            argv,
+                            stdout=subprocess.PIPE,
+                            stderr=subprocess.STDOUT,
+                            text=True,
+                            encoding="utf-8",
+                            errors="replace",
+                            env=_c_locale_env(),
+                            timeout=self.timeout,
+                        )
+                    except FileNotFoundError as exc:
+                        raise VirshError(
+                            127,
+                            "virsh binary not found in PATH; install libvirt-clients",
+                            combined,
+                        ) from exc
+                    except subprocess.TimeoutExpired as exc:
+                        admission.outcome = OUTCOME_DROPPED
+                        if self.cache is not None:
+                            self.cache.invalidate(self.uri)
+                        raise VirshError(
+                            -1,
+                            f"virsh timed out after {self.timeout}s: {' '.join(combined)}",
+                            combined,
+                        ) from exc
+                    # Only a drop before the first command finished is safe
+                    # to replay: nothing after it has run yet.
+                    dropped = (
+                        result.returncode != 0
+                        and first_marker not in result.stdout
+                        and _is_transient_connection_error(result.stdout)
+                    )
+                    admission.outcome = OUTCOME_DROPPED if dropped else OUTCOME_OK
+                if dropped and attempt < len(_CONNECTION_ERROR_BACKOFF):
+                    span.retry(_CONNECTION_ERROR_BACKOFF[attempt])
+                    time.sleep(_CONNECTION_ERROR_BACKOFF[attempt])
+                    continue
+                break
+            span.finish(result.returncode)
+        return result.stdout
+
+    def _split(
+        self, output: str, markers: list[str], commands: list[list[str]]
+    ) -> list[subprocess.CompletedProcess[str]]:
+        """Cut the merged output at the markers into per-command results.
+
+        ``markers[n + 1]`` follows ``commands[n]``; a command whose closing
+        marker never appeared did not finish and is reported as failed.
+        """
+        segments: list[list[str]] = [[]]
+        for line in output.splitlines():
+            if len(segments) < len(markers) and line.strip() == markers[len(segments)]:
+                segments.append([])
+            else:
+                segments[-1].append(line)
+        finished = len(segments) - 1
+
+        results: list[subprocess.CompletedProcess[str]] = []
+        for n, args in enumerate(commands):
+            lines = segments[n] if n < len(segments) else []
+            errors = "".join(f"{line}\n" for line in lines if line.startswith("error:"))
+            stdout = "".join(
+                f"{line}\n" for line in lines if not line.startswith("error:")
+            )
+            if n < finished:
+                returncode = 1 if errors else 0
+            else:
+                returncode, errors = 1, errors or _BATCH_NOT_RUN_STDERR
+            results.append(
+                subprocess.CompletedProcess(
+                    ["virsh", "-c", self.uri, *args], returncode, stdout, errors
+                )
+            )
+        return results
 
 
 # ---------------------------------------------------------------------------
@@ -222,6 +531,10 @@ _REASON_HUMAN: dict[tuple[str, str], str] = {
     (DOMSTATE_RUNNING, "migration canceled"): "returned from migration",
     (DOMSTATE_RUNNING, "save canceled"): "returned from failed save process",
     (DOMSTATE_RUNNING, "wakeup"): "returned from pmsuspended due to wakeup event",
+    (
+        DOMSTATE_RUNNING,
+        "event wakeup",
+    ): "returned from pmsuspended due to wakeup event",
     (DOMSTATE_RUNNING, "crashed"): "resumed from crashed",
     (DOMSTATE_RUNNING, "post-copy"): "running in post-copy migration mode",
     (DOMSTATE_RUNNING, "post-copy failed"): "running in failed post-copy migration",
@@ -247,6 +560,70 @@ _REASON_HUMAN: dict[tuple[str, str], str] = {
 }
 
 
+# ``virsh domstats --state`` reports ``state.state`` / ``state.reason`` as the
+# raw ``virDomainState`` / ``virDomain<State>Reason`` enum integers. These
+# tables translate them to the exact strings ``virsh domstate --reason`` prints
+# (libvirt's ``virshDomainStateToString`` / ``virshDomainStateReasonToString``),
+# so bulk and per-domain reads are interchangeable. Unknown codes (a newer
+# libvirt) fall back to ``"unknown"``.
+_DOMSTATE_BY_CODE: dict[int, str] = {
+    0: DOMSTATE_NO_STATE,
+    1: DOMSTATE_RUNNING,
+    2: DOMSTATE_IDLE,
+    3: DOMSTATE_PAUSED,
+    4: DOMSTATE_IN_SHUTDOWN,
+    5: DOMSTATE_SHUT_OFF,
+    6: DOMSTATE_CRASHED,
+    7: DOMSTATE_PMSUSPENDED,
+}
+
+_REASONS_BY_STATE_CODE: dict[str, tuple[str, ...]] = {
+    DOMSTATE_RUNNING: (
+        "unknown",
+        "booted",
+        "migrated",
+        "restored",
+        "from snapshot",
+        "unpaused",
+        "migration canceled",
+        "save canceled",
+        "event wakeup",
+        "crashed",
+        "post-copy",
+        "post-copy failed",
+    ),
+    DOMSTATE_PAUSED: (
+        "unknown",
+        "user",
+        "migrating",
+        "saving",
+        "dumping",
+        "i/o error",
+        "watchdog",
+        "from snapshot",
+        "shutting down",
+        "creating snapshot",
+        "starting up",
+        "post-copy",
+        "post-copy failed",
+        "api error",
+    ),
+    DOMSTATE_IN_SHUTDOWN: ("unknown", "user"),
+    DOMSTATE_SHUT_OFF: (
+        "unknown",
+        "shutdown",
+        "destroyed",
+        "crashed",
+        "migrated",
+        "saved",
+        "failed",
+        "from snapshot",
+        "daemon",
+    ),
+    DOMSTATE_CRASHED: ("unknown", "panicked"),
+}
+
+
 def humanize_state(state: str, reason: str) -> tuple[str, str]:
     """Convert a ``virsh`` state/reason pair into human-friendly strings.
 
@@ -265,19 +642,28 @@ def humanize_state(state: str, reason: str) -> tuple[str, str]:
 # ---------------------------------------------------------------------------
 
 
-def virsh_list_all_names(uri: str) -> list[str]:
+def virsh_list_all_names(
+    uri: str, *, cache: VirshReadCache | None = None
+) -> list[str]:
     """Return all domain names known to libvirt at ``uri`` (running or not).
 
     Uses ``virsh list --all --name`` which prints one bare domain name per
     line. Blank lines (including the trailing newline) are stripped.
     """
-    result = run_virsh(uri, ["list", "--all", "--name"])
-    return [line.strip() for line in result.stdout.splitlines() if line.strip()]
+    result = run_virsh(uri, ["list", "--all", "--name"], cache=cache)
+    return _parse_name_lines(result.stdout)
+
 
+def _parse_name_lines(text: str) -> list[str]:
+    """Return the non-blank, stripped lines of a ``--name`` listing."""
+    return [line.strip() for line in text.splitlines() if line.strip()]
 
-def virsh_domstate(uri: str, name: str) -> str:
+
+def virsh_domstate(
+    uri: str, name: str, *, cache: VirshReadCache | None = None
+) -> str:
     """Return the raw lowercase state string for ``name`` (e.g. ``running``)."""
-    result = run_virsh(uri, ["domstate", name])
+    result = run_virsh(uri, ["domstate", name], cache=cache)
     return result.stdout.strip().lower()
 
 
@@ -308,7 +694,9 @@ class DomInfo:
     persistent: bool
 
 
-def virsh_dominfo(uri: str, name: str) -> DomInfo:
+def virsh_dominfo(
+    uri: str, name: str, *, cache: VirshReadCache | None = None
+) -> DomInfo:
     """Return parsed :class:`DomInfo` for domain ``name`` via one ``virsh`` call.
 
     Runs ``virsh dominfo <name>`` once (the only sanctioned cheap read for the
@@ -324,6 +712,7 @@ def virsh_dominfo(uri: str, name: str) -> DomInfo:
     Args:
         uri: libvirt connection URI.
         name: The exact domain name to inspect.
+        cache: Optional request-scoped read cache (see :func:`run_virsh`).
 
     Returns:
         A :class:`DomInfo` with the cheap facts for ``name``.
@@ -333,10 +722,14 @@ def virsh_dominfo(uri: str, name: str) -> DomInfo:
             failure. The caller is expected to skip the whole connection when a
             ``VirshError`` surfaces.
     """
-    result = run_virsh(uri, ["dominfo", name])
+    result = run_virsh(uri, ["dominfo", name], cache=cache)
+    return _parse_dominfo(result.stdout)
+
 
+def _parse_dominfo(text: str) -> DomInfo:
+    """Parse ``virsh dominfo`` ``Field: value`` lines into a :class:`DomInfo`."""
     fields: dict[str, str] = {}
-    for line in result.stdout.splitlines():
+    for line in text.splitlines():
         key, sep, value = line.partition(":")
         if sep:
             fields[key.strip()] = value.strip()
@@ -388,15 +781,22 @@ def vm_exists(uri: str, name: str) -> bool:
     return result.returncode == 0
 
 
-def virsh_domstate_reason(uri: str, name: str) -> tuple[str, str]:
+def virsh_domstate_reason(
+    uri: str, name: str, *, cache: VirshReadCache | None = None
+) -> tuple[str, str]:
     """Return ``(state, reason)`` for ``name``.
 
     ``virsh domstate --reason`` emits a single line of the form
     ``<state> (<reason words>)``. Returns ``("", "")``-style empty strings if
     the output cannot be parsed, but in practice virsh always emits both.
     """
-    result = run_virsh(uri, ["domstate", "--reason", name])
-    text = result.stdout.strip().lower()
+    result = run_virsh(uri, ["domstate", "--reason", name], cache=cache)
+    return _parse_domstate_reason(result.stdout)
+
+
+def _parse_domstate_reason(text: str) -> tuple[str, str]:
+    """Split ``<state> (<reason words>)`` into a lowercase ``(state, reason)``."""
+    text = text.strip().lower()
     if not text:
         return "", ""
     if "(" in text and text.endswith(")"):
@@ -405,14 +805,164 @@ def virsh_domstate_reason(uri: str, name: str) -> tuple[str, str]:
     return text, ""
 
 
-def virsh_snapshot_names(uri: str, name: str) -> list[str]:
+def virsh_domstates(
+    uri: str, *, cache: VirshReadCache | None = None
+) -> dict[str, tuple[str, str]]:
+    """Return ``{name: (state, reason)}`` for every domain at ``uri`` in one call.
+
+    Runs a single ``virsh domstats --state`` — which covers active and
+    inactive domains alike — instead of ``virsh list`` plus a ``virsh
+    domstate`` per domain, so callers that need the state of many domains
+    (``lvlab status``) cost one ``virsh`` round-trip regardless of manifest
+    size. The numeric ``state.state`` / ``state.reason`` codes are translated
+    to the same lowercase strings :func:`virsh_domstate_reason` returns.
+
+    A domain absent from the result is not defined at ``uri``; membership
+    doubles as the existence check callers used ``virsh_list_all_names``
+    for.
+
+    Args:
+        uri: libvirt connection URI.
+        cache: Optional request-scoped read cache (see :func:`run_virsh`).
+
+    Returns:
+        Mapping of domain name to its ``(state, reason)`` pair.
+
+    Raises:
+        VirshError: On nonzero exit or a connection-level failure.
+    """
+    result = run_virsh(uri, ["domstats", "--state"], cache=cache)
+    return _parse_domstats_state(result.stdout)
+
+
+def _parse_domstats_records(text: str) -> dict[str, dict[str, str]]:
+    """Split ``virsh domstats`` output into ``{name: {key: value}}``.
+
+    Each record is a ``Domain: '<name>'`` header followed by indented
+    ``<key>=<value>`` lines. Record order is preserved.
+    """
+    records: dict[str, dict[str, str]] = {}
+    current: dict[str, str] | None = None
+    for line in text.splitlines():
+        stripped = line.strip()
+        if stripped.startswith("Domain:"):
+            name = stripped[len("Domain:") :].strip()
+            if len(name) >= 2 and name[0] == name[-1] == "'":
+                name = name[1:-1]
+            current = records.setdefault(name, {})
+        elif current is not None and "=" in stripped:
+            key, _, value = stripped.partition("=")
+            current[key.strip()] = value.strip()
+    return records
+
+
+def _domstats_state(fields: dict[str, str]) -> tuple[str, str] | None:
+    """Translate one record's ``state.*`` codes, or ``None`` if absent."""
+    state_code = _parse_leading_int(fields.get("state.state"))
+    if state_code is None:
+        return None
+    state = _DOMSTATE_BY_CODE.get(state_code, "unknown")
+    reasons = _REASONS_BY_STATE_CODE.get(state, ("unknown",))
+    reason_code = _parse_leading_int(fields.get("state.reason"))
+    if reason_code is None or not 0 <= reason_code < len(reasons):
+        return state, "unknown"
+    return state, reasons[reason_code]
+
+
+def _parse_domstats_state(text: str) -> dict[str, tuple[str, str]]:
+    """Parse ``virsh domstats --state`` output into ``{name: (state, reason)}``.
+
+    A record missing its ``state.state`` line is skipped rather than guessed
+    at.
+    """
+    states: dict[str, tuple[str, str]] = {}
+    for name, fields in _parse_domstats_records(text).items():
+        state = _domstats_state(fields)
+        if state is not None:
+            states[name] = state
+    return states
+
+
+def virsh_dominfos(
+    uri: str, *, cache: VirshReadCache | None = None
+) -> dict[str, DomInfo]:
+    """Return :class:`DomInfo` for every domain at ``uri`` in three bulk reads.
+
+    The bulk counterpart of :func:`virsh_dominfo` for callers that want the
+    cheap facts of *every* domain (``lvlab global show instances``): instead
+    of ``virsh list`` plus one ``virsh dominfo`` per domain, it runs
+
+    - ``virsh domstats --state --vcpu --balloon`` for state, vCPUs
+      (``vcpu.current``) and max memory (``balloon.maximum``, KiB), and
+    - ``virsh list --all --autostart --name`` and ``virsh list --all
+      --persistent --name`` for the two flags,
+
+    so the cost no longer grows with the domain count. Only a domain whose
+    ``domstats`` record lacks a field (an older libvirt, or a driver that
+    does not report ``vcpu`` / ``balloon`` stats for inactive guests) falls
+    back to its own ``virsh dominfo``.
+
+    Args:
+        uri: libvirt connection URI.
+        cache: Optional request-scoped read cache (see :func:`run_virsh`).
+
+    Returns:
+        Mapping of domain name to :class:`DomInfo`, in ``domstats`` order.
+
+    Raises:
+        VirshError: On nonzero exit or a connection-level failure of any of
+            the reads.
+    """
+    result = run_virsh(
+        uri, ["domstats", "--state", "--vcpu", "--balloon"], cache=cache
+    )
+    records = _parse_domstats_records(result.stdout)
+    autostart = set(
+        _parse_name_lines(
+            run_virsh(
+                uri, ["list", "--all", "--autostart", "--name"], cache=cache
+            ).stdout
+        )
+    )
+    persistent = set(
+        _parse_name_lines(
+            run_virsh(
+                uri, ["list", "--all", "--persistent", "--name"], cache=cache
+            ).stdout
+        )
+    )
+
+    infos: dict[str, DomInfo] = {}
+    for name, fields in records.items():
+        state = _domstats_state(fields)
+        vcpus = _parse_leading_int(fields.get("vcpu.current"))
+        max_memory_kib = _parse_leading_int(fields.get("balloon.maximum"))
+        if state is None or vcpus is None or max_memory_kib is None:
+            fallback = virsh_dominfo(uri, name, cache=cache)
+            state = state or (fallback.state, "")
+            vcpus = fallback.vcpus if vcpus is None else vcpus
+            if max_memory_kib is None:
+                max_memory_kib = fallback.max_memory_kib
+        infos[name] = DomInfo(
+            state=state[0],
+            vcpus=vcpus,
+            max_memory_kib=max_memory_kib,
+            autostart=name in autostart,
+            persistent=name in persistent,
+        )
+    return infos
+
+
+def virsh_snapshot_names(
+    uri: str, name: str, *, cache: VirshReadCache | None = None
+) -> list[str]:
     """Return snapshot names for domain ``name`` in creation order.
 
     Uses ``virsh snapshot-list <name> --name`` which prints one snapshot name
     per line in creation order.
     """
-    result = run_virsh(uri, ["snapshot-list", name, "--name"])
-    return [line.strip() for line in result.stdout.splitlines() if line.strip()]
+    result = run_virsh(uri, ["snapshot-list", name, "--name"], cache=cache)
+    return _parse_name_lines(result.stdout)
 
 
 # ---------------------------------------------------------------------------
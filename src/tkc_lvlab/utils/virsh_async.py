@@ -0,0 +1,226 @@
+"""``asyncio`` counterparts of the :mod:`tkc_lvlab.utils.virsh` helpers.
+
+The validate harness (``scripts/validate``) runs on an event loop, but every
+libvirt read it made went through the blocking :func:`run_virsh`, stalling
+the loop for the duration of each ``virsh`` fork. The coroutines here are
+built on :func:`asyncio.create_subprocess_exec`, so hundreds of concurrent
+domain queries can be driven from one loop without a thread per call.
+
+The contract mirrors the sync API exactly:
+
+- the same argv (``virsh -c <uri> <args...>``) and ``LC_ALL=C`` / ``LANG=C``
+    locale forcing;
+- the same transient connection-drop retry (the backoff schedule and stderr
+    markers are shared with :mod:`tkc_lvlab.utils.virsh`; the sleeps are
+    :func:`asyncio.sleep`);
+- the same per-URI admission control and circuit breaker
+    (:mod:`tkc_lvlab.utils.virsh_limit`), waited on without blocking the loop;
+- the same :class:`VirshError` mapping: ``rc=127`` for a missing binary,
+    ``rc=-1`` on timeout (the child is killed and reaped first), the real exit
+    code and stderr otherwise;
+- the same parsers, so ``await virsh_dominfo_async(...)`` and
+    ``virsh_dominfo(...)`` return identical values for identical output.
+
+Output is always captured (there is no async equivalent of ``capture=False``
+passthrough), and calls never route through a
+:mod:`~tkc_lvlab.utils.virsh_session` pool, whose sessions are blocking.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import subprocess
+from typing import TYPE_CHECKING
+
+from ..exceptions import VirshError
+from .trace import KIND_VIRSH, trace_span
+from .virsh import (
+    _CONNECTION_ERROR_BACKOFF,
+    DomInfo,
+    _c_locale_env,
+    _is_transient_connection_error,
+    _parse_dominfo,
+    _parse_domstate_reason,
+    _parse_domstats_state,
+    _parse_name_lines,
+)
+from .virsh_limit import (
+    OUTCOME_DROPPED,
+    OUTCOME_OK,
+    unlimited_async,
+    virsh_limiter,
+)
+
+if TYPE_CHECKING:
+    from .virsh_cache import VirshReadCache
+
+
+async def _exec_once(
+    argv: list[str], *, timeout: float | None, input_text: str | None
+) -> subprocess.CompletedProcess[str]:
+    """Spawn ``argv`` once and collect it, killing the child on timeout.
+
+    Raises:
+        FileNotFoundError: ``argv[0]`` is not on ``PATH``.
+        asyncio.TimeoutError: ``timeout`` elapsed (the child is reaped).
+    """
+    proc = await asyncio.create_subprocess_exec(
+        *argv,
+        stdin=asyncio.subprocess.PIPE if input_text is not None else None,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        env=_c_locale_env(),
+    )
+    stdin = input_text.encode("utf-8") if input_text is not None else None
+    try:
+        out, err = await asyncio.wait_for(proc.communicate(stdin), timeout=timeout)
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+        raise
+    return subprocess.CompletedProcess(
+        argv,
+        proc.returncode if proc.returncode is not None else -1,
+        out.decode("utf-8", errors="replace"),
+        err.decode("utf-8", errors="replace"),
+    )
+
+
+async def run_virsh_async(
+    uri: str,
+    args: list[str],
+    *,
+    check: bool = True,
+    timeout: float | None = 30.0,
+    input_text: str | None = None,
+    cache: VirshReadCache | None = None,
+) -> subprocess.CompletedProcess[str]:
+    """Run ``virsh -c <uri> <args...>`` without blocking the event loop.
+
+    The coroutine twin of :func:`tkc_lvlab.utils.virsh.run_virsh`: same
+    locale forcing, same transient connection-drop retry with
+    ``_CONNECTION_ERROR_BACKOFF`` (awaited, not slept), same error mapping.
+    stdout/stderr are always captured.
+
+    Args:
+        uri: libvirt connection URI (e.g. ``qemu:///session``).
+        args: ``virsh`` subcommand and flags (no leading ``virsh -c <uri>``).
+        check: If ``True``, raise :class:`VirshError` on nonzero exit.
+        timeout: Wall-clock seconds per attempt before the child is killed
+            and :class:`VirshError` (``rc=-1``) is raised.
+        input_text: Optional stdin text.
+        cache: Optional request-scoped read cache, honoured exactly as
+            :func:`run_virsh` does.
+
+    Returns:
+        The :class:`subprocess.CompletedProcess` for the final attempt.
+
+    Raises:
+        VirshError: On nonzero exit (when ``check=True``), on missing
+            ``virsh`` binary, or on timeout. A transient connection drop only
+            raises after the retry budget is exhausted.
+    """
+    argv = ["virsh", "-c", uri, *args]
+    with trace_span(KIND_VIRSH, argv) as span:
+        if cache is not None:
+            cached = cache.lookup(uri, args)
+            if cached is not None:
+                span.record.transport = "cache"
+                span.finish(cached.returncode)
+                return cached
+
+        span.record.transport = "exec"
+        limiter = virsh_limiter(uri)
+        for attempt in range(len(_CONNECTION_ERROR_BACKOFF) + 1):
+            async with (
+                limiter.admit_async(args) if limiter is not None else unlimited_async()
+            ) as admission:
+                try:
+                    result = await _exec_once(
+                        argv, timeout=timeout, input_text=input_text
+                    )
+                except FileNotFoundError as exc:
+                    raise VirshError(
+                        127,
+                        "virsh binary not found in PATH; install libvirt-clients",
+                        args,
+                    ) from exc
+                except asyncio.TimeoutError as exc:
+                    admission.outcome = OUTCOME_DROPPED
+                    if cache is not None:
+                        cache.record_mutation(uri, args)
+                    raise VirshError(
+                        -1,
+                        f"virsh timed out after {timeout}s: {' '.join(args)}",
+                        args,
+                    ) from exc
+                dropped = result.returncode != 0 and _is_transient_connection_error(
+                    result.stderr
+                )
+                admission.outcome = OUTCOME_DROPPED if dropped else OUTCOME_OK
+
+            if dropped and attempt < len(_CONNECTION_ERROR_BACKOFF):
+                span.retry(_CONNECTION_ERROR_BACKOFF[attempt])
+                await asyncio.sleep(_CONNECTION_ERROR_BACKOFF[attempt])
+                continue
+            break
+
+        span.finish(result.returncode)
+        if cache is not None:
+            cache.store(uri, args, result)
+            cache.record_mutation(uri, args)
+
+        if check and result.returncode != 0:
+            raise VirshError(result.returncode, result.stderr or "", args)
+
+        return result
+
+
+async def virsh_list_all_names_async(
+    uri: str, *, cache: VirshReadCache | None = None
+) -> list[str]:
+    """Coroutine twin of :func:`~tkc_lvlab.utils.virsh.virsh_list_all_names`."""
+    result = await run_virsh_async(uri, ["list", "--all", "--name"], cache=cache)
+    return _parse_name_lines(result.stdout)
+
+
+async def virsh_domstate_async(
+    uri: str, name: str, *, cache: VirshReadCache | None = None
+) -> str:
+    """Coroutine twin of :func:`~tkc_lvlab.utils.virsh.virsh_domstate`."""
+    result = await run_virsh_async(uri, ["domstate", name], cache=cache)
+    return result.stdout.strip().lower()
+
+
+async def virsh_domstate_reason_async(
+    uri: str, name: str, *, cache: VirshReadCache | None = None
+) -> tuple[str, str]:
+    """Coroutine twin of :func:`~tkc_lvlab.utils.virsh.virsh_domstate_reason`."""
+    result = await run_virsh_async(uri, ["domstate", "--reason", name], cache=cache)
+    return _parse_domstate_reason(result.stdout)
+
+
+async def virsh_domstates_async(
+    uri: str, *, cache: VirshReadCache | None = None
+) -> dict[str, tuple[str, str]]:
+    """Coroutine twin of :func:`~tkc_lvlab.utils.virsh.virsh_domstates`."""
+    result = await run_virsh_async(uri, ["domstats", "--state"], cache=cache)
+    return _parse_domstats_state(result.stdout)
+
+
+async def virsh_dominfo_async(
+    uri: str, name: str, *, cache: VirshReadCache | None = None
+) -> DomInfo:
+    """Coroutine twin of :func:`~tkc_lvlab.utils.virsh.virsh_dominfo`."""
+    result = await run_virsh_async(uri, ["dominfo", name], cache=cache)
+    return _parse_dominfo(result.stdout)
+
+
+async def virsh_snapshot_names_async(
+    uri: str, name: str, *, cache: VirshReadCache | None = None
+) -> list[str]:
+    """Coroutine twin of :func:`~tkc_lvlab.utils.virsh.virsh_snapshot_names`."""
+    result = await run_virsh_async(
+        uri, ["snapshot-list", name, "--name"], cache=cache
+    )
+    return _parse_name_lines(result.stdout)
@@ -0,0 +1,214 @@
+"""Request-scoped memoization of read-only ``virsh`` verbs.
+
+One ``lvlab up`` / ``destroy`` / ``snapshot`` run asks libvirt the same
+questions several times in a row — :meth:`Machine.exists_in_libvirt`, then
+``poweron``, then the snapshot or destroy collaborator each re-read the
+domain list and state even though nothing changed in between.
+
+A :class:`VirshReadCache` is created once per CLI command and threaded
+through :class:`~tkc_lvlab.utils.libvirt.Machine` and the ``virsh_*``
+helpers into :func:`~tkc_lvlab.utils.virsh.run_virsh`, which consults it:
+
+- **Reads** (``list``, ``domstats``, ``domstate``, ``dominfo``,
+    ``snapshot-list``, ``net-dumpxml``) are memoized per ``(uri, args)``
+    for a per-verb TTL (:data:`READ_VERB_TTLS`). Only successful results
+    are stored, so a failure is always re-asked.
+- **Mutations** invalidate precisely what they can have changed: a
+    ``start`` / ``destroy`` drops the URI's domain listings and that
+    domain's state reads but keeps its snapshot list; ``snapshot-create``
+    / ``snapshot-delete`` drop only that domain's snapshot list;
+    ``undefine`` drops everything about the domain. Verbs the cache does not
+    know about drop every entry for the URI.
+- :attr:`VirshReadCache.hits` / :attr:`VirshReadCache.misses` count
+    lookups of cacheable verbs, so a ``-vv`` run shows the redundant calls
+    are gone.
+
+Changes made outside ``run_virsh`` (``virt-install`` defining a domain)
+must call :meth:`VirshReadCache.invalidate` themselves.
+"""
+
+from __future__ import annotations
+
+import subprocess
+import threading
+import time
+from dataclasses import dataclass
+
+#: Seconds a successful read stays fresh, keyed by ``virsh`` verb. Listings
+#: and state are short-lived (another client can start a domain under us);
+#: snapshot lists and network XML change only through our own mutations.
+READ_VERB_TTLS: dict[str, float] = {
+    "list": 5.0,
+    "domstats": 5.0,
+    "domstate": 2.0,
+    "dominfo": 5.0,
+    "snapshot-list": 30.0,
+    "net-dumpxml": 60.0,
+}
+
+# What each cached read describes — the unit mutations invalidate.
+_KIND_LISTING = "listing"  # URI-wide domain listing (list, domstats)
+_KIND_STATE = "state"  # one domain's run state (domstate, dominfo)
+_KIND_SNAPSHOTS = "snapshots"  # one domain's snapshot list
+_KIND_NETWORK = "network"  # one network's definition
+
+_READ_VERB_KINDS: dict[str, str] = {
+    "list": _KIND_LISTING,
+    "domstats": _KIND_LISTING,
+    "domstate": _KIND_STATE,
+    "dominfo": _KIND_STATE,
+    "snapshot-list": _KIND_SNAPSHOTS,
+    "net-dumpxml": _KIND_NETWORK,
+}
+
+# Mutating verb -> (drops the URI's domain listings, per-subject kinds it
+# drops). The subject is whichever cached domain/network name appears in
+# the mutation's arguments.
+_MUTATION_SCOPES: dict[str, tuple[bool, frozenset[str]]] = {
+    **{
+        verb: (True, frozenset({_KIND_STATE}))
+        for verb in (
+            "start",
+            "shutdown",
+            "destroy",
+            "reboot",
+            "reset",
+            "suspend",
+            "resume",
+            "managedsave",
+        )
+    },
+    **{
+        verb: (False, frozenset({_KIND_SNAPSHOTS}))
+        for verb in ("snapshot-create", "snapshot-create-as", "snapshot-delete")
+    },
+    "snapshot-revert": (True, frozenset({_KIND_STATE, _KIND_SNAPSHOTS})),
+    "undefine": (True, frozenset({_KIND_STATE, _KIND_SNAPSHOTS})),
+    **{
+        verb: (False, frozenset({_KIND_NETWORK}))
+        for verb in ("net-start", "net-destroy", "net-update", "net-autostart")
+    },
+}
+
+
+@dataclass
+class _Entry:
+    """One memoized read."""
+
+    kind: str
+    subject: str | None
+    result: subprocess.CompletedProcess[str]
+    expires_at: float
+
+
+def _subject(args: list[str]) -> str | None:
+    """Return the first positional argument after the verb (the domain/network)."""
+    for arg in args[1:]:
+        if not arg.startswith("-"):
+            return arg
+    return None
+
+
+class VirshReadCache:
+    """Per-command TTL cache for read-only ``virsh`` invocations.
+
+    Thread-safe; one instance is meant to live for a single CLI command.
+
+    Args:
+        ttls: Optional per-verb TTL overrides merged over
+            :data:`READ_VERB_TTLS`.
+
+    Attributes:
+        hits: Lookups answered from the cache.
+        misses: Lookups of cacheable verbs that had to run ``virsh``.
+    """
+
+    def __init__(self, ttls: dict[str, float] | None = None) -> None:
+        self.ttls = {**READ_VERB_TTLS, **(ttls or {})}
+        self.hits = 0
+        self.misses = 0
+        self._entries: dict[tuple[str, tuple[str, ...]], _Entry] = {}
+        self._lock = threading.Lock()
+
+    def is_cacheable(self, args: list[str]) -> bool:
+        """Return whether ``args`` is a read verb this cache memoizes."""
+        return bool(args) and args[0] in _READ_VERB_KINDS
+
+    def lookup(
+        self, uri: str, args: list[str]
+    ) -> subprocess.CompletedProcess[str] | None:
+        """Return a fresh memoized result for ``args`` at ``uri``, or ``None``.
+
+        Counts a hit or a miss for cacheable verbs; non-read verbs return
+        ``None`` without touching the counters.
+        """
+        if not self.is_cacheable(args):
+            return None
+        key = (uri, tuple(args))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at > time.monotonic():
+                self.hits += 1
+                return entry.result
+            self._entries.pop(key, None)
+            self.misses += 1
+        return None
+
+    def store(
+        self, uri: str, args: list[str], result: subprocess.CompletedProcess[str]
+    ) -> None:
+        """Memoize a successful read; failures and non-read verbs are ignored."""
+        if not self.is_cacheable(args) or result.returncode != 0:
+            return
+        entry = _Entry(
+            kind=_READ_VERB_KINDS[args[0]],
+            subject=_subject(args),
+            result=result,
+            expires_at=time.monotonic() + self.ttls.get(args[0], 0.0),
+        )
+        with self._lock:
+            self._entries[(uri, tuple(args))] = entry
+
+    def record_mutation(self, uri: str, args: list[str]) -> None:
+        """Invalidate whatever the (attempted) verb ``args`` may have changed.
+
+        Called for every non-read verb, successful or not — a failed
+        ``destroy`` may still have moved the domain's state.
+        """
+        if not args or self.is_cacheable(args):
+            return
+        scope = _MUTATION_SCOPES.get(args[0])
+        if scope is None:
+            self.invalidate(uri)
+            return
+        drop_listings, kinds = scope
+        named = set(args[1:])
+        with self._lock:
+            for key in [
+                key
+                for key, entry in self._entries.items()
+                if key[0] == uri
+                and (
+                    (drop_listings and entry.kind == _KIND_LISTING)
+                    or (entry.kind in kinds and entry.subject in named)
+                )
+            ]:
+                del self._entries[key]
+
+    def invalidate(self, uri: str | None = None) -> None:
+        """Drop every entry for ``uri``, or the whole cache when ``uri`` is ``None``."""
+        with self._lock:
+            if uri is None:
+                self._entries.clear()
+                return
+            for key in [key for key in self._entries if key[0] == uri]:
+                del self._entries[key]
+
+    def stats(self) -> dict[str, int]:
+        """Return the ``hits`` / ``misses`` / live ``entries`` counters."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._entries),
+            }
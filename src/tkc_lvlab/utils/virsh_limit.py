@@ -0,0 +1,314 @@
+"""Per-URI admission control and circuit breaking for ``virsh`` calls.
+
+Issue #129's transient ``remote peer disconnected`` / ``failed to connect to
+the hypervisor`` errors appear exactly when ``lvlab smoke`` batches and
+``init`` fire many concurrent ``virsh`` calls at ``virtqemud``. A fixed
+retry schedule alone makes that worse: every dropped call comes back
+0.5/1/2 s later with the same concurrency, and the run collapses into a
+retry storm.
+
+:func:`~tkc_lvlab.utils.virsh.run_virsh` (and its async twin) therefore
+pass every attempt through the URI's :class:`VirshLimiter`:
+
+- **AIMD admission.** At most :attr:`AdmissionController.limit` calls are
+    in flight per URI; the rest wait their turn. Each success the daemon
+    answers (a genuine command failure counts — the daemon responded) grows
+    the limit by ``1 / limit`` (one slot per window of successes); each
+    connection drop halves it. Drops from calls admitted before the last
+    decrease do not halve it again, so one burst of failures costs one
+    decrease, not ``log2(limit)`` of them.
+- **Circuit breaker.** :attr:`CircuitBreaker.failure_threshold`
+    consecutive connection drops, with no answered call for
+    :attr:`CircuitBreaker.reset_timeout` seconds, open the circuit (an
+    overloaded daemon still answering some calls is the admission
+    controller's problem, not the breaker's): calls fail immediately
+    with :class:`~tkc_lvlab.exceptions.VirshUnavailableError` instead of
+    queueing up behind a dead daemon. After
+    :attr:`CircuitBreaker.reset_timeout` seconds a single probe call is let
+    through; its success closes the circuit, its failure re-opens it.
+
+Set ``LVLAB_VIRSH_MAX_INFLIGHT`` to change the per-URI ceiling, or to ``0``
+to disable admission control and breaking entirely.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Iterator
+
+from .._logging import get_logger
+from ..exceptions import VirshUnavailableError
+
+logger = get_logger(__name__)
+
+#: Environment variable overriding the per-URI in-flight ceiling (``0`` = off).
+MAX_INFLIGHT_ENV_VAR = "LVLAB_VIRSH_MAX_INFLIGHT"
+
+#: Starting and maximum in-flight ``virsh`` calls per URI.
+DEFAULT_INITIAL_LIMIT = 8
+DEFAULT_MAX_LIMIT = 32
+
+#: Consecutive connection drops that open a URI's circuit.
+DEFAULT_FAILURE_THRESHOLD = 6
+
+#: Seconds an open circuit refuses calls before letting one probe through.
+DEFAULT_RESET_TIMEOUT = 5.0
+
+# How often a coroutine waiting for admission re-checks for a free slot.
+_ASYNC_ADMIT_POLL_SECONDS = 0.01
+
+# Call outcomes reported back to the limiter.
+OUTCOME_OK = "ok"  # the daemon answered (success or a genuine command error)
+OUTCOME_DROPPED = "dropped"  # connection-level failure or timeout
+OUTCOME_NEUTRAL = "neutral"  # never reached the daemon for a local reason
+
+_CIRCUIT_CLOSED = "closed"
+_CIRCUIT_OPEN = "open"
+_CIRCUIT_HALF_OPEN = "half-open"
+
+
+class AdmissionController:
+    """AIMD cap on concurrently admitted calls.
+
+    Args:
+        initial: Starting limit.
+        maximum: Ceiling the additive increase never passes.
+        minimum: Floor the multiplicative decrease never passes.
+    """
+
+    def __init__(
+        self,
+        initial: int = DEFAULT_INITIAL_LIMIT,
+        maximum: int = DEFAULT_MAX_LIMIT,
+        minimum: int = 1,
+    ) -> None:
+        self.maximum = maximum
+        self.minimum = minimum
+        self._limit = float(max(minimum, min(initial, maximum)))
+        self.in_flight = 0
+        self.epoch = 0
+        self._cond = threading.Condition()
+
+    @property
+    def limit(self) -> int:
+        """The current whole-number cap on in-flight calls."""
+        return int(self._limit)
+
+    def try_acquire(self) -> int | None:
+        """Admit one call if a slot is free; return its epoch, else ``None``."""
+        with self._cond:
+            if self.in_flight >= self.limit:
+                return None
+            self.in_flight += 1
+            return self.epoch
+
+    def acquire(self) -> int:
+        """Block until a slot is free, admit the call, and return its epoch."""
+        with self._cond:
+            self._cond.wait_for(lambda: self.in_flight < self.limit)
+            self.in_flight += 1
+            return self.epoch
+
+    def release(self, epoch: int, outcome: str) -> None:
+        """Free the call's slot and adjust the limit for its ``outcome``.
+
+        Args:
+            epoch: The value :meth:`acquire` returned for this call.
+            outcome: :data:`OUTCOME_OK`, :data:`OUTCOME_DROPPED` or
+                :data:`OUTCOME_NEUTRAL`.
+        """
+        with self._cond:
+            self.in_flight -= 1
+            if outcome == OUTCOME_OK:
+                self._limit = min(float(self.maximum), self._limit + 1.0 / self._limit)
+            elif outcome == OUTCOME_DROPPED and epoch == self.epoch:
+                self._limit = max(float(self.minimum), self._limit / 2.0)
+                self.epoch += 1
+                logger.debug("virsh admission limit cut to %d", self.limit)
+            self._cond.notify_all()
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker with a single half-open probe.
+
+    Args:
+        failure_threshold: Consecutive drops that open the circuit.
+        reset_timeout: Seconds the circuit stays open before a probe, and
+            how long without an answered call before drops can open it.
+        clock: Monotonic clock; injectable for tests.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        reset_timeout: float = DEFAULT_RESET_TIMEOUT,
+        clock=time.monotonic,
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.state = _CIRCUIT_CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._last_ok: float | None = None
+        self._probing = False
+
+    def allow(self) -> float | None:
+        """Return ``None`` if a call may proceed, else seconds until the next probe."""
+        with self._lock:
+            if self.state == _CIRCUIT_CLOSED:
+                return None
+            waited = self._clock() - self._opened_at
+            if self.state == _CIRCUIT_OPEN and waited >= self.reset_timeout:
+                self.state = _CIRCUIT_HALF_OPEN
+            if self.state == _CIRCUIT_HALF_OPEN and not self._probing:
+                self._probing = True
+                return None
+            return max(0.0, self.reset_timeout - waited)
+
+    def record(self, outcome: str) -> None:
+        """Feed one call's outcome into the breaker."""
+        with self._lock:
+            self._probing = False
+            if outcome == OUTCOME_OK:
+                if self.state != _CIRCUIT_CLOSED:
+                    logger.info("libvirt daemon reachable again; circuit closed")
+                self.state = _CIRCUIT_CLOSED
+                self.failures = 0
+                self._last_ok = self._clock()
+            elif outcome == OUTCOME_DROPPED:
+                self.failures += 1
+                now = self._clock()
+                quiet = (
+                    self._last_ok is None
+                    or now - self._last_ok >= self.reset_timeout
+                )
+                if self.state == _CIRCUIT_HALF_OPEN or (
+                    quiet and self.failures >= self.failure_threshold
+                ):
+                    if self.state != _CIRCUIT_OPEN:
+                        logger.warning(
+                            "libvirt daemon unreachable after %d connection "
+                            "failures; failing virsh calls fast for %.0fs",
+                            self.failures,
+                            self.reset_timeout,
+                        )
+                    self.state = _CIRCUIT_OPEN
+                    self._opened_at = now
+
+
+@dataclass
+class _Admission:
+    """One admitted call; the caller sets :attr:`outcome` before release."""
+
+    epoch: int
+    outcome: str = OUTCOME_NEUTRAL
+
+
+class VirshLimiter:
+    """Admission controller plus circuit breaker for one connection URI.
+
+    Args:
+        uri: libvirt connection URI (named in fail-fast errors).
+        max_limit: Ceiling for the admission controller.
+    """
+
+    def __init__(self, uri: str, max_limit: int = DEFAULT_MAX_LIMIT) -> None:
+        self.uri = uri
+        self.controller = AdmissionController(
+            initial=min(DEFAULT_INITIAL_LIMIT, max_limit), maximum=max_limit
+        )
+        self.breaker = CircuitBreaker()
+
+    def _refuse_if_open(self, args: list[str]) -> None:
+        retry_in = self.breaker.allow()
+        if retry_in is not None:
+            raise VirshUnavailableError(
+                -2,
+                f"error: failed to connect to the hypervisor at {self.uri}: "
+                f"circuit open, next attempt in {retry_in:.1f}s",
+                args,
+            )
+
+    def _finish(self, admission: _Admission) -> None:
+        self.controller.release(admission.epoch, admission.outcome)
+        self.breaker.record(admission.outcome)
+
+    @contextlib.contextmanager
+    def admit(self, args: list[str]) -> Iterator[_Admission]:
+        """Hold an in-flight slot for one ``virsh`` attempt.
+
+        Raises:
+            VirshUnavailableError: The circuit is open (raised before waiting).
+        """
+        self._refuse_if_open(args)
+        admission = _Admission(self.controller.acquire())
+        try:
+            yield admission
+        finally:
+            self._finish(admission)
+
+    @contextlib.asynccontextmanager
+    async def admit_async(self, args: list[str]):
+        """Coroutine twin of :meth:`admit`; waits without blocking the loop."""
+        self._refuse_if_open(args)
+        epoch = self.controller.try_acquire()
+        while epoch is None:
+            await asyncio.sleep(_ASYNC_ADMIT_POLL_SECONDS)
+            epoch = self.controller.try_acquire()
+        admission = _Admission(epoch)
+        try:
+            yield admission
+        finally:
+            self._finish(admission)
+
+
+@contextlib.contextmanager
+def unlimited() -> Iterator[_Admission]:
+    """Stand-in for :meth:`VirshLimiter.admit` when admission control is off."""
+    yield _Admission(0)
+
+
+@contextlib.asynccontextmanager
+async def unlimited_async():
+    """Stand-in for :meth:`VirshLimiter.admit_async` when admission control is off."""
+    yield _Admission(0)
+
+
+def _max_inflight() -> int:
+    raw = os.environ.get(MAX_INFLIGHT_ENV_VAR, "").strip()
+    if not raw:
+        return DEFAULT_MAX_LIMIT
+    try:
+        return max(0, int(raw))
+    except ValueError:
+        logger.warning("Ignoring non-integer %s=%r", MAX_INFLIGHT_ENV_VAR, raw)
+        return DEFAULT_MAX_LIMIT
+
+
+_LIMITERS: dict[str, VirshLimiter] = {}
+_LIMITERS_LOCK = threading.Lock()
+
+
+def virsh_limiter(uri: str) -> VirshLimiter | None:
+    """Return the process-wide limiter for ``uri`` (``None`` when disabled)."""
+    max_limit = _max_inflight()
+    if max_limit == 0:
+        return None
+    with _LIMITERS_LOCK:
+        limiter = _LIMITERS.get(uri)
+        if limiter is None or limiter.controller.maximum != max_limit:
+            limiter = _LIMITERS[uri] = VirshLimiter(uri, max_limit)
+        return limiter
+
+
+def reset_limiters() -> None:
+    """Forget every URI's limiter state (tests, long-lived embedding)."""
+    with _LIMITERS_LOCK:
+        _LIMITERS.clear()
@@ -0,0 +1,436 @@
+"""Persistent interactive ``virsh`` sessions, pooled per connection URI.
+
+A one-shot :func:`tkc_lvlab.utils.virsh.run_virsh` forks ``virsh -c <uri>``,
+performs the libvirt connect handshake against ``virtqemud``, runs one verb
+and tears the connection down again. ``Machine.poweron``,
+``Machine.exists_in_libvirt`` and the snapshot helpers each issue two or three
+of those back to back, and on a busy host the handshake dominates the wall
+clock of ``lvlab status`` / ``lvlab up --all``.
+
+This module keeps a long-lived interactive ``virsh -q -c <uri>`` shell open
+per URI and multiplexes commands over its stdin/stdout:
+
+- **Framing.** Each command is bracketed by two ``echo`` markers carrying a
+    per-session sequence number. Everything ``virsh`` prints between the
+    begin and end marker is the command's stdout. Prompt echoes (``virsh #
+    <line>``) emitted by readline-enabled builds are stripped, so both
+    readline and plain-``fgets`` builds frame identically.
+- **Exit status.** The interactive shell does not report a per-command exit
+    code. A command is treated as failed (``returncode=1``) when it wrote an
+    ``error:`` line to stderr — the same line ``virsh`` prints before exiting
+    nonzero in one-shot mode — so the :class:`VirshError` contract is
+    unchanged. stderr is drained after the end marker arrives; ``virsh``
+    writes a command's errors before it reads the next line, so the drain
+    always sees them.
+- **Failure modes.** A session whose process exits mid-command reports a
+    ``broken pipe`` failure, which the retry layer in ``run_virsh`` already
+    classifies as a transient connection drop; it then calls
+    :meth:`VirshSessionPool.reset` so the retry reconnects. A command that
+    overruns its timeout kills the session and raises
+    :class:`subprocess.TimeoutExpired`, which ``run_virsh`` maps to
+    ``VirshError(-1, ...)`` exactly as before.
+
+Pooling is opt-in: ``run_virsh`` only routes through a pool inside a
+:func:`virsh_sessions` block (the ``lvlab`` root callback opens one per
+command). Outside such a block, and for anything the line protocol cannot
+carry (stdin payloads, passthrough stdio, arguments containing newlines),
+``run_virsh`` keeps forking a one-shot process. A missing ``virsh`` binary
+disables the pool and falls back to the one-shot path, which reports the
+familiar ``rc=127`` error. Set ``LVLAB_VIRSH_SESSIONS=0`` to opt out
+entirely.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import itertools
+import os
+import select
+import shlex
+import subprocess
+import threading
+import time
+from typing import Iterator
+
+from .._logging import get_logger
+
+logger = get_logger(__name__)
+
+#: Environment variable that disables session pooling when set to ``0``.
+SESSIONS_ENV_VAR = "LVLAB_VIRSH_SESSIONS"
+
+#: Upper bound on concurrently open interactive shells per URI. Callers beyond
+#: this wait for a session to be released instead of spawning another.
+DEFAULT_MAX_SESSIONS_PER_URI = 4
+
+# Prompts ``virsh`` prints before reading each interactive line (read-write
+# and read-only connections respectively).
+_PROMPTS: tuple[str, ...] = ("virsh # ", "virsh > ")
+
+_MARKER_PREFIX = "__LVLAB_SESSION_"
+
+# Seconds to wait for a closed shell to exit before killing it.
+_CLOSE_GRACE_SECONDS = 2.0
+
+# stderr text reported when the shell exits mid-command. Carries the
+# ``broken pipe`` connection-drop marker so the retry layer reconnects.
+_SESSION_EXITED_STDERR = "error: broken pipe: interactive virsh session exited"
+
+
+def sessions_enabled() -> bool:
+    """Return ``False`` when ``LVLAB_VIRSH_SESSIONS=0`` opts out of pooling."""
+    return os.environ.get(SESSIONS_ENV_VAR, "1").strip() != "0"
+
+
+def _session_safe(args: list[str]) -> bool:
+    """Return whether ``args`` can travel over the line-based session protocol.
+
+    A newline or carriage return inside an argument would split the command
+    across two interactive lines, so such calls stay on the one-shot path.
+    """
+    return bool(args) and not any("\n" in arg or "\r" in arg for arg in args)
+
+
+def _strip_prompts(line: str) -> str:
+    """Remove any leading interactive prompts from one stdout line."""
+    stripped = True
+    while stripped:
+        stripped = False
+        for prompt in _PROMPTS:
+            if line.startswith(prompt):
+                line = line[len(prompt) :]
+                stripped = True
+    return line
+
+
+class VirshSession:
+    """One long-lived interactive ``virsh`` shell bound to a single URI.
+
+    Not thread-safe on its own: :class:`VirshSessionPool` hands a session to
+    exactly one caller at a time.
+
+    Args:
+        uri: libvirt connection URI the shell connects to.
+
+    Attributes:
+        uri: The connection URI.
+        commands_run: Number of commands multiplexed over this session.
+    """
+
+    def __init__(self, uri: str) -> None:
+        self.uri = uri
+        self.commands_run = 0
+        self._proc: subprocess.Popen[bytes] | None = None
+        self._buffer = b""
+        self._seq = itertools.count()
+
+    @property
+    def alive(self) -> bool:
+        """``True`` while the underlying ``virsh`` process is running."""
+        return self._proc is not None and self._proc.poll() is None
+
+    def start(self) -> None:
+        """Spawn the interactive shell.
+
+        Raises:
+            FileNotFoundError: ``virsh`` is not on ``PATH``.
+        """
+        from .virsh import _c_locale_env  # local import: avoid cycle
+
+        self._buffer = b""
+        self._proc = subprocess.Popen(  # noqa: S603 (args are constructed in-process)
+            ["virsh", "-q", "-c", self.uri],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            env=_c_locale_env(),
+        )
+        os.set_blocking(self._proc.stderr.fileno(), False)
+        logger.debug("Started interactive virsh session for %s", self.uri)
+
+    def run(
+        self, args: list[str], *, timeout: float | None
+    ) -> subprocess.CompletedProcess[str]:
+        """Run one ``virsh`` command over the session.
+
+        Args:
+            args: ``virsh`` subcommand and flags (no leading ``virsh -c``).
+            timeout: Wall-clock seconds before the session is killed, or
+                ``None`` to wait indefinitely.
+
+        Returns:
+            A :class:`subprocess.CompletedProcess` shaped like the one-shot
+            path's: ``args`` is the equivalent one-shot argv, ``returncode``
+            is ``1`` when the command reported an ``error:`` on stderr.
+
+        Raises:
+            FileNotFoundError: The shell had to be (re)started and ``virsh``
+                is not on ``PATH``.
+            subprocess.TimeoutExpired: The command overran ``timeout``. The
+                session is killed first.
+        """
+        if not self.alive:
+            self.start()
+        argv = ["virsh", "-c", self.uri, *args]
+        seq = next(self._seq)
+        begin = f"{_MARKER_PREFIX}{seq}_BEGIN__"
+        end = f"{_MARKER_PREFIX}{seq}_END__"
+        written = [f"echo {begin}", shlex.join(args), f"echo {end}"]
+
+        # Anything still buffered on stderr belongs to an earlier command.
+        self._drain_stderr()
+        try:
+            self._proc.stdin.write("".join(f"{w}\n" for w in written).encode())
+            self._proc.stdin.flush()
+        except OSError:
+            stderr = self._drain_stderr()
+            self.close()
+            return subprocess.CompletedProcess(
+                argv, 1, "", stderr or _SESSION_EXITED_STDERR
+            )
+
+        lines = self._read_until(end, timeout, argv)
+        self.commands_run += 1
+        if lines is None:
+            stderr = self._drain_stderr()
+            self.close()
+            return subprocess.CompletedProcess(
+                argv, 1, "", stderr or _SESSION_EXITED_STDERR
+            )
+
+        stdout = "".join(f"{line}\n" for line in self._frame(lines, begin, written))
+        stderr = self._drain_stderr()
+        failed = any(line.startswith("error:") for line in stderr.splitlines())
+        return subprocess.CompletedProcess(argv, 1 if failed else 0, stdout, stderr)
+
+    @staticmethod
+    def _frame(lines: list[str], begin: str, written: list[str]) -> list[str]:
+        """Return the command's output lines between the begin marker and the end.
+
+        Drops everything up to and including the begin marker (the welcome
+        banner on a fresh shell, prompt residue), plus readline's echo of
+        each line we wrote.
+        """
+        output: list[str] = []
+        started = False
+        for raw in lines:
+            echoed = any(raw.startswith(p) and raw[len(p) :] in written for p in _PROMPTS)
+            line = _strip_prompts(raw)
+            if not started:
+                started = line == begin
+                continue
+            if echoed:
+                continue
+            output.append(line)
+        return output
+
+    def _read_until(
+        self, end: str, timeout: float | None, argv: list[str]
+    ) -> list[str] | None:
+        """Collect stdout lines until one equals ``end`` (prompts stripped).
+
+        Returns:
+            The lines read before the end marker, or ``None`` on EOF (the
+            shell exited mid-command).
+
+        Raises:
+            subprocess.TimeoutExpired: ``timeout`` elapsed first.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        fd = self._proc.stdout.fileno()
+        lines: list[str] = []
+        while True:
+            while b"\n" in self._buffer:
+                raw, self._buffer = self._buffer.split(b"\n", 1)
+                line = raw.decode("utf-8", errors="replace").rstrip("\r")
+                if _strip_prompts(line) == end:
+                    return lines
+                lines.append(line)
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                self.close(kill=True)
+                raise subprocess.TimeoutExpired(argv, timeout)
+            ready, _, _ = select.select([fd], [], [], remaining)
+            if not ready:
+                continue
+            chunk = os.read(fd, 65536)
+            if not chunk:
+                return None
+            self._buffer += chunk
+
+    def _drain_stderr(self) -> str:
+        """Return (and consume) whatever the shell has written to stderr so far."""
+        if self._proc is None or self._proc.stderr is None:
+            return ""
+        chunks: list[bytes] = []
+        while True:
+            try:
+                chunk = os.read(self._proc.stderr.fileno(), 65536)
+            except (BlockingIOError, OSError):
+                break
+            if not chunk:
+                break
+            chunks.append(chunk)
+        return b"".join(chunks).decode("utf-8", errors="replace")
+
+    def close(self, *, kill: bool = False) -> None:
+        """Terminate the shell (``quit`` by closing stdin, ``kill`` on request)."""
+        proc, self._proc = self._proc, None
+        self._buffer = b""
+        if proc is None:
+            return
+        try:
+            if kill:
+                proc.kill()
+            elif proc.stdin is not None:
+                proc.stdin.close()
+            proc.wait(timeout=_CLOSE_GRACE_SECONDS)
+        except (OSError, subprocess.TimeoutExpired):
+            proc.kill()
+            proc.wait()
+        finally:
+            for stream in (proc.stdin, proc.stdout, proc.stderr):
+                if stream is not None:
+                    with contextlib.suppress(OSError):
+                        stream.close()
+
+
+class VirshSessionPool:
+    """Thread-safe pool of :class:`VirshSession` objects keyed by URI.
+
+    Args:
+        max_sessions_per_uri: Cap on concurrently open shells per URI.
+
+    Attributes:
+        sessions_started: Number of shells spawned over the pool's lifetime
+            (reconnects included) — lets tests and ``--trace`` style
+            diagnostics confirm commands were multiplexed.
+    """
+
+    def __init__(self, max_sessions_per_uri: int = DEFAULT_MAX_SESSIONS_PER_URI) -> None:
+        self.max_sessions_per_uri = max(1, max_sessions_per_uri)
+        self.sessions_started = 0
+        self._cond = threading.Condition()
+        self._idle: dict[str, list[VirshSession]] = {}
+        self._open: dict[str, int] = {}
+        self._unavailable = False
+        self._closed = False
+
+    def run(
+        self, uri: str, args: list[str], *, timeout: float | None
+    ) -> subprocess.CompletedProcess[str] | None:
+        """Run ``args`` against ``uri`` over a pooled session.
+
+        Returns:
+            The completed command, or ``None`` when the pool cannot carry the
+            call (closed pool, unsafe arguments, or no ``virsh`` binary) and
+            the caller should fall back to a one-shot process.
+
+        Raises:
+            subprocess.TimeoutExpired: The command overran ``timeout``.
+        """
+        if self._closed or self._unavailable or not _session_safe(args):
+            return None
+        session = self._acquire(uri)
+        keep = False
+        try:
+            if not session.alive:
+                self.sessions_started += 1
+            result = session.run(args, timeout=timeout)
+            keep = True
+            return result
+        except FileNotFoundError:
+            # No virsh on PATH: stop trying; the one-shot path raises the
+            # canonical rc=127 VirshError.
+            self._unavailable = True
+            return None
+        finally:
+            self._release(session, keep=keep)
+
+    def reset(self, uri: str) -> None:
+        """Close every idle session for ``uri`` so the next call reconnects."""
+        with self._cond:
+            idle = self._idle.pop(uri, [])
+            self._open[uri] = self._open.get(uri, 0) - len(idle)
+            self._cond.notify_all()
+        for session in idle:
+            session.close()
+
+    def close(self) -> None:
+        """Close every idle session and refuse further work."""
+        with self._cond:
+            self._closed = True
+            idle = [s for sessions in self._idle.values() for s in sessions]
+            self._idle.clear()
+            self._open.clear()
+            self._cond.notify_all()
+        for session in idle:
+            session.close()
+
+    def _acquire(self, uri: str) -> VirshSession:
+        """Return an idle session for ``uri``, opening one if under the cap."""
+        with self._cond:
+            while True:
+                idle = self._idle.get(uri)
+                if idle:
+                    return idle.pop()
+                if self._open.get(uri, 0) < self.max_sessions_per_uri:
+                    self._open[uri] = self._open.get(uri, 0) + 1
+                    return VirshSession(uri)
+                self._cond.wait()
+
+    def _release(self, session: VirshSession, *, keep: bool) -> None:
+        """Return ``session`` to the idle list, or close it if it is unusable."""
+        with self._cond:
+            if keep and session.alive and not self._closed:
+                self._idle.setdefault(session.uri, []).append(session)
+                self._cond.notify()
+                return
+            self._open[session.uri] = max(0, self._open.get(session.uri, 0) - 1)
+            self._cond.notify()
+        session.close()
+
+
+_ACTIVE_POOL: VirshSessionPool | None = None
+_ACTIVE_LOCK = threading.Lock()
+
+
+def active_session_pool() -> VirshSessionPool | None:
+    """Return the pool opened by the innermost :func:`virsh_sessions`, if any."""
+    return _ACTIVE_POOL
+
+
+@contextlib.contextmanager
+def virsh_sessions(
+    max_sessions_per_uri: int = DEFAULT_MAX_SESSIONS_PER_URI,
+) -> Iterator[VirshSessionPool | None]:
+    """Route :func:`~tkc_lvlab.utils.virsh.run_virsh` through pooled sessions.
+
+    Re-entrant: a nested block reuses the already-active pool, and only the
+    outermost block closes it. Yields ``None`` (and changes nothing) when
+    ``LVLAB_VIRSH_SESSIONS=0``.
+
+    Args:
+        max_sessions_per_uri: Cap on concurrently open shells per URI.
+
+    Yields:
+        The active :class:`VirshSessionPool`, or ``None`` when disabled.
+    """
+    global _ACTIVE_POOL  # pylint: disable=global-statement
+    if not sessions_enabled():
+        yield None
+        return
+    with _ACTIVE_LOCK:
+        outer = _ACTIVE_POOL
+        if outer is None:
+            _ACTIVE_POOL = VirshSessionPool(max_sessions_per_uri)
+        pool = _ACTIVE_POOL
+    if outer is not None:
+        yield outer
+        return
+    try:
+        yield pool
+    finally:
+        with _ACTIVE_LOCK:
+            _ACTIVE_POOL = None
+        pool.close()
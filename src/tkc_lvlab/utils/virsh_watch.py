@@ -0,0 +1,599 @@
+"""Event-driven waits on libvirt domain state and DHCP leases.
+
+``lvlab smoke``, ``createvm`` and the validate harness all used to wait by
+sleep-polling ``virsh`` — one ``domstate`` / ``domifaddr`` /
+``net-dhcp-leases`` fork per VM per 1–5 s tick. A shutdown or a fresh lease
+was noticed up to a full interval late, and N concurrent VMs meant N
+independent polling loops.
+
+This module replaces those loops with two shared, per-URI primitives:
+
+- :class:`DomainWatcher` keeps one ``virsh -c <uri> event --all --loop``
+    process open and parses its ``lifecycle`` lines. A waiter registers a
+    :class:`concurrent.futures.Future` for the states it cares about and
+    blocks on it; the reader thread resolves it the moment the matching
+    event arrives. To close the subscribe/read race, a waiter reads the
+    current state once after registering, and re-reads it every
+    :data:`EVENT_RECHECK_SECONDS` as a backstop for a missed event. When
+    the event stream is unavailable (``virsh`` too old, connection lost,
+    ``LVLAB_VIRSH_EVENTS=0``) waits degrade to plain polling at the
+    caller's interval, so behaviour never gets worse than before.
+- :class:`LeasePoller` runs a single polling thread per URI for every
+    pending lease waiter. Waiters that ask the same question (every
+    ``createvm`` on one network asks ``net-dhcp-leases <net>``) share one
+    ``virsh`` call per tick, and a domain ``Started`` / ``Resumed`` event
+    kicks an immediate poll instead of waiting out the interval.
+
+Both are reached through :func:`wait_for_domain_state` and
+:func:`wait_for_lease`. Inside a :func:`virsh_watchers` block the
+watchers and pollers are shared by every caller (``smoke`` opens one around
+its batch run, the validate harness around its event loop); outside one,
+each wait starts and tears down its own.
+"""
+
+from __future__ import annotations
+
+import concurrent.futures
+import contextlib
+import os
+import re
+import subprocess
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Collection, Iterator
+
+from .._logging import get_logger
+from ..exceptions import VirshError
+from .virsh import _c_locale_env, run_virsh, virsh_domstate
+
+logger = get_logger(__name__)
+
+#: Environment variable that disables the ``virsh event`` stream when ``0``.
+EVENTS_ENV_VAR = "LVLAB_VIRSH_EVENTS"
+
+#: Seconds between backstop state re-reads while the event stream is live.
+#: Only matters if an event is lost; a healthy stream resolves waits first.
+EVENT_RECHECK_SECONDS = 10.0
+
+#: Default seconds between shared lease-poller ticks.
+DEFAULT_LEASE_POLL_INTERVAL = 2.0
+
+# Seconds to wait for the ``virsh event`` child to exit before killing it.
+_CLOSE_GRACE_SECONDS = 2.0
+
+# ``event 'lifecycle' for domain 'web01_lab': Stopped Shutdown`` — optionally
+# prefixed by a ``--timestamp`` stamp, which is ignored.
+_LIFECYCLE_RE = re.compile(
+    r"event 'lifecycle' for domain '(?P<domain>[^']+)': (?P<event>\S+)(?: (?P<detail>.*))?$"
+)
+
+#: Lifecycle event -> the ``virsh domstate`` string the domain is left in.
+#: ``Defined`` / ``Shutdown`` imply no settled state and are not mapped;
+#: ``Undefined`` reports the pseudo-state ``"absent"``.
+LIFECYCLE_EVENT_STATES: dict[str, str] = {
+    "started": "running",
+    "resumed": "running",
+    "suspended": "paused",
+    "stopped": "shut off",
+    "crashed": "crashed",
+    "pmsuspended": "pmsuspended",
+    "undefined": "absent",
+}
+
+# Events after which a domain may newly hold a lease.
+_LEASE_KICK_EVENTS = frozenset({"started", "resumed"})
+
+
+def events_enabled() -> bool:
+    """Return ``False`` when ``LVLAB_VIRSH_EVENTS=0`` opts out of the event stream."""
+    return os.environ.get(EVENTS_ENV_VAR, "1").strip() != "0"
+
+
+class WatcherStopped(Exception):
+    """The ``virsh event`` stream ended while a waiter was pending."""
+
+
+@dataclass(frozen=True)
+class DomainEvent:
+    """One parsed ``lifecycle`` line from ``virsh event``."""
+
+    domain: str
+    event: str
+    detail: str
+    state: str | None
+
+
+def parse_event_line(line: str) -> DomainEvent | None:
+    """Parse one ``virsh event --loop`` output line.
+
+    Args:
+        line: A raw output line.
+
+    Returns:
+        The parsed lifecycle event (``event`` lowercased, ``state`` mapped via
+        :data:`LIFECYCLE_EVENT_STATES`), or ``None`` for anything else —
+        non-lifecycle events, the ``events received`` trailer, blank lines.
+    """
+    match = _LIFECYCLE_RE.search(line.strip())
+    if match is None:
+        return None
+    event = match.group("event").lower()
+    return DomainEvent(
+        domain=match.group("domain"),
+        event=event,
+        detail=(match.group("detail") or "").strip(),
+        state=LIFECYCLE_EVENT_STATES.get(event),
+    )
+
+
+@dataclass
+class _StateWaiter:
+    states: frozenset[str]
+    future: concurrent.futures.Future[str]
+
+
+class DomainWatcher:
+    """One ``virsh event --all --loop`` stream for a connection URI.
+
+    Args:
+        uri: libvirt connection URI.
+    """
+
+    def __init__(self, uri: str) -> None:
+        self.uri = uri
+        self._proc: subprocess.Popen[str] | None = None
+        self._reader: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self._waiters: dict[str, list[_StateWaiter]] = {}
+        self._listeners: list[Callable[[DomainEvent], None]] = []
+        self._stopped = False
+
+    @property
+    def alive(self) -> bool:
+        """Whether the event stream is running and delivering events."""
+        return (
+            not self._stopped
+            and self._proc is not None
+            and self._proc.poll() is None
+        )
+
+    def start(self) -> bool:
+        """Spawn the event stream; return whether it is running.
+
+        A missing binary or a stream that cannot start leaves the watcher
+        stopped, and :meth:`wait_for_state` falls back to polling.
+        """
+        if not events_enabled():
+            self._stopped = True
+            return False
+        try:
+            self._proc = subprocess.Popen(  # pylint: disable=consider-using-with
+                ["virsh", "-c", self.uri, "event", "--all", "--loop"],
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+                encoding="utf-8",
+                errors="replace",
+                bufsize=1,
+                env=_c_locale_env(),
+            )
+        except OSError as exc:
+            logger.debug("virsh event stream unavailable for %s: %s", self.uri, exc)
+            self._stopped = True
+            return False
+        self._reader = threading.Thread(
+            target=self._read_events, name=f"virsh-event:{self.uri}", daemon=True
+        )
+        self._reader.start()
+        return True
+
+    def add_listener(self, callback: Callable[[DomainEvent], None]) -> None:
+        """Call ``callback`` (on the reader thread) for every lifecycle event.
+
+        An exception from ``callback`` is logged and does not stop the stream.
+        """
+        with self._lock:
+            self._listeners.append(callback)
+
+    def _read_events(self) -> None:
+        assert self._proc is not None and self._proc.stdout is not None
+        try:
+            for line in self._proc.stdout:
+                event = parse_event_line(line)
+                if event is not None:
+                    self._dispatch(event)
+        finally:
+            # However the reader ends, pending waiters switch to polling.
+            self._mark_stopped()
+
+    def _dispatch(self, event: DomainEvent) -> None:
+        logger.debug(
+            "virsh event %s: %s %s %s", self.uri, event.domain, event.event, event.detail
+        )
+        with self._lock:
+            listeners = list(self._listeners)
+            if event.state is not None:
+                pending = self._waiters.get(event.domain, [])
+                for waiter in [w for w in pending if event.state in w.states]:
+                    pending.remove(waiter)
+                    waiter.future.set_result(event.state)
+        for callback in listeners:
+            try:
+                callback(event)
+            except Exception as e:  # pylint: disable=broad-except
+                logger.warning("virsh event listener %r failed: %s", callback, e)
+
+    def _mark_stopped(self) -> None:
+        with self._lock:
+            self._stopped = True
+            pending = [w for waiters in self._waiters.values() for w in waiters]
+            self._waiters.clear()
+        for waiter in pending:
+            if not waiter.future.done():
+                waiter.future.set_exception(WatcherStopped(self.uri))
+
+    def _register(self, domain: str, states: frozenset[str]) -> _StateWaiter:
+        waiter = _StateWaiter(states, concurrent.futures.Future())
+        with self._lock:
+            if self._stopped:
+                waiter.future.set_exception(WatcherStopped(self.uri))
+            else:
+                self._waiters.setdefault(domain, []).append(waiter)
+        return waiter
+
+    def _unregister(self, domain: str, waiter: _StateWaiter) -> None:
+        with self._lock:
+            pending = self._waiters.get(domain, [])
+            if waiter in pending:
+                pending.remove(waiter)
+            if not pending:
+                self._waiters.pop(domain, None)
+
+    def wait_for_state(
+        self,
+        domain: str,
+        states: Collection[str],
+        *,
+        timeout: float,
+        read_state: Callable[[], str],
+        poll_interval: float,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> str | None:
+        """Block until ``domain`` is in one of ``states`` or ``timeout`` elapses.
+
+        Args:
+            domain: Domain name as libvirt reports it.
+            states: Target ``domstate`` strings (``"absent"`` for undefined).
+            timeout: Seconds to wait in total.
+            read_state: Zero-argument callable returning the current state.
+                Called once up front and on every backstop re-read; its
+                :class:`VirshError` propagates to the caller.
+            poll_interval: Seconds between reads once the event stream is
+                unavailable.
+            sleep: Sleep function for the polling fallback.
+
+        Returns:
+            The state that satisfied the wait, or ``None`` on timeout.
+        """
+        wanted = frozenset(states)
+        deadline = time.monotonic() + timeout
+        while True:
+            waiter = self._register(domain, wanted)
+            try:
+                current = read_state()
+                if current in wanted:
+                    return current
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                try:
+                    return waiter.future.result(
+                        timeout=min(remaining, EVENT_RECHECK_SECONDS)
+                    )
+                except concurrent.futures.TimeoutError:
+                    continue
+                except WatcherStopped:
+                    break
+            finally:
+                self._unregister(domain, waiter)
+        # Event stream gone: poll for whatever budget is left.
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            sleep(min(poll_interval, remaining))
+            current = read_state()
+            if current in wanted:
+                return current
+
+    def close(self) -> None:
+        """Stop the event stream and fail any pending waiters over to polling."""
+        proc = self._proc
+        if proc is not None and proc.poll() is None:
+            proc.terminate()
+            try:
+                proc.wait(timeout=_CLOSE_GRACE_SECONDS)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                proc.wait()
+        if self._reader is not None:
+            self._reader.join(timeout=_CLOSE_GRACE_SECONDS)
+        self._mark_stopped()
+
+
+@dataclass
+class _LeaseWaiter:
+    args: tuple[str, ...]
+    extract: Callable[[str], str | None]
+    future: concurrent.futures.Future[str]
+
+
+class LeasePoller:
+    """One polling thread answering every pending lease waiter for a URI.
+
+    The thread runs only while waiters are pending. Each tick groups waiters
+    by their ``virsh`` arguments, runs each distinct query once, and resolves
+    every waiter whose ``extract`` finds an address in the output.
+
+    Args:
+        uri: libvirt connection URI.
+        interval: Seconds between ticks.
+    """
+
+    def __init__(self, uri: str, interval: float = DEFAULT_LEASE_POLL_INTERVAL) -> None:
+        self.uri = uri
+        self.interval = interval
+        self.queries_run = 0
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._waiters: list[_LeaseWaiter] = []
+        self._thread: threading.Thread | None = None
+        self._closed = False
+
+    def watch(
+        self, args: list[str], extract: Callable[[str], str | None]
+    ) -> concurrent.futures.Future[str]:
+        """Register a waiter; its future resolves with the first address found.
+
+        Args:
+            args: ``virsh`` arguments whose stdout carries the lease
+                (``["net-dhcp-leases", net]``, ``["domifaddr", dom, ...]``).
+            extract: Returns the address from that stdout, or ``None``. If
+                it raises, the future fails with that exception; other
+                waiters keep polling.
+
+        Returns:
+            A future resolved with the address. Cancel it to stop waiting.
+        """
+        waiter = _LeaseWaiter(tuple(args), extract, concurrent.futures.Future())
+        with self._lock:
+            if self._closed:
+                waiter.future.cancel()
+                return waiter.future
+            self._waiters.append(waiter)
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name=f"lease-poller:{self.uri}", daemon=True
+                )
+                self._thread.start()
+        self.kick()
+        return waiter.future
+
+    def kick(self) -> None:
+        """Run the next tick now instead of at the end of the interval."""
+        self._wake.set()
+
+    def on_event(self, event: DomainEvent) -> None:
+        """:class:`DomainWatcher` listener: poll as soon as a domain starts."""
+        if event.event in _LEASE_KICK_EVENTS:
+            self.kick()
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            with self._lock:
+                self._waiters = [w for w in self._waiters if not w.future.done()]
+                if not self._waiters or self._closed:
+                    self._thread = None
+                    return
+                pending = list(self._waiters)
+            try:
+                self._tick(pending)
+            except Exception as e:  # pylint: disable=broad-except
+                # Keep the thread alive: later watchers rely on it to exit
+                # through the branch above, which resets ``_thread``.
+                logger.warning("Lease poll on %s failed: %s", self.uri, e)
+
+    def _tick(self, pending: list[_LeaseWaiter]) -> None:
+        by_query: dict[tuple[str, ...], list[_LeaseWaiter]] = {}
+        for waiter in pending:
+            by_query.setdefault(waiter.args, []).append(waiter)
+        for args, waiters in by_query.items():
+            self.queries_run += 1
+            try:
+                result = run_virsh(self.uri, list(args), check=False)
+            except VirshError:
+                continue
+            if result.returncode != 0:
+                continue
+            for waiter in waiters:
+                try:
+                    address = waiter.extract(result.stdout)
+                except Exception as e:  # pylint: disable=broad-except
+                    logger.warning("Lease extractor for %s failed: %s", args, e)
+                    if waiter.future.set_running_or_notify_cancel():
+                        waiter.future.set_exception(e)
+                    continue
+                if address and waiter.future.set_running_or_notify_cancel():
+                    waiter.future.set_result(address)
+
+    def close(self) -> None:
+        """Cancel every pending waiter and let the polling thread exit."""
+        with self._lock:
+            self._closed = True
+            pending, self._waiters = self._waiters, []
+            thread = self._thread
+        for waiter in pending:
+            waiter.future.cancel()
+        self.kick()
+        if thread is not None:
+            thread.join(timeout=_CLOSE_GRACE_SECONDS)
+
+
+class VirshWatchers:
+    """Per-URI :class:`DomainWatcher` and :class:`LeasePoller` registry.
+
+    Args:
+        lease_interval: Tick interval for pollers this registry creates.
+    """
+
+    def __init__(self, lease_interval: float = DEFAULT_LEASE_POLL_INTERVAL) -> None:
+        self.lease_interval = lease_interval
+        self._lock = threading.Lock()
+        self._watchers: dict[str, DomainWatcher] = {}
+        self._pollers: dict[str, LeasePoller] = {}
+
+    def domain_watcher(self, uri: str) -> DomainWatcher:
+        """Return the URI's watcher, starting its event stream on first use."""
+        with self._lock:
+            watcher = self._watchers.get(uri)
+            if watcher is None:
+                watcher = self._watchers[uri] = DomainWatcher(uri)
+                watcher.start()
+                poller = self._pollers.get(uri)
+                if poller is not None:
+                    watcher.add_listener(poller.on_event)
+            return watcher
+
+    def lease_poller(self, uri: str) -> LeasePoller:
+        """Return the URI's shared lease poller."""
+        with self._lock:
+            poller = self._pollers.get(uri)
+            if poller is None:
+                poller = self._pollers[uri] = LeasePoller(uri, self.lease_interval)
+                watcher = self._watchers.get(uri)
+                if watcher is not None:
+                    watcher.add_listener(poller.on_event)
+            return poller
+
+    def close(self) -> None:
+        """Stop every event stream and poller."""
+        with self._lock:
+            watchers, self._watchers = list(self._watchers.values()), {}
+            pollers, self._pollers = list(self._pollers.values()), {}
+        for poller in pollers:
+            poller.close()
+        for watcher in watchers:
+            watcher.close()
+
+
+_ACTIVE_WATCHERS: VirshWatchers | None = None
+_ACTIVE_LOCK = threading.Lock()
+
+
+def active_watchers() -> VirshWatchers | None:
+    """Return the registry opened by the innermost :func:`virsh_watchers`, if any."""
+    return _ACTIVE_WATCHERS
+
+
+@contextlib.contextmanager
+def virsh_watchers(
+    lease_interval: float = DEFAULT_LEASE_POLL_INTERVAL,
+) -> Iterator[VirshWatchers]:
+    """Share domain watchers and lease pollers across every wait in the block.
+
+    Re-entrant: a nested block reuses the already-active registry, and only
+    the outermost block closes it.
+
+    Args:
+        lease_interval: Tick interval for the shared lease pollers.
+
+    Yields:
+        The active :class:`VirshWatchers`.
+    """
+    global _ACTIVE_WATCHERS  # pylint: disable=global-statement
+    with _ACTIVE_LOCK:
+        outer = _ACTIVE_WATCHERS
+        if outer is None:
+            _ACTIVE_WATCHERS = VirshWatchers(lease_interval)
+        registry = _ACTIVE_WATCHERS
+    if outer is not None:
+        yield outer
+        return
+    try:
+        yield registry
+    finally:
+        with _ACTIVE_LOCK:
+            _ACTIVE_WATCHERS = None
+        registry.close()
+
+
+def wait_for_domain_state(
+    uri: str,
+    domain: str,
+    states: Collection[str],
+    *,
+    timeout: float,
+    poll_interval: float = 1.0,
+    read_state: Callable[[], str] | None = None,
+) -> str | None:
+    """Block until ``domain`` reaches one of ``states``; event-driven when possible.
+
+    Args:
+        uri: libvirt connection URI.
+        domain: Domain name as libvirt reports it.
+        states: Target ``domstate`` strings (``"absent"`` for undefined).
+        timeout: Seconds to wait in total.
+        poll_interval: Polling cadence if the event stream is unavailable.
+        read_state: Current-state reader; defaults to
+            :func:`~tkc_lvlab.utils.virsh.virsh_domstate`.
+
+    Returns:
+        The state reached, or ``None`` on timeout.
+
+    Raises:
+        VirshError: ``read_state`` failed (domain gone, daemon unreachable).
+    """
+    reader = read_state or (lambda: virsh_domstate(uri, domain))
+    with virsh_watchers() as registry:
+        return registry.domain_watcher(uri).wait_for_state(
+            domain,
+            states,
+            timeout=timeout,
+            read_state=reader,
+            poll_interval=poll_interval,
+        )
+
+
+def wait_for_lease(
+    uri: str,
+    args: list[str],
+    extract: Callable[[str], str | None],
+    *,
+    timeout: float,
+) -> str | None:
+    """Block until the shared lease poller finds an address for this waiter.
+
+    Args:
+        uri: libvirt connection URI.
+        args: ``virsh`` query whose stdout carries the lease.
+        extract: Returns the address from that stdout, or ``None``.
+        timeout: Seconds to wait in total.
+
+    Returns:
+        The address, or ``None`` if none appeared within ``timeout``.
+
+    Raises:
+        Exception: Whatever ``extract`` raised, re-raised in the caller.
+    """
+    with virsh_watchers() as registry:
+        registry.domain_watcher(uri)  # lifecycle events kick the poller
+        future = registry.lease_poller(uri).watch(args, extract)
+        try:
+            return future.result(timeout=timeout)
+        except (concurrent.futures.TimeoutError, concurrent.futures.CancelledError):
+            future.cancel()
+            return None
@@ -53,6 +53,35 @@ def _restore_lvlab_logger_propagation() -> Iterator[None]:
     logging.getLogger("tkc_lvlab").propagate = True
 
 
+@pytest.fixture(autouse=True)
+def _reset_virsh_limiters() -> Iterator[None]:
+    """Give every test fresh per-URI virsh admission/circuit-breaker state.
+
+    The limiters in :mod:`tkc_lvlab.utils.virsh_limit` are process-wide, so
+    connection drops simulated by one test would otherwise count toward
+    opening the circuit for the next.
+    """
+    from tkc_lvlab.utils.virsh_limit import reset_limiters
+
+    reset_limiters()
+    yield
+    reset_limiters()
+
+
+@pytest.fixture(autouse=True)
+def _reset_network_info_cache() -> Iterator[None]:
+    """Start every test with an empty process-wide network-info cache.
+
+    Tests feed different mocked ``net-dumpxml`` output for the same
+    ``(uri, network)``; a memoized parse from one must not answer the next.
+    """
+    from tkc_lvlab.utils.network import network_info_cache
+
+    network_info_cache().invalidate()
+    yield
+    network_info_cache().invalidate()
+
+
 LVLAB_TEST_PREFIX: str = f"lvlab-test-{int(time.time() * 1000)}-{secrets.token_hex(2)}-"
 """Session-unique prefix every test-owned libvirt/qemu resource must start with.
 
@@ -0,0 +1,75 @@
+"""Shared fake HTTP responses for the image-download unit tests.
+
+Module-private to the test suite. Pytest does not collect anything from
+this file because its filename does not match the ``test_*.py``
+discovery pattern; the fakes are imported explicitly by the test modules
+that stub ``requests.get`` or feed :func:`tkc_lvlab.utils.images._iter_body`,
+so each of them doesn't hand-roll its own copy of the same surface.
+"""
+
+from __future__ import annotations
+
+import requests
+
+
+class FakeResponse:
+    """Minimal stand-in for a streamed ``requests`` response.
+
+    Mimics only the surface ``_stream_to_partial`` touches:
+    ``raise_for_status``, ``headers.get``, ``status_code``, and
+    ``raw.read``.
+    """
+
+    def __init__(
+        self,
+        body: bytes = b"",
+        *,
+        status_code: int = 200,
+        accept_ranges: bool = False,
+        http_error: bool = False,
+        content_encoding: str | None = None,
+        content_length: int | None = None,
+    ) -> None:
+        self._body = body
+        self.status_code = status_code
+        # ``content_length`` lets a test advertise a length that differs from
+        # the written body — e.g. the COMPRESSED size on a gzip response.
+        length = content_length if content_length is not None else len(body)
+        self.headers: dict[str, str] = {"content-length": str(length)}
+        if accept_ranges:
+            self.headers["accept-ranges"] = "bytes"
+        if content_encoding:
+            self.headers["content-encoding"] = content_encoding
+        self._http_error = http_error
+        self.closed = False
+        self.raw = FakeRaw(body)
+
+    def raise_for_status(self) -> None:
+        if self._http_error:
+            # Mirror requests: the raised HTTPError carries the response, so
+            # callers can read ``exc.response.status_code``.
+            err = requests.HTTPError(f"{self.status_code} error")
+            err.response = self  # type: ignore[attr-defined]
+            raise err
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class FakeRaw:
+    """The urllib3 body reader behind :class:`FakeResponse`.
+
+    Records every requested read size in ``read_sizes`` so tests can check
+    how the body was chunked.
+    """
+
+    def __init__(self, body: bytes) -> None:
+        self._body = body
+        self._offset = 0
+        self.read_sizes: list[int] = []
+
+    def read(self, amt: int, decode_content: bool = True) -> bytes:  # noqa: ARG002
+        self.read_sizes.append(amt)
+        data = self._body[self._offset : self._offset + amt]
+        self._offset += len(data)
+        return data
@@ -0,0 +1,147 @@
+"""Cloud-image cache quota and LRU eviction (:mod:`tkc_lvlab.utils.cache_quota`).
+
+Cache directories are real ``tmp_path`` trees of small files; "last used"
+comes from a :class:`UsageLog` driven by a fake clock, so eviction order is
+deterministic.
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from tkc_lvlab import cli
+from tkc_lvlab.utils.cache_quota import (
+    UsageLog,
+    cache_usage_bytes,
+    evict_to_quota,
+    parse_cache_quota,
+    record_image_use,
+)
+
+
+def _write(path: Path, size: int) -> str:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"x" * size)
+    return str(path)
+
+
+def _usage(cache: Path, *names: str) -> UsageLog:
+    """A usage log recording ``names`` as used in that order, oldest first."""
+    now = [1000.0]
+    usage = UsageLog.for_image_dir(str(cache))
+    usage._clock = lambda: now[0]  # pylint: disable=protected-access
+    for name in names:
+        usage.record(str(cache / name))
+        now[0] += 60
+    return usage
+
+
+@pytest.mark.parametrize("value", [None, 0, 50 * 1024**3])
+def test_parse_cache_quota(value) -> None:
+    config_defaults = {} if value is None else {"cache_max_bytes": value}
+    assert parse_cache_quota(config_defaults) == value
+
+
+@pytest.mark.parametrize("value", ["50G", -1, 1.5, True])
+def test_parse_cache_quota_rejects_non_byte_counts(value) -> None:
+    with pytest.raises(ValueError, match="cache_max_bytes"):
+        parse_cache_quota({"cache_max_bytes": value})
+
+
+def test_usage_counts_hard_links_once(tmp_path: Path) -> None:
+    image = _write(tmp_path / "a.qcow2", 1000)
+    os.makedirs(tmp_path / ".blobs" / "sha256")
+    os.link(image, tmp_path / ".blobs" / "sha256" / "abc")
+    os.symlink(image, tmp_path / "b.qcow2")
+    _write(tmp_path / "c.qcow2.partial", 24)
+
+    assert cache_usage_bytes(str(tmp_path)) == 1024
+
+
+def test_record_image_use_stamps_by_file_name(tmp_path: Path) -> None:
+    record_image_use(str(tmp_path / "a.qcow2"))
+
+    assert list(UsageLog.for_image_dir(str(tmp_path)).last_used()) == ["a.qcow2"]
+
+
+def test_least_recently_used_go_first(tmp_path: Path) -> None:
+    for name in ("old.qcow2", "middle.qcow2", "new.qcow2"):
+        _write(tmp_path / name, 1000)
+    _write(tmp_path / "old.qcow2.SHA256SUMS", 10)
+    usage = _usage(tmp_path, "old.qcow2", "middle.qcow2", "new.qcow2")
+
+    evicted = evict_to_quota(str(tmp_path), 1500, set(), usage=usage)
+
+    assert [os.path.basename(c.image_fpath) for c in evicted] == [
+        "old.qcow2",
+        "middle.qcow2",
+    ]
+    assert sorted(os.listdir(tmp_path)) == [".locks", ".usage", "new.qcow2"]
+    assert list(usage.last_used()) == ["new.qcow2"]
+
+
+def test_protected_images_are_never_evicted(tmp_path: Path) -> None:
+    oldest = _write(tmp_path / "oldest.qcow2", 1000)
+    _write(tmp_path / "newer.qcow2", 1000)
+    usage = _usage(tmp_path, "oldest.qcow2", "newer.qcow2")
+
+    evicted = evict_to_quota(str(tmp_path), 0, {oldest}, usage=usage)
+
+    assert [os.path.basename(c.image_fpath) for c in evicted] == ["newer.qcow2"]
+    assert os.path.exists(oldest)
+
+
+def test_nothing_is_evicted_under_quota(tmp_path: Path) -> None:
+    _write(tmp_path / "a.qcow2", 1000)
+
+    assert evict_to_quota(str(tmp_path), 1000, set()) == []
+    assert os.path.exists(tmp_path / "a.qcow2")
+
+
+def test_evicting_the_last_alias_frees_its_blob(tmp_path: Path) -> None:
+    blob = tmp_path / ".blobs" / "sha256" / "abc"
+    _write(blob, 1000)
+    os.link(blob, tmp_path / "a.qcow2")
+
+    evict_to_quota(str(tmp_path), 0, set())
+
+    assert not blob.exists()
+    assert cache_usage_bytes(str(tmp_path)) == 0
+
+
+def test_cli_quota_protects_what_images_clean_protects(tmp_path: Path) -> None:
+    cache = tmp_path / "cloud-images"
+    in_use = _write(cache / "in-use.qcow2", 1000)
+    commented = _write(cache / "commented.qcow2", 1000)
+    unused = _write(cache / "unused.qcow2", 1000)
+    config_defaults = {"cloud_image_basedir": str(cache), "cache_max_bytes": 0}
+
+    with (
+        mock.patch.object(cli, "backing_files_in_use", return_value={in_use}),
+        mock.patch.object(
+            cli, "_read_manifest_text", return_value="# os: commented.qcow2\n"
+        ),
+    ):
+        cli._enforce_cache_quota({}, {}, config_defaults)
+
+    assert os.path.exists(in_use)
+    assert os.path.exists(commented)
+    assert not os.path.exists(unused)
+
+
+def test_cli_quota_honours_the_cleanup_lock(tmp_path: Path) -> None:
+    cache = tmp_path / "cloud-images"
+    unused = _write(cache / "unused.qcow2", 1000)
+    config_defaults = {
+        "cloud_image_basedir": str(cache),
+        "cache_max_bytes": 0,
+        "prevent_cloud_image_cleanup": True,
+    }
+
+    cli._enforce_cache_quota({}, {}, config_defaults)
+
+    assert os.path.exists(unused)
@@ -162,3 +162,16 @@ def test_image_version_unknown_format_returns_question_mark() -> None:
 def test_image_version_handles_empty_inputs_gracefully() -> None:
     """Empty inputs → ``?`` rather than raising."""
     assert image_version("", "") == "?"
+
+
+def test_build_image_entry_carries_mirrors() -> None:
+    """``mirrors`` passes through as a tuple; absent means none."""
+    entry = build_image_entry(
+        "debian13",
+        {
+            "image_url": "https://example/a/debian.qcow2",
+            "mirrors": ["https://mirror1/a", "https://mirror2/b/"],
+        },
+    )
+    assert entry.mirrors == ("https://mirror1/a", "https://mirror2/b/")
+    assert build_image_entry("debian13", {"image_url": "x"}).mirrors == ()
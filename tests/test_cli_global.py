@@ -1,6 +1,6 @@
 """Unit tests for the ``lvlab global show instances`` CLI command.
 
-These tests stub the virsh enumeration helpers and :func:`parse_config` at
+These tests stub the bulk virsh enumeration helper and :func:`parse_config` at
 the ``tkc_lvlab.cli`` import boundary so nothing here ever invokes ``virsh``
 or libvirt. They lock in the cross-connection behaviour: domains from every
 reachable connection appear in one table, an unreachable connection is skipped
@@ -10,6 +10,7 @@ manifest is present in the working directory.
 
 from __future__ import annotations
 
+import threading
 from unittest import mock
 
 from typer.testing import CliRunner
@@ -17,6 +18,7 @@ from typer.testing import CliRunner
 from tkc_lvlab import cli
 from tkc_lvlab.cli import app
 from tkc_lvlab.utils.virsh import DomInfo, VirshError
+from tkc_lvlab.utils.virsh_cache import VirshReadCache
 
 # Domains keyed by URI for the enumeration stubs. The two default URIs return
 # disjoint domain sets so a test can prove both connections are merged.
@@ -48,22 +50,17 @@ DOMINFO_BY_NAME = {
 }
 
 
-def _list_side_effect(domains_by_uri: dict[str, list[str]]):
-    """Return a virsh_list_all_names stub keyed on the connection URI."""
+def _dominfos_side_effect(domains_by_uri: dict[str, list[str]]):
+    """Return a virsh_dominfos stub keyed on the connection URI."""
 
-    def _side(uri: str) -> list[str]:
+    def _side(uri: str, **_kwargs) -> dict[str, DomInfo]:
         if uri not in domains_by_uri:
-            raise AssertionError(f"unexpected list call for {uri}")
-        return domains_by_uri[uri]
+            raise AssertionError(f"unexpected dominfos call for {uri}")
+        return {name: DOMINFO_BY_NAME[name] for name in domains_by_uri[uri]}
 
     return _side
 
 
-def _dominfo_side(uri: str, name: str) -> DomInfo:
-    """Return the canned DomInfo for ``name`` regardless of connection."""
-    return DOMINFO_BY_NAME[name]
-
-
 def test_instances_merges_domains_from_both_connections() -> None:
     """Domains from qemu:///system AND qemu:///session both land in the table."""
     runner = CliRunner()
@@ -75,9 +72,8 @@ def test_instances_merges_domains_from_both_connections() -> None:
         # No manifest in CWD -> no In-manifest column for this case.
         mock.patch.object(cli, "parse_config", return_value=None),
         mock.patch.object(
-            cli, "virsh_list_all_names", side_effect=_list_side_effect(domains)
+            cli, "virsh_dominfos", side_effect=_dominfos_side_effect(domains)
         ),
-        mock.patch.object(cli, "virsh_dominfo", side_effect=_dominfo_side),
     ):
         result = runner.invoke(app, ["global", "show", "instances"])
 
@@ -98,17 +94,16 @@ def test_instances_unreachable_connection_is_skipped_not_fatal() -> None:
     """A connection that errors is skipped with a note; the others still render."""
     runner = CliRunner()
 
-    def list_side(uri: str) -> list[str]:
+    def dominfos_side(uri: str, **_kwargs) -> dict[str, DomInfo]:
         if uri == "qemu:///session":
-            raise VirshError(1, "failed to connect to the hypervisor", ["list"])
+            raise VirshError(1, "failed to connect to the hypervisor", ["domstats"])
         if uri == "qemu:///system":
-            return SYSTEM_DOMAINS
-        raise AssertionError(f"unexpected list call for {uri}")
+            return {name: DOMINFO_BY_NAME[name] for name in SYSTEM_DOMAINS}
+        raise AssertionError(f"unexpected dominfos call for {uri}")
 
     with (
         mock.patch.object(cli, "parse_config", return_value=None),
-        mock.patch.object(cli, "virsh_list_all_names", side_effect=list_side),
-        mock.patch.object(cli, "virsh_dominfo", side_effect=_dominfo_side),
+        mock.patch.object(cli, "virsh_dominfos", side_effect=dominfos_side),
     ):
         result = runner.invoke(app, ["global", "show", "instances"])
 
@@ -136,9 +131,8 @@ def test_instances_in_manifest_column_when_manifest_present() -> None:
     with (
         mock.patch.object(cli, "parse_config", return_value=parsed),
         mock.patch.object(
-            cli, "virsh_list_all_names", side_effect=_list_side_effect(domains)
+            cli, "virsh_dominfos", side_effect=_dominfos_side_effect(domains)
         ),
-        mock.patch.object(cli, "virsh_dominfo", side_effect=_dominfo_side),
     ):
         result = runner.invoke(app, ["global", "show", "instances"])
 
@@ -161,9 +155,8 @@ def test_instances_no_manifest_omits_in_manifest_column() -> None:
     with (
         mock.patch.object(cli, "parse_config", return_value=None),
         mock.patch.object(
-            cli, "virsh_list_all_names", side_effect=_list_side_effect(domains)
+            cli, "virsh_dominfos", side_effect=_dominfos_side_effect(domains)
         ),
-        mock.patch.object(cli, "virsh_dominfo", side_effect=_dominfo_side),
     ):
         result = runner.invoke(app, ["global", "show", "instances"])
 
@@ -190,9 +183,8 @@ def test_instances_extra_uri_is_enumerated() -> None:
         with (
             mock.patch.object(cli, "parse_config", return_value=None),
             mock.patch.object(
-                cli, "virsh_list_all_names", side_effect=_list_side_effect(domains)
+                cli, "virsh_dominfos", side_effect=_dominfos_side_effect(domains)
             ),
-            mock.patch.object(cli, "virsh_dominfo", side_effect=_dominfo_side),
         ):
             result = runner.invoke(
                 app,
@@ -213,11 +205,55 @@ def test_instances_all_connections_empty_reports_none() -> None:
     with (
         mock.patch.object(cli, "parse_config", return_value=None),
         mock.patch.object(
-            cli, "virsh_list_all_names", side_effect=_list_side_effect(domains)
+            cli, "virsh_dominfos", side_effect=_dominfos_side_effect(domains)
         ),
-        mock.patch.object(cli, "virsh_dominfo", side_effect=_dominfo_side),
     ):
         result = runner.invoke(app, ["global", "show", "instances"])
 
     assert result.exit_code == 0, result.output
     assert "No instances found" in result.output
+
+
+def test_instances_connections_are_queried_concurrently_in_stable_order() -> None:
+    """Both connections are in flight at once; rows still follow URI order."""
+    both_started = threading.Barrier(2, timeout=5)
+
+    def dominfos_side(uri: str, **_kwargs) -> dict[str, DomInfo]:
+        both_started.wait()  # deadlocks (BrokenBarrierError) if run serially
+        names = SYSTEM_DOMAINS if uri == "qemu:///system" else SESSION_DOMAINS
+        return {name: DOMINFO_BY_NAME[name] for name in names}
+
+    with mock.patch.object(cli, "virsh_dominfos", side_effect=dominfos_side):
+        rows, skipped = cli._global_collect_instances(
+            ["qemu:///system", "qemu:///session"]
+        )
+
+    assert skipped == []
+    assert [(uri, name) for uri, name, _ in rows] == [
+        ("qemu:///system", "web01_demo"),
+        ("qemu:///system", "db01_demo"),
+        ("qemu:///session", "scratch_session"),
+    ]
+
+
+def test_instances_workers_share_the_command_read_cache() -> None:
+    """Pooled per-URI reads get the command's cache, explicitly and via context."""
+    seen: list[tuple[object, object]] = []
+    lock = threading.Lock()
+
+    def dominfos_side(uri: str, *, cache=None) -> dict[str, DomInfo]:
+        with lock:
+            seen.append((cache, cli._virsh_cache()))
+        return {}
+
+    with (
+        mock.patch.object(cli, "parse_config", return_value=None),
+        mock.patch.object(cli, "virsh_dominfos", side_effect=dominfos_side),
+    ):
+        result = CliRunner().invoke(app, ["global", "show", "instances"])
+
+    assert result.exit_code == 0, result.output
+    assert len(seen) == 2
+    caches = {id(explicit) for explicit, _ in seen} | {id(ctx) for _, ctx in seen}
+    assert len(caches) == 1
+    assert isinstance(seen[0][0], VirshReadCache)
@@ -130,6 +130,29 @@ def test_quiet_accepted_before_or_after_subcommand(argv):
     assert cfg.call_args.kwargs["quiet"] is True
 
 
+@pytest.mark.parametrize(
+    "argv",
+    [
+        ["--trace", "{path}", "status"],
+        ["status", "--trace", "{path}"],
+        ["status", "--trace={path}"],
+    ],
+)
+def test_trace_value_flag_accepted_before_or_after_subcommand(argv, tmp_path):
+    """``--trace FILE`` is hoisted together with its value in either position."""
+    path = tmp_path / "trace.jsonl"
+    argv = [token.format(path=path) for token in argv]
+    with (
+        mock.patch.object(cli, "configure_logging"),
+        mock.patch.object(cli, "parse_config", return_value=None),
+        mock.patch.object(cli, "trace_to", wraps=cli.trace_to) as trace_to,
+    ):
+        result = runner.invoke(app, argv)
+    assert result.exit_code == 0, result.output
+    trace_to.assert_called_once_with(path)
+    assert path.exists()
+
+
 def test_global_flag_hoisted_through_nested_subcommand():
     """A global buried after a *nested* ``snapshot list <vm>`` still reaches the
     root — only the top app carries :class:`~tkc_lvlab.cli.GlobalFlagGroup`, but
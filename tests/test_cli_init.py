@@ -18,6 +18,7 @@ from typer.testing import CliRunner
 from tkc_lvlab import cli
 from tkc_lvlab.cli import app
 from tkc_lvlab.exceptions import ConfigError
+from tkc_lvlab.utils.http_client import DownloadClient
 
 
 def _mock_image(name: str, *, has_gpg: bool, has_checksum: bool) -> mock.MagicMock:
@@ -31,6 +32,7 @@ def _mock_image(name: str, *, has_gpg: bool, has_checksum: bool) -> mock.MagicMo
     # (#124), so set a real string here — without this the MagicMock auto-attr
     # would crash re.match.
     img.filename = "image.qcow2"
+    img.download_segments = 4
     img.checksum_url_gpg = (
         f"https://example.invalid/{name}/keyring.gpg" if has_gpg else None
     )
@@ -45,24 +47,34 @@ def _mock_image(name: str, *, has_gpg: bool, has_checksum: bool) -> mock.MagicMo
     img.download_checksum_gpg.return_value = True
     img.gpg_verify_checksum_file.return_value = True
     img.checksum_verify_image.return_value = True
+    img.is_verified.return_value = False
+    # ``init`` orders the queue by the bytes each image still needs; ``None``
+    # (size unknown) keeps the declared order.
+    img.pending_download_bytes.return_value = None
     return img
 
 
-def _run_init(images: list[mock.MagicMock]) -> "object":
+def _run_init(
+    images: list[mock.MagicMock],
+    args: tuple[str, ...] = (),
+    *,
+    config_defaults: dict | None = None,
+    machines: list[dict] | None = None,
+) -> "object":
     """Invoke ``lvlab init`` with ``parse_config`` and ``CloudImage`` patched."""
     runner = CliRunner()
     parse_return = (
         {"name": "test-env"},
         {f"img{idx}": {} for idx, _ in enumerate(images)},
-        {},
-        [],
+        config_defaults or {},
+        machines or [],
     )
     with ExitStack() as stack:
         stack.enter_context(
             mock.patch.object(cli, "parse_config", return_value=parse_return)
         )
         stack.enter_context(mock.patch.object(cli, "CloudImage", side_effect=images))
-        return runner.invoke(app, ["init"])
+        return runner.invoke(app, ["init", *args])
 
 
 def test_init_downloads_all_artefacts_when_nothing_local() -> None:
@@ -100,6 +112,52 @@ def test_init_verifies_when_all_artefacts_already_local() -> None:
     assert "done" in result.output
 
 
+def test_init_skips_verification_of_an_already_verified_image() -> None:
+    """A still-valid verification record means neither verifier reruns."""
+    img = _mock_image("fedora44", has_gpg=True, has_checksum=True)
+    img.exists_locally.return_value = True
+    img.is_verified.return_value = True
+    result = _run_init([img])
+
+    assert result.exit_code == 0, result.output
+    img.gpg_verify_checksum_file.assert_not_called()
+    img.checksum_verify_image.assert_not_called()
+    assert "done" in result.output
+
+
+def test_init_reverify_ignores_the_verification_record() -> None:
+    img = _mock_image("fedora44", has_gpg=True, has_checksum=True)
+    img.exists_locally.return_value = True
+    img.is_verified.return_value = True
+    result = _run_init([img], ("--reverify",))
+
+    assert result.exit_code == 0, result.output
+    img.gpg_verify_checksum_file.assert_called_once()
+    img.checksum_verify_image.assert_called_once()
+
+
+def test_init_downloads_share_one_pooled_client() -> None:
+    """Every file of every image goes through the same DownloadClient."""
+    images = [
+        _mock_image(name, has_gpg=True, has_checksum=True)
+        for name in ("fedora44", "debian13")
+    ]
+    result = _run_init(images)
+
+    assert result.exit_code == 0, result.output
+    clients = {
+        call.kwargs["client"]
+        for img in images
+        for call in (
+            img.download_image.call_args,
+            img.download_checksum.call_args,
+            img.download_checksum_gpg.call_args,
+        )
+    }
+    assert len(clients) == 1
+    assert isinstance(clients.pop(), DownloadClient)
+
+
 def test_init_skips_gpg_branch_when_image_has_no_gpg_url() -> None:
     """Debian-style image: no checksum GPG keyring → skip GPG download/verify."""
     img = _mock_image("debian12", has_gpg=False, has_checksum=True)
@@ -317,3 +375,69 @@ def test_init_one_image_failure_exits_1_others_still_processed() -> None:
     # The healthy image was still processed despite the other's failure.
     good.download_image.assert_called_once()
     bad.download_image.assert_called_once()
+
+
+# ---------------------------------------------------------------------------
+# Download scheduling, --limit-rate and --background
+# ---------------------------------------------------------------------------
+
+
+def test_init_fetches_machine_images_first_then_smallest() -> None:
+    """Images a machine boots from lead the queue; the rest go smallest first."""
+    started: list[str] = []
+    images = []
+    for name, size in (
+        ("big", 900),
+        ("unknown", None),
+        ("small", 100),
+        ("needed", 5000),
+    ):
+        img = _mock_image(name, has_gpg=False, has_checksum=False)
+        img.pending_download_bytes.return_value = size
+        img.download_image.side_effect = lambda name=name, **_kw: (
+            started.append(name) or True
+        )
+        images.append(img)
+
+    result = _run_init(images, ("--jobs", "1"), machines=[{"os": "needed"}])
+
+    assert result.exit_code == 0, result.output
+    assert started == ["needed", "small", "big", "unknown"]
+
+
+def test_init_limit_rate_shares_one_bucket() -> None:
+    images = [
+        _mock_image(name, has_gpg=False, has_checksum=False)
+        for name in ("fedora44", "debian13")
+    ]
+    result = _run_init(images, ("--limit-rate", "2M"))
+
+    assert result.exit_code == 0, result.output
+    client = images[0].download_image.call_args.kwargs["client"]
+    assert client is images[1].download_image.call_args.kwargs["client"]
+    assert client.bucket.rate == 2 * 1024**2
+
+
+def test_init_rejects_a_malformed_rate() -> None:
+    img = _mock_image("fedora44", has_gpg=False, has_checksum=False)
+    result = _run_init([img], ("--limit-rate", "fast"))
+
+    assert result.exit_code == 2
+    assert "invalid rate" in result.output
+    img.download_image.assert_not_called()
+
+
+def test_init_background_detaches_and_reports_the_log(tmp_path) -> None:
+    """The parent side of ``--background``: report the child and exit 0."""
+    img = _mock_image("fedora44", has_gpg=False, has_checksum=False)
+    with mock.patch.object(cli.os, "fork", return_value=4242):
+        result = _run_init(
+            [img],
+            ("--background",),
+            config_defaults={"cloud_image_basedir": str(tmp_path)},
+        )
+
+    assert result.exit_code == 0, result.output
+    assert "pid 4242" in result.output
+    assert str(tmp_path / "cloud-images" / ".logs" / "init.log") in result.output
+    img.download_image.assert_not_called()
@@ -4,9 +4,9 @@ These tests stub the virsh helpers and :func:`parse_config` at the
 ``tkc_lvlab.cli`` import boundary so nothing here ever invokes ``virsh``
 or libvirt. They lock in two things:
 
-- The Phase 2 port: ``status`` uses ``virsh_list_all_names`` +
-    ``virsh_domstate`` and only queries state for *deployed* domains
-    (no N+1 ``virsh domstate`` for undeployed machines).
+- The bulk state read: ``status`` makes exactly one ``virsh_domstates``
+    call no matter how many machines the manifest lists, and renders the
+    humanized state reason that call carries for free.
 - The issue #103 reshape: machines and images render as the shared-style
     tables, the Images table merges the built-in default catalog with the
     manifest (labelling each image's ``source``), and built-in defaults
@@ -26,6 +26,7 @@ from typer.testing import CliRunner
 from tkc_lvlab import cli
 from tkc_lvlab.cli import app
 from tkc_lvlab.utils.virsh import VirshError
+from tkc_lvlab.utils.virsh_cache import VirshReadCache
 
 # A representative manifest tuple matching parse_config's return shape:
 # (environment, images, config_defaults, machines).
@@ -60,26 +61,19 @@ def _patched_config(
     )
 
 
-def test_status_happy_path_mixed_states_no_reason_suffix() -> None:
+def test_status_happy_path_mixed_states_with_reason() -> None:
     """alpha running, beta shut off, gamma undeployed — rendered in the Machines table."""
     runner = CliRunner()
-    # Only the two deployed VMs come back from virsh list.
-    listed = ["alpha_demo", "beta_demo"]
-
-    def domstate_side_effect(uri: str, name: str) -> str:
-        assert uri == "qemu:///session"
-        if name == "alpha_demo":
-            return "running"
-        if name == "beta_demo":
-            return "shut off"
-        raise AssertionError(f"unexpected domstate call for {name}")
+    # Only the two deployed VMs come back from the bulk state read.
+    states = {
+        "alpha_demo": ("running", "booted"),
+        "beta_demo": ("shut off", "shutdown"),
+        "unrelated_other": ("running", "booted"),
+    }
 
     with (
         _patched_config(),
-        mock.patch.object(cli, "virsh_list_all_names", return_value=listed),
-        mock.patch.object(
-            cli, "virsh_domstate", side_effect=domstate_side_effect
-        ) as domstate_mock,
+        mock.patch.object(cli, "virsh_domstates", return_value=states) as states_mock,
     ):
         result = runner.invoke(app, ["status"])
 
@@ -95,24 +89,42 @@ def test_status_happy_path_mixed_states_no_reason_suffix() -> None:
     assert "beta" in out and "shut off" in out
     assert "gamma" in out and "undeployed" in out
 
-    # Regression guard: the dropped state-reason suffix must not reappear.
-    # The N+1 ``virsh domstate --reason`` avoidance is the real contract —
-    # only the two DEPLOYED VMs are queried, never the undeployed one.
-    assert "normal startup" not in out
-    assert domstate_mock.call_count == 2
+    # The humanized reason column is back, at no extra virsh cost.
+    assert "Reason" in out
+    assert "normal startup from boot" in out
+    assert "normal shutdown" in out
+    states_mock.assert_called_once_with("qemu:///session", cache=mock.ANY)
+    # The root callback's per-command cache actually reaches the helper.
+    assert isinstance(states_mock.call_args.kwargs["cache"], VirshReadCache)
 
     # Image URLs surface in the Images table.
     assert "https://example.invalid/fedora.qcow2" in out
     assert "https://example.invalid/debian.qcow2" in out
 
 
-def test_status_all_undeployed_skips_domstate_entirely() -> None:
-    """No machines present on the hypervisor -> all 'undeployed', zero domstate calls."""
+def test_status_is_one_virsh_call_regardless_of_manifest_size() -> None:
+    """A 50-machine manifest still costs exactly one bulk state query."""
+    runner = CliRunner()
+    machines = [{"vm_name": f"vm{i:02d}"} for i in range(50)]
+    states = {f"vm{i:02d}_demo": ("running", "booted") for i in range(0, 50, 2)}
+    with (
+        _patched_config(machines=machines),
+        mock.patch.object(cli, "virsh_domstates", return_value=states) as states_mock,
+        mock.patch.object(cli, "run_virsh") as run_mock,
+    ):
+        result = runner.invoke(app, ["status"])
+
+    assert result.exit_code == 0, result.output
+    states_mock.assert_called_once()
+    run_mock.assert_not_called()
+
+
+def test_status_all_undeployed() -> None:
+    """No machines present on the hypervisor -> all 'undeployed'."""
     runner = CliRunner()
     with (
         _patched_config(),
-        mock.patch.object(cli, "virsh_list_all_names", return_value=[]),
-        mock.patch.object(cli, "virsh_domstate") as domstate_mock,
+        mock.patch.object(cli, "virsh_domstates", return_value={}),
     ):
         result = runner.invoke(app, ["status"])
 
@@ -121,61 +133,30 @@ def test_status_all_undeployed_skips_domstate_entirely() -> None:
     for vm in ("alpha", "beta", "gamma"):
         assert vm in out
     assert "undeployed" in out
-    domstate_mock.assert_not_called()
 
 
 def test_status_list_failure_exits_nonzero() -> None:
-    """When virsh list itself fails, the command logs an error and exits 1."""
+    """When the bulk state query fails, the command logs an error and exits 1."""
     runner = CliRunner()
-    err = VirshError(1, "error: failed to connect to the hypervisor", ["list"])
+    err = VirshError(1, "error: failed to connect to the hypervisor", ["domstats"])
     with (
         _patched_config(),
-        mock.patch.object(cli, "virsh_list_all_names", side_effect=err),
-        mock.patch.object(cli, "virsh_domstate") as domstate_mock,
+        mock.patch.object(cli, "virsh_domstates", side_effect=err),
     ):
         result = runner.invoke(app, ["status"])
 
     assert result.exit_code == 1
-    # We never reach the per-machine loop if listing fails.
-    domstate_mock.assert_not_called()
-    # The Machines table is built only after a successful list, so its
+    # The Machines table is built only after a successful query, so its
     # header column must not have been rendered.
     assert "undeployed" not in result.output
 
 
-def test_status_per_machine_domstate_failure_continues() -> None:
-    """One VM's domstate failing renders an inline fallback; others render normally."""
-    runner = CliRunner()
-    listed = ["alpha_demo", "beta_demo"]
-
-    def domstate_side_effect(uri: str, name: str) -> str:
-        if name == "alpha_demo":
-            raise VirshError(1, "error: Domain not found", ["domstate", name])
-        if name == "beta_demo":
-            return "running"
-        raise AssertionError(f"unexpected domstate call for {name}")
-
-    with (
-        _patched_config(),
-        mock.patch.object(cli, "virsh_list_all_names", return_value=listed),
-        mock.patch.object(cli, "virsh_domstate", side_effect=domstate_side_effect),
-    ):
-        result = runner.invoke(app, ["status"])
-
-    # Per-machine failure does NOT take the whole command down.
-    assert result.exit_code == 0, result.output
-    out = result.output
-    assert "unknown (virsh error)" in out
-    assert "running" in out
-    assert "undeployed" in out  # gamma
-
-
 def test_status_parse_config_typeerror_exits_nonzero() -> None:
     """If the manifest can't be parsed, status exits 1 (existing contract)."""
     runner = CliRunner()
     with (
         mock.patch.object(cli, "parse_config", side_effect=TypeError("bad config")),
-        mock.patch.object(cli, "virsh_list_all_names") as list_mock,
+        mock.patch.object(cli, "virsh_domstates") as list_mock,
     ):
         result = runner.invoke(app, ["status"])
 
@@ -189,8 +170,7 @@ def test_status_renders_env_name_then_machines_then_images_in_order() -> None:
     runner = CliRunner()
     with (
         _patched_config(machines=[]),  # empty machines is fine; we check section order
-        mock.patch.object(cli, "virsh_list_all_names", return_value=[]),
-        mock.patch.object(cli, "virsh_domstate"),
+        mock.patch.object(cli, "virsh_domstates", return_value={}),
     ):
         result = runner.invoke(app, ["status"])
 
@@ -217,8 +197,7 @@ def test_status_images_table_labels_source_and_shows_defaults(tmp_path) -> None:
     config_defaults = {"cloud_image_basedir": str(tmp_path)}  # empty -> cached "no"
     with (
         _patched_config(images=images, machines=[], config_defaults=config_defaults),
-        mock.patch.object(cli, "virsh_list_all_names", return_value=[]),
-        mock.patch.object(cli, "virsh_domstate"),
+        mock.patch.object(cli, "virsh_domstates", return_value={}),
     ):
         result = runner.invoke(app, ["status"])
 
@@ -247,8 +226,7 @@ def test_status_image_missing_url_does_not_crash(tmp_path) -> None:
     config_defaults = {"cloud_image_basedir": str(tmp_path)}
     with (
         _patched_config(images=images, machines=[], config_defaults=config_defaults),
-        mock.patch.object(cli, "virsh_list_all_names", return_value=[]),
-        mock.patch.object(cli, "virsh_domstate"),
+        mock.patch.object(cli, "virsh_domstates", return_value={}),
     ):
         result = runner.invoke(app, ["status"])
 
@@ -274,7 +252,7 @@ def test_status_no_manifest_renders_friendly_landing() -> None:
     runner = CliRunner()
     with (
         mock.patch.object(cli, "parse_config", return_value=None),
-        mock.patch.object(cli, "virsh_list_all_names") as list_mock,
+        mock.patch.object(cli, "virsh_domstates") as list_mock,
     ):
         result = runner.invoke(app, ["status"])
 
@@ -328,7 +306,7 @@ def test_status_invalid_manifest_still_exits_one() -> None:
         mock.patch.object(
             cli, "parse_config", side_effect=ConfigError("manifest malformed")
         ),
-        mock.patch.object(cli, "virsh_list_all_names") as list_mock,
+        mock.patch.object(cli, "virsh_domstates") as list_mock,
     ):
         result = runner.invoke(app, ["status"])
 
@@ -35,6 +35,17 @@ def _hermetic_host_config(monkeypatch: pytest.MonkeyPatch) -> None:
     monkeypatch.setattr(cli, "load_host_config", lambda *a, **k: HostConfig())
 
 
+@pytest.fixture(autouse=True)
+def _no_cache_usage_log(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Keep the mocked ``CloudImage``'s use stamp out of the working tree.
+
+    ``CloudImage`` is a ``MagicMock`` here, whose ``image_fpath`` is a
+    relative ``MagicMock/...`` path; recording its use would create a
+    ``.usage`` log under the current directory.
+    """
+    monkeypatch.setattr(cli, "record_image_use", lambda *a, **k: None)
+
+
 def _patched_config() -> mock._patch:
     """Patch ``cli.parse_config`` with a single-machine manifest."""
     return mock.patch.object(
@@ -6,6 +6,8 @@
 
 from __future__ import annotations
 
+import contextlib
+import subprocess
 from unittest import mock
 
 from typer.testing import CliRunner
@@ -98,3 +100,33 @@ def test_up_all_skips_remaining_when_machines_is_empty() -> None:
     assert (
         "no machines" in result.output.lower() or "0 machines" in result.output.lower()
     )
+
+
+def test_up_all_shares_one_virsh_read_cache() -> None:
+    """The per-command read cache reaches every machine: one state probe total."""
+    machines = [_machine("web01"), _machine("db01")]
+    parse_return = (
+        {"name": "test-env", "libvirt_uri": "qemu:///system"},
+        {"debian12": {"image_url": "https://example/debian12.qcow2"}},
+        {"interfaces": {}, "domain": "test.local"},
+        machines,
+    )
+    domstats = "".join(
+        f"Domain: '{m['vm_name']}_test-env'\n  state.state=1\n  state.reason=1\n\n"
+        for m in machines
+    )
+
+    def fake_run(argv, **_kwargs):
+        return subprocess.CompletedProcess(argv, 0, domstats, "")
+
+    with (
+        mock.patch.object(cli, "parse_config", return_value=parse_return),
+        mock.patch.object(cli, "_host_networks", return_value={}),
+        mock.patch.object(cli, "virsh_sessions", contextlib.nullcontext),
+        mock.patch("tkc_lvlab.utils.virsh.subprocess.run", side_effect=fake_run) as run,
+    ):
+        result = CliRunner().invoke(app, ["up", "--all"])
+
+    assert result.exit_code == 0, result.output
+    assert result.output.count("is running already") == 2
+    assert run.call_count == 1
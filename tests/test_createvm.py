@@ -28,6 +28,7 @@ from __future__ import annotations
 
 import json
 import re
+import struct
 import subprocess
 from pathlib import Path
 from unittest import mock
@@ -308,6 +309,7 @@ def all_external_mocked(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> dict
         "wait_for_dhcp_lease": mock.Mock(return_value=None),
         "subprocess_run": mock.Mock(side_effect=_fake_subprocess_run),
         "copyfile": mock.Mock(),
+        "record_image_use": mock.Mock(),
     }
 
     monkeypatch.setattr(cv_mod, "check_createvm_tooling", mocks["tooling"])
@@ -331,6 +333,7 @@ def all_external_mocked(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> dict
 
     monkeypatch.setattr(subprocess, "run", mocks["subprocess_run"])
     monkeypatch.setattr("tkc_lvlab.scripts.createvm.shutil.copyfile", mocks["copyfile"])
+    monkeypatch.setattr(cv_mod, "record_image_use", mocks["record_image_use"])
 
     # Bypass osinfo-db lookup (would add a virt-install subprocess call).
     monkeypatch.setattr(cv_mod, "resolve_os_variant", lambda v: (v, None))
@@ -445,6 +448,9 @@ def test_copies_disk_then_resizes(all_external_mocked: dict, tmp_path: Path) ->
     assert result.exit_code == 0, result.output
 
     all_external_mocked["copyfile"].assert_called_once()
+    all_external_mocked["record_image_use"].assert_called_once_with(
+        all_external_mocked["fake_image"].image_fpath
+    )
     qemu_img_calls = [
         c
         for c in all_external_mocked["subprocess_run"].call_args_list
@@ -501,6 +507,28 @@ def test_resize_runs_when_disk_size_gt_base(
     assert resize_calls[0].args[0][-1] == "35G"
 
 
+def test_base_size_read_from_qcow2_header(
+    all_external_mocked: dict, tmp_path: Path
+) -> None:
+    """A readable qcow2 base is sized from its header, without ``qemu-img info``."""
+    header = struct.pack(">4sIQIIQ", b"QFI\xfb", 2, 0, 0, 16, 10 * _GIB)
+    Path(all_external_mocked["fake_image"].image_fpath).write_bytes(
+        header.ljust(72, b"\0")
+    )
+
+    result = _invoke(["testvm.local", "debian12", "--disk-size", "5G"], tmp_path)
+    assert result.exit_code == 0, result.output
+
+    qemu_img_calls = [
+        c.args[0][1]
+        for c in all_external_mocked["subprocess_run"].call_args_list
+        if c.args[0][0] == "qemu-img"
+    ]
+    assert qemu_img_calls == []
+    assert "skipping resize" in result.output
+    assert "10G" in result.output
+
+
 def test_dependency_failure_exits_nonzero(
     all_external_mocked: dict, tmp_path: Path
 ) -> None:
@@ -1381,3 +1409,27 @@ def test_ip6_on_bridge_with_gateway6_dns6_passes_through(
     network_config = (tmp_path / "testvm.local" / "network-config").read_text()
     assert "2001:db8:10::50/64" in network_config
     assert "2001:db8:10::1" in network_config  # gateway/DNS
+
+
+def _cached_image_mock(*, verified: bool) -> mock.MagicMock:
+    image = mock.MagicMock()
+    image.exists_locally.return_value = True
+    image.checksum_url = "https://example.invalid/SHA256SUMS"
+    image.checksum_url_gpg = "https://example.invalid/keyring.gpg"
+    image.is_verified.return_value = verified
+    image.checksum_verify_image.return_value = True
+    return image
+
+
+def test_ensure_image_available_skips_an_already_verified_image() -> None:
+    image = _cached_image_mock(verified=True)
+    cv_mod._ensure_image_available(image)
+    image.gpg_verify_checksum_file.assert_not_called()
+    image.checksum_verify_image.assert_not_called()
+
+
+def test_ensure_image_available_reverify_checks_again() -> None:
+    image = _cached_image_mock(verified=True)
+    cv_mod._ensure_image_available(image, reverify=True)
+    image.gpg_verify_checksum_file.assert_called_once()
+    image.checksum_verify_image.assert_called_once()
@@ -0,0 +1,109 @@
+"""Unit tests for :mod:`tkc_lvlab.utils.http_client`.
+
+A local ``http.server`` records the client port of every request, so a test
+can count how many TCP connections a sequence of downloads actually opened.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+from tkc_lvlab.utils.http_client import DownloadClient
+from tkc_lvlab.utils.images import CloudImage
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def log_message(self, *_args) -> None:
+        pass
+
+    def do_GET(self) -> None:  # noqa: N802 - http.server naming
+        with self.server.lock:
+            self.server.ports.append(self.client_address[1])
+        body = self.path.encode() * 100
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    httpd.daemon_threads = True
+    httpd.lock = threading.Lock()
+    httpd.ports = []
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    httpd.base = f"http://127.0.0.1:{httpd.server_address[1]}"
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_image_checksum_and_keyring_share_one_connection(server, tmp_path: Path) -> None:
+    with DownloadClient() as client:
+        for name in ("image.qcow2", "SHA256SUMS", "keyring.gpg"):
+            assert CloudImage._download_file(
+                f"{server.base}/{name}", str(tmp_path / name), client=client
+            )
+
+    assert len(server.ports) == 3
+    assert len(set(server.ports)) == 1  # one handshake, two reuses
+    assert (tmp_path / "SHA256SUMS").read_bytes() == b"/SHA256SUMS" * 100
+
+
+def test_without_a_client_every_file_connects_anew(server, tmp_path: Path) -> None:
+    for name in ("image.qcow2", "SHA256SUMS"):
+        CloudImage._download_file(f"{server.base}/{name}", str(tmp_path / name))
+    assert len(set(server.ports)) == 2
+
+
+def test_workers_share_the_pool_without_exceeding_it(server) -> None:
+    client = DownloadClient(jobs=2)
+    assert client.pool_size == 2
+
+    def fetch(index: int) -> bytes:
+        return client.get(f"{server.base}/f{index}", timeout=5).content
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        bodies = list(pool.map(fetch, range(12)))
+    client.close()
+
+    assert bodies[3] == b"/f3" * 100
+    assert len(set(server.ports)) <= 2  # two workers, two kept-alive connections
+
+
+def test_pool_is_sized_for_segmented_ranges() -> None:
+    assert DownloadClient(3, connections_per_job=4).pool_size == 12
+    assert DownloadClient(0).pool_size == 1
+
+
+def test_each_thread_gets_its_own_session() -> None:
+    client = DownloadClient()
+    main = client.session()
+    other: list = []
+    thread = threading.Thread(target=lambda: other.append(client.session()))
+    thread.start()
+    thread.join()
+    assert client.session() is main
+    assert other[0] is not main
+
+
+def test_limit_rate_throttles_downloads(server, tmp_path: Path) -> None:
+    # ~200 kB body; the 100 kB first bucketful is free, the rest takes
+    # about 0.25 s at 400 kB/s.
+    url = f"{server.base}/{'a' * 1999}"
+    with DownloadClient(limit_rate=400_000) as client:
+        started = time.monotonic()
+        assert CloudImage._download_file(url, str(tmp_path / "image"), client=client)
+        elapsed = time.monotonic() - started
+
+    assert (tmp_path / "image").stat().st_size == 200_000
+    assert elapsed > 0.2
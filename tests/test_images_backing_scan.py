@@ -0,0 +1,138 @@
+"""The backing-file scan behind ``lvlab images clean`` (:func:`backing_users`).
+
+The disk header reader (:func:`~tkc_lvlab.utils.vdisk.disk_header`) is
+replaced by a fake that looks the backing path up in a dict and records its
+calls, so the tests can see which disks were
+probed, how many at once, and which answers came from the scan cache.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from pathlib import Path
+from unittest import mock
+
+from tkc_lvlab.utils import images as images_mod
+from tkc_lvlab.utils.images import backing_users
+from tkc_lvlab.utils.vdisk import DiskHeader
+
+
+def _setup(tmp_path: Path, disks: dict[str, str | None]) -> tuple[dict, Path]:
+    """Create ``disks`` (relative path -> backing) under a lab basedir."""
+    cache = tmp_path / "cloud-images"
+    cache.mkdir()
+    (cache / "base.qcow2").write_bytes(b"base")
+    for rel in disks:
+        (tmp_path / rel).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / rel).write_bytes(b"disk")
+    config_defaults = {
+        "cloud_image_basedir": str(tmp_path),
+        "disk_image_basedir": str(tmp_path),
+    }
+    return config_defaults, cache
+
+
+class _FakeHeaders:
+    def __init__(self, tmp_path: Path, disks: dict[str, str | None]) -> None:
+        self.backings = {str(tmp_path / rel): b for rel, b in disks.items()}
+        self.probed: list[str] = []
+        self.failing: set[str] = set()
+        self._lock = threading.Lock()
+
+    def __call__(self, disk_path: str) -> DiskHeader | None:
+        with self._lock:
+            self.probed.append(disk_path)
+        if disk_path in self.failing:
+            return None
+        backing = self.backings.get(disk_path)
+        return DiskHeader(disk_path, "qcow2", 1 << 30, 65536, backing)
+
+
+def test_scan_maps_cache_images_to_their_disks(tmp_path: Path) -> None:
+    base = str(tmp_path / "cloud-images" / "base.qcow2")
+    disks = {
+        "env/vm1/disk0.qcow2": base,
+        "env/vm2/disk0.qcow2": base,
+        "env/vm3/disk0.qcow2": "/elsewhere/other.qcow2",
+        "env/vm4/disk0.qcow2": None,
+    }
+    config_defaults, _cache = _setup(tmp_path, disks)
+    fake = _FakeHeaders(tmp_path, disks)
+
+    with mock.patch.object(images_mod, "disk_header", side_effect=fake):
+        users = backing_users({}, config_defaults)
+
+    assert {k: sorted(v) for k, v in users.items()} == {
+        base: [
+            str(tmp_path / "env/vm1/disk0.qcow2"),
+            str(tmp_path / "env/vm2/disk0.qcow2"),
+        ]
+    }
+    # The cached base images themselves are never probed.
+    assert sorted(fake.probed) == sorted(str(tmp_path / rel) for rel in disks)
+
+
+def test_repeat_scan_only_probes_changed_disks(tmp_path: Path) -> None:
+    base = str(tmp_path / "cloud-images" / "base.qcow2")
+    disks = {"env/vm1/disk0.qcow2": base, "env/vm2/disk0.qcow2": None}
+    config_defaults, _cache = _setup(tmp_path, disks)
+    fake = _FakeHeaders(tmp_path, disks)
+    with mock.patch.object(images_mod, "disk_header", side_effect=fake):
+        first = backing_users({}, config_defaults)
+        fake.probed.clear()
+
+        assert backing_users({}, config_defaults) == first
+        assert fake.probed == []
+
+        changed = tmp_path / "env/vm2/disk0.qcow2"
+        changed.write_bytes(b"rebased disk")
+        fake.backings[str(changed)] = base
+        users = backing_users({}, config_defaults)
+
+    assert fake.probed == [str(changed)]
+    assert len(users[base]) == 2
+
+
+def test_failed_probes_are_not_cached(tmp_path: Path) -> None:
+    base = str(tmp_path / "cloud-images" / "base.qcow2")
+    disks = {"env/vm1/disk0.qcow2": base}
+    config_defaults, _cache = _setup(tmp_path, disks)
+    fake = _FakeHeaders(tmp_path, disks)
+    fake.failing.add(str(tmp_path / "env/vm1/disk0.qcow2"))
+
+    with mock.patch.object(images_mod, "disk_header", side_effect=fake):
+        assert backing_users({}, config_defaults) == {}
+        fake.failing.clear()
+        assert list(backing_users({}, config_defaults)) == [base]
+
+    assert len(fake.probed) == 2
+
+
+def test_probes_run_concurrently(tmp_path: Path) -> None:
+    disks = {f"env/vm{i}/disk0.qcow2": None for i in range(4)}
+    config_defaults, _cache = _setup(tmp_path, disks)
+    # Each probe waits for all four: a serial scan would break the barrier.
+    barrier = threading.Barrier(4, timeout=5)
+
+    def probe(disk_path: str) -> DiskHeader:
+        barrier.wait()
+        return DiskHeader(disk_path, "qcow2", 1 << 30)
+
+    with mock.patch.object(images_mod, "disk_header", side_effect=probe):
+        assert backing_users({}, config_defaults, jobs=4) == {}
+    assert not barrier.broken
+
+
+def test_scan_cache_lives_in_a_hidden_cache_directory(tmp_path: Path) -> None:
+    disks = {"env/vm1/disk0.qcow2": None}
+    config_defaults, cache = _setup(tmp_path, disks)
+
+    with mock.patch.object(
+        images_mod, "disk_header", side_effect=_FakeHeaders(tmp_path, disks)
+    ):
+        backing_users({}, config_defaults)
+
+    assert os.path.isfile(cache / ".scan" / "backing.json")
+    protected = {str(cache / "base.qcow2")}
+    assert images_mod.find_cleanup_candidates(str(cache), protected) == []
@@ -0,0 +1,169 @@
+"""Content-addressed cloud-image cache (``content_addressed_cache``).
+
+Downloads are served by a patched ``requests.get`` that answers from an
+in-memory table of URLs, so a test can tell which files were actually
+fetched. Blob references are real hard links and symlinks in ``tmp_path``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+from pathlib import Path
+from unittest import mock
+
+from typer.testing import CliRunner
+
+from tkc_lvlab import cli
+from tkc_lvlab.cli import app
+from tkc_lvlab.utils.images import (
+    CloudImage,
+    enumerate_protected_files,
+    find_cleanup_candidates,
+    find_orphan_blobs,
+    read_digest,
+)
+
+from tests.http_fakes import FakeResponse
+
+IMAGE = b"cloud image bytes " * 4096
+DIGEST = hashlib.sha256(IMAGE).hexdigest()
+BASE = "https://mirror.example/pub"
+
+
+def _serve(files: dict[str, bytes]):
+    """Patch ``requests.get`` to answer from ``files`` (filename -> body)."""
+
+    def get(url, **_kwargs):
+        return FakeResponse(files[url.rsplit("/", 1)[1]])
+
+    return mock.patch("tkc_lvlab.utils.images.requests.get", side_effect=get)
+
+
+def _image(tmp_path: Path, filename: str, *, checksum: bool = True) -> CloudImage:
+    config = {"image_url": f"{BASE}/{filename}"}
+    if checksum:
+        config["checksum_url"] = f"{BASE}/SHA256SUMS"
+        config["checksum_type"] = "sha256"
+    config_defaults = {
+        "cloud_image_basedir": str(tmp_path / "cloud-images"),
+        "download_segments": 1,
+        "content_addressed_cache": True,
+    }
+    return CloudImage(filename.split(".")[0], config, {}, config_defaults)
+
+
+def _fetched(get: mock.Mock) -> list[str]:
+    return [call.args[0].rsplit("/", 1)[1] for call in get.call_args_list]
+
+
+def test_download_is_interned_under_its_digest(tmp_path: Path) -> None:
+    image = _image(tmp_path, "noble.img")
+    manifest = f"{DIGEST} *noble.img\n".encode()
+
+    with _serve({"noble.img": IMAGE, "SHA256SUMS": manifest}):
+        assert image.download_image()
+
+    blob = Path(image.blob_dir, "sha256", DIGEST)
+    assert os.path.samefile(blob, image.image_fpath)
+    assert read_digest(image.image_fpath, "sha256") == DIGEST
+    assert image.checksum_verify_image()
+    # The store is a hidden directory: never a cleanup candidate itself.
+    config = {"image_url": image.image_url, "checksum_url": image.checksum_url}
+    config_defaults = {"cloud_image_basedir": str(tmp_path / "cloud-images")}
+    protected = enumerate_protected_files({image.name: config}, {}, config_defaults)
+    assert find_cleanup_candidates(image.image_dir, protected) == []
+    assert find_orphan_blobs(image.image_dir) == []
+
+
+def test_same_bytes_under_another_name_are_linked_not_fetched(tmp_path: Path) -> None:
+    current = _image(tmp_path, "noble.img")
+    alias = _image(tmp_path, "noble-latest.img")
+    manifest = f"{DIGEST} *noble.img\n{DIGEST} *noble-latest.img\n".encode()
+    files = {"noble.img": IMAGE, "noble-latest.img": IMAGE, "SHA256SUMS": manifest}
+    with _serve(files):
+        current.download_image()
+
+    with _serve(files) as get:
+        assert alias.download_image()
+
+    assert _fetched(get) == ["SHA256SUMS"]
+    assert os.path.samefile(alias.image_fpath, current.image_fpath)
+    assert os.stat(alias.image_fpath).st_nlink == 3
+    assert alias.checksum_verify_image()
+
+
+def test_duplicate_download_shares_the_stored_blob(tmp_path: Path) -> None:
+    first = _image(tmp_path, "one.img", checksum=False)
+    second = _image(tmp_path, "two.img", checksum=False)
+
+    with _serve({"one.img": IMAGE, "two.img": IMAGE}) as get:
+        first.download_image()
+        second.download_image()
+
+    assert _fetched(get) == ["one.img", "two.img"]
+    assert os.path.samefile(first.image_fpath, second.image_fpath)
+    assert read_digest(second.image_fpath, "sha256") == DIGEST
+
+
+def test_blob_is_orphaned_once_its_last_alias_goes(tmp_path: Path) -> None:
+    first = _image(tmp_path, "one.img", checksum=False)
+    second = _image(tmp_path, "two.img", checksum=False)
+    with _serve({"one.img": IMAGE, "two.img": IMAGE}):
+        first.download_image()
+        second.download_image()
+    blob = str(Path(first.blob_dir, "sha256", DIGEST))
+
+    assert find_orphan_blobs(first.image_dir, [first.image_fpath]) == []
+    assert find_orphan_blobs(
+        first.image_dir, [first.image_fpath, second.image_fpath]
+    ) == [blob]
+
+
+def test_symlink_aliases_when_hard_links_fail(tmp_path: Path) -> None:
+    image = _image(tmp_path, "one.img", checksum=False)
+
+    with (
+        _serve({"one.img": IMAGE}),
+        mock.patch("tkc_lvlab.utils.images.os.link", side_effect=PermissionError),
+    ):
+        assert image.download_image()
+
+    blob = str(Path(image.blob_dir, "sha256", DIGEST))
+    assert os.readlink(image.image_fpath) == blob
+    assert Path(image.image_fpath).read_bytes() == IMAGE
+    assert find_orphan_blobs(image.image_dir) == []
+    assert find_orphan_blobs(image.image_dir, [image.image_fpath]) == [blob]
+
+
+def test_clean_collects_the_blobs_of_removed_aliases(tmp_path: Path) -> None:
+    kept = _image(tmp_path, "kept.img", checksum=False)
+    stale = _image(tmp_path, "stale.img", checksum=False)
+    with _serve({"kept.img": IMAGE, "stale.img": b"an older build"}):
+        kept.download_image()
+        stale.download_image()
+    stale_blob = os.path.realpath(
+        Path(stale.blob_dir, "sha256", hashlib.sha256(b"an older build").hexdigest())
+    )
+    config_defaults = {"cloud_image_basedir": str(tmp_path / "cloud-images")}
+    images = {"kept": {"image_url": f"{BASE}/kept.img"}}
+
+    with (
+        mock.patch.object(
+            cli, "parse_config", return_value=({}, images, config_defaults, [])
+        ),
+        mock.patch.object(cli, "backing_files_in_use", return_value=set()),
+        mock.patch.object(cli, "_read_manifest_text", return_value=""),
+    ):
+        dry_run = CliRunner().invoke(app, ["images", "clean"])
+        assert f"Would remove orphaned blob: {stale_blob}" in dry_run.output
+        assert os.path.exists(stale_blob)
+
+        result = CliRunner().invoke(app, ["images", "clean", "--force"])
+
+    assert result.exit_code == 0, result.output
+    assert "and 1 orphaned blob(s)." in result.output
+    assert not os.path.exists(stale.image_fpath)
+    assert not os.path.exists(stale_blob)
+    assert Path(kept.image_fpath).read_bytes() == IMAGE
+    assert find_orphan_blobs(kept.image_dir) == []
@@ -1,4 +1,4 @@
-"""Unit tests for ``CloudImage._parse_checksum_file``.
+"""Unit tests for ``CloudImage._parse_checksum_file`` and image verification.
 
 The parser handles two distinct upstream checksum formats and a verified
 swap. Each behavior locked in here came from a real-bug surface:
@@ -15,9 +15,14 @@ swap. Each behavior locked in here came from a real-bug surface:
 
 from __future__ import annotations
 
+import hashlib
+import os
+import threading
+import tracemalloc
 from pathlib import Path
+from unittest import mock
 
-from tkc_lvlab.utils.images import CloudImage
+from tkc_lvlab.utils.images import CloudImage, hash_file, verify_images, write_digest
 
 FEDORA_SAMPLE = """# Comment line that should not break parsing
 SHA256 (Fedora-Cloud-Base-Generic.x86_64-40-1.14.qcow2) = abc123def456
@@ -137,3 +142,142 @@ def test_parse_checksum_file_comments_and_blank_lines_ignored(tmp_path: Path) ->
     assert "" not in parsed
     assert "#" not in parsed
     assert "-----BEGIN" not in parsed
+
+
+def _image_with_checksum(tmp_path: Path, payload: bytes, expected: str) -> CloudImage:
+    image = CloudImage(
+        "debian12",
+        {
+            "image_url": "https://cloud.debian.org/debian-12-generic-amd64.qcow2",
+            "checksum_url": "https://cloud.debian.org/SHA512SUMS",
+            "checksum_type": "sha512",
+        },
+        {},
+        {"cloud_image_basedir": str(tmp_path)},
+    )
+    os.makedirs(image.image_dir, exist_ok=True)
+    Path(image.image_fpath).write_bytes(payload)
+    Path(image.checksum_fpath).write_text(f"{expected}  {image.filename}\n")
+    return image
+
+
+def test_verify_uses_the_download_digest_without_reading_the_image(
+    tmp_path: Path,
+) -> None:
+    """A digest recorded at download time turns verification into a compare."""
+    payload = b"image bytes"
+    digest = hashlib.sha512(payload).hexdigest()
+    image = _image_with_checksum(tmp_path, payload, digest)
+    write_digest(image.image_fpath, "sha512", digest)
+
+    real_open = open
+
+    def guarded_open(path, *args, **kwargs):
+        assert os.fspath(path) != image.image_fpath, "image was re-read"
+        return real_open(path, *args, **kwargs)
+
+    with mock.patch("builtins.open", side_effect=guarded_open):
+        assert image.checksum_verify_image() is True
+
+
+def test_stale_digest_is_ignored_and_the_image_rehashed(tmp_path: Path) -> None:
+    """A digest recorded for different bytes (file replaced since) is not trusted."""
+    payload = b"replaced by hand"
+    image = _image_with_checksum(tmp_path, payload, hashlib.sha512(payload).hexdigest())
+    write_digest(image.image_fpath, "sha512", "0" * 128)
+    Path(image.image_fpath).write_bytes(payload + b"!")  # size changes
+
+    assert image.checksum_verify_image() is False
+    Path(image.image_fpath).write_bytes(payload)
+    write_digest(image.image_fpath, "sha512", hashlib.sha512(payload).hexdigest())
+    assert image.checksum_verify_image() is True
+
+
+def test_hash_file_matches_hashlib_across_block_boundaries(tmp_path: Path) -> None:
+    payload = bytes(range(256)) * 41  # not a multiple of the buffer
+    fpath = tmp_path / "blob"
+    fpath.write_bytes(payload)
+    assert hash_file(str(fpath), "sha256", buffer_size=1000) == (
+        hashlib.sha256(payload).hexdigest()
+    )
+
+
+def test_hash_file_memory_is_bounded_by_the_buffer(tmp_path: Path) -> None:
+    """Peak allocation tracks the buffer, not the (here 8 MiB) file size."""
+    fpath = tmp_path / "big"
+    with open(fpath, "wb") as handle:
+        for _ in range(8):
+            handle.write(os.urandom(1024 * 1024))
+
+    tracemalloc.start()
+    try:
+        hash_file(str(fpath), "sha512", buffer_size=64 * 1024)
+        _current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert peak < 512 * 1024
+
+
+def test_checksum_buffer_bytes_comes_from_config_defaults(tmp_path: Path) -> None:
+    image = CloudImage(
+        "debian12",
+        {"image_url": "https://cloud.debian.org/debian-12-generic-amd64.qcow2"},
+        {},
+        {"cloud_image_basedir": str(tmp_path), "checksum_buffer_bytes": 4096},
+    )
+    assert image.checksum_buffer_bytes == 4096
+
+
+def test_verify_images_keeps_order_and_runs_concurrently(tmp_path: Path) -> None:
+    good = b"good image"
+    images = [
+        _image_with_checksum(tmp_path / "a", good, hashlib.sha512(good).hexdigest()),
+        _image_with_checksum(tmp_path / "b", b"corrupt", hashlib.sha512(good).hexdigest()),
+    ]
+    barrier = threading.Barrier(2, timeout=5)
+    real_hash_file = hash_file
+
+    def rendezvous(fpath, algorithm, **kwargs):
+        if algorithm == "sha512":  # the images, not the checksum manifests
+            barrier.wait()  # both images must be hashing at once
+        return real_hash_file(fpath, algorithm, **kwargs)
+
+    with mock.patch("tkc_lvlab.utils.images.hash_file", side_effect=rendezvous):
+        assert verify_images(images, jobs=2) == [True, False]
+
+
+def test_successful_verification_is_recorded_and_reused(tmp_path: Path) -> None:
+    payload = b"cached image"
+    image = _image_with_checksum(tmp_path, payload, hashlib.sha512(payload).hexdigest())
+    assert image.is_verified() is False
+
+    assert image.checksum_verify_image() is True
+    assert image.is_verified() is True
+
+
+def test_changed_checksum_manifest_invalidates_the_record(tmp_path: Path) -> None:
+    payload = b"cached image"
+    image = _image_with_checksum(tmp_path, payload, hashlib.sha512(payload).hexdigest())
+    assert image.checksum_verify_image() is True
+
+    with open(image.checksum_fpath, "a", encoding="utf-8") as handle:
+        handle.write("0011  some-other-image.qcow2\n")
+    assert image.is_verified() is False
+
+
+def test_replaced_image_invalidates_the_record_even_with_same_size_and_mtime(
+    tmp_path: Path,
+) -> None:
+    payload = b"cached image"
+    image = _image_with_checksum(tmp_path, payload, hashlib.sha512(payload).hexdigest())
+    assert image.checksum_verify_image() is True
+    stat = os.stat(image.image_fpath)
+
+    # Swap in a different file (new inode) with identical size and mtime.
+    replacement = Path(image.image_fpath + ".new")
+    replacement.write_bytes(b"CACHED IMAGE")
+    os.utime(replacement, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    os.replace(replacement, image.image_fpath)
+
+    assert image.is_verified() is False
+    assert image.checksum_verify_image() is False
@@ -130,6 +130,38 @@ def test_candidate_groups_its_sidecars(tmp_path) -> None:
     assert set(candidate.all_fpaths) == {image, checksum, verified, gpg}
 
 
+def test_sidecars_group_under_the_shortest_unprotected_name(tmp_path) -> None:
+    """Nested sidecars join the shortest name they extend; with that name
+    protected, the next-shortest unprotected one becomes the primary."""
+    cache = tmp_path / "cloud-images"
+    names = [
+        "a.qcow2",
+        "a.qcow2.SUMS",
+        "a.qcow2.SUMS.verified",
+        "b.qcow2",
+        "b.qcow2.SUMS",
+        "b.qcow2.SUMS.verified",
+        "b.qcow2-old",  # shares a prefix, but not a dotted one
+    ]
+    for name in names:
+        _touch(str(cache / name))
+
+    candidates = find_cleanup_candidates(str(cache), {str(cache / "b.qcow2")})
+
+    grouped = [
+        (
+            os.path.basename(candidate.image_fpath),
+            [os.path.basename(p) for p in candidate.sidecar_fpaths],
+        )
+        for candidate in candidates
+    ]
+    assert grouped == [
+        ("a.qcow2", ["a.qcow2.SUMS", "a.qcow2.SUMS.verified"]),
+        ("b.qcow2-old", []),
+        ("b.qcow2.SUMS", ["b.qcow2.SUMS.verified"]),
+    ]
+
+
 def test_missing_cache_dir_yields_no_candidates(tmp_path) -> None:
     """A cache dir that does not exist yet produces no candidates (no crash)."""
     candidates = find_cleanup_candidates(str(tmp_path / "absent"), protected=set())
@@ -179,6 +211,20 @@ def test_commented_image_protects_its_sidecars_too(tmp_path) -> None:
     }
 
 
+def test_comment_naming_a_sidecar_protects_its_whole_family(tmp_path) -> None:
+    """Mentioning only the checksum file still protects the image it belongs
+    to (the image's name is part of the sidecar's) and its other sidecars —
+    wider than the sidecar alone, which is the safe direction."""
+    cache = tmp_path / "cloud-images"
+    names = ["noble.img", "noble.img.SHA256SUMS", "noble.img.SHA256SUMS.verified"]
+    for name in names + ["noble.img-old"]:
+        _touch(str(cache / name))
+
+    protected = comment_referenced_files(str(cache), "# noble.img.SHA256SUMS\n")
+
+    assert protected == {os.path.abspath(str(cache / name)) for name in names}
+
+
 def test_active_manifest_line_does_not_trigger_comment_protection(tmp_path) -> None:
     """Only the text after ``#`` counts: a filename on an ACTIVE (uncommented)
     line is not picked up here (it's covered by enumerate_protected_files)."""
@@ -23,62 +23,20 @@ no-op so the backoff doesn't slow the suite, and every byte lands under
 
 from __future__ import annotations
 
+import hashlib
+import time
 from pathlib import Path
-from typing import Iterable
 from unittest.mock import patch
 
 import pytest
 import requests
+import urllib3.exceptions
 
 from tkc_lvlab.exceptions import ImageError
-from tkc_lvlab.utils.images import CloudImage
+from tkc_lvlab.utils import images as images_mod
+from tkc_lvlab.utils.images import CloudImage, _iter_body, _ThrottledProgress, read_digest
 
-
-class _FakeResponse:
-    """Minimal stand-in for a streamed ``requests`` response.
-
-    Mimics only the surface ``_stream_to_partial`` touches:
-    ``raise_for_status``, ``headers.get``, ``status_code``, and
-    ``iter_content``.
-    """
-
-    def __init__(
-        self,
-        *,
-        body: bytes = b"",
-        status_code: int = 200,
-        accept_ranges: bool = False,
-        http_error: bool = False,
-        content_encoding: str | None = None,
-        content_length: int | None = None,
-    ) -> None:
-        self._body = body
-        self.status_code = status_code
-        # ``content_length`` lets a test advertise a length that differs from
-        # the written body — e.g. the COMPRESSED size on a gzip response.
-        length = content_length if content_length is not None else len(body)
-        self.headers: dict[str, str] = {"content-length": str(length)}
-        if accept_ranges:
-            self.headers["accept-ranges"] = "bytes"
-        if content_encoding:
-            self.headers["content-encoding"] = content_encoding
-        self._http_error = http_error
-        self.closed = False
-
-    def raise_for_status(self) -> None:
-        if self._http_error:
-            # Mirror requests: the raised HTTPError carries the response, so
-            # callers can read ``exc.response.status_code``.
-            err = requests.HTTPError(f"{self.status_code} error")
-            err.response = self  # type: ignore[attr-defined]
-            raise err
-
-    def close(self) -> None:
-        self.closed = True
-
-    def iter_content(self, block_size: int) -> Iterable[bytes]:
-        for i in range(0, len(self._body), block_size):
-            yield self._body[i : i + block_size]
+from tests.http_fakes import FakeResponse
 
 
 def test_readtimeout_then_success_completes(tmp_path: Path) -> None:
@@ -94,7 +52,7 @@ def test_readtimeout_then_success_completes(tmp_path: Path) -> None:
     # First call raises ReadTimeout (mid-transfer stall); second succeeds.
     side_effects = [
         requests.exceptions.ReadTimeout("read timed out"),
-        _FakeResponse(body=payload),
+        FakeResponse(body=payload),
     ]
 
     with patch("tkc_lvlab.utils.images.requests.get", side_effect=side_effects) as get:
@@ -123,7 +81,7 @@ def test_http_404_fails_fast_with_no_retry(tmp_path: Path) -> None:
     """
     destination = tmp_path / "image.qcow2"
 
-    not_found = _FakeResponse(status_code=404, http_error=True)
+    not_found = FakeResponse(status_code=404, http_error=True)
 
     with patch("tkc_lvlab.utils.images.requests.get", return_value=not_found) as get:
         with patch("tkc_lvlab.utils.images.time.sleep") as sleep:
@@ -157,8 +115,8 @@ def test_resume_sends_range_header_when_partial_exists(tmp_path: Path) -> None:
     # Attempt 1: advertise Accept-Ranges and content-length for the full body,
     # deliver the head, then stall (ChunkedEncodingError) leaving a partial.
     # Attempt 2: a 206 carrying only the tail (content-length = remaining).
-    first = _FakeResponse(body=full, accept_ranges=True)
-    second = _FakeResponse(body=tail, status_code=206)
+    first = FakeResponse(body=full, accept_ranges=True)
+    second = FakeResponse(body=tail, status_code=206)
 
     def fake_get(url, *, stream, timeout, headers):  # noqa: ARG001
         # Write the head + raise to simulate a stall after partial delivery,
@@ -233,7 +191,7 @@ def test_gzip_encoded_response_completes_without_false_incomplete(
     destination = tmp_path / "fedora.gpg"
     decoded = b"d" * 4700  # bytes requests actually writes (decoded)
     # Advertise the COMPRESSED length (smaller) — the trap.
-    resp = _FakeResponse(body=decoded, content_encoding="gzip", content_length=4494)
+    resp = FakeResponse(body=decoded, content_encoding="gzip", content_length=4494)
 
     with patch("tkc_lvlab.utils.images.requests.get", return_value=resp) as get:
         with patch("tkc_lvlab.utils.images.time.sleep") as sleep:
@@ -270,10 +228,10 @@ def test_http_416_on_resume_discards_stale_partial_and_restarts(
         if calls["n"] == 1:
             # A partial exists -> we resume with a Range -> server says 416.
             assert headers.get("Range") == "bytes=5000-"
-            return _FakeResponse(status_code=416)
+            return FakeResponse(status_code=416)
         # Retry: the stale partial was discarded, so no Range, full 200.
         assert "Range" not in headers
-        return _FakeResponse(body=payload)
+        return FakeResponse(body=payload)
 
     with patch("tkc_lvlab.utils.images.requests.get", side_effect=fake_get):
         with patch("tkc_lvlab.utils.images.time.sleep"):
@@ -296,7 +254,7 @@ def test_download_or_raise_wraps_http_error_with_workaround(tmp_path: Path) -> N
     ImageError that names the URL, the reason, and the manual cache path.
     """
     destination = tmp_path / "image.qcow2"
-    not_found = _FakeResponse(status_code=404, http_error=True)
+    not_found = FakeResponse(status_code=404, http_error=True)
 
     with patch("tkc_lvlab.utils.images.requests.get", return_value=not_found):
         with patch("tkc_lvlab.utils.images.time.sleep"):
@@ -313,7 +271,7 @@ def test_download_or_raise_wraps_http_error_with_workaround(tmp_path: Path) -> N
 
 
 def test_download_file_progress_callback_reports_monotonic_bytes(
-    tmp_path: Path,
+    tmp_path: Path, monkeypatch
 ) -> None:
     """With a progress_callback, bytes are reported monotonically up to the total.
 
@@ -322,7 +280,9 @@ def test_download_file_progress_callback_reports_monotonic_bytes(
     """
     destination = tmp_path / "image.qcow2"
     payload = b"z" * 4500  # several 1024-byte chunks
-    resp = _FakeResponse(body=payload)
+    resp = FakeResponse(body=payload)
+    monkeypatch.setattr(images_mod, "_MIN_CHUNK_BYTES", 1024)
+    monkeypatch.setattr(images_mod, "_MAX_CHUNK_BYTES", 1024)
 
     seen: list[tuple[int, int]] = []
 
@@ -340,3 +300,135 @@ def test_download_file_progress_callback_reports_monotonic_bytes(
     assert done_values == sorted(done_values)  # monotonic non-decreasing
     assert done_values[-1] == len(payload)  # ends at the full size
     assert all(total == len(payload) for _, total in seen)
+
+
+def test_digest_is_computed_while_streaming(tmp_path: Path) -> None:
+    """With ``hash_name`` set, the digest lands next to the image — no re-read."""
+    destination = tmp_path / "image.qcow2"
+    payload = b"z" * 5000
+
+    with patch(
+        "tkc_lvlab.utils.images.requests.get", return_value=FakeResponse(body=payload)
+    ):
+        assert CloudImage._download_file(
+            "https://mirror.example/image.qcow2", str(destination), hash_name="sha256"
+        )
+
+    assert read_digest(str(destination), "sha256") == hashlib.sha256(payload).hexdigest()
+    assert read_digest(str(destination), "sha512") is None  # other algorithm
+
+
+def test_resumed_download_hashes_the_existing_prefix(tmp_path: Path) -> None:
+    """A 206 resume digests prefix-on-disk + tail, i.e. the whole file."""
+    destination = tmp_path / "image.qcow2"
+    partial = tmp_path / "image.qcow2.partial"
+    head, tail = b"h" * 3000, b"t" * 1000
+    partial.write_bytes(head)
+
+    def fake_get(url, *, stream, timeout, headers):  # noqa: ARG001
+        assert headers == {"Range": "bytes=3000-"}
+        return FakeResponse(body=tail, status_code=206)
+
+    with patch("tkc_lvlab.utils.images.requests.get", side_effect=fake_get):
+        assert CloudImage._download_file(
+            "https://mirror.example/image.qcow2", str(destination), hash_name="sha512"
+        )
+
+    assert destination.read_bytes() == head + tail
+    assert (
+        read_digest(str(destination), "sha512")
+        == hashlib.sha512(head + tail).hexdigest()
+    )
+
+
+def test_restart_after_ignored_range_hashes_only_the_new_body(tmp_path: Path) -> None:
+    """A 200 to a Range request truncates the partial; the stale prefix is not hashed."""
+    destination = tmp_path / "image.qcow2"
+    (tmp_path / "image.qcow2.partial").write_bytes(b"old" * 100)
+    payload = b"n" * 2000
+
+    with patch(
+        "tkc_lvlab.utils.images.requests.get", return_value=FakeResponse(body=payload)
+    ):
+        assert CloudImage._download_file(
+            "https://mirror.example/image.qcow2", str(destination), hash_name="sha256"
+        )
+
+    assert read_digest(str(destination), "sha256") == hashlib.sha256(payload).hexdigest()
+
+
+def test_progress_callback_is_throttled_but_ends_on_the_full_size(
+    tmp_path: Path, monkeypatch
+) -> None:
+    """Chunks arriving faster than the interval collapse to first + final update."""
+    monkeypatch.setattr(images_mod, "_MIN_CHUNK_BYTES", 1024)
+    monkeypatch.setattr(images_mod, "_MAX_CHUNK_BYTES", 1024)
+    monkeypatch.setattr(images_mod, "_PROGRESS_INTERVAL_SECONDS", 3600)
+    payload = b"p" * 10_000
+    seen: list[tuple[int, int]] = []
+
+    with patch(
+        "tkc_lvlab.utils.images.requests.get", return_value=FakeResponse(body=payload)
+    ):
+        assert CloudImage._download_file(
+            "https://mirror.example/image.qcow2",
+            str(tmp_path / "image.qcow2"),
+            progress_callback=lambda done, total: seen.append((done, total)),
+        )
+
+    assert seen == [(1024, len(payload)), (len(payload), len(payload))]
+
+
+def test_throttled_progress_forwards_once_per_interval() -> None:
+    now = [0.0]
+    seen: list[int] = []
+    progress = _ThrottledProgress(
+        lambda done, _total: seen.append(done), interval=1.0, clock=lambda: now[0]
+    )
+
+    for done, at in ((1, 0.0), (2, 0.5), (3, 1.0), (4, 1.2)):
+        now[0] = at
+        progress(done, 10)
+    assert seen == [1, 3]
+    progress.flush()
+    progress.flush()  # nothing further withheld
+    assert seen == [1, 3, 4]
+
+
+def test_read_size_doubles_on_fast_reads_up_to_the_ceiling(monkeypatch) -> None:
+    monkeypatch.setattr(images_mod, "_MIN_CHUNK_BYTES", 1024)
+    monkeypatch.setattr(images_mod, "_MAX_CHUNK_BYTES", 4096)
+    response = FakeResponse(body=b"f" * 20_000)
+
+    assert b"".join(_iter_body(response)) == b"f" * 20_000
+    assert response.raw.read_sizes[:5] == [1024, 2048, 4096, 4096, 4096]
+
+
+def test_read_size_halves_when_reads_run_slow(monkeypatch) -> None:
+    monkeypatch.setattr(images_mod, "_MIN_CHUNK_BYTES", 1024)
+    monkeypatch.setattr(images_mod, "_MAX_CHUNK_BYTES", 4096)
+    monkeypatch.setattr(images_mod, "_CHUNK_TARGET_SECONDS", 0.05)
+    response = FakeResponse(body=b"s" * 20_000)
+    reads = response.raw.read
+
+    def read(amt: int, decode_content: bool = True) -> bytes:
+        if len(response.raw.read_sizes) >= 3:
+            time.sleep(0.08)  # the link slows down after three reads
+        return reads(amt, decode_content)
+
+    response.raw.read = read
+    chunks = list(_iter_body(response))
+
+    assert b"".join(chunks) == b"s" * 20_000
+    assert response.raw.read_sizes[:5] == [1024, 2048, 4096, 4096, 2048]
+
+
+def test_body_read_errors_surface_as_requests_exceptions() -> None:
+    response = FakeResponse(body=b"x")
+
+    def drop(amt: int, decode_content: bool = True) -> bytes:  # noqa: ARG001
+        raise urllib3.exceptions.ProtocolError("connection broken")
+
+    response.raw.read = drop
+    with pytest.raises(requests.exceptions.ChunkedEncodingError):
+        list(_iter_body(response))
@@ -0,0 +1,115 @@
+"""Cross-process cloud-image cache locking (:func:`cache_lock`).
+
+One test holds the lock from a real child process to prove the ``flock`` is
+visible across processes; the others run two ``lvlab init`` workers for the
+same image on threads (separate opens of the lock file conflict within one
+process too) to show the waiter reuses the holder's download and reports
+its wait as a progress phase.
+"""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+import threading
+from pathlib import Path
+from unittest import mock
+
+from tkc_lvlab import cli
+from tkc_lvlab.utils.images import CloudImage, cache_lock, find_cleanup_candidates
+
+from tests.http_fakes import FakeResponse
+
+_HOLDER = """
+import fcntl, os, sys
+fd = os.open(sys.argv[1], os.O_RDWR | os.O_CREAT, 0o664)
+fcntl.flock(fd, fcntl.LOCK_EX)
+print("locked", flush=True)
+sys.stdin.read()
+"""
+
+
+def test_lock_held_by_another_process_is_waited_for(tmp_path: Path) -> None:
+    image = tmp_path / "image.qcow2"
+    (tmp_path / ".locks").mkdir()
+    holder = subprocess.Popen(
+        [sys.executable, "-c", _HOLDER, str(tmp_path / ".locks" / "image.qcow2.lock")],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    assert holder.stdout.readline().strip() == "locked"
+    waits: list[float] = []
+
+    def on_wait(waited: float) -> None:
+        waits.append(waited)
+        if len(waits) == 2:
+            holder.stdin.close()  # the holder exits, releasing its lock
+
+    with cache_lock(str(image), on_wait=on_wait) as waited:
+        assert holder.wait(timeout=5) == 0
+    assert len(waits) >= 2
+    assert waited >= waits[-1] > 0
+
+
+def test_free_lock_is_taken_without_waiting(tmp_path: Path) -> None:
+    on_wait = mock.Mock()
+    with cache_lock(str(tmp_path / "image.qcow2"), on_wait=on_wait) as waited:
+        pass
+    assert waited == 0.0
+    on_wait.assert_not_called()
+    # The lock file sits in a hidden directory ``images clean`` never lists.
+    assert (tmp_path / ".locks" / "image.qcow2.lock").exists()
+    assert find_cleanup_candidates(str(tmp_path), set()) == []
+
+
+def test_second_worker_waits_and_reuses_the_download(tmp_path: Path) -> None:
+    config = {"image_url": "https://mirror.example/image.qcow2"}
+    config_defaults = {
+        "cloud_image_basedir": str(tmp_path / "cloud-images"),
+        "download_segments": 1,
+    }
+    progress = cli._InitProgress(["first", "second"])
+    phases: dict[str, list[str]] = {"first": [], "second": []}
+    someone_waiting = threading.Event()
+    set_phase = progress.set_phase
+
+    def record_phase(name: str, phase: str) -> None:
+        phases[name].append(phase)
+        if phase.startswith("waiting"):
+            someone_waiting.set()
+        set_phase(name, phase)
+
+    def slow_get(url, **_kwargs):  # noqa: ARG001
+        # Hold the lock until the other worker is visibly queued behind it.
+        assert someone_waiting.wait(timeout=5)
+        return FakeResponse(b"image bytes" * 100)
+
+    with (
+        mock.patch.object(progress, "set_phase", side_effect=record_phase),
+        mock.patch("tkc_lvlab.utils.images.requests.get", side_effect=slow_get) as get,
+    ):
+        results: dict[str, bool] = {}
+        workers = [
+            threading.Thread(
+                target=lambda name=name: results.__setitem__(
+                    name,
+                    cli._init_image_worker(
+                        CloudImage(name, config, {}, config_defaults), progress
+                    ),
+                )
+            )
+            for name in ("first", "second")
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(timeout=10)
+
+    assert results == {"first": True, "second": True}
+    assert get.call_count == 1  # one transfer; the waiter reused it
+    downloader, waiter = sorted(phases, key=lambda n: "downloading" not in phases[n])
+    assert "waiting" not in " ".join(phases[downloader])
+    assert any(p.startswith("waiting ") for p in phases[waiter])
+    assert "downloading" not in phases[waiter]
+    assert phases[waiter][-1] == "done"
@@ -0,0 +1,299 @@
+"""Conditional refresh of cached images (``lvlab images refresh``).
+
+A local ``http.server`` publishes an image and its ``SHA256SUMS`` with an
+``ETag`` and ``Last-Modified``, answers ``If-None-Match`` with ``304`` and
+records every request, so a test can "publish a new build" by swapping the
+served bytes and assert exactly what was (not) re-fetched. ``qemu-img`` is
+never run: the overlay rebase is patched.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest import mock
+
+import pytest
+from typer.testing import CliRunner
+
+from tkc_lvlab import cli
+from tkc_lvlab.cli import app
+from tkc_lvlab.exceptions import ImageError
+from tkc_lvlab.utils import images as images_mod
+from tkc_lvlab.utils.images import (
+    CloudImage,
+    check_upstream_images,
+    read_digest,
+    read_remote_record,
+)
+
+OLD = b"old build " * 1000
+NEW = b"new build " * 1200
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *_args) -> None:
+        pass
+
+    def _headers_for(self, body: bytes) -> None:
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", self.server.etag)
+        self.send_header("Last-Modified", "Tue, 01 Sep 2026 10:00:00 GMT")
+        self.end_headers()
+
+    def _answer(self, *, with_body: bool) -> None:
+        with self.server.lock:
+            self.server.requests.append(
+                (self.command, self.path, self.headers.get("If-None-Match"))
+            )
+        if self.command == "HEAD" and self.server.reject_head:
+            self.send_response(405)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body = self.server.files.get(self.path)
+        if body is None:
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if self.headers.get("If-None-Match") == self.server.etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self._headers_for(body)
+        if with_body:
+            self.wfile.write(body)
+
+    def do_HEAD(self) -> None:  # noqa: N802 - http.server naming
+        self._answer(with_body=False)
+
+    def do_GET(self) -> None:  # noqa: N802 - http.server naming
+        self._answer(with_body=True)
+
+
+def _publish(server, image: bytes, etag: str) -> None:
+    server.files = {
+        "/image.qcow2": image,
+        "/SHA256SUMS": f"{hashlib.sha256(image).hexdigest()}  image.qcow2\n".encode(),
+    }
+    server.etag = etag
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    httpd.daemon_threads = True
+    httpd.lock = threading.Lock()
+    httpd.requests = []
+    httpd.reject_head = False
+    _publish(httpd, OLD, '"v1"')
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    httpd.base = f"http://127.0.0.1:{httpd.server_address[1]}"
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _config(server) -> dict:
+    return {
+        "image_url": f"{server.base}/image.qcow2",
+        "checksum_url": f"{server.base}/SHA256SUMS",
+        "checksum_type": "sha256",
+    }
+
+
+def _image(server, tmp_path: Path) -> CloudImage:
+    config_defaults = {
+        "cloud_image_basedir": str(tmp_path / "cloud-images"),
+        "download_segments": 1,
+    }
+    return CloudImage("testimg", _config(server), {}, config_defaults)
+
+
+def _cached(server, tmp_path: Path) -> CloudImage:
+    """An image fetched and verified the way ``lvlab init`` does it."""
+    image = _image(server, tmp_path)
+    assert image.download_image(progress_callback=lambda *_: None)
+    assert image.download_checksum()
+    assert image.checksum_verify_image()
+    server.requests.clear()
+    return image
+
+
+def test_download_records_the_upstream_validators(server, tmp_path: Path) -> None:
+    image = _cached(server, tmp_path)
+
+    record = read_remote_record(image.image_fpath, image.image_url)
+    assert record["etag"] == '"v1"'
+    assert record["last_modified"] == "Tue, 01 Sep 2026 10:00:00 GMT"
+    assert record["content_length"] == len(OLD)
+    # A record made for another URL does not count.
+    assert read_remote_record(image.image_fpath, f"{server.base}/other.qcow2") is None
+
+
+def test_unchanged_image_is_answered_with_304(server, tmp_path: Path) -> None:
+    image = _cached(server, tmp_path)
+
+    (result,) = check_upstream_images([image])
+
+    assert (result.status, result.detail) == ("current", "not modified")
+    assert server.requests == [("HEAD", "/image.qcow2", '"v1"')]
+
+
+def test_new_build_is_reported_changed(server, tmp_path: Path) -> None:
+    image = _cached(server, tmp_path)
+    _publish(server, NEW, '"v2"')
+
+    (result,) = check_upstream_images([image])
+
+    assert result.status == "changed"
+    assert '"v1" -> "v2"' in result.detail
+
+
+def test_server_without_head_gets_a_conditional_get(server, tmp_path: Path) -> None:
+    image = _cached(server, tmp_path)
+    server.reject_head = True
+
+    assert image.check_upstream().status == "current"
+    assert [method for method, _path, _inm in server.requests] == ["HEAD", "GET"]
+
+
+def test_image_cached_before_records_is_judged_by_size_and_date(
+    server, tmp_path: Path
+) -> None:
+    image = _cached(server, tmp_path)
+    os.remove(image.image_fpath + images_mod.REMOTE_SUFFIX)
+
+    # Same size, and the local copy is newer than Last-Modified: current,
+    # and that answer becomes the baseline for the next check.
+    assert image.check_upstream().status == "current"
+    assert read_remote_record(image.image_fpath, image.image_url)["etag"] == '"v1"'
+
+    os.remove(image.image_fpath + images_mod.REMOTE_SUFFIX)
+    _publish(server, NEW, '"v2"')
+    result = image.check_upstream()
+    assert result.status == "changed"
+    assert result.detail == f"size {len(OLD)} -> {len(NEW)}"
+
+
+def test_uncached_and_unreachable_images(server, tmp_path: Path) -> None:
+    image = _image(server, tmp_path)
+    assert image.check_upstream().status == "missing"
+
+    image = _cached(server, tmp_path)
+    server.files = {}
+    result = image.check_upstream()
+    assert (result.status, result.detail) == ("error", "HTTP 404")
+
+
+def test_refresh_swaps_in_the_verified_new_build(server, tmp_path: Path) -> None:
+    image = _cached(server, tmp_path)
+    _publish(server, NEW, '"v2"')
+
+    image.refresh(progress_callback=lambda *_: None)
+
+    assert Path(image.image_fpath).read_bytes() == NEW
+    assert read_digest(image.image_fpath, "sha256") == hashlib.sha256(NEW).hexdigest()
+    assert image.is_verified()
+    assert read_remote_record(image.image_fpath, image.image_url)["etag"] == '"v2"'
+    assert not (Path(image.image_dir) / ".refresh" / "image.qcow2").exists()
+    assert image.check_upstream().status == "current"
+
+
+def test_refresh_that_fails_verification_leaves_the_cache_alone(
+    server, tmp_path: Path
+) -> None:
+    image = _cached(server, tmp_path)
+    _publish(server, NEW, '"v2"')
+    server.files["/SHA256SUMS"] = f"{'0' * 64}  image.qcow2\n".encode()
+    before = os.stat(image.image_fpath).st_ino
+
+    with pytest.raises(ImageError, match="does not match its checksum"):
+        image.refresh(progress_callback=lambda *_: None)
+
+    assert os.stat(image.image_fpath).st_ino == before
+    assert Path(image.image_fpath).read_bytes() == OLD
+    assert image.is_verified()  # the old manifest and record were kept too
+    assert not (Path(image.image_dir) / ".refresh" / "image.qcow2").exists()
+
+
+def test_refresh_keeps_backing_file_users_on_the_old_bytes(
+    server, tmp_path: Path
+) -> None:
+    image = _cached(server, tmp_path)
+    old_inode = os.stat(image.image_fpath).st_ino
+    _publish(server, NEW, '"v2"')
+    overlay = str(tmp_path / "env" / "vm" / "disk.qcow2")
+
+    with mock.patch.object(images_mod, "_qemu_img_rebase", return_value=True) as rebase:
+        image.refresh(overlays=[overlay], progress_callback=lambda *_: None)
+
+    (call,) = rebase.call_args_list
+    disk, retained = call.args
+    assert disk == overlay
+    assert retained.startswith(image.image_fpath + ".")
+    assert os.stat(retained).st_ino == old_inode
+    assert Path(retained).read_bytes() == OLD
+    assert Path(image.image_fpath).read_bytes() == NEW
+
+
+def test_refresh_is_abandoned_when_an_overlay_cannot_be_repointed(
+    server, tmp_path: Path
+) -> None:
+    image = _cached(server, tmp_path)
+    _publish(server, NEW, '"v2"')
+
+    with mock.patch.object(images_mod, "_qemu_img_rebase", return_value=False):
+        with pytest.raises(ImageError, match="is its VM running"):
+            image.refresh(overlays=["/lab/vm/disk.qcow2"])
+
+    assert Path(image.image_fpath).read_bytes() == OLD
+    assert not [r for r in server.requests if r[0] == "GET"]  # nothing downloaded
+
+
+def _run_refresh(server, tmp_path: Path, *args: str) -> object:
+    config_defaults = {
+        "cloud_image_basedir": str(tmp_path / "cloud-images"),
+        "download_segments": 1,
+    }
+    source = ({"name": "test-env"}, {"testimg": _config(server)}, config_defaults, [])
+    with (
+        mock.patch.object(cli, "_init_image_source", return_value=source),
+        mock.patch.object(cli, "backing_users", return_value={}),
+    ):
+        return CliRunner().invoke(app, ["images", "refresh", *args])
+
+
+def test_cli_check_reports_without_downloading(server, tmp_path: Path) -> None:
+    image = _cached(server, tmp_path)
+    _publish(server, NEW, '"v2"')
+
+    result = _run_refresh(server, tmp_path, "--check")
+
+    assert result.exit_code == 0, result.output
+    assert "testimg: changed" in result.output
+    assert "Re-run without --check" in result.output
+    assert Path(image.image_fpath).read_bytes() == OLD
+
+
+def test_cli_refresh_downloads_only_changed_images(server, tmp_path: Path) -> None:
+    image = _cached(server, tmp_path)
+    _publish(server, NEW, '"v2"')
+
+    result = _run_refresh(server, tmp_path)
+
+    assert result.exit_code == 0, result.output
+    assert "Refreshed testimg." in result.output
+    assert Path(image.image_fpath).read_bytes() == NEW
+
+    server.requests.clear()
+    result = _run_refresh(server, tmp_path)
+    assert "All cached images are current." in result.output
+    assert [method for method, _path, _inm in server.requests] == ["HEAD"]
@@ -21,6 +21,7 @@ the port:
 
 from __future__ import annotations
 
+import subprocess
 from unittest import mock
 
 import pytest
@@ -31,6 +32,40 @@ from tkc_lvlab.utils.virsh import VirshError
 URI = "qemu:///session"
 
 
+def _states(state: str) -> dict[str, tuple[str, str]]:
+    """Bulk ``virsh_domstates`` result with ``web01_lab`` in ``state``."""
+    return {"web01_lab": (state, "unknown"), "other_lab": ("running", "booted")}
+
+
+def _batch_via(run, domstate: str = "shut off"):
+    """A ``VirshBatch`` stand-in: queued verbs go through ``run``, except
+    ``domstate``, which answers ``domstate``. A raising ``run`` propagates
+    like a checked batch failure."""
+
+    class _FakeBatch:
+        def __init__(self, uri, **_kwargs):
+            self.uri = uri
+            self.commands: list[list[str]] = []
+
+        def add(self, args, *, check=True):
+            self.commands.append(args)
+            return len(self.commands) - 1
+
+        def run(self):
+            results = []
+            for args in self.commands:
+                if args[0] == "domstate":
+                    results.append(
+                        subprocess.CompletedProcess(args, 0, f"{domstate}\n", "")
+                    )
+                else:
+                    run(self.uri, args)
+                    results.append(subprocess.CompletedProcess(args, 0, "", ""))
+            return results
+
+    return _FakeBatch
+
+
 @pytest.fixture
 def machine(tmp_path) -> Machine:
     """A Machine stub with the attributes lifecycle methods touch.
@@ -63,13 +98,10 @@ def test_destroy_running_vm_calls_destroy_then_undefine(machine: Machine) -> Non
     run_mock = mock.Mock()
     with (
         mock.patch(
-            "tkc_lvlab.utils.libvirt.virsh_list_all_names",
-            return_value=["web01_lab"],
-        ),
-        mock.patch(
-            "tkc_lvlab.utils.libvirt.virsh_domstate",
-            side_effect=["running", "shut off"],
+            "tkc_lvlab.utils.libvirt.virsh_domstates",
+            return_value=_states("running"),
         ),
+        mock.patch("tkc_lvlab.utils.libvirt.VirshBatch", _batch_via(run_mock)),
         mock.patch("tkc_lvlab.utils.libvirt.run_virsh", run_mock),
         mock.patch("tkc_lvlab.utils.snapshot_cleanup.run_virsh", run_mock),
     ):
@@ -89,10 +121,9 @@ def test_destroy_already_shut_off_skips_destroy(machine: Machine) -> None:
     run_mock = mock.Mock()
     with (
         mock.patch(
-            "tkc_lvlab.utils.libvirt.virsh_list_all_names",
-            return_value=["web01_lab"],
+            "tkc_lvlab.utils.libvirt.virsh_domstates",
+            return_value=_states("shut off"),
         ),
-        mock.patch("tkc_lvlab.utils.libvirt.virsh_domstate", return_value="shut off"),
         mock.patch("tkc_lvlab.utils.libvirt.run_virsh", run_mock),
         mock.patch("tkc_lvlab.utils.snapshot_cleanup.run_virsh", run_mock),
     ):
@@ -119,10 +150,9 @@ def test_destroy_undefine_drops_snapshots_in_one_shot(
     )
     with (
         mock.patch(
-            "tkc_lvlab.utils.libvirt.virsh_list_all_names",
-            return_value=["web01_lab"],
+            "tkc_lvlab.utils.libvirt.virsh_domstates",
+            return_value=_states("shut off"),
         ),
-        mock.patch("tkc_lvlab.utils.libvirt.virsh_domstate", return_value="shut off"),
         mock.patch("tkc_lvlab.utils.libvirt.run_virsh", run_mock),
         mock.patch("tkc_lvlab.utils.snapshot_cleanup.run_virsh", run_mock),
     ):
@@ -149,15 +179,15 @@ def _raise_snapshot_block():
 
 
 def test_destroy_absent_domain_returns_false(machine: Machine) -> None:
-    """If ``virsh list`` doesn't show the domain, destroy is a no-op that
+    """If the bulk state snapshot doesn't show the domain, destroy is a no-op that
     returns False. It must NOT call destroy/undefine on a domain that's
     not there — that would be a wrong-target risk."""
     with (
         mock.patch(
-            "tkc_lvlab.utils.libvirt.virsh_list_all_names",
-            return_value=["other_lab"],
+            "tkc_lvlab.utils.libvirt.virsh_domstates",
+            return_value={"other_lab": ("running", "booted")},
         ),
-        mock.patch("tkc_lvlab.utils.libvirt.virsh_domstate") as state_mock,
+        mock.patch("tkc_lvlab.utils.libvirt.VirshBatch") as state_mock,
         mock.patch("tkc_lvlab.utils.libvirt.run_virsh") as run_mock,
     ):
         result = machine.destroy(URI)
@@ -179,13 +209,15 @@ def test_destroy_destroy_failure_skips_undefine(machine: Machine) -> None:
 
     with (
         mock.patch(
-            "tkc_lvlab.utils.libvirt.virsh_list_all_names",
-            return_value=["web01_lab"],
+            "tkc_lvlab.utils.libvirt.virsh_domstates",
+            return_value=_states("running"),
         ),
-        mock.patch("tkc_lvlab.utils.libvirt.virsh_domstate", return_value="running"),
         mock.patch(
             "tkc_lvlab.utils.libvirt.run_virsh", side_effect=fake_run
         ) as run_mock,
+        mock.patch(
+            "tkc_lvlab.utils.libvirt.VirshBatch", _batch_via(run_mock)
+        ),
         mock.patch("tkc_lvlab.utils.snapshot_cleanup.run_virsh", side_effect=fake_run),
     ):
         result = machine.destroy(URI)
@@ -196,6 +228,32 @@ def test_destroy_destroy_failure_skips_undefine(machine: Machine) -> None:
     assert "undefine" not in called_subcommands
 
 
+def test_destroy_post_destroy_state_failure_is_attributed(
+    machine: Machine, caplog
+) -> None:
+    """destroy and domstate share one batched virsh process; a failure of the
+    domstate half is logged as the state query, not as the force-off."""
+    batch = mock.Mock()
+    batch.return_value.run.side_effect = VirshError(
+        1, "error: failed to get domain", ["domstate", "web01_lab"]
+    )
+    with (
+        mock.patch(
+            "tkc_lvlab.utils.libvirt.virsh_domstates",
+            return_value=_states("running"),
+        ),
+        mock.patch("tkc_lvlab.utils.libvirt.VirshBatch", batch),
+        mock.patch("tkc_lvlab.utils.libvirt.run_virsh") as run_mock,
+    ):
+        result = machine.destroy(URI)
+
+    assert result is False
+    run_mock.assert_not_called()
+    assert "Failed to query state of web01 after destroy" in caplog.text
+    added = [call.args[0] for call in batch.return_value.add.call_args_list]
+    assert added == [["destroy", "web01_lab"], ["domstate", "web01_lab"]]
+
+
 def test_destroy_undefine_failure_skips_file_cleanup(
     machine: Machine, tmp_path
 ) -> None:
@@ -213,10 +271,9 @@ def test_destroy_undefine_failure_skips_file_cleanup(
 
     with (
         mock.patch(
-            "tkc_lvlab.utils.libvirt.virsh_list_all_names",
-            return_value=["web01_lab"],
+            "tkc_lvlab.utils.libvirt.virsh_domstates",
+            return_value=_states("shut off"),
         ),
-        mock.patch("tkc_lvlab.utils.libvirt.virsh_domstate", return_value="shut off"),
         mock.patch("tkc_lvlab.utils.libvirt.run_virsh", side_effect=fake_run),
         mock.patch("tkc_lvlab.utils.snapshot_cleanup.run_virsh", side_effect=fake_run),
     ):
@@ -242,16 +299,15 @@ def test_poweron_shut_off_vm_invokes_start(machine: Machine) -> None:
     ``virsh start`` and return 0 to satisfy the ``> 0`` check in cli.py."""
     with (
         mock.patch(
-            "tkc_lvlab.utils.libvirt.virsh_list_all_names",
-            return_value=["web01_lab"],
+            "tkc_lvlab.utils.libvirt.virsh_domstates",
+            return_value=_states("shut off"),
         ),
-        mock.patch("tkc_lvlab.utils.libvirt.virsh_domstate", return_value="shut off"),
         mock.patch("tkc_lvlab.utils.libvirt.run_virsh") as run_mock,
     ):
         result = machine.poweron(URI)
 
     assert result == 0
-    run_mock.assert_called_once_with(URI, ["start", "web01_lab"])
+    run_mock.assert_called_once_with(URI, ["start", "web01_lab"], cache=None)
 
 
 def test_poweron_crashed_vm_invokes_start(machine: Machine) -> None:
@@ -259,16 +315,15 @@ def test_poweron_crashed_vm_invokes_start(machine: Machine) -> None:
     against accidentally narrowing the trigger set during the port."""
     with (
         mock.patch(
-            "tkc_lvlab.utils.libvirt.virsh_list_all_names",
-            return_value=["web01_lab"],
+            "tkc_lvlab.utils.libvirt.virsh_domstates",
+            return_value=_states("crashed"),
         ),
-        mock.patch("tkc_lvlab.utils.libvirt.virsh_domstate", return_value="crashed"),
         mock.patch("tkc_lvlab.utils.libvirt.run_virsh") as run_mock,
     ):
         result = machine.poweron(URI)
 
     assert result == 0
-    run_mock.assert_called_once_with(URI, ["start", "web01_lab"])
+    run_mock.assert_called_once_with(URI, ["start", "web01_lab"], cache=None)
 
 
 def test_poweron_running_vm_is_noop(machine: Machine) -> None:
@@ -277,10 +332,9 @@ def test_poweron_running_vm_is_noop(machine: Machine) -> None:
     success."""
     with (
         mock.patch(
-            "tkc_lvlab.utils.libvirt.virsh_list_all_names",
-            return_value=["web01_lab"],
+            "tkc_lvlab.utils.libvirt.virsh_domstates",
+            return_value=_states("running"),
         ),
-        mock.patch("tkc_lvlab.utils.libvirt.virsh_domstate", return_value="running"),
         mock.patch("tkc_lvlab.utils.libvirt.run_virsh") as run_mock,
     ):
         result = machine.poweron(URI)
@@ -294,10 +348,9 @@ def test_poweron_start_failure_returns_one(machine: Machine) -> None:
     cli.py caller looks for."""
     with (
         mock.patch(
-            "tkc_lvlab.utils.libvirt.virsh_list_all_names",
-            return_value=["web01_lab"],
+            "tkc_lvlab.utils.libvirt.virsh_domstates",
+            return_value=_states("shut off"),
         ),
-        mock.patch("tkc_lvlab.utils.libvirt.virsh_domstate", return_value="shut off"),
         mock.patch(
             "tkc_lvlab.utils.libvirt.run_virsh",
             side_effect=VirshError(1, "boot failed", ["start", "web01_lab"]),
@@ -308,16 +361,32 @@ def test_poweron_start_failure_returns_one(machine: Machine) -> None:
     assert result == 1
 
 
+def test_poweron_state_query_failure_returns_one(machine: Machine) -> None:
+    """A failed bulk state read (URI unreachable) is a ``> 0`` failure, and
+    nothing is started blind."""
+    with (
+        mock.patch(
+            "tkc_lvlab.utils.libvirt.virsh_domstates",
+            side_effect=VirshError(1, "failed to connect", ["domstats"]),
+        ),
+        mock.patch("tkc_lvlab.utils.libvirt.run_virsh") as run_mock,
+    ):
+        result = machine.poweron(URI)
+
+    assert result == 1
+    run_mock.assert_not_called()
+
+
 def test_poweron_absent_domain_returns_zero(machine: Machine) -> None:
     """Preserve the pre-port behavior: if the domain isn't defined, warn
     and return 0. ``cli.py`` does its own existence check before calling
     poweron, so this branch is the safety net, not the primary path."""
     with (
         mock.patch(
-            "tkc_lvlab.utils.libvirt.virsh_list_all_names",
-            return_value=["other_lab"],
+            "tkc_lvlab.utils.libvirt.virsh_domstates",
+            return_value={"other_lab": ("running", "booted")},
         ),
-        mock.patch("tkc_lvlab.utils.libvirt.virsh_domstate") as state_mock,
+        mock.patch("tkc_lvlab.utils.libvirt.VirshBatch") as state_mock,
         mock.patch("tkc_lvlab.utils.libvirt.run_virsh") as run_mock,
     ):
         result = machine.poweron(URI)
@@ -340,16 +409,15 @@ def test_shutdown_active_states_invoke_shutdown(machine: Machine, state: str) ->
     losing the ``idle`` case during the port."""
     with (
         mock.patch(
-            "tkc_lvlab.utils.libvirt.virsh_list_all_names",
-            return_value=["web01_lab"],
+            "tkc_lvlab.utils.libvirt.virsh_domstates",
+            return_value=_states(state),
         ),
-        mock.patch("tkc_lvlab.utils.libvirt.virsh_domstate", return_value=state),
         mock.patch("tkc_lvlab.utils.libvirt.run_virsh") as run_mock,
     ):
         result = machine.shutdown(URI)
 
     assert result == 0
-    run_mock.assert_called_once_with(URI, ["shutdown", "web01_lab"])
+    run_mock.assert_called_once_with(URI, ["shutdown", "web01_lab"], cache=None)
 
 
 def test_shutdown_shut_off_vm_is_noop(machine: Machine) -> None:
@@ -357,10 +425,9 @@ def test_shutdown_shut_off_vm_is_noop(machine: Machine) -> None:
     on that. Return 0 so cli.py treats the no-op as success."""
     with (
         mock.patch(
-            "tkc_lvlab.utils.libvirt.virsh_list_all_names",
-            return_value=["web01_lab"],
+            "tkc_lvlab.utils.libvirt.virsh_domstates",
+            return_value=_states("shut off"),
         ),
-        mock.patch("tkc_lvlab.utils.libvirt.virsh_domstate", return_value="shut off"),
         mock.patch("tkc_lvlab.utils.libvirt.run_virsh") as run_mock,
     ):
         result = machine.shutdown(URI)
@@ -374,10 +441,9 @@ def test_shutdown_failure_returns_one(machine: Machine) -> None:
     the cli.py caller checks."""
     with (
         mock.patch(
-            "tkc_lvlab.utils.libvirt.virsh_list_all_names",
-            return_value=["web01_lab"],
+            "tkc_lvlab.utils.libvirt.virsh_domstates",
+            return_value=_states("running"),
         ),
-        mock.patch("tkc_lvlab.utils.libvirt.virsh_domstate", return_value="running"),
         mock.patch(
             "tkc_lvlab.utils.libvirt.run_virsh",
             side_effect=VirshError(1, "agent unresponsive", ["shutdown", "web01_lab"]),
@@ -393,10 +459,10 @@ def test_shutdown_absent_domain_returns_zero(machine: Machine) -> None:
     behavior. cli.py already checks existence, so this is defensive."""
     with (
         mock.patch(
-            "tkc_lvlab.utils.libvirt.virsh_list_all_names",
-            return_value=["other_lab"],
+            "tkc_lvlab.utils.libvirt.virsh_domstates",
+            return_value={"other_lab": ("running", "booted")},
         ),
-        mock.patch("tkc_lvlab.utils.libvirt.virsh_domstate") as state_mock,
+        mock.patch("tkc_lvlab.utils.libvirt.VirshBatch") as state_mock,
         mock.patch("tkc_lvlab.utils.libvirt.run_virsh") as run_mock,
     ):
         result = machine.shutdown(URI)
@@ -40,38 +40,37 @@ URI = "qemu:///session"
 
 
 def test_exists_in_libvirt_absent_returns_empty_strings(machine: Machine) -> None:
-    """When the domain isn't in the list, return (False, "", "") — not the
-    old (False, 0, 0) tuple — and don't call domstate at all."""
-    with (
-        mock.patch(
-            "tkc_lvlab.utils.libvirt.virsh_list_all_names", return_value=["other_lab"]
-        ) as list_mock,
-        mock.patch("tkc_lvlab.utils.libvirt.virsh_domstate_reason") as state_mock,
-    ):
+    """When the domain isn't in the bulk state snapshot, return
+    (False, "", "") — not the old (False, 0, 0) tuple."""
+    with mock.patch(
+        "tkc_lvlab.utils.libvirt.virsh_domstates",
+        return_value={"other_lab": ("running", "booted")},
+    ) as states_mock:
         result = machine.exists_in_libvirt(URI)
 
     assert result == (False, "", "")
-    list_mock.assert_called_once_with(URI)
-    state_mock.assert_not_called()
+    states_mock.assert_called_once_with(URI, cache=None)
 
 
 def test_exists_in_libvirt_present_returns_state_and_reason(machine: Machine) -> None:
     """When the domain is present, surface the lowercase virsh state strings
-    cli.py now compares against (``running``, ``shut off``, etc.)."""
+    cli.py now compares against (``running``, ``shut off``, etc.) straight
+    from the one bulk call — no follow-up per-domain ``domstate``."""
     with (
         mock.patch(
-            "tkc_lvlab.utils.libvirt.virsh_list_all_names",
-            return_value=["web01_lab", "other_lab"],
-        ),
-        mock.patch(
-            "tkc_lvlab.utils.libvirt.virsh_domstate_reason",
-            return_value=("running", "booted"),
-        ) as state_mock,
+            "tkc_lvlab.utils.libvirt.virsh_domstates",
+            return_value={
+                "web01_lab": ("running", "booted"),
+                "other_lab": ("shut off", "shutdown"),
+            },
+        ) as states_mock,
+        mock.patch("tkc_lvlab.utils.libvirt.run_virsh") as run_mock,
     ):
         result = machine.exists_in_libvirt(URI)
 
     assert result == (True, "running", "booted")
-    state_mock.assert_called_once_with(URI, "web01_lab")
+    states_mock.assert_called_once_with(URI, cache=None)
+    run_mock.assert_not_called()
 
 
 def test_exists_in_libvirt_namespacing_uses_libvirt_vm_name(machine: Machine) -> None:
@@ -80,37 +79,20 @@ def test_exists_in_libvirt_namespacing_uses_libvirt_vm_name(machine: Machine) ->
     must not collide; only ``web01_<env>`` is the real domain name."""
     machine.libvirt_vm_name = "web01_prod"
     with mock.patch(
-        "tkc_lvlab.utils.libvirt.virsh_list_all_names",
-        return_value=["web01_dev"],  # the dev namespaced name, not prod
+        "tkc_lvlab.utils.libvirt.virsh_domstates",
+        # the dev namespaced name, not prod
+        return_value={"web01_dev": ("running", "booted")},
     ):
         exists, _, _ = machine.exists_in_libvirt(URI)
     assert exists is False
 
 
-def test_exists_in_libvirt_domstate_race_treated_as_absent(machine: Machine) -> None:
-    """If the domain vanishes between the list and the lookup, ``virsh``
-    raises ``VirshError`` for the second call. The method should treat that
-    as 'no longer present' rather than crashing the caller."""
-    with (
-        mock.patch(
-            "tkc_lvlab.utils.libvirt.virsh_list_all_names", return_value=["web01_lab"]
-        ),
-        mock.patch(
-            "tkc_lvlab.utils.libvirt.virsh_domstate_reason",
-            side_effect=VirshError(1, "domain not found", ["domstate"]),
-        ),
-    ):
-        result = machine.exists_in_libvirt(URI)
-
-    assert result == (False, "", "")
-
-
 def test_exists_in_libvirt_list_failure_propagates(machine: Machine) -> None:
-    """A failure of the initial ``virsh list`` (URI unreachable, virsh
-    missing, etc.) is an environmental problem — surface it, don't swallow."""
+    """A failure of the bulk state query (URI unreachable, virsh missing,
+    etc.) is an environmental problem — surface it, don't swallow."""
     with mock.patch(
-        "tkc_lvlab.utils.libvirt.virsh_list_all_names",
-        side_effect=VirshError(127, "virsh not found", ["list"]),
+        "tkc_lvlab.utils.libvirt.virsh_domstates",
+        side_effect=VirshError(127, "virsh not found", ["domstats"]),
     ):
         with pytest.raises(VirshError):
             machine.exists_in_libvirt(URI)
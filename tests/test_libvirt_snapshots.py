@@ -12,6 +12,7 @@ filesystem side effects.
 from __future__ import annotations
 
 import contextlib
+import subprocess
 from unittest import mock
 
 import pytest
@@ -47,76 +48,78 @@ def _fake_xml_tempfile(xml: str):
 # ---------------------------------------------------------------------------
 
 
+def _listing_batch(domains: list[str], snapshots: list[str] | None):
+    """A ``VirshBatch`` stand-in answering the ``list`` + ``snapshot-list``
+    pair. ``snapshots=None`` makes ``snapshot-list`` fail (domain missing)."""
+    queued: list[list[str]] = []
+
+    class _FakeBatch:
+        def __init__(self, uri, **_kwargs):
+            assert uri == URI
+
+        def add(self, args, *, check=True):
+            queued.append(args)
+            return len(queued) - 1
+
+        def run(self):
+            listing = subprocess.CompletedProcess(
+                queued[0], 0, "".join(f"{d}\n" for d in domains), ""
+            )
+            if snapshots is None:
+                snap = subprocess.CompletedProcess(
+                    queued[1], 1, "", "error: failed to get domain 'web01_lab'\n"
+                )
+            else:
+                snap = subprocess.CompletedProcess(
+                    queued[1], 0, "".join(f"{n}\n" for n in snapshots), ""
+                )
+            return [listing, snap]
+
+    return _FakeBatch, queued
+
+
 def test_list_snapshots_present_with_snapshots_preserves_order(
     machine: Machine,
 ) -> None:
     """When the domain exists, return the names ``virsh snapshot-list --name``
     emits, in order. Order matters because callers display them to a human
-    and the libvirt-python implementation preserved creation order."""
-    with (
-        mock.patch(
-            "tkc_lvlab.utils.libvirt.virsh_list_all_names",
-            return_value=["web01_lab", "other_lab"],
-        ),
-        mock.patch(
-            "tkc_lvlab.utils.libvirt.virsh_snapshot_names",
-            return_value=["snap-a", "snap-b", "snap-c"],
-        ) as snap_mock,
-    ):
+    and the libvirt-python implementation preserved creation order. Both
+    reads are queued on one batched ``virsh`` process."""
+    fake, queued = _listing_batch(["web01_lab", "other_lab"], ["snap-a", "snap-b", "snap-c"])
+    with mock.patch("tkc_lvlab.utils.libvirt.VirshBatch", fake):
         result = machine.list_snapshots(URI)
 
     assert result == ["snap-a", "snap-b", "snap-c"]
-    snap_mock.assert_called_once_with(URI, "web01_lab")
+    assert queued == [
+        ["list", "--all", "--name"],
+        ["snapshot-list", "web01_lab", "--name"],
+    ]
 
 
 def test_list_snapshots_present_no_snapshots_returns_empty(machine: Machine) -> None:
     """A defined domain with zero snapshots: ``[]``, not ``None`` and not a
     crash. Regression guard: a wrong-shape return here breaks the for-loop
     in the cli.py snapshot command."""
-    with (
-        mock.patch(
-            "tkc_lvlab.utils.libvirt.virsh_list_all_names",
-            return_value=["web01_lab"],
-        ),
-        mock.patch(
-            "tkc_lvlab.utils.libvirt.virsh_snapshot_names",
-            return_value=[],
-        ),
-    ):
+    fake, _ = _listing_batch(["web01_lab"], [])
+    with mock.patch("tkc_lvlab.utils.libvirt.VirshBatch", fake):
         assert machine.list_snapshots(URI) == []
 
 
 def test_list_snapshots_absent_domain_returns_empty(machine: Machine) -> None:
-    """If the domain isn't defined at the URI, return ``[]`` and don't
-    call ``virsh snapshot-list``. This mirrors the previous libvirt-python
-    behavior (the conn was opened but no lookup happened)."""
-    with (
-        mock.patch(
-            "tkc_lvlab.utils.libvirt.virsh_list_all_names",
-            return_value=["other_lab"],
-        ),
-        mock.patch("tkc_lvlab.utils.libvirt.virsh_snapshot_names") as snap_mock,
-    ):
+    """If the domain isn't defined at the URI, return ``[]`` — even if the
+    batched ``snapshot-list`` somehow answered (only the listing decides)."""
+    fake, _ = _listing_batch(["other_lab"], ["stale"])
+    with mock.patch("tkc_lvlab.utils.libvirt.VirshBatch", fake):
         assert machine.list_snapshots(URI) == []
 
-    snap_mock.assert_not_called()
-
 
 def test_list_snapshots_race_treated_as_absent(machine: Machine) -> None:
     """If the domain disappears between the list and the snapshot-list
     call, treat that as 'no snapshots' rather than crashing. The previous
     libvirt-python code would have raised; the port should not regress to
     that behavior."""
-    with (
-        mock.patch(
-            "tkc_lvlab.utils.libvirt.virsh_list_all_names",
-            return_value=["web01_lab"],
-        ),
-        mock.patch(
-            "tkc_lvlab.utils.libvirt.virsh_snapshot_names",
-            side_effect=VirshError(1, "domain not found", ["snapshot-list"]),
-        ),
-    ):
+    fake, _ = _listing_batch(["web01_lab"], None)
+    with mock.patch("tkc_lvlab.utils.libvirt.VirshBatch", fake):
         assert machine.list_snapshots(URI) == []
 
 
@@ -158,6 +161,7 @@ def test_create_snapshot_happy_path_uses_xmlfile_and_timeout(
         URI,
         ["snapshot-create", "web01_lab", "--xmlfile", "/tmp/lvlab-snapshot-FAKE.xml"],
         timeout=120.0,
+        cache=None,
     )
 
 
@@ -248,6 +252,7 @@ def test_delete_snapshot_happy_path_returns_none(machine: Machine) -> None:
         URI,
         ["snapshot-delete", "web01_lab", "snap-1"],
         timeout=120.0,
+        cache=None,
     )
 
 
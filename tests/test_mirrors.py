@@ -0,0 +1,199 @@
+"""Mirror ranking and mid-transfer failover (:mod:`tkc_lvlab.utils.mirrors`).
+
+Two local ``http.server`` instances on different ports stand in for two
+mirror hosts. Each serves one image with ``Range`` support and can be made
+slow, told to drop the connection part-way through a full-body answer, or
+to publish a different build; every request is recorded with its
+``Range`` header so a test can see where a resume started.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+from tkc_lvlab.exceptions import ImageError
+from tkc_lvlab.utils import images as images_mod
+from tkc_lvlab.utils.images import CloudImage, read_digest, read_remote_record
+from tkc_lvlab.utils.mirrors import MirrorStats, mirror_urls, rank_mirrors
+
+IMAGE = bytes(range(256)) * 4096  # 1 MiB
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *_args) -> None:
+        pass
+
+    def do_GET(self) -> None:  # noqa: N802 - http.server naming
+        server = self.server
+        byte_range = self.headers.get("Range")
+        with server.lock:
+            server.requests.append(byte_range)
+        time.sleep(server.delay)
+        if self.path != "/pub/image.qcow2":
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body, start = server.body, 0
+        if byte_range:
+            first, _, last = byte_range.removeprefix("bytes=").partition("-")
+            start = int(first)
+            end = int(last) if last else len(body) - 1
+            self.send_response(206)
+            self.send_header(
+                "Content-Range", f"bytes {start}-{end}/{len(server.body)}"
+            )
+            body = body[start : end + 1]
+        else:
+            self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Accept-Ranges", "bytes")
+        self.end_headers()
+        if server.cut_after is not None and not byte_range:
+            self.wfile.write(body[: server.cut_after])
+            self.wfile.flush()
+            self.close_connection = True
+            return
+        self.wfile.write(body)
+
+
+def _start_server() -> ThreadingHTTPServer:
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    httpd.daemon_threads = True
+    httpd.lock = threading.Lock()
+    httpd.requests = []
+    httpd.body = IMAGE
+    httpd.delay = 0.0
+    httpd.cut_after = None
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    httpd.base = f"http://127.0.0.1:{httpd.server_address[1]}/pub"
+    return httpd
+
+
+@pytest.fixture
+def hosts():
+    servers = [_start_server(), _start_server()]
+    yield servers
+    for httpd in servers:
+        httpd.shutdown()
+        httpd.server_close()
+
+
+def _image(primary, mirror, tmp_path: Path) -> CloudImage:
+    config = {
+        "image_url": f"{primary.base}/image.qcow2",
+        "mirrors": [mirror.base + "/"],
+        "checksum_url": f"{primary.base}/SHA256SUMS",
+        "checksum_type": "sha256",
+    }
+    config_defaults = {
+        "cloud_image_basedir": str(tmp_path / "cloud-images"),
+        "download_segments": 1,
+    }
+    return CloudImage("testimg", config, {}, config_defaults)
+
+
+def test_mirror_urls_keep_the_primary_first() -> None:
+    urls = mirror_urls(
+        "https://a.example/x/img.qcow2",
+        ["https://b.example/y", "https://b.example/y/", "https://a.example/x"],
+    )
+    assert urls == ["https://a.example/x/img.qcow2", "https://b.example/y/img.qcow2"]
+
+
+def test_fastest_mirror_wins_and_is_remembered(hosts, tmp_path: Path) -> None:
+    slow, fast = hosts
+    slow.delay = 0.3
+    urls = mirror_urls(f"{slow.base}/image.qcow2", [fast.base])
+    stats = MirrorStats(str(tmp_path / "throughput.json"))
+
+    assert rank_mirrors(urls, stats=stats) == [urls[1], urls[0]]
+    assert stats.throughput(urls[1]) > stats.throughput(urls[0])
+
+    # The next run ranks from the remembered figures without probing.
+    for httpd in hosts:
+        httpd.requests.clear()
+    assert rank_mirrors(urls, stats=stats) == [urls[1], urls[0]]
+    assert slow.requests == fast.requests == []
+
+
+def test_stale_measurements_are_probed_again(hosts, tmp_path: Path) -> None:
+    now = [1000.0]
+    stats = MirrorStats(str(tmp_path / "throughput.json"), ttl=60, clock=lambda: now[0])
+    urls = mirror_urls(f"{hosts[0].base}/image.qcow2", [hosts[1].base])
+    rank_mirrors(urls, stats=stats)
+    hosts[0].requests.clear()
+
+    now[0] += 61
+    assert stats.throughput(urls[0]) is None
+    rank_mirrors(urls, stats=stats)
+    assert hosts[0].requests == ["bytes=0-524287"]
+
+
+def test_mirror_with_another_build_is_dropped(hosts, tmp_path: Path) -> None:
+    primary, stale = hosts
+    stale.body = IMAGE[:1000]
+    urls = mirror_urls(f"{primary.base}/image.qcow2", [stale.base])
+
+    assert rank_mirrors(urls) == [urls[0]]
+
+
+def test_unreachable_mirror_is_kept_as_a_last_resort(hosts) -> None:
+    urls = mirror_urls(f"{hosts[0].base}/image.qcow2", [hosts[1].base + "/gone"])
+    assert rank_mirrors(urls) == urls  # the 404 probe ranks last
+
+
+def test_dropped_transfer_resumes_on_the_other_mirror(
+    hosts, tmp_path: Path, monkeypatch
+) -> None:
+    # Fixed 64 KiB reads: the four complete before the drop are kept, the
+    # one cut short is lost with the connection.
+    monkeypatch.setattr(images_mod, "_MIN_CHUNK_BYTES", 65536)
+    monkeypatch.setattr(images_mod, "_MAX_CHUNK_BYTES", 65536)
+    primary, mirror = hosts
+    image = _image(primary, mirror, tmp_path)
+    # Remembered figures put the primary first; it then dies part-way.
+    stats = MirrorStats.for_image_dir(image.image_dir)
+    stats.record(image.image_url, 1e9)
+    stats.record(mirror.base, 1e6)
+    primary.cut_after = 300_000
+
+    assert image.download_image(progress_callback=lambda *_: None)
+
+    assert Path(image.image_fpath).read_bytes() == IMAGE
+    assert mirror.requests == ["bytes=262144-"]
+    digest = hashlib.sha256(IMAGE).hexdigest()
+    assert read_digest(image.image_fpath, "sha256") == digest
+    # The mirror's validators are not the primary URL's to record.
+    assert read_remote_record(image.image_fpath, image.image_url) is None
+
+
+def test_mirror_without_the_file_is_skipped(hosts, tmp_path: Path) -> None:
+    primary, mirror = hosts
+    image = _image(primary, mirror, tmp_path)
+    image.mirrors = [mirror.base + "/gone"]
+    stats = MirrorStats.for_image_dir(image.image_dir)
+    stats.record(mirror.base, 1e9)  # ranked first, but 404s
+
+    assert image.download_image(progress_callback=lambda *_: None)
+
+    assert Path(image.image_fpath).read_bytes() == IMAGE
+    assert read_remote_record(image.image_fpath, image.image_url) is not None
+
+
+def test_every_source_failing_names_the_mirrors(hosts, tmp_path: Path) -> None:
+    primary, mirror = hosts
+    image = _image(primary, mirror, tmp_path)
+    image.image_url = f"{primary.base}/gone.qcow2"
+    image.mirrors = [mirror.base + "/gone"]
+
+    with pytest.raises(ImageError, match=r"gone\.qcow2 or its 1 mirror\(s\)"):
+        image.download_image(progress_callback=lambda *_: None)
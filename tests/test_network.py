@@ -148,7 +148,7 @@ def test_get_network_info_parses_nat_network() -> None:
         info = get_network_info("qemu:///system", "default")
 
     # run_virsh is invoked with the URI and the net-dumpxml args.
-    run_mock.assert_called_once_with("qemu:///system", ["net-dumpxml", "default"])
+    run_mock.assert_called_once_with("qemu:///system", ["net-dumpxml", "default"], cache=None)
 
     assert info.name == "default"
     assert info.forward_mode == "nat"
@@ -210,6 +210,100 @@ def test_get_network_info_malformed_xml_translates_to_libvirt_network_error() ->
             get_network_info("qemu:///system", "default")
 
 
+# ---------------------------------------------------------------------------
+# get_network_info — per-(uri, network) memoization
+# ---------------------------------------------------------------------------
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_repeated_lookups_cost_one_dumpxml_per_network() -> None:
+    """A manifest of many machines on one network reads its XML once."""
+    with mock.patch.object(
+        net_mod, "run_virsh", return_value=_fake_completed(NAT_NETWORK_XML)
+    ) as run:
+        infos = [get_network_info("qemu:///system", "default") for _ in range(5)]
+        get_network_info("qemu:///session", "default")
+
+    assert run.call_count == 2  # one per (uri, network)
+    assert all(info is infos[0] for info in infos)
+
+
+def test_expired_entry_with_unchanged_xml_is_not_reparsed() -> None:
+    clock = _Clock()
+    cache = net_mod.NetworkInfoCache(ttl=30.0, clock=clock)
+    with mock.patch.object(
+        net_mod, "run_virsh", return_value=_fake_completed(NAT_NETWORK_XML)
+    ) as run:
+        first = cache.get("qemu:///system", "default")
+        clock.now = 31.0
+        second = cache.get("qemu:///system", "default")
+
+    assert run.call_count == 2
+    assert second is first
+    assert (cache.parses, cache.revalidations) == (1, 1)
+
+
+def test_redefined_network_is_reparsed_after_ttl() -> None:
+    clock = _Clock()
+    cache = net_mod.NetworkInfoCache(ttl=30.0, clock=clock)
+    with mock.patch.object(
+        net_mod,
+        "run_virsh",
+        side_effect=[
+            _fake_completed(NAT_NETWORK_XML),
+            _fake_completed(BRIDGE_NETWORK_XML),
+        ],
+    ):
+        assert cache.get("qemu:///system", "default").forward_mode == "nat"
+        clock.now = 31.0
+        assert cache.get("qemu:///system", "default").forward_mode == "bridge"
+    assert cache.parses == 2
+
+
+def test_invalidate_forces_a_re_read() -> None:
+    with mock.patch.object(
+        net_mod, "run_virsh", return_value=_fake_completed(NAT_NETWORK_XML)
+    ) as run:
+        get_network_info("qemu:///system", "default")
+        net_mod.network_info_cache().invalidate("qemu:///system", "default")
+        get_network_info("qemu:///system", "default")
+    assert run.call_count == 2
+
+
+def test_failed_read_is_not_memoized() -> None:
+    with mock.patch.object(
+        net_mod,
+        "run_virsh",
+        side_effect=[
+            VirshError(1, "error: Network not found", ["net-dumpxml", "default"]),
+            _fake_completed(NAT_NETWORK_XML),
+        ],
+    ):
+        with pytest.raises(LibvirtNetworkError):
+            get_network_info("qemu:///system", "default")
+        assert get_network_info("qemu:///system", "default").gateway_ip == "192.168.122.1"
+
+
+def test_dhcp_range_is_parsed_once_on_the_cached_info() -> None:
+    with mock.patch.object(
+        net_mod, "run_virsh", return_value=_fake_completed(NAT_NETWORK_XML)
+    ):
+        info = get_network_info("qemu:///system", "default")
+    assert info.dhcp_range == (
+        ipaddress.IPv4Address("192.168.122.2"),
+        ipaddress.IPv4Address("192.168.122.254"),
+    )
+    assert info.dhcp6_range is None
+    assert "dhcp_range" in vars(info)  # precomputed, not lazily on first use
+
+
 # ---------------------------------------------------------------------------
 # get_network_info — IPv6 parsing (#137 dual-stack)
 # ---------------------------------------------------------------------------
@@ -0,0 +1,104 @@
+"""Unit tests for :mod:`tkc_lvlab.utils.rate_limit` and its use in downloads.
+
+The bucket runs on the real monotonic clock, so rates here are chosen for
+waits of a few hundred milliseconds with generous margins.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from tkc_lvlab.utils import images as images_mod
+from tkc_lvlab.utils.http_client import DownloadClient
+from tkc_lvlab.utils.rate_limit import ByteBudget, TokenBucket, parse_rate
+
+from tests.http_fakes import FakeResponse
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        ("1500", 1500),
+        ("500K", 500 * 1024),
+        ("10m", 10 * 1024**2),
+        ("1.5G", int(1.5 * 1024**3)),
+        ("2MiB/s", 2 * 1024**2),
+        (" 64kb ", 64 * 1024),
+    ],
+)
+def test_parse_rate(text: str, expected: int) -> None:
+    assert parse_rate(text) == expected
+
+
+@pytest.mark.parametrize("text", ["", "fast", "0", "10X", "-5M"])
+def test_parse_rate_rejects_nonsense(text: str) -> None:
+    with pytest.raises(ValueError, match="invalid rate"):
+        parse_rate(text)
+
+
+def test_bucket_holds_the_sustained_rate() -> None:
+    bucket = TokenBucket(200_000, burst=20_000)
+
+    started = time.monotonic()
+    for _ in range(6):
+        bucket.consume(20_000)
+    elapsed = time.monotonic() - started
+
+    # The first bucketful is free; the other 100 kB take 0.5 s at 200 kB/s.
+    assert 0.4 < elapsed < 1.5
+
+
+def test_oversized_request_leaves_the_bucket_in_debt() -> None:
+    bucket = TokenBucket(100_000, burst=10_000)
+
+    assert bucket.consume(40_000) < 0.05  # a full bucket admits it at once
+    assert bucket.consume(1) > 0.25  # ... and the next caller pays it off
+
+
+def test_waiters_are_served_by_priority() -> None:
+    bucket = TokenBucket(50_000, burst=10_000)
+    bucket.consume(10_000)  # empty: everyone below has to queue
+    served: list[str] = []
+
+    def take(name: str, priority: int) -> None:
+        bucket.consume(10_000, priority=priority)
+        served.append(name)
+
+    low = threading.Thread(target=take, args=("low", 5))
+    low.start()
+    while not bucket._waiters:  # pylint: disable=protected-access
+        time.sleep(0.001)
+    high = threading.Thread(target=take, args=("high", 0))
+    high.start()
+    low.join(timeout=5)
+    high.join(timeout=5)
+
+    assert served == ["high", "low"]
+
+
+def test_limited_reads_never_exceed_one_bucketful() -> None:
+    response = FakeResponse(b"x" * 100_000)
+    budget = ByteBudget(TokenBucket(10_000_000, burst=16_384))
+
+    body = b"".join(images_mod._iter_body(response, budget=budget))
+
+    assert len(body) == 100_000
+    assert set(response.raw.read_sizes) == {16_384}
+
+
+def test_client_budget_carries_the_worker_priority() -> None:
+    assert DownloadClient().budget() is None
+
+    client = DownloadClient(limit_rate=1024**2)
+    assert client.budget().priority == 0
+    with client.prioritized(3):
+        budget = client.budget()
+        with client.prioritized(7):
+            assert client.budget().priority == 7
+        assert client.budget().priority == 3
+    assert client.budget().priority == 0
+    assert budget.bucket is client.bucket
+    assert budget.priority == 3
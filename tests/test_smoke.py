@@ -326,48 +326,51 @@ def test_parse_domifaddr_lease_ignores_ipv6_only_and_header():
 # ---------------------------------------------------------------------------
 
 
-def test_await_shutoff_returns_early_on_clean_poweroff():
-    """A guest that ACPI-powers-off promptly is caught within one interval,
-    not after the full grace budget."""
-    states = iter(["running", "shut off"])
-    sleeps: list[float] = []
-
-    got = smoke._await_shutoff(
-        lambda: next(states), retries=8, interval=2, sleep=sleeps.append
-    )
+def test_await_shutoff_returns_early_on_clean_poweroff(monkeypatch):
+    """A guest that ACPI-powers-off promptly is reported as a clean shutdown;
+    the wait targets "shut off" (or an undefined domain) within the bounded
+    grace budget."""
+    calls = []
+
+    def fake_wait(uri, domain, states, *, timeout, poll_interval):
+        calls.append((uri, domain, tuple(states), timeout, poll_interval))
+        return "shut off"
 
-    assert got is True
-    # Saw "running" once, slept once, then "shut off" -> stopped early.
-    assert sleeps == [2]
+    monkeypatch.setattr(smoke, "wait_for_domain_state", fake_wait)
+
+    assert smoke._await_shutoff("qemu:///system", "web01_lab") is True
+    assert calls == [
+        (
+            "qemu:///system",
+            "web01_lab",
+            ("shut off", "absent"),
+            smoke.SHUTDOWN_GRACE_SECONDS,
+            smoke.SHUTDOWN_POLL_INTERVAL,
+        )
+    ]
 
 
-def test_await_shutoff_gives_up_after_grace_budget():
+def test_await_shutoff_gives_up_after_grace_budget(monkeypatch):
     """A guest that ignores ACPI poweroff (Ubuntu cloud image) is abandoned
     after the bounded grace so the caller can force it off — never the ~60s
     stall the old 12x5s loop produced (issue #132)."""
-    sleeps: list[float] = []
-
-    got = smoke._await_shutoff(
-        lambda: "running", retries=8, interval=2, sleep=sleeps.append
-    )
+    monkeypatch.setattr(smoke, "wait_for_domain_state", lambda *a, **kw: None)
 
-    assert got is False
-    # 8 polls -> 7 sleeps (no sleep after the final poll); bounded at 14s, not 60.
-    assert sleeps == [2] * 7
+    assert smoke._await_shutoff("qemu:///system", "web01_lab") is False
+    # Bounded at 14s, not 60.
+    assert smoke.SHUTDOWN_GRACE_SECONDS == 14
 
 
-def test_await_shutoff_stops_when_state_is_unreadable():
+def test_await_shutoff_stops_when_state_is_unreadable(monkeypatch):
     """An unreadable state (VirshError) stops the wait immediately rather than
     burning the whole grace budget; the unconditional force-destroy follows."""
-    sleeps: list[float] = []
 
-    def boom() -> str:
+    def boom(*_args, **_kwargs) -> str:
         raise VirshError(1, "failed to connect to the hypervisor", ["domstate", "x"])
 
-    got = smoke._await_shutoff(boom, retries=8, interval=2, sleep=sleeps.append)
+    monkeypatch.setattr(smoke, "wait_for_domain_state", boom)
 
-    assert got is True
-    assert sleeps == []
+    assert smoke._await_shutoff("qemu:///system", "web01_lab") is True
 
 
 # ---------------------------------------------------------------------------
@@ -51,7 +51,7 @@ def test_undefine_clean_path_uses_no_snapshots_flag(
 
     undefine_with_snapshot_cleanup(URI, DOMAIN)  # Must not raise.
 
-    run.assert_called_once_with(URI, ["undefine", DOMAIN])
+    run.assert_called_once_with(URI, ["undefine", DOMAIN], cache=None)
 
 
 def test_undefine_non_snapshot_error_propagates(
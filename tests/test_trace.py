@@ -0,0 +1,163 @@
+"""Unit tests for :mod:`tkc_lvlab.utils.trace` (``--trace FILE``).
+
+Process records come from real (trivial) children spawned with
+``sys.executable``; ``virsh`` records come from :func:`run_virsh` with
+``subprocess.run`` mocked at the ``tkc_lvlab.utils.virsh`` boundary, as in
+``test_virsh.py``.
+"""
+
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+from unittest import mock
+
+from typer.testing import CliRunner
+
+from tkc_lvlab.scripts import deletevm as deletevm_mod
+from tkc_lvlab.utils import trace, virsh
+from tkc_lvlab.utils.trace import KIND_PROCESS, KIND_VIRSH, active_tracer, trace_to
+from tkc_lvlab.utils.virsh import run_virsh
+from tkc_lvlab.utils.virsh_cache import VirshReadCache
+
+URI = "qemu:///session"
+
+
+def _lines(path) -> list[dict]:
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def _completed(stdout: str = "", stderr: str = "", returncode: int = 0):
+    return subprocess.CompletedProcess(["virsh"], returncode, stdout, stderr)
+
+
+def test_every_subprocess_is_recorded_and_popen_restored(tmp_path):
+    path = tmp_path / "trace.jsonl"
+    with trace_to(path, summary=False) as tracer:
+        assert active_tracer() is tracer
+        subprocess.run([sys.executable, "-c", "raise SystemExit(3)"], check=False)
+        subprocess.run([sys.executable, "-c", "pass"], check=True)
+
+    assert subprocess.Popen is trace._ORIGINAL_POPEN
+    assert active_tracer() is None
+    records = _lines(path)
+    assert [r["returncode"] for r in records] == [3, 0]
+    assert all(r["kind"] == KIND_PROCESS for r in records)
+    assert records[0]["argv"][0] == sys.executable
+    assert all(r["duration_s"] > 0 for r in records)
+
+
+def test_spawn_failure_is_recorded_with_the_error(tmp_path):
+    path = tmp_path / "trace.jsonl"
+    with trace_to(path, summary=False):
+        try:
+            subprocess.run(["lvlab-definitely-not-a-binary"], check=False)
+        except FileNotFoundError:
+            pass
+    (record,) = _lines(path)
+    assert record["returncode"] is None
+    assert record["error"]
+
+
+def test_run_virsh_records_one_logical_call_with_retries(tmp_path):
+    path = tmp_path / "trace.jsonl"
+    drop = _completed(stderr="error: failed to connect to the hypervisor", returncode=1)
+    with (
+        trace_to(path, summary=False),
+        mock.patch(
+            "tkc_lvlab.utils.virsh.subprocess.run",
+            side_effect=[drop, drop, _completed("running\n")],
+        ),
+        mock.patch("tkc_lvlab.utils.virsh.time.sleep"),
+    ):
+        run_virsh(URI, ["domstate", "web01_lab"])
+
+    (record,) = _lines(path)
+    assert record["kind"] == KIND_VIRSH
+    assert record["argv"] == ["virsh", "-c", URI, "domstate", "web01_lab"]
+    assert record["retries"] == 2
+    assert record["backoff_s"] == sum(virsh._CONNECTION_ERROR_BACKOFF[:2])
+    assert record["transport"] == "exec"
+    assert record["returncode"] == 0
+
+
+def test_virsh_spawn_is_not_double_counted(tmp_path, monkeypatch):
+    """A real one-shot ``virsh`` fork inside run_virsh yields only the logical record."""
+    bindir = tmp_path / "bin"
+    bindir.mkdir()
+    fake = bindir / "virsh"
+    fake.write_text(f"#!{sys.executable}\nprint('running')\n")
+    fake.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{bindir}:/usr/bin:/bin")
+    monkeypatch.setenv("LVLAB_VIRSH_SESSIONS", "0")
+    path = tmp_path / "trace.jsonl"
+    with trace_to(path, summary=False):
+        run_virsh(URI, ["domstate", "web01_lab"])
+    assert [r["kind"] for r in _lines(path)] == [KIND_VIRSH]
+
+
+def test_cache_hits_are_traced_as_such(tmp_path):
+    path = tmp_path / "trace.jsonl"
+    cache = VirshReadCache()
+    with (
+        trace_to(path, summary=False),
+        mock.patch(
+            "tkc_lvlab.utils.virsh.subprocess.run", return_value=_completed("a\n")
+        ),
+    ):
+        run_virsh(URI, ["list", "--all", "--name"], cache=cache)
+        run_virsh(URI, ["list", "--all", "--name"], cache=cache)
+    assert [r["transport"] for r in _lines(path)] == ["exec", "cache"]
+
+
+def test_failed_virsh_call_is_recorded_with_the_error(tmp_path):
+    path = tmp_path / "trace.jsonl"
+    with (
+        trace_to(path, summary=False),
+        mock.patch(
+            "tkc_lvlab.utils.virsh.subprocess.run",
+            return_value=_completed(stderr="error: no domain", returncode=1),
+        ),
+    ):
+        try:
+            run_virsh(URI, ["domstate", "ghost"])
+        except virsh.VirshError:
+            pass
+    (record,) = _lines(path)
+    assert record["returncode"] == 1
+    assert "no domain" in record["error"]
+
+
+def test_summary_groups_by_program_slowest_first(tmp_path):
+    with trace_to(tmp_path / "trace.jsonl", summary=False) as tracer:
+        for argv, duration in (
+            (["virsh", "-c", URI, "start", "a"], 0.5),
+            (["virsh", "-c", URI, "start", "b"], 1.5),
+            (["/usr/bin/qemu-img", "info", "x"], 0.1),
+            (["virt-install", "--name", "a"], 3.0),
+        ):
+            kind = KIND_VIRSH if argv[0] == "virsh" else KIND_PROCESS
+            tracer.add(trace.TraceRecord(kind, argv, 0.0, duration_s=duration))
+
+    rows = tracer.summary()
+    assert [row["program"] for row in rows] == ["virt-install", "virsh start", "qemu-img"]
+    assert rows[1]["calls"] == 2
+    assert rows[1]["total_s"] == 2.0
+    assert rows[1]["max_s"] == 1.5
+
+
+def test_deletevm_trace_option_writes_file_and_summary(tmp_path):
+    path = tmp_path / "trace.jsonl"
+    with mock.patch(
+        "tkc_lvlab.utils.virsh.subprocess.run",
+        return_value=_completed(returncode=1, stderr="error: no domain"),
+    ):
+        result = CliRunner().invoke(
+            deletevm_mod.app, ["ghost", "--force", "--trace", str(path)]
+        )
+
+    assert result.exit_code == 1
+    records = _lines(path)
+    assert records and records[0]["kind"] == KIND_VIRSH
+    assert "Trace:" in result.output
@@ -6,15 +6,28 @@ vs ``backing`` (cloud-image overlay, opt-in), strategy resolution
 ``shutil.copyfile`` and ``subprocess.run`` are mocked at the module
 boundary so no real ``cp`` / ``qemu-img`` runs; the parent dir lands under
 ``tmp_path``.
+
+The header reader tests write qcow2 headers byte by byte with ``struct``.
 """
 
 from __future__ import annotations
 
+import json
+import os
+import struct
 import subprocess
 from types import SimpleNamespace
 from unittest import mock
 
-from tkc_lvlab.utils.vdisk import DEFAULT_DISK_STRATEGY, VirtualDisk
+import pytest
+
+from tkc_lvlab.utils import vdisk as vdisk_mod
+from tkc_lvlab.utils.vdisk import (
+    DEFAULT_DISK_STRATEGY,
+    VirtualDisk,
+    disk_header,
+    read_disk_header,
+)
 
 
 def _vdisk(tmp_path, disk: dict, config_defaults: dict | None = None) -> VirtualDisk:
@@ -129,3 +142,154 @@ def test_create_copy_failure_returns_false(tmp_path) -> None:
     ):
         assert vd.create() is False
     run.assert_not_called()
+
+
+# --- header reader ---------------------------------------------------------
+
+_GIB = 1024**3
+
+
+def _qcow2(
+    path,
+    size: int,
+    *,
+    cluster_bits: int = 16,
+    backing: str | None = None,
+    backing_format: str | None = None,
+    version: int = 3,
+) -> str:
+    """Write a qcow2 header (no data clusters) the way ``qemu-img`` lays it out."""
+    header_length = 104 if version == 3 else 72
+    extensions = b""
+    if backing_format:
+        name = backing_format.encode()
+        extensions += struct.pack(">II", 0xE2792ACA, len(name))
+        extensions += name.ljust((len(name) + 7) & ~7, b"\0")
+    extensions += struct.pack(">II", 0, 0)
+    backing_name = backing.encode() if backing else b""
+    backing_offset = header_length + len(extensions) if backing else 0
+    header = struct.pack(
+        ">4sIQIIQIIQQIIQ",
+        b"QFI\xfb",
+        version,
+        backing_offset,
+        len(backing_name),
+        cluster_bits,
+        size,
+        0,  # crypt_method
+        0,  # l1_size
+        0,  # l1_table_offset
+        0,  # refcount_table_offset
+        0,  # refcount_table_clusters
+        0,  # nb_snapshots
+        0,  # snapshots_offset
+    )
+    if version == 3:
+        header += struct.pack(">QQQII", 0, 0, 0, 4, header_length)
+    path.write_bytes(header + extensions + backing_name)
+    return str(path)
+
+
+def test_reads_qcow2_v3_header(tmp_path) -> None:
+    """Size, cluster size, backing file and its format come from the header."""
+    disk = _qcow2(
+        tmp_path / "disk0.qcow2",
+        25 * _GIB,
+        cluster_bits=21,
+        backing="../cloud-images/base.qcow2",
+        backing_format="qcow2",
+    )
+
+    header = read_disk_header(disk)
+
+    assert header.format == "qcow2"
+    assert header.virtual_size == 25 * _GIB
+    assert header.cluster_size == 2 * 1024 * 1024
+    assert header.backing_file == "../cloud-images/base.qcow2"
+    assert header.backing_format == "qcow2"
+    # Relative backing names resolve against the disk, like qemu-img's
+    # full-backing-filename.
+    assert header.full_backing_file == os.path.join(
+        str(tmp_path), "../cloud-images/base.qcow2"
+    )
+
+
+def test_reads_qcow2_v2_header_without_backing(tmp_path) -> None:
+    header = read_disk_header(_qcow2(tmp_path / "base.qcow2", 2 * _GIB, version=2))
+
+    assert (header.format, header.virtual_size, header.cluster_size) == (
+        "qcow2",
+        2 * _GIB,
+        65536,
+    )
+    assert header.backing_file is None
+    assert header.full_backing_file is None
+
+
+def test_unrecognised_bytes_are_raw(tmp_path) -> None:
+    """No known magic: a raw image whose virtual size is its file size."""
+    image = tmp_path / "base.img"
+    image.write_bytes(b"\0" * 4096)
+
+    header = read_disk_header(str(image))
+
+    assert (header.format, header.virtual_size) == ("raw", 4096)
+    assert header.cluster_size is None
+
+
+def test_corrupt_qcow2_header_raises(tmp_path) -> None:
+    disk = _qcow2(tmp_path / "bad.qcow2", _GIB, cluster_bits=40)
+
+    with pytest.raises(ValueError, match="cluster_bits"):
+        read_disk_header(disk)
+    assert disk_header(disk) is None
+
+
+def test_header_is_memoized_until_the_image_changes(tmp_path) -> None:
+    disk = tmp_path / "disk0.qcow2"
+    _qcow2(disk, _GIB)
+    with mock.patch.object(vdisk_mod, "open", create=True, side_effect=open) as opened:
+        assert read_disk_header(str(disk)).virtual_size == _GIB
+        assert read_disk_header(str(disk)).virtual_size == _GIB
+        assert opened.call_count == 1
+
+        _qcow2(disk, 2 * _GIB, backing="/cache/base.qcow2")
+        os.utime(disk, ns=(0, 1))  # a new mtime even on coarse clocks
+        assert read_disk_header(str(disk)).virtual_size == 2 * _GIB
+    assert opened.call_count == 2
+
+
+def test_magic_past_the_qcow2_header_start_is_probed(tmp_path) -> None:
+    """vdi's signature sits at 0x40: it must not be mistaken for raw."""
+    image = tmp_path / "appliance.vdi"
+    banner = b"<<< Oracle VM VirtualBox Disk Image >>>\n".ljust(0x40, b"\0")
+    image.write_bytes(banner + b"\x7f\x10\xda\xbe" + b"\0" * 444)
+
+    assert read_disk_header(str(image)) is None
+
+
+def test_exotic_formats_fall_back_to_qemu_img(tmp_path) -> None:
+    """vmdk and friends are left to qemu-img; its failures are not memoized."""
+    image = tmp_path / "appliance.vmdk"
+    image.write_bytes(b"KDMV" + b"\0" * 508)
+    info = {
+        "format": "vmdk",
+        "virtual-size": 8 * _GIB,
+        "cluster-size": 65536,
+        "backing-filename": "parent.vmdk",
+    }
+    failure = subprocess.CalledProcessError(1, ["qemu-img", "info"])
+    ok = subprocess.CompletedProcess([], 0, stdout=json.dumps(info), stderr="")
+
+    assert read_disk_header(str(image)) is None
+    with mock.patch.object(
+        vdisk_mod.subprocess, "run", side_effect=[failure, ok]
+    ) as run:
+        assert disk_header(str(image)) is None
+        header = disk_header(str(image))
+        assert disk_header(str(image)) == header
+
+    assert run.call_count == 2
+    assert run.call_args.args[0] == ["qemu-img", "info", "--output=json", str(image)]
+    assert (header.format, header.virtual_size) == ("vmdk", 8 * _GIB)
+    assert header.full_backing_file == str(tmp_path / "parent.vmdk")
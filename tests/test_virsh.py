@@ -26,8 +26,10 @@ from tkc_lvlab.utils.virsh import (
     humanize_state,
     run_virsh,
     virsh_dominfo,
+    virsh_dominfos,
     virsh_domstate,
     virsh_domstate_reason,
+    virsh_domstates,
     virsh_list_all_names,
     virsh_snapshot_names,
 )
@@ -523,6 +525,71 @@ def test_virsh_domstate_reason_parses(stdout, expected):
     assert call_args[0] == ["virsh", "-c", URI, "domstate", "--reason", "vm1"]
 
 
+# Shape of ``LC_ALL=C virsh domstats --state``: one ``Domain: '<name>'``
+# record per domain (active and inactive), numeric enum codes underneath.
+_DOMSTATS_STATE = """\
+Domain: 'web01_lab'
+  state.state=1
+  state.reason=1
+
+Domain: 'db01_lab'
+  state.state=5
+  state.reason=2
+
+Domain: 'odd one'
+  state.state=3
+  state.reason=99
+
+Domain: 'future'
+  state.state=42
+  state.reason=0
+
+Domain: 'truncated'
+
+"""
+
+
+def test_virsh_domstates_parses_bulk_output():
+    with mock.patch(
+        "tkc_lvlab.utils.virsh.subprocess.run",
+        return_value=_completed(stdout=_DOMSTATS_STATE),
+    ) as run:
+        states = virsh_domstates(URI)
+
+    run.assert_called_once()
+    assert run.call_args.args[0] == ["virsh", "-c", URI, "domstats", "--state"]
+    assert states == {
+        "web01_lab": ("running", "booted"),
+        "db01_lab": ("shut off", "destroyed"),
+        # Out-of-range reason codes degrade to "unknown" rather than raising.
+        "odd one": ("paused", "unknown"),
+        "future": ("unknown", "unknown"),
+    }
+
+
+def test_virsh_domstates_reasons_match_domstate_reason_strings():
+    """Bulk reasons use the same strings humanize_state already maps."""
+    stdout = "Domain: 'a'\n  state.state=5\n  state.reason=1\n"
+    with mock.patch(
+        "tkc_lvlab.utils.virsh.subprocess.run", return_value=_completed(stdout=stdout)
+    ):
+        state, reason = virsh_domstates(URI)["a"]
+    assert humanize_state(state, reason) == ("the machine is shut off", "normal shutdown")
+
+
+def test_virsh_domstates_empty_and_error():
+    with mock.patch(
+        "tkc_lvlab.utils.virsh.subprocess.run", return_value=_completed(stdout="")
+    ):
+        assert virsh_domstates(URI) == {}
+    with mock.patch(
+        "tkc_lvlab.utils.virsh.subprocess.run",
+        return_value=_completed(stderr="error: unknown command", returncode=1),
+    ):
+        with pytest.raises(VirshError):
+            virsh_domstates(URI)
+
+
 @pytest.mark.parametrize(
     "stdout,expected",
     [
@@ -643,6 +710,87 @@ def test_virsh_dominfo_missing_numeric_lines_yield_none():
     assert info.persistent is False
 
 
+# ---------------------------------------------------------------------------
+# virsh_dominfos — bulk DomInfo for every domain on a connection.
+# ---------------------------------------------------------------------------
+
+_DOMSTATS_INFO = """\
+Domain: 'web01_demo'
+  state.state=1
+  state.reason=1
+  vcpu.current=2
+  vcpu.maximum=2
+  balloon.current=2097152
+  balloon.maximum=2097152
+
+Domain: 'build02_demo'
+  state.state=5
+  state.reason=2
+  vcpu.current=1
+  vcpu.maximum=1
+  balloon.maximum=1048576
+
+Domain: 'legacy_demo'
+  state.state=5
+  state.reason=0
+
+"""
+
+
+def _bulk_virsh(argv, **_kwargs):
+    verb_args = argv[3:]
+    if verb_args[0] == "domstats":
+        return _completed(stdout=_DOMSTATS_INFO)
+    if "--autostart" in verb_args:
+        return _completed(stdout="web01_demo\n\n")
+    if "--persistent" in verb_args:
+        return _completed(stdout="web01_demo\nbuild02_demo\nlegacy_demo\n\n")
+    if verb_args == ["dominfo", "legacy_demo"]:
+        return _completed(stdout=DOMINFO_SHUTOFF_SAMPLE)
+    raise AssertionError(f"unexpected virsh call {argv}")
+
+
+def test_virsh_dominfos_reads_every_domain_in_bulk():
+    """Complete domstats records cost no per-domain dominfo; sparse ones do."""
+    with mock.patch(
+        "tkc_lvlab.utils.virsh.subprocess.run", side_effect=_bulk_virsh
+    ) as run:
+        infos = virsh_dominfos(URI)
+
+    assert list(infos) == ["web01_demo", "build02_demo", "legacy_demo"]
+    assert infos["web01_demo"] == DomInfo(
+        state="running",
+        vcpus=2,
+        max_memory_kib=2097152,
+        autostart=True,
+        persistent=True,
+    )
+    assert infos["build02_demo"] == DomInfo(
+        state="shut off",
+        vcpus=1,
+        max_memory_kib=1048576,
+        autostart=False,
+        persistent=True,
+    )
+    # legacy_demo has no vcpu/balloon stats: filled in from its dominfo, but
+    # the flags still come from the bulk listings.
+    assert infos["legacy_demo"].vcpus == 1
+    assert infos["legacy_demo"].max_memory_kib == 1048576
+    assert infos["legacy_demo"].autostart is False
+    verbs = [call.args[0][3] for call in run.call_args_list]
+    assert verbs.count("dominfo") == 1
+    assert len(verbs) == 4
+
+
+def test_virsh_dominfos_propagates_connection_error():
+    with mock.patch(
+        "tkc_lvlab.utils.virsh.subprocess.run",
+        return_value=_completed(stderr="error: permission denied", returncode=1),
+    ):
+        with pytest.raises(VirshError):
+            virsh_dominfos(URI)
+
+
 # ---------------------------------------------------------------------------
 # Module-level re-exports — smoke check so future refactors don't quietly
 # rename the public constants used by callers.
@@ -662,7 +810,9 @@ def test_module_exports_public_names():
         "virsh_list_all_names",
         "virsh_domstate",
         "virsh_domstate_reason",
+        "virsh_domstates",
         "virsh_dominfo",
+        "virsh_dominfos",
         "DomInfo",
         "virsh_snapshot_names",
     ]:
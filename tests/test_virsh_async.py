@@ -0,0 +1,219 @@
+"""Unit tests for :mod:`tkc_lvlab.utils.virsh_async`.
+
+``asyncio.create_subprocess_exec`` is mocked at the ``virsh_async`` import
+boundary with a tiny fake process, so no test ever spawns ``virsh``. The
+point of these tests is parity: the coroutines must build the same argv,
+retry the same transient drops, map the same errors, and parse to the same
+values as their sync twins in :mod:`tkc_lvlab.utils.virsh`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import subprocess
+from unittest import mock
+
+import pytest
+
+from tkc_lvlab.utils import virsh, virsh_async
+from tkc_lvlab.utils.virsh import VirshError
+from tkc_lvlab.utils.virsh_cache import VirshReadCache
+
+URI = "qemu:///session"
+
+DOMINFO_OUT = (
+    "Id:             3\n"
+    "Name:           web01_lab\n"
+    "UUID:           6f1c1d2e-0000-0000-0000-000000000000\n"
+    "State:          running\n"
+    "CPU(s):         2\n"
+    "Max memory:     2097152 KiB\n"
+    "Used memory:    2097152 KiB\n"
+    "Autostart:      disable\n"
+)
+
+
+class _FakeProc:
+    """Just enough of :class:`asyncio.subprocess.Process` for ``_exec_once``."""
+
+    def __init__(
+        self,
+        stdout: str = "",
+        stderr: str = "",
+        returncode: int = 0,
+        *,
+        delay: float = 0.0,
+    ) -> None:
+        self._out = stdout.encode()
+        self._err = stderr.encode()
+        self._rc = returncode
+        self._delay = delay
+        self.returncode: int | None = None
+        self.killed = False
+        self.stdin_seen: bytes | None = None
+
+    async def communicate(self, stdin: bytes | None = None):
+        self.stdin_seen = stdin
+        await asyncio.sleep(self._delay)
+        self.returncode = self._rc
+        return self._out, self._err
+
+    def kill(self) -> None:
+        self.killed = True
+        self.returncode = -9
+
+    async def wait(self) -> int:
+        return self.returncode
+
+
+def _spawner(*procs: _FakeProc) -> mock.AsyncMock:
+    return mock.AsyncMock(side_effect=list(procs))
+
+
+def _patch_exec(spawn):
+    return mock.patch.object(
+        virsh_async.asyncio, "create_subprocess_exec", new=spawn
+    )
+
+
+def test_argv_and_locale_match_the_sync_api():
+    spawn = _spawner(_FakeProc("web01_lab\n"))
+    with _patch_exec(spawn):
+        result = asyncio.run(virsh_async.run_virsh_async(URI, ["list", "--all"]))
+
+    assert result.returncode == 0
+    assert result.stdout == "web01_lab\n"
+    assert spawn.call_args.args == ("virsh", "-c", URI, "list", "--all")
+    env = spawn.call_args.kwargs["env"]
+    assert env["LC_ALL"] == "C" and env["LANG"] == "C"
+    assert spawn.call_args.kwargs["stdin"] is None
+
+
+def test_input_text_is_piped_to_stdin():
+    proc = _FakeProc()
+    with _patch_exec(_spawner(proc)):
+        asyncio.run(
+            virsh_async.run_virsh_async(URI, ["define", "/dev/stdin"], input_text="<x/>")
+        )
+    assert proc.stdin_seen == b"<x/>"
+
+
+def test_nonzero_exit_raises_virsh_error_when_checked():
+    with _patch_exec(_spawner(_FakeProc(stderr="error: no domain", returncode=1))):
+        with pytest.raises(VirshError) as excinfo:
+            asyncio.run(virsh_async.run_virsh_async(URI, ["domstate", "ghost"]))
+    assert excinfo.value.returncode == 1
+    assert "no domain" in excinfo.value.stderr
+
+
+def test_nonzero_exit_is_returned_when_unchecked():
+    with _patch_exec(_spawner(_FakeProc(returncode=1))):
+        result = asyncio.run(
+            virsh_async.run_virsh_async(URI, ["domstate", "ghost"], check=False)
+        )
+    assert result.returncode == 1
+
+
+def test_transient_connection_error_is_retried_with_shared_backoff():
+    drop = "error: failed to connect to the hypervisor"
+    spawn = _spawner(_FakeProc(stderr=drop, returncode=1), _FakeProc("running\n"))
+    sleep = mock.AsyncMock()
+    with _patch_exec(spawn), mock.patch.object(virsh_async.asyncio, "sleep", sleep):
+        state = asyncio.run(virsh_async.virsh_domstate_async(URI, "web01_lab"))
+
+    assert state == "running"
+    assert spawn.call_count == 2
+    assert mock.call(virsh._CONNECTION_ERROR_BACKOFF[0]) in sleep.await_args_list
+
+
+def test_missing_binary_maps_to_rc_127():
+    spawn = mock.AsyncMock(side_effect=FileNotFoundError("virsh"))
+    with _patch_exec(spawn):
+        with pytest.raises(VirshError) as excinfo:
+            asyncio.run(virsh_async.run_virsh_async(URI, ["list"]))
+    assert excinfo.value.returncode == 127
+
+
+def test_timeout_kills_the_child_and_maps_to_rc_minus_one():
+    proc = _FakeProc(delay=5.0)
+    with _patch_exec(_spawner(proc)):
+        with pytest.raises(VirshError) as excinfo:
+            asyncio.run(virsh_async.run_virsh_async(URI, ["list"], timeout=0.01))
+    assert excinfo.value.returncode == -1
+    assert proc.killed
+
+
+@pytest.mark.parametrize(
+    ("sync_fn", "async_fn", "args", "stdout"),
+    [
+        (
+            virsh.virsh_list_all_names,
+            virsh_async.virsh_list_all_names_async,
+            (),
+            "web01_lab\n\ndb01_lab\n",
+        ),
+        (virsh.virsh_dominfo, virsh_async.virsh_dominfo_async, ("web01_lab",), DOMINFO_OUT),
+        (
+            virsh.virsh_domstate_reason,
+            virsh_async.virsh_domstate_reason_async,
+            ("web01_lab",),
+            "shut off (shutdown)\n",
+        ),
+        (
+            virsh.virsh_domstates,
+            virsh_async.virsh_domstates_async,
+            (),
+            "Domain: 'web01_lab'\n  state.state=1\n  state.reason=1\n",
+        ),
+        (
+            virsh.virsh_snapshot_names,
+            virsh_async.virsh_snapshot_names_async,
+            ("web01_lab",),
+            "snap-1\nsnap-2\n",
+        ),
+    ],
+)
+def test_parsers_match_the_sync_helpers(sync_fn, async_fn, args, stdout):
+    completed = subprocess.CompletedProcess(["virsh"], 0, stdout, "")
+    with mock.patch("tkc_lvlab.utils.virsh.subprocess.run", return_value=completed):
+        expected = sync_fn(URI, *args)
+    with _patch_exec(_spawner(_FakeProc(stdout))):
+        actual = asyncio.run(async_fn(URI, *args))
+    assert actual == expected
+
+
+def test_reads_honour_the_read_cache():
+    cache = VirshReadCache()
+    spawn = _spawner(_FakeProc("web01_lab\n"))
+
+    async def _twice():
+        first = await virsh_async.virsh_list_all_names_async(URI, cache=cache)
+        second = await virsh_async.virsh_list_all_names_async(URI, cache=cache)
+        return first, second
+
+    with _patch_exec(spawn):
+        assert asyncio.run(_twice()) == (["web01_lab"], ["web01_lab"])
+    assert spawn.call_count == 1
+    assert cache.hits == 1
+
+
+def test_many_queries_run_concurrently_on_one_loop():
+    """200 queries that each take 50ms finish in far less than 200 * 50ms."""
+    names = [f"vm{i:03d}" for i in range(200)]
+    spawn = mock.AsyncMock(
+        side_effect=lambda *argv, **_kw: _FakeProc(f"{argv[-1]}-running\n", delay=0.05)
+    )
+
+    async def _all():
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        states = await asyncio.gather(
+            *(virsh_async.virsh_domstate_async(URI, n) for n in names)
+        )
+        return states, loop.time() - start
+
+    with _patch_exec(spawn):
+        states, elapsed = asyncio.run(_all())
+
+    assert states == [f"{n}-running" for n in names]
+    assert elapsed < 2.0
@@ -0,0 +1,222 @@
+"""Unit tests for :class:`tkc_lvlab.utils.virsh.VirshBatch`.
+
+A fake ``virsh`` on ``PATH`` parses the single-argument ``"cmd ; cmd"``
+form the way the real one does, runs each verb, and (like ``virsh``)
+flushes stdout before writing an ``error:`` line, so the merged-stream
+splitting is exercised end to end. Every spawn is appended to a log file so
+a test can assert how many processes a batch cost.
+"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from unittest import mock
+
+import pytest
+
+from tkc_lvlab.utils import virsh
+from tkc_lvlab.utils.virsh import VirshBatch, VirshError
+from tkc_lvlab.utils.virsh_cache import VirshReadCache
+
+URI = "qemu:///session"
+
+_FAKE_VIRSH = """#!{python}
+import os, shlex, sys
+
+with open(os.environ["FAKE_VIRSH_LOG"], "a") as log:
+    log.write(repr(sys.argv[3:]) + "\\n")
+
+drops = os.environ.get("FAKE_VIRSH_DROPS_FILE")
+if drops and int(open(drops).read() or 0) > 0:
+    remaining = int(open(drops).read()) - 1
+    open(drops, "w").write(str(remaining))
+    sys.stderr.write("error: failed to connect to the hypervisor\\n")
+    sys.exit(1)
+
+def error(msg):
+    sys.stdout.flush()
+    sys.stderr.write("error: " + msg + "\\n")
+    sys.stderr.flush()
+
+tokens = shlex.split(sys.argv[3])
+commands, current = [], []
+for token in tokens:
+    if token == ";":
+        commands.append(current)
+        current = []
+    else:
+        current.append(token)
+commands.append(current)
+
+rc = 0
+for cmd in commands:
+    rc = 0
+    verb, args = cmd[0], cmd[1:]
+    if verb == "echo":
+        print(" ".join(args))
+    elif verb == "destroy":
+        print("Domain '%s' destroyed" % args[0])
+    elif verb == "domstate":
+        if args[0] == "ghost":
+            error("failed to get domain '%s'" % args[0])
+            rc = 1
+        else:
+            print("shut off")
+    elif verb == "list":
+        print("web01_lab")
+        print("db01_lab")
+    elif verb == "crash":
+        sys.stdout.flush()
+        os._exit(3)
+    else:
+        error("unknown command: '%s'" % verb)
+        rc = 1
+sys.exit(rc)
+"""
+
+
+@pytest.fixture
+def fake_virsh(tmp_path, monkeypatch):
+    """Install the fake ``virsh``; return a callable listing the spawns."""
+    bindir = tmp_path / "bin"
+    bindir.mkdir()
+    script = bindir / "virsh"
+    script.write_text(_FAKE_VIRSH.format(python=sys.executable))
+    script.chmod(0o755)
+    log = tmp_path / "spawns.log"
+    log.touch()
+    monkeypatch.setenv("PATH", f"{bindir}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.setenv("FAKE_VIRSH_LOG", str(log))
+
+    def spawns() -> list[str]:
+        return log.read_text().splitlines()
+
+    return spawns
+
+
+def test_batch_runs_in_one_process_and_splits_per_command(fake_virsh):
+    batch = VirshBatch(URI)
+    batch.add(["destroy", "web01_lab"])
+    batch.add(["domstate", "web01_lab"])
+    batch.add(["domstate", "ghost"], check=False)
+
+    destroyed, state, ghost = batch.run()
+
+    assert len(fake_virsh()) == 1
+    assert destroyed.returncode == 0
+    assert destroyed.stdout == "Domain 'web01_lab' destroyed\n"
+    assert destroyed.args == ["virsh", "-c", URI, "destroy", "web01_lab"]
+    assert state.stdout.strip() == "shut off"
+    assert state.stderr == ""
+    assert ghost.returncode == 1
+    assert ghost.stdout == ""
+    assert ghost.stderr == "error: failed to get domain 'ghost'\n"
+
+
+def test_checked_failure_is_attributed_to_its_own_command(fake_virsh):
+    batch = VirshBatch(URI)
+    batch.add(["domstate", "ghost"])
+    batch.add(["destroy", "web01_lab"])
+
+    with pytest.raises(VirshError) as excinfo:
+        batch.run()
+
+    assert list(excinfo.value.args) == ["domstate", "ghost"]
+    assert "failed to get domain 'ghost'" in excinfo.value.stderr
+    assert len(fake_virsh()) == 1
+
+
+def test_command_after_a_crash_is_reported_not_run(fake_virsh):
+    batch = VirshBatch(URI)
+    batch.add(["list", "--all", "--name"])
+    batch.add(["crash"], check=False)
+    batch.add(["domstate", "web01_lab"], check=False)
+
+    listing, crashed, after = batch.run()
+
+    assert listing.returncode == 0
+    assert listing.stdout == "web01_lab\ndb01_lab\n"
+    assert crashed.returncode == 1
+    assert after.returncode == 1
+    assert "not run" in after.stderr
+
+
+def test_connection_drop_before_first_command_is_retried(fake_virsh, tmp_path, monkeypatch):
+    drops = tmp_path / "drops"
+    drops.write_text("2")
+    monkeypatch.setenv("FAKE_VIRSH_DROPS_FILE", str(drops))
+    batch = VirshBatch(URI)
+    batch.add(["destroy", "web01_lab"])
+    batch.add(["domstate", "web01_lab"])
+
+    with mock.patch("tkc_lvlab.utils.virsh.time.sleep") as sleep:
+        _destroyed, state = batch.run()
+
+    assert state.stdout.strip() == "shut off"
+    assert len(fake_virsh()) == 3
+    # time.sleep is patched module-wide; pick out the backoff sleeps.
+    for delay in virsh._CONNECTION_ERROR_BACKOFF[:2]:
+        assert mock.call(delay) in sleep.call_args_list
+
+
+def test_cached_read_is_not_sent_and_mutation_invalidates(fake_virsh):
+    cache = VirshReadCache()
+    cache.store(
+        URI,
+        ["list", "--all", "--name"],
+        subprocess.CompletedProcess([], 0, "web01_lab\n", ""),
+    )
+    cache.store(
+        URI,
+        ["domstate", "web01_lab"],
+        subprocess.CompletedProcess([], 0, "running\n", ""),
+    )
+    batch = VirshBatch(URI, cache=cache)
+    batch.add(["list", "--all", "--name"])
+    batch.add(["destroy", "web01_lab"])
+    batch.add(["domstate", "web01_lab"])
+
+    listing, _destroyed, state = batch.run()
+
+    assert listing.stdout == "web01_lab\n"  # served from the cache
+    # A read queued after the mutation is never answered from the cache.
+    assert state.stdout.strip() == "shut off"
+    (spawn,) = fake_virsh()
+    assert "list" not in spawn
+    assert cache.lookup(URI, ["domstate", "web01_lab"]).stdout.strip() == "shut off"
+
+
+def test_batch_rides_the_session_pool_when_one_is_active():
+    calls: list[list[str]] = []
+
+    def fake_run(uri, args, **kwargs):
+        calls.append(args)
+        return subprocess.CompletedProcess(["virsh", "-c", uri, *args], 0, "ok\n", "")
+
+    with (
+        mock.patch("tkc_lvlab.utils.virsh.active_session_pool", return_value=object()),
+        mock.patch("tkc_lvlab.utils.virsh.run_virsh", side_effect=fake_run),
+    ):
+        batch = VirshBatch(URI)
+        batch.add(["destroy", "web01_lab"])
+        batch.add(["domstate", "web01_lab"])
+        results = batch.run()
+
+    assert calls == [["destroy", "web01_lab"], ["domstate", "web01_lab"]]
+    assert [r.stdout for r in results] == ["ok\n", "ok\n"]
+
+
+def test_add_rejects_multiline_arguments():
+    with pytest.raises(ValueError):
+        VirshBatch(URI).add(["desc", "web01_lab", "line1\nline2"])
+
+
+def test_missing_binary_raises_127(tmp_path, monkeypatch):
+    monkeypatch.setenv("PATH", str(tmp_path))
+    batch = VirshBatch(URI)
+    batch.add(["domstate", "web01_lab"])
+    with pytest.raises(VirshError) as excinfo:
+        batch.run()
+    assert excinfo.value.returncode == 127
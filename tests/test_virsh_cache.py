@@ -0,0 +1,191 @@
+"""Unit tests for :mod:`tkc_lvlab.utils.virsh_cache`.
+
+``subprocess.run`` is mocked at the ``tkc_lvlab.utils.virsh`` boundary (as in
+``test_virsh.py``), so every assertion about "how many times did virsh run"
+counts real :func:`run_virsh` dispatches.
+"""
+
+from __future__ import annotations
+
+import subprocess
+from unittest import mock
+
+import pytest
+
+from tkc_lvlab.utils.libvirt import Machine
+from tkc_lvlab.utils.virsh import (
+    VirshError,
+    run_virsh,
+    virsh_domstate,
+    virsh_list_all_names,
+    virsh_snapshot_names,
+)
+from tkc_lvlab.utils.virsh_cache import VirshReadCache
+
+URI = "qemu:///session"
+
+
+def _completed(stdout: str = "", stderr: str = "", returncode: int = 0):
+    return subprocess.CompletedProcess(["virsh"], returncode, stdout, stderr)
+
+
+def _fake_virsh(argv, **_kwargs):
+    """Answer the handful of verbs these tests issue."""
+    verb = argv[3]
+    if verb == "list":
+        return _completed("web01_lab\n")
+    if verb == "domstats":
+        return _completed("Domain: 'web01_lab'\n  state.state=5\n  state.reason=1\n")
+    if verb == "domstate":
+        return _completed("shut off\n")
+    if verb == "snapshot-list":
+        return _completed("snap-1\n")
+    return _completed()
+
+
+@pytest.fixture
+def run():
+    with mock.patch(
+        "tkc_lvlab.utils.virsh.subprocess.run", side_effect=_fake_virsh
+    ) as run_mock:
+        yield run_mock
+
+
+def _verbs(run_mock) -> list[str]:
+    return [call.args[0][3] for call in run_mock.call_args_list]
+
+
+def test_repeated_read_is_answered_from_cache(run):
+    cache = VirshReadCache()
+    assert virsh_list_all_names(URI, cache=cache) == ["web01_lab"]
+    assert virsh_list_all_names(URI, cache=cache) == ["web01_lab"]
+
+    assert run.call_count == 1
+    assert cache.stats() == {"hits": 1, "misses": 1, "entries": 1}
+
+
+def test_entries_are_keyed_by_uri_and_args(run):
+    cache = VirshReadCache()
+    virsh_domstate(URI, "web01_lab", cache=cache)
+    virsh_domstate(URI, "db01_lab", cache=cache)
+    virsh_domstate("qemu:///system", "web01_lab", cache=cache)
+
+    assert run.call_count == 3
+    assert cache.hits == 0
+
+
+def test_failed_read_is_not_cached(run):
+    cache = VirshReadCache()
+    run.side_effect = None
+    run.return_value = _completed(stderr="error: no domain", returncode=1)
+    for _ in range(2):
+        with pytest.raises(VirshError):
+            virsh_domstate(URI, "ghost", cache=cache)
+
+    assert run.call_count == 2
+    assert cache.stats()["entries"] == 0
+
+
+def test_expired_entry_is_re_read(run):
+    cache = VirshReadCache(ttls={"list": 0.0})
+    virsh_list_all_names(URI, cache=cache)
+    virsh_list_all_names(URI, cache=cache)
+
+    assert run.call_count == 2
+    assert cache.misses == 2
+
+
+def test_start_invalidates_state_and_listings_but_not_snapshots(run):
+    cache = VirshReadCache()
+    virsh_list_all_names(URI, cache=cache)
+    virsh_domstate(URI, "web01_lab", cache=cache)
+    virsh_domstate(URI, "db01_lab", cache=cache)
+    virsh_snapshot_names(URI, "web01_lab", cache=cache)
+
+    run_virsh(URI, ["start", "web01_lab"], cache=cache)
+
+    virsh_list_all_names(URI, cache=cache)  # re-read
+    virsh_domstate(URI, "web01_lab", cache=cache)  # re-read
+    virsh_domstate(URI, "db01_lab", cache=cache)  # other domain: hit
+    virsh_snapshot_names(URI, "web01_lab", cache=cache)  # snapshots: hit
+
+    assert _verbs(run) == [
+        "list",
+        "domstate",
+        "domstate",
+        "snapshot-list",
+        "start",
+        "list",
+        "domstate",
+    ]
+    assert cache.hits == 2
+
+
+def test_snapshot_create_invalidates_only_that_domains_snapshot_list(run):
+    cache = VirshReadCache()
+    virsh_list_all_names(URI, cache=cache)
+    virsh_snapshot_names(URI, "web01_lab", cache=cache)
+    virsh_snapshot_names(URI, "db01_lab", cache=cache)
+
+    run_virsh(
+        URI, ["snapshot-create", "web01_lab", "--xmlfile", "/tmp/x.xml"], cache=cache
+    )
+
+    virsh_list_all_names(URI, cache=cache)
+    virsh_snapshot_names(URI, "web01_lab", cache=cache)
+    virsh_snapshot_names(URI, "db01_lab", cache=cache)
+
+    assert _verbs(run).count("snapshot-list") == 3
+    assert _verbs(run).count("list") == 1
+
+
+def test_undefine_drops_everything_about_the_domain(run):
+    cache = VirshReadCache()
+    virsh_domstate(URI, "web01_lab", cache=cache)
+    virsh_snapshot_names(URI, "web01_lab", cache=cache)
+
+    run_virsh(URI, ["undefine", "web01_lab", "--snapshots-metadata"], cache=cache)
+
+    assert cache.stats()["entries"] == 0
+
+
+def test_unknown_verb_invalidates_the_whole_uri(run):
+    cache = VirshReadCache()
+    virsh_list_all_names(URI, cache=cache)
+    virsh_list_all_names("qemu:///system", cache=cache)
+
+    run_virsh(URI, ["define", "/tmp/domain.xml"], cache=cache)
+
+    virsh_list_all_names(URI, cache=cache)
+    virsh_list_all_names("qemu:///system", cache=cache)
+    assert _verbs(run).count("list") == 3
+    assert cache.hits == 1
+
+
+def test_failed_mutation_still_invalidates(run):
+    cache = VirshReadCache()
+    virsh_domstate(URI, "web01_lab", cache=cache)
+    run.side_effect = None
+    run.return_value = _completed(stderr="error: operation failed", returncode=1)
+    with pytest.raises(VirshError):
+        run_virsh(URI, ["destroy", "web01_lab"], cache=cache)
+
+    assert cache.stats()["entries"] == 0
+
+
+def test_machine_up_path_reads_state_once(run):
+    """exists_in_libvirt -> poweron issue one domstats, then start re-reads."""
+    cache = VirshReadCache()
+    machine = object.__new__(Machine)
+    machine.libvirt_vm_name = "web01_lab"
+    machine.vm_name = "web01"
+    machine.config_fpath = "/nonexistent"
+    machine.virsh_cache = cache
+
+    exists, state, _ = machine.exists_in_libvirt(URI)
+    assert (exists, state) == (True, "shut off")
+    assert machine.poweron(URI) == 0
+    machine.exists_in_libvirt(URI)
+
+    assert _verbs(run) == ["domstats", "start", "domstats"]
+    assert cache.hits == 1
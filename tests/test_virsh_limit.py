@@ -0,0 +1,293 @@
+"""Unit tests for :mod:`tkc_lvlab.utils.virsh_limit`.
+
+The controller and breaker are exercised directly; the ``run_virsh``
+integration mocks ``subprocess.run`` at the ``tkc_lvlab.utils.virsh``
+boundary, as in ``test_virsh.py``. ``conftest.py`` resets the process-wide
+limiters around every test.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import pytest
+
+from tkc_lvlab.exceptions import VirshError, VirshUnavailableError
+from tkc_lvlab.utils import virsh_limit
+from tkc_lvlab.utils.virsh import run_virsh
+from tkc_lvlab.utils.virsh_limit import (
+    OUTCOME_DROPPED,
+    OUTCOME_NEUTRAL,
+    OUTCOME_OK,
+    AdmissionController,
+    CircuitBreaker,
+    virsh_limiter,
+)
+
+URI = "qemu:///system"
+DROP = "error: failed to connect to the hypervisor"
+
+
+def _completed(stdout: str = "", stderr: str = "", returncode: int = 0):
+    return subprocess.CompletedProcess(["virsh"], returncode, stdout, stderr)
+
+
+# ---------------------------------------------------------------------------
+# AdmissionController
+# ---------------------------------------------------------------------------
+
+
+def test_successes_grow_the_limit_additively():
+    ctl = AdmissionController(initial=4, maximum=8)
+    for _ in range(3):
+        ctl.release(ctl.acquire(), OUTCOME_OK)
+    assert ctl.limit == 4  # +1/limit per success: a window of ~limit to grow by one
+    for _ in range(2):
+        ctl.release(ctl.acquire(), OUTCOME_OK)
+    assert ctl.limit == 5
+
+
+def test_limit_never_exceeds_maximum():
+    ctl = AdmissionController(initial=8, maximum=8)
+    for _ in range(100):
+        ctl.release(ctl.acquire(), OUTCOME_OK)
+    assert ctl.limit == 8
+
+
+def test_one_burst_of_drops_halves_the_limit_once():
+    ctl = AdmissionController(initial=8)
+    epochs = [ctl.acquire() for _ in range(6)]
+    for epoch in epochs:
+        ctl.release(epoch, OUTCOME_DROPPED)
+    assert ctl.limit == 4
+    # A drop admitted after the cut is a new signal.
+    ctl.release(ctl.acquire(), OUTCOME_DROPPED)
+    assert ctl.limit == 2
+
+
+def test_neutral_outcome_leaves_the_limit_alone():
+    ctl = AdmissionController(initial=4)
+    ctl.release(ctl.acquire(), OUTCOME_NEUTRAL)
+    assert ctl.limit == 4
+    assert ctl.in_flight == 0
+
+
+def test_acquire_blocks_at_the_limit():
+    ctl = AdmissionController(initial=1)
+    first = ctl.acquire()
+    assert ctl.try_acquire() is None
+    admitted = threading.Event()
+
+    def second():
+        ctl.acquire()
+        admitted.set()
+
+    threading.Thread(target=second, daemon=True).start()
+    assert not admitted.wait(0.1)
+    ctl.release(first, OUTCOME_OK)
+    assert admitted.wait(2)
+
+
+# ---------------------------------------------------------------------------
+# CircuitBreaker
+# ---------------------------------------------------------------------------
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_breaker_opens_after_consecutive_drops_and_probes_once():
+    clock = _Clock()
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=5.0, clock=clock)
+    for _ in range(3):
+        assert breaker.allow() is None
+        breaker.record(OUTCOME_DROPPED)
+
+    assert breaker.allow() == pytest.approx(5.0)
+    clock.now = 5.0
+    assert breaker.allow() is None  # the single half-open probe
+    assert breaker.allow() is not None  # everyone else still fails fast
+    breaker.record(OUTCOME_OK)
+    assert breaker.allow() is None
+    assert breaker.failures == 0
+
+
+def test_failed_probe_reopens_the_circuit():
+    clock = _Clock()
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=5.0, clock=clock)
+    breaker.record(OUTCOME_DROPPED)
+    breaker.record(OUTCOME_DROPPED)
+    clock.now = 6.0
+    assert breaker.allow() is None
+    breaker.record(OUTCOME_DROPPED)
+    assert breaker.allow() == pytest.approx(5.0)
+
+
+def test_success_resets_the_consecutive_count():
+    breaker = CircuitBreaker(failure_threshold=2)
+    breaker.record(OUTCOME_DROPPED)
+    breaker.record(OUTCOME_OK)
+    breaker.record(OUTCOME_DROPPED)
+    assert breaker.allow() is None
+
+
+def test_recently_answering_daemon_is_not_cut_off():
+    """Drops right after an answered call mean overload, not a dead daemon."""
+    clock = _Clock()
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=5.0, clock=clock)
+    breaker.record(OUTCOME_OK)
+    for _ in range(4):
+        breaker.record(OUTCOME_DROPPED)
+    assert breaker.allow() is None
+    clock.now = 5.0
+    breaker.record(OUTCOME_DROPPED)
+    assert breaker.allow() is not None
+
+
+# ---------------------------------------------------------------------------
+# run_virsh integration
+# ---------------------------------------------------------------------------
+
+
+def test_run_virsh_fails_fast_once_the_circuit_opens():
+    with (
+        mock.patch(
+            "tkc_lvlab.utils.virsh.subprocess.run",
+            return_value=_completed(stderr=DROP, returncode=1),
+        ) as run,
+        mock.patch("tkc_lvlab.utils.virsh.time.sleep"),
+    ):
+        with pytest.raises(VirshError) as first:
+            run_virsh(URI, ["list"])
+        assert not isinstance(first.value, VirshUnavailableError)
+        assert run.call_count == 4  # initial attempt + 3 retries
+
+        # Drops 5 and 6 trip the breaker; the remaining retry is refused.
+        with pytest.raises(VirshUnavailableError):
+            run_virsh(URI, ["list"])
+        assert run.call_count == 6
+
+        with pytest.raises(VirshUnavailableError) as refused:
+            run_virsh(URI, ["list"])
+        assert run.call_count == 6  # never spawned
+
+    assert refused.value.returncode == -2
+    assert URI in refused.value.stderr
+
+
+def test_circuit_is_per_uri():
+    limiter = virsh_limiter(URI)
+    for _ in range(virsh_limit.DEFAULT_FAILURE_THRESHOLD):
+        limiter.breaker.record(OUTCOME_DROPPED)
+    with mock.patch(
+        "tkc_lvlab.utils.virsh.subprocess.run", return_value=_completed("ok\n")
+    ):
+        with pytest.raises(VirshUnavailableError):
+            run_virsh(URI, ["list"])
+        assert run_virsh("qemu:///session", ["list"]).stdout == "ok\n"
+
+
+def test_in_flight_calls_are_capped(monkeypatch):
+    monkeypatch.setenv(virsh_limit.MAX_INFLIGHT_ENV_VAR, "2")
+    lock = threading.Lock()
+    active = [0]
+    peak = [0]
+
+    def slow_run(*_args, **_kwargs):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.02)
+        with lock:
+            active[0] -= 1
+        return _completed("ok\n")
+
+    with mock.patch("tkc_lvlab.utils.virsh.subprocess.run", side_effect=slow_run):
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(lambda _: run_virsh(URI, ["list"]), range(16)))
+
+    assert peak[0] == 2
+
+
+def test_zero_disables_admission_control(monkeypatch):
+    monkeypatch.setenv(virsh_limit.MAX_INFLIGHT_ENV_VAR, "0")
+    assert virsh_limiter(URI) is None
+
+
+def test_adaptive_cap_beats_a_retry_storm(monkeypatch):
+    """A daemon that drops connections above 4 concurrent clients: the limiter
+    settles under the knee, so far fewer attempts are wasted than unlimited."""
+
+    real_sleep = time.sleep  # the patch below replaces the module attribute
+
+    def run_workload() -> tuple[int, int]:
+        lock = threading.Lock()
+        active = [0]
+        attempts = [0]
+
+        def daemon(*_args, **_kwargs):
+            with lock:
+                active[0] += 1
+                attempts[0] += 1
+                overloaded = active[0] > 4
+            real_sleep(0.005)
+            with lock:
+                active[0] -= 1
+            return _completed(stderr=DROP, returncode=1) if overloaded else _completed("ok\n")
+
+        failures = 0
+        with (
+            mock.patch("tkc_lvlab.utils.virsh.subprocess.run", side_effect=daemon),
+            mock.patch("tkc_lvlab.utils.virsh.time.sleep"),
+        ):
+
+            def one(_):
+                try:
+                    run_virsh(URI, ["domstate", "x"])
+                    return 0
+                except VirshError:
+                    return 1
+
+            with ThreadPoolExecutor(max_workers=32) as pool:
+                failures = sum(pool.map(one, range(128)))
+        return attempts[0], failures
+
+    monkeypatch.setenv(virsh_limit.MAX_INFLIGHT_ENV_VAR, "0")
+    unlimited_attempts, _ = run_workload()
+    monkeypatch.setenv(virsh_limit.MAX_INFLIGHT_ENV_VAR, "32")
+    limited_attempts, limited_failures = run_workload()
+
+    assert limited_failures == 0
+    assert limited_attempts < unlimited_attempts
+
+
+def test_async_admission_waits_without_blocking_the_loop(monkeypatch):
+    monkeypatch.setenv(virsh_limit.MAX_INFLIGHT_ENV_VAR, "1")
+    limiter = virsh_limiter(URI)
+    order: list[str] = []
+
+    async def call(name: str):
+        async with limiter.admit_async(["list"]) as admission:
+            order.append(f"{name}-in")
+            await asyncio.sleep(0.02)
+            order.append(f"{name}-out")
+            admission.outcome = OUTCOME_OK
+
+    async def main():
+        await asyncio.gather(call("a"), call("b"))
+
+    asyncio.run(main())
+    assert order in (
+        ["a-in", "a-out", "b-in", "b-out"],
+        ["b-in", "b-out", "a-in", "a-out"],
+    )
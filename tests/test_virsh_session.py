@@ -0,0 +1,250 @@
+"""Unit tests for :mod:`tkc_lvlab.utils.virsh_session`.
+
+A tiny fake ``virsh`` (a Python script placed first on ``PATH``) emulates the
+interactive shell: it echoes each input line behind a readline-style prompt
+and answers a handful of verbs. That exercises the real ``Popen`` framing
+without a libvirt host.
+"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+import threading
+from unittest import mock
+
+import pytest
+
+from tkc_lvlab.utils import virsh, virsh_session
+from tkc_lvlab.utils.virsh import (
+    VirshError,
+    run_virsh,
+    virsh_domstate,
+    virsh_list_all_names,
+)
+from tkc_lvlab.utils.virsh_session import (
+    VirshSessionPool,
+    active_session_pool,
+    virsh_sessions,
+)
+
+URI = "qemu:///session"
+
+_FAKE_VIRSH = """\
+#!{python}
+import json, os, shlex, sys, time
+
+with open(os.environ["FAKE_VIRSH_LOG"], "a") as log:
+    log.write(json.dumps(sys.argv[1:]) + "\\n")
+drop_flag = os.environ["FAKE_VIRSH_DROP"]
+
+print("Welcome to the fake virsh")
+for line in sys.stdin:
+    line = line.rstrip("\\n")
+    sys.stdout.write("virsh # " + line + "\\n")
+    argv = shlex.split(line)
+    verb, rest = argv[0], argv[1:]
+    if verb == "echo":
+        print(" ".join(rest))
+    elif verb == "list":
+        print("web\\ndb\\n")
+    elif verb == "domstate":
+        if rest[0] == "web":
+            print("running\\n")
+        else:
+            sys.stderr.write("error: failed to get domain '%s'\\n" % rest[0])
+    elif verb == "locale":
+        print(os.environ.get("LC_ALL"), os.environ.get("LANG"))
+    elif verb == "args":
+        print(json.dumps(rest))
+    elif verb == "sleep":
+        sys.stdout.flush()
+        time.sleep(30)
+    elif verb == "drop":
+        if os.path.exists(drop_flag):
+            os.unlink(drop_flag)
+            sys.stderr.write("error: failed to connect to the hypervisor\\n")
+            sys.stderr.flush()
+            sys.exit(1)
+        print("reconnected")
+    sys.stdout.flush()
+    sys.stderr.flush()
+"""
+
+
+@pytest.fixture
+def fake_virsh(tmp_path, monkeypatch):
+    """Install the fake ``virsh`` on ``PATH``; return the spawn-log path."""
+    bindir = tmp_path / "bin"
+    bindir.mkdir()
+    script = bindir / "virsh"
+    script.write_text(_FAKE_VIRSH.format(python=sys.executable))
+    script.chmod(0o755)
+    log = tmp_path / "spawns.log"
+    log.touch()
+    monkeypatch.setenv("PATH", f"{bindir}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.setenv("FAKE_VIRSH_LOG", str(log))
+    monkeypatch.setenv("FAKE_VIRSH_DROP", str(tmp_path / "drop-once"))
+    monkeypatch.delenv(virsh_session.SESSIONS_ENV_VAR, raising=False)
+    return log
+
+
+def _spawns(log) -> int:
+    return len(log.read_text().splitlines())
+
+
+def test_run_virsh_multiplexes_commands_over_one_session(fake_virsh):
+    """Several verbs against one URI share a single interactive shell."""
+    with virsh_sessions() as pool:
+        assert active_session_pool() is pool
+        assert virsh_list_all_names(URI) == ["web", "db"]
+        assert virsh_domstate(URI, "web") == "running"
+        assert virsh_domstate(URI, "web") == "running"
+
+    assert _spawns(fake_virsh) == 1
+    assert pool.sessions_started == 1
+    assert active_session_pool() is None
+    assert "-q" in fake_virsh.read_text()
+
+
+def test_session_strips_banner_and_prompt_echoes(fake_virsh):
+    """stdout carries only the command's own output, shaped like one-shot mode."""
+    with virsh_sessions():
+        result = run_virsh(URI, ["domstate", "web"])
+
+    assert result.stdout == "running\n\n"
+    assert result.returncode == 0
+    assert result.args == ["virsh", "-c", URI, "domstate", "web"]
+
+
+def test_session_forces_c_locale(fake_virsh, monkeypatch):
+    """The interactive shell inherits the same LC_ALL/LANG=C override."""
+    monkeypatch.setenv("LC_ALL", "de_DE.UTF-8")
+    monkeypatch.setenv("LANG", "de_DE.UTF-8")
+    with virsh_sessions():
+        result = run_virsh(URI, ["locale"])
+
+    assert result.stdout.strip() == "C C"
+
+
+def test_session_quotes_arguments(fake_virsh):
+    """Arguments with spaces, quotes and ``;`` survive the shell round-trip."""
+    tricky = ["my vm", "it's", "a;b", "#hash"]
+    with virsh_sessions():
+        result = run_virsh(URI, ["args", *tricky])
+
+    assert result.stdout.strip() == '["my vm", "it\'s", "a;b", "#hash"]'
+
+
+def test_session_error_maps_to_virsh_error(fake_virsh):
+    """An ``error:`` on stderr is a failure: VirshError(rc=1) with the stderr."""
+    with virsh_sessions():
+        with pytest.raises(VirshError) as excinfo:
+            virsh_domstate(URI, "ghost")
+        # The session survives a command-level error and stays reusable.
+        assert virsh_domstate(URI, "web") == "running"
+
+    assert excinfo.value.returncode == 1
+    assert "failed to get domain 'ghost'" in excinfo.value.stderr
+    assert _spawns(fake_virsh) == 1
+
+
+def test_session_check_false_returns_failed_result(fake_virsh):
+    """``check=False`` returns the nonzero result instead of raising."""
+    with virsh_sessions():
+        result = run_virsh(URI, ["domstate", "ghost"], check=False)
+
+    assert result.returncode == 1
+    assert "failed to get domain" in result.stderr
+
+
+def test_session_connection_drop_reconnects_and_retries(fake_virsh, tmp_path):
+    """A shell dying with a connection error is retried on a fresh shell."""
+    (tmp_path / "drop-once").touch()
+    with mock.patch("tkc_lvlab.utils.virsh.time.sleep") as sleep:
+        with virsh_sessions():
+            result = run_virsh(URI, ["drop"])
+
+    assert result.stdout.strip() == "reconnected"
+    assert mock.call(virsh._CONNECTION_ERROR_BACKOFF[0]) in sleep.call_args_list
+    assert _spawns(fake_virsh) == 2
+
+
+def test_session_timeout_raises_and_kills_session(fake_virsh):
+    """A timed-out command maps to VirshError(-1) and the next call respawns."""
+    with virsh_sessions():
+        with pytest.raises(VirshError) as excinfo:
+            run_virsh(URI, ["sleep"], timeout=0.5)
+        assert virsh_domstate(URI, "web") == "running"
+
+    assert excinfo.value.returncode == -1
+    assert _spawns(fake_virsh) == 2
+
+
+def test_input_text_bypasses_the_pool(fake_virsh):
+    """stdin payloads cannot travel over the session, so they fork one-shot."""
+    with virsh_sessions():
+        with mock.patch(
+            "tkc_lvlab.utils.virsh.subprocess.run",
+            return_value=subprocess.CompletedProcess(["virsh"], 0, "ok\n", ""),
+        ) as run:
+            run_virsh(URI, ["define", "/dev/stdin"], input_text="<domain/>")
+
+    run.assert_called_once()
+    assert _spawns(fake_virsh) == 0
+
+
+def test_newline_argument_bypasses_the_pool(fake_virsh):
+    """An argument containing a newline would split the line protocol."""
+    pool = VirshSessionPool()
+    assert pool.run(URI, ["desc", "web", "line1\nline2"], timeout=5) is None
+    assert _spawns(fake_virsh) == 0
+
+
+def test_missing_binary_falls_back_to_one_shot(tmp_path, monkeypatch):
+    """No virsh on PATH disables the pool; the one-shot path reports rc=127."""
+    monkeypatch.setenv("PATH", str(tmp_path))
+    monkeypatch.delenv(virsh_session.SESSIONS_ENV_VAR, raising=False)
+    with virsh_sessions():
+        with pytest.raises(VirshError) as excinfo:
+            run_virsh(URI, ["list"])
+
+    assert excinfo.value.returncode == 127
+
+
+def test_env_var_disables_sessions(fake_virsh, monkeypatch):
+    """LVLAB_VIRSH_SESSIONS=0 leaves run_virsh on the one-shot path."""
+    monkeypatch.setenv(virsh_session.SESSIONS_ENV_VAR, "0")
+    with virsh_sessions() as pool:
+        assert pool is None
+        assert active_session_pool() is None
+
+
+def test_nested_blocks_share_the_outer_pool(fake_virsh):
+    """Only the outermost block owns (and closes) the pool."""
+    with virsh_sessions() as outer:
+        with virsh_sessions() as inner:
+            assert inner is outer
+        assert active_session_pool() is outer
+    assert active_session_pool() is None
+
+
+def test_pool_caps_sessions_per_uri(fake_virsh):
+    """Concurrent callers beyond the cap wait rather than spawning more shells."""
+    pool = VirshSessionPool(max_sessions_per_uri=2)
+    results: list[str] = []
+
+    def worker() -> None:
+        for _ in range(3):
+            results.append(pool.run(URI, ["domstate", "web"], timeout=10).stdout)
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    pool.close()
+
+    assert results == ["running\n\n"] * 12
+    assert _spawns(fake_virsh) <= 2
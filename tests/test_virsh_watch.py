@@ -0,0 +1,310 @@
+"""Unit tests for :mod:`tkc_lvlab.utils.virsh_watch`.
+
+The event stream tests put a fake ``virsh`` on ``PATH`` whose ``event`` verb
+tails a file: a test "emits" a libvirt lifecycle event by appending a line.
+The lease-poller tests mock ``run_virsh`` at the ``virsh_watch`` boundary and
+count the queries a tick actually makes.
+"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+import threading
+import time
+from unittest import mock
+
+import pytest
+
+from tkc_lvlab.utils import virsh_watch
+from tkc_lvlab.utils.virsh_watch import (
+    DomainWatcher,
+    LeasePoller,
+    active_watchers,
+    parse_event_line,
+    virsh_watchers,
+    wait_for_lease,
+)
+
+URI = "qemu:///session"
+
+_FAKE_VIRSH = """#!{python}
+import os, sys, time
+
+if "event" in sys.argv:
+    path = os.environ["FAKE_VIRSH_EVENTS"]
+    pos = 0
+    while True:
+        with open(path) as fh:
+            data = fh.read()
+        if len(data) > pos:
+            sys.stdout.write(data[pos:])
+            sys.stdout.flush()
+            pos = len(data)
+        if "QUIT" in data:
+            sys.exit(0)
+        time.sleep(0.01)
+sys.exit(1)
+"""
+
+
+@pytest.fixture
+def events(tmp_path, monkeypatch):
+    """Install the fake ``virsh``; return a callable that emits one event line."""
+    bindir = tmp_path / "bin"
+    bindir.mkdir()
+    script = bindir / "virsh"
+    script.write_text(_FAKE_VIRSH.format(python=sys.executable))
+    script.chmod(0o755)
+    feed = tmp_path / "events"
+    feed.touch()
+    monkeypatch.setenv("PATH", f"{bindir}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.setenv("FAKE_VIRSH_EVENTS", str(feed))
+    monkeypatch.delenv(virsh_watch.EVENTS_ENV_VAR, raising=False)
+
+    def emit(line: str) -> None:
+        with feed.open("a") as fh:
+            fh.write(line + "\n")
+
+    return emit
+
+
+def _emit_later(emit, line: str, delay: float = 0.1) -> None:
+    threading.Timer(delay, emit, args=(line,)).start()
+
+
+def _counting(state: str):
+    calls: list[None] = []
+
+    def read() -> str:
+        calls.append(None)
+        return state
+
+    return read, calls
+
+
+def test_parse_event_line_lifecycle_and_noise():
+    event = parse_event_line("event 'lifecycle' for domain 'web01_lab': Stopped Shutdown")
+    assert event is not None
+    assert (event.domain, event.event, event.detail, event.state) == (
+        "web01_lab",
+        "stopped",
+        "Shutdown",
+        "shut off",
+    )
+
+    stamped = parse_event_line(
+        "2026-10-17 12:00:00.000+0000: event 'lifecycle' for domain 'db01': Started Booted"
+    )
+    assert stamped is not None and stamped.state == "running"
+
+    defined = parse_event_line("event 'lifecycle' for domain 'db01': Defined Added")
+    assert defined is not None and defined.state is None
+
+    assert parse_event_line("event 'reboot' for domain 'db01'") is None
+    assert parse_event_line("events received: 3") is None
+    assert parse_event_line("") is None
+
+
+def test_wait_resolves_on_event_without_polling(events):
+    watcher = DomainWatcher(URI)
+    assert watcher.start()
+    read, calls = _counting("running")
+    try:
+        _emit_later(events, "event 'lifecycle' for domain 'web01_lab': Stopped Shutdown")
+        start = time.monotonic()
+        got = watcher.wait_for_state(
+            "web01_lab", {"shut off"}, timeout=5, read_state=read, poll_interval=60
+        )
+    finally:
+        watcher.close()
+
+    assert got == "shut off"
+    assert time.monotonic() - start < 3
+    # One up-front read to close the subscribe race; the event did the rest.
+    assert len(calls) == 1
+
+
+def test_events_for_other_domains_do_not_resolve(events):
+    watcher = DomainWatcher(URI)
+    watcher.start()
+    read, _ = _counting("running")
+    try:
+        _emit_later(events, "event 'lifecycle' for domain 'db01_lab': Stopped Shutdown")
+        got = watcher.wait_for_state(
+            "web01_lab", {"shut off"}, timeout=0.4, read_state=read, poll_interval=60
+        )
+    finally:
+        watcher.close()
+    assert got is None
+
+
+def test_wait_returns_immediately_when_already_in_state(events):
+    watcher = DomainWatcher(URI)
+    watcher.start()
+    try:
+        got = watcher.wait_for_state(
+            "web01_lab",
+            {"shut off"},
+            timeout=5,
+            read_state=lambda: "shut off",
+            poll_interval=60,
+        )
+    finally:
+        watcher.close()
+    assert got == "shut off"
+
+
+def test_disabled_events_fall_back_to_polling(monkeypatch):
+    monkeypatch.setenv(virsh_watch.EVENTS_ENV_VAR, "0")
+    watcher = DomainWatcher(URI)
+    assert not watcher.start()
+    states = iter(["running", "running", "shut off"])
+    sleeps: list[float] = []
+
+    got = watcher.wait_for_state(
+        "web01_lab",
+        {"shut off"},
+        timeout=30,
+        read_state=lambda: next(states),
+        poll_interval=2,
+        sleep=sleeps.append,
+    )
+
+    assert got == "shut off"
+    assert sleeps == [2, 2]
+
+
+def test_stream_exit_mid_wait_falls_back_to_polling(events):
+    watcher = DomainWatcher(URI)
+    watcher.start()
+    states = iter(["running", "shut off"])
+    sleeps: list[float] = []
+    try:
+        _emit_later(events, "QUIT")
+        got = watcher.wait_for_state(
+            "web01_lab",
+            {"shut off"},
+            timeout=30,
+            read_state=lambda: next(states),
+            poll_interval=2,
+            sleep=sleeps.append,
+        )
+    finally:
+        watcher.close()
+    assert got == "shut off"
+    assert sleeps == [2]
+    assert not watcher.alive
+
+
+def test_failing_listener_does_not_stop_the_stream(events):
+    watcher = DomainWatcher(URI)
+    assert watcher.start()
+    seen: list[str] = []
+
+    def broken(event) -> None:
+        seen.append(event.domain)
+        raise RuntimeError("listener bug")
+
+    watcher.add_listener(broken)
+    read, calls = _counting("running")
+    try:
+        _emit_later(events, "event 'lifecycle' for domain 'db01_lab': Started Booted")
+        _emit_later(
+            events, "event 'lifecycle' for domain 'web01_lab': Stopped Shutdown", 0.3
+        )
+        got = watcher.wait_for_state(
+            "web01_lab", {"shut off"}, timeout=5, read_state=read, poll_interval=60
+        )
+        assert watcher.alive
+    finally:
+        watcher.close()
+
+    # The second event was still delivered: no fallback re-read was needed.
+    assert got == "shut off"
+    assert len(calls) == 1
+    assert seen == ["db01_lab", "web01_lab"]
+
+
+def _completed(stdout: str, returncode: int = 0):
+    return subprocess.CompletedProcess(["virsh"], returncode, stdout, "")
+
+
+def test_lease_poller_shares_one_query_between_waiters():
+    leases = iter([_completed(""), _completed("52:54:00:aa 10.0.0.5\n52:54:00:bb 10.0.0.6\n")])
+    poller = LeasePoller(URI, interval=0.05)
+
+    def extract_for(mac: str):
+        def extract(output: str) -> str | None:
+            for line in output.splitlines():
+                if line.startswith(mac):
+                    return line.split()[1]
+            return None
+
+        return extract
+
+    with mock.patch.object(
+        virsh_watch, "run_virsh", side_effect=lambda *a, **kw: next(leases)
+    ) as run:
+        first = poller.watch(["net-dhcp-leases", "default"], extract_for("52:54:00:aa"))
+        second = poller.watch(["net-dhcp-leases", "default"], extract_for("52:54:00:bb"))
+        assert first.result(timeout=5) == "10.0.0.5"
+        assert second.result(timeout=5) == "10.0.0.6"
+        poller.close()
+
+    # Two waiters, two ticks, two queries — not one loop per waiter.
+    assert run.call_count == 2
+    assert poller.queries_run == 2
+
+
+def test_lease_poller_started_event_kicks_an_immediate_tick():
+    poller = LeasePoller(URI, interval=60)
+    replies = iter([_completed(""), _completed("10.0.0.5")])
+    with mock.patch.object(
+        virsh_watch, "run_virsh", side_effect=lambda *a, **kw: next(replies)
+    ):
+        future = poller.watch(["domifaddr", "web01_lab"], lambda out: out or None)
+        time.sleep(0.1)  # first (empty) tick runs on registration
+        assert not future.done()
+        poller.on_event(
+            parse_event_line("event 'lifecycle' for domain 'web01_lab': Started Booted")
+        )
+        assert future.result(timeout=5) == "10.0.0.5"
+        poller.close()
+
+
+def test_lease_poller_survives_a_failing_extractor():
+    poller = LeasePoller(URI, interval=0.05)
+
+    def broken(output: str) -> str | None:  # noqa: ARG001
+        raise ValueError("extractor bug")
+
+    with mock.patch.object(virsh_watch, "run_virsh", return_value=_completed("10.0.0.5")):
+        failed = poller.watch(["domifaddr", "web01_lab"], broken)
+        healthy = poller.watch(["domifaddr", "web01_lab"], lambda out: out or None)
+        with pytest.raises(ValueError, match="extractor bug"):
+            failed.result(timeout=5)
+        assert healthy.result(timeout=5) == "10.0.0.5"
+        # The polling thread is still serving (or restarts for) new waiters.
+        later = poller.watch(["domifaddr", "db01_lab"], lambda out: out or None)
+        assert later.result(timeout=5) == "10.0.0.5"
+        poller.close()
+
+
+def test_wait_for_lease_times_out_and_cancels(monkeypatch):
+    monkeypatch.setenv(virsh_watch.EVENTS_ENV_VAR, "0")
+    with mock.patch.object(virsh_watch, "run_virsh", return_value=_completed("")):
+        got = wait_for_lease(URI, ["domifaddr", "web01_lab"], lambda out: None, timeout=0.2)
+    assert got is None
+
+
+def test_virsh_watchers_is_reentrant(monkeypatch):
+    monkeypatch.setenv(virsh_watch.EVENTS_ENV_VAR, "0")
+    assert active_watchers() is None
+    with virsh_watchers() as outer:
+        with virsh_watchers() as inner:
+            assert inner is outer
+        assert active_watchers() is outer
+        assert outer.lease_poller(URI) is outer.lease_poller(URI)
+    assert active_watchers() is None